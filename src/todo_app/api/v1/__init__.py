@@ -1,8 +1,17 @@
 from fastapi import APIRouter
 
 from todo_app.api.v1.healthcheck import router as healthcheck_router
-from todo_app.api.v1.money_flows import router as money_flows_router
+from todo_app.api.v1.monitoring import router as monitoring_router
+from todo_app.core.database import DB_MODE
+
+# DB_MODE=asyncの場合は非同期版（AsyncSession）、それ以外は同期版（Session）のルーターを使う
+# 使わない方のルーター（とそのリポジトリ）は読み込まない（起動を速くするため）
+if DB_MODE == "async":
+    from todo_app.api.v1.money_flows_async import router as money_flows_router
+else:
+    from todo_app.api.v1.money_flows import router as money_flows_router
 
 router = APIRouter()
 router.include_router(healthcheck_router, prefix="/healthcheck", tags=["Healthcheck"])
 router.include_router(money_flows_router, prefix="/money_flows", tags=["MoneyFlows"])
+router.include_router(monitoring_router, prefix="/monitoring", tags=["Monitoring"])
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 
+from todo_app.core.logger import HEALTHCHECK_LOG_SAMPLE_EVERY
 from todo_app.loggers.custom_logger import logger
 
 router = APIRouter()
@@ -7,5 +8,6 @@ router = APIRouter()
 @router.get("")
 def healthcheck() -> str:
     # ここで設定したロガーを使う。docker desktopのapiコンテナのlogに表示される
-    logger.info("ヘルスチェックの中身です")
+    # 監視から頻繁に呼ばれるため、HEALTHCHECK_LOG_SAMPLE_EVERY回に1回だけ出す
+    logger.info("ヘルスチェックの中身です", extra={"sample_every": HEALTHCHECK_LOG_SAMPLE_EVERY})
     return "お疲れ様です！！"
@@ -1,51 +1,454 @@
-from typing import Annotated
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, Response
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
+from todo_app.cache.read_cache import read_cache
+from todo_app.core.database import (
+    BULK_ID_CHUNK_SIZE,
+    BULK_INSERT_CHUNK_SIZE,
+    BULK_MAX_ROWS,
+    WRITE_BATCHING_ENABLED,
+)
 from todo_app.exceptions.business_error_exception import BusinessException
+from todo_app.exceptions.conflict_exception import ConflictException
+from todo_app.exceptions.partial_commit_exception import PartialCommitException
+from todo_app.logic.calculate.calculate_datetime import get_now
+from todo_app.logic.calculate.calculate_monthly_summary import MonthlySummaryDeltas
+from todo_app.logic.conditional.etag import (
+    build_conditional_headers,
+    build_etag,
+    is_etag_matched,
+)
+from todo_app.logic.pagination.cursor import (
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+from todo_app.logic.search.title_ngrams import NGRAM_TOKEN_SIZE
 from todo_app.models.db.base import get_db
 from todo_app.models.db.money_flows import MoneyFlowKind, MoneyFlows
 from todo_app.models.request.v1.money_flows import (
+    AggregatePeriod,
     CreateMoneyFlowRequest,
     DeleteMoneyFlowRequest,
+    JstDatetime,
+    Kind,
+    MoneyFlowFilter,
+    SortOrder,
+    TitleMatch,
     UpdateMoneyFlowRequest,
 )
 from todo_app.models.response.v1.money_flows import (
     CreateMoneyFlowResponse,
+    CreateMoneyFlowsBulkResponse,
+    GetBalanceResponse,
+    GetMoneyFlowAggregateResponseItem,
     GetMoneyFlowResponseItem,
+    GetMoneyFlowsPageResponse,
+    GetRunningBalanceResponse,
+    GetRunningBalanceResponseItem,
+    SearchMoneyFlowResponseItem,
+    SearchMoneyFlowsResponse,
     UpdateMoneyFlowResponse,
 )
+from todo_app.repositories.money_flow_balance import get_balance, get_running_balance
+from todo_app.repositories.money_flow_monthly_summary import (
+    apply_monthly_summary_deltas,
+    get_monthly_summaries,
+)
 from todo_app.repositories.money_flows import (
+    MONEY_FLOWS_CACHE_NAMESPACE,
+    aggregate_money_flows,
+    delete_money_flows_by_ids,
     get_money_flow_by_id,
-    get_money_flows_all,
+    get_money_flow_items,
+    get_money_flow_snapshot_by_id,
+    get_money_flow_snapshots_by_ids,
+    get_money_flow_version,
+    get_money_flows_page,
+    insert_money_flows,
+    search_money_flows,
+    update_money_flow,
+    update_money_flows_by_ids,
 )
+from todo_app.writers.money_flows_writer import MoneyFlowRow, money_flows_writer
+
+# ★リクエストの確認・月次集計の増減・レスポンスの組み立て・エラーへの変換は、「（非同期版と共通）」の関数にまとめ、
+# 　非同期版（money_flows_async.py）からも使う。ルーターの関数には、DBへのアクセスの順番だけを書く。
 
 router = APIRouter()
 
+# 他の人が先に更新・削除していた（versionが古い）場合のメッセージ（409）
+STALE_VERSION_MESSAGE = "他のユーザーが先に更新しています。最新のデータを取得し直してください。"
+
+# 一括登録（commit_per_chunk=True）が途中で失敗した場合のメッセージ（500。登録済みのidも返す）
+PARTIAL_COMMIT_MESSAGE = "一括登録の途中で失敗しました。idsの行までは登録されています。"
+
 # ★TODO: APIテスト実施の際に、BusinessExceptionのみでなく、他の例外（SystemException、DatabaseExceptioなど）の自作エラーも追加する。
 
 
-@router.get("")
-def get_money_flows(session: Annotated[Session, Depends(get_db)]) -> list[GetMoneyFlowResponseItem]:
-    money_flow_items = get_money_flows_all(session)
+# GETのクエリパラメータから絞り込み条件を組み立てる（一覧・ページネーションで共通）
+# from, toはPythonの予約語のため、aliasでクエリパラメータ名を指定する
+# month_from, month_to：YYYYMM（どちらも含む）例：202504。日本時間の月で絞り込む
+def get_money_flow_filter(
+    date_from: Annotated[JstDatetime | None, Query(alias="from")] = None,
+    date_to: Annotated[JstDatetime | None, Query(alias="to")] = None,
+    month_from: Annotated[int | None, Query(ge=100001, le=999912)] = None,
+    month_to: Annotated[int | None, Query(ge=100001, le=999912)] = None,
+    kind: Kind | None = None,
+    amount_min: int | None = None,
+    amount_max: int | None = None,
+    order: SortOrder = "asc",
+) -> MoneyFlowFilter:
+    if date_from is not None and date_to is not None and date_from >= date_to:
+        raise BusinessException("fromにはtoより前の日時を指定してください。")
+    if month_from is not None and month_to is not None and month_from > month_to:
+        raise BusinessException("month_fromにはmonth_to以前の月を指定してください。")
+    if amount_min is not None and amount_max is not None and amount_min > amount_max:
+        raise BusinessException("amount_minにはamount_max以下の値を指定してください。")
+
+    return MoneyFlowFilter(
+        date_from=date_from,
+        date_to=date_to,
+        month_from=month_from,
+        month_to=month_to,
+        kind=kind,
+        amount_min=amount_min,
+        amount_max=amount_max,
+        order=order,
+    )
+
+
+# 条件付きGETのレスポンスヘッダー（ETag・Last-Modified）と、If-None-Matchと一致したか（一致したら304を返す）
+# params：ETagに含める、APIごとの条件（同じデータでも、条件が違えば別のETagにする）（非同期版と共通）
+def check_conditional_get(
+    version: tuple[datetime | None, int], params: dict[str, Any], if_none_match: str | None
+) -> tuple[dict[str, str], bool]:
+    max_updated_at, count = version
+    etag = build_etag(max_updated_at, count, params)
+    return build_conditional_headers(etag, max_updated_at), is_etag_matched(if_none_match, etag)
+
+
+# 一覧取得
+# 件数が多くても速く返せるよう、ORMのインスタンス・Pydanticのモデルを1行ずつ作らず、
+# 取得した値をそのままorjsonでJSONにする（Responseを直接返すため、戻り値の検証・変換は行われない）
+# response_model：APIドキュメント（OpenAPI）にレスポンスの形を載せるために指定
+# 条件付きGET：先に(MAX(updated_at), 件数)だけを取得してETagを作り、If-None-Matchと同じなら
+# 行を読まずに304（中身なし）を返す（ポーリングで変更がない場合の通信量・処理を減らす）
+@router.get("", response_model=list[GetMoneyFlowResponseItem], response_class=ORJSONResponse)
+def get_money_flows(
+    session: Annotated[Session, Depends(get_db)],
+    filters: Annotated[MoneyFlowFilter, Depends(get_money_flow_filter)],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    version = get_money_flow_version(session, filters=filters)
+    headers, not_modified = check_conditional_get(
+        version, {"route": "list", "filters": filters.model_dump(mode="json")}, if_none_match
+    )
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    return ORJSONResponse(
+        get_money_flow_items(session, filters=filters, data_version=version), headers=headers
+    )
+
+
+# ページネーションのカーソルを(occurred_date, id)に戻す（非同期版と共通）
+def parse_page_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise BusinessException("カーソルが不正です。") from e
+
+
+# limit + 1件まで取得した行から、ページのレスポンスを作る（非同期版と共通）
+def build_page_response(items: list[dict], limit: int) -> GetMoneyFlowsPageResponse:
+    # limit + 1件目が取れた場合のみ次のページがある
+    has_next = len(items) > limit
+    items = items[:limit]
+
+    next_cursor = None
+    if has_next:
+        next_cursor = encode_cursor(items[-1]["occurred_date"], items[-1]["id"])
+
+    return GetMoneyFlowsPageResponse(
+        items=[GetMoneyFlowResponseItem(**item) for item in items], next_cursor=next_cursor
+    )
+
+
+# カーソルページネーション
+# cursor：前のレスポンスのnext_cursorをそのまま渡す（1ページ目は指定しない）
+@router.get("/page")
+def get_money_flows_paginated(
+    session: Annotated[Session, Depends(get_db)],
+    filters: Annotated[MoneyFlowFilter, Depends(get_money_flow_filter)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: str | None = None,
+) -> GetMoneyFlowsPageResponse:
+    decoded_cursor = parse_page_cursor(cursor)
+    items = get_money_flows_page(session, limit=limit, cursor=decoded_cursor, filters=filters)
+    return build_page_response(items, limit)
 
+
+# 1行ごとの残高の条件を確認し、カーソルを(occurred_date, id)に戻す（非同期版と共通）
+def parse_running_balance_request(
+    date_from: datetime | None, date_to: datetime | None, cursor: str | None
+) -> tuple[datetime, int] | None:
+    if date_from is not None and date_to is not None and date_from >= date_to:
+        raise BusinessException("fromにはtoより前の日時を指定してください。")
+    return parse_page_cursor(cursor)
+
+
+# limit + 1件まで取得した残高付きの行から、レスポンスを作る（非同期版と共通）
+def build_running_balance_response(items: list[dict], limit: int) -> GetRunningBalanceResponse:
+    # limit + 1件目が取れた場合のみ次のページがある
+    has_next = len(items) > limit
+    items = items[:limit]
+
+    next_cursor = None
+    if has_next:
+        next_cursor = encode_cursor(items[-1]["occurred_date"], items[-1]["id"])
+
+    return GetRunningBalanceResponse(
+        items=[GetRunningBalanceResponseItem(**item) for item in items], next_cursor=next_cursor
+    )
+
+
+# 1行ごとの残高（収入 - 支出の累計）を、発生日時の順（occurred_date, id）にページごとに返す
+# from, toで期間を絞り込んでも、残高はそれより前の収支を含めた値になる
+@router.get("/running_balance")
+def get_money_flows_running_balance(
+    session: Annotated[Session, Depends(get_db)],
+    date_from: Annotated[JstDatetime | None, Query(alias="from")] = None,
+    date_to: Annotated[JstDatetime | None, Query(alias="to")] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: str | None = None,
+) -> GetRunningBalanceResponse:
+    decoded_cursor = parse_running_balance_request(date_from, date_to, cursor)
+    items = get_running_balance(
+        session, limit=limit, cursor=decoded_cursor, date_from=date_from, date_to=date_to
+    )
+    return build_running_balance_response(items, limit)
+
+
+# ある時点（as_ofより前）の残高
+# 全件を読まず、月次集計（前月までの月数分の行）とその月の収支（1か月分以内の行）から求める
+@router.get("/balance")
+def get_money_flows_balance(
+    session: Annotated[Session, Depends(get_db)], as_of: JstDatetime
+) -> GetBalanceResponse:
+    return GetBalanceResponse(as_of=as_of, balance=get_balance(session, (as_of, None)))
+
+
+# タイトル検索の条件を確認し、カーソルを(順位, occurred_date, id)に戻す（非同期版と共通）
+def parse_search_request(
+    q: str, match: TitleMatch, cursor: str | None
+) -> tuple[int, datetime, int] | None:
+    # 部分一致は2文字ずつのn-gramのインデックスで検索するため、1文字では検索できない
+    if match == "contains" and len(q) < NGRAM_TOKEN_SIZE:
+        raise BusinessException(
+            f"部分一致の検索は{NGRAM_TOKEN_SIZE}文字以上で指定してください（1文字の場合はmatch=prefix）。"
+        )
+    if cursor is None:
+        return None
+    try:
+        return decode_search_cursor(cursor)
+    except ValueError as e:
+        raise BusinessException("カーソルが不正です。") from e
+
+
+# limit + 1件まで取得した検索結果から、レスポンスを作る（非同期版と共通）
+def build_search_response(items: list[dict], limit: int) -> SearchMoneyFlowsResponse:
+    # limit + 1件目が取れた場合のみ次のページがある
+    has_next = len(items) > limit
+    items = items[:limit]
+
+    next_cursor = None
+    if has_next:
+        last_item = items[-1]
+        next_cursor = encode_search_cursor(
+            last_item["rank"], last_item["occurred_date"], last_item["id"]
+        )
+
+    return SearchMoneyFlowsResponse(
+        items=[SearchMoneyFlowResponseItem(**item) for item in items], next_cursor=next_cursor
+    )
+
+
+# タイトル検索（前方一致 / 部分一致）
+# 完全一致 → 前方一致 → 部分一致の順に、同じ順位の中では新しい順に並べる
+# 日本語（「お米」など）も、全件を読まずにインデックスで検索する
+@router.get("/search")
+def search_money_flows_by_title(
+    session: Annotated[Session, Depends(get_db)],
+    q: Annotated[str, Query(min_length=1, max_length=30)],
+    match: TitleMatch = "contains",
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: str | None = None,
+) -> SearchMoneyFlowsResponse:
+    decoded_cursor = parse_search_request(q, match, cursor)
+    items = search_money_flows(session, query=q, match=match, limit=limit, cursor=decoded_cursor)
+    return build_search_response(items, limit)
+
+
+# 集計の行から、レスポンスを作る（非同期版と共通）
+def build_aggregate_response(aggregates: Iterable[Row]) -> list[GetMoneyFlowAggregateResponseItem]:
     return [
-        GetMoneyFlowResponseItem(
-            id=item.id,
-            title=item.title,
-            amount=item.amount,
-            occurred_date=item.occurred_date,
+        GetMoneyFlowAggregateResponseItem(
+            period=item.period,
             kind=item.kind.value,
+            total_amount=item.total_amount,  # MySQLのSUMはDecimalで返るが、Pydanticがintに変換する
+            count=item.flow_count,
         )
-        for item in money_flow_items
+        for item in aggregates
     ]
 
 
+# 期間（月・週・年）と収支ごとの合計金額・件数
+# 絞り込み条件は一覧と共通（orderは期間の並び順に使う）
+@router.get("/aggregates", response_model=list[GetMoneyFlowAggregateResponseItem])
+def get_money_flow_aggregates(
+    session: Annotated[Session, Depends(get_db)],
+    filters: Annotated[MoneyFlowFilter, Depends(get_money_flow_filter)],
+    response: Response,
+    period: AggregatePeriod = "month",
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response | list[GetMoneyFlowAggregateResponseItem]:
+    # 条件付きGET（一覧と同じ）
+    version = get_money_flow_version(session, filters=filters)
+    headers, not_modified = check_conditional_get(
+        version,
+        {"route": "aggregates", "period": period, "filters": filters.model_dump(mode="json")},
+        if_none_match,
+    )
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    return build_aggregate_response(
+        aggregate_money_flows(session, period=period, filters=filters, data_version=version)
+    )
+
+
+# 月次集計の行から、レスポンスを作る（非同期版と共通）
+def build_monthly_summary_response(
+    summaries: Iterable[Any],
+) -> list[GetMoneyFlowAggregateResponseItem]:
+    return [
+        GetMoneyFlowAggregateResponseItem(
+            period=f"{summary.month // 100:04d}-{summary.month % 100:02d}",  # 集計APIのperiod=monthと同じ形式
+            kind=summary.kind.value,
+            total_amount=summary.total_amount,
+            count=summary.flow_count,
+        )
+        for summary in summaries
+    ]
+
+
+# 月・収支ごとの合計金額・件数（月次集計テーブルから取得するため、収支の件数によらず月数分の行だけを読む）
+# month_from, month_to：YYYYMM（どちらも含む）例：202504
+@router.get("/monthly_summary")
+def get_money_flow_monthly_summary(
+    session: Annotated[Session, Depends(get_db)],
+    month_from: Annotated[int | None, Query(ge=100001, le=999912)] = None,
+    month_to: Annotated[int | None, Query(ge=100001, le=999912)] = None,
+    kind: Kind | None = None,
+) -> list[GetMoneyFlowAggregateResponseItem]:
+    summaries = get_monthly_summaries(
+        session,
+        month_from=month_from,
+        month_to=month_to,
+        kind=MoneyFlowKind(kind) if kind is not None else None,
+    )
+    return build_monthly_summary_response(summaries)
+
+
+# 書き込みに失敗した場合に、代わりに返すAPIのエラー（そのまま返す場合はNone）（非同期版と共通）
+# ・StaleDataError：読んでから書き込むまでの間に、他の人が更新・削除した（DELETEの条件のversionが一致しなかった）→ 409
+# ・committed_ids：一括登録（commit_per_chunk=True）で、失敗する前にcommitしたidがある → 500と登録済みのid
+def build_write_error(e: Exception, committed_ids: list[int] | None = None) -> HTTPException | None:
+    if isinstance(e, StaleDataError):
+        return ConflictException(STALE_VERSION_MESSAGE)
+    if committed_ids:
+        return PartialCommitException(PARTIAL_COMMIT_MESSAGE, committed_ids)
+    return None
+
+
+# 書き込みのトランザクション（非同期版は、money_flows_async.pyのwrite_transaction_async）
+# ・ブロックを抜けたらcommitする。失敗した場合は、書き込めなかった値・idを返さないよう、
+# 　ロールバックしたうえでエラーにする（build_write_error）
+# ・書き込んだ後は、一覧・集計のキャッシュを消す（commit・rollbackのどちらの後でも）
+@contextmanager
+def write_transaction(session: Session, committed_ids: list[int] | None = None) -> Iterator[None]:
+    try:
+        yield
+        session.commit()
+    except Exception as e:
+        session.rollback()
+        if (error := build_write_error(e, committed_ids)) is not None:
+            raise error from e
+        raise
+    finally:
+        read_cache.invalidate(MONEY_FLOWS_CACHE_NAMESPACE)
+
+
+# 登録APIの値を、複数行INSERT（BULK_INSERT_COLUMNS）の1行分のタプルにする（非同期版と共通）
+# now：一括登録では、全行で同じ登録日時にする
+def build_money_flow_row(body: CreateMoneyFlowRequest, now: datetime | None = None) -> MoneyFlowRow:
+    now = now or get_now()
+    return (body.title, body.amount, body.occurred_date, MoneyFlowKind(body.kind), now, now)
+
+
+# 登録した場合のレスポンス（登録直後のため、versionは初期値の1）
+# 登録した行をDBから読み直さず、リクエストの値から作る（非同期版と共通）
+def build_created_money_flow_response(
+    id: int, body: CreateMoneyFlowRequest
+) -> CreateMoneyFlowResponse:
+    return CreateMoneyFlowResponse(
+        id=id,
+        title=body.title,
+        amount=body.amount,
+        occurred_date=body.occurred_date,
+        kind=body.kind,
+        version=1,
+    )
+
+
+# 月次集計の増減（非同期版と共通）
+# removed：削除した行・更新前の行（occurred_date, kind, amountを持つ行）、added：登録・更新後の値
+# 更新は、更新前の値を引いて、更新後の値を足す（月や収支の種類が変わった場合は、両方の月・種類が増減する）
+def build_monthly_summary_deltas(
+    removed: Iterable[Any] = (),
+    added: Iterable[CreateMoneyFlowRequest | UpdateMoneyFlowRequest] = (),
+) -> MonthlySummaryDeltas:
+    deltas = MonthlySummaryDeltas()
+    for row in removed:
+        deltas.subtract(row.occurred_date, row.kind, row.amount)
+    for item in added:
+        deltas.add(item.occurred_date, MoneyFlowKind(item.kind), item.amount)
+    return deltas
+
+
 @router.post("")
 def create_money_flows(
     body: CreateMoneyFlowRequest, session: Annotated[Session, Depends(get_db)]
 ) -> CreateMoneyFlowResponse:
+    # まとめて書き込むモードでは、書き込み役のスレッドに登録を依頼し、commitされるまで待つ（最大WRITE_BATCH_TIMEOUT_MS）
+    # （失敗した場合は、他のリクエストに影響させず、このリクエストだけエラーにする）
+    if WRITE_BATCHING_ENABLED:
+        id = money_flows_writer.submit_and_wait(build_money_flow_row(body))
+        return build_created_money_flow_response(id, body)
+
     new_money_flow = MoneyFlows(
         title=body.title,
         amount=body.amount,
@@ -55,45 +458,160 @@ def create_money_flows(
 
     session.add(new_money_flow)
 
-    try:
-        session.commit()
-    except Exception:
-        session.rollback()
-    return CreateMoneyFlowResponse(
-        id=new_money_flow.id,
-        title=new_money_flow.title,
-        amount=new_money_flow.amount,
-        occurred_date=new_money_flow.occurred_date,
-        kind=new_money_flow.kind.value,
+    # 月次集計テーブルにも同じトランザクションで反映する
+    with write_transaction(session):
+        # INSERTしてidを採番し、commitの前にidだけ取っておく
+        # （commitすると属性が期限切れになり、読むたびにSELECTで読み直すため）
+        session.flush()
+        id = new_money_flow.id
+        apply_monthly_summary_deltas(session, build_monthly_summary_deltas(added=[body]))
+    return build_created_money_flow_response(id, body)
+
+
+# 一括登録（JSONの配列を受け取る）
+# 配列全体のバリデーションが通ってから、chunk_size行ずつ複数行INSERTで登録する
+# commit_per_chunk=False：全体を1トランザクションで登録（途中で失敗したら何も登録されない）
+# commit_per_chunk=True：チャンクごとにcommit（大量データの取り込み向け。失敗したチャンク以降は登録されない）
+# 　失敗した場合は500のPartialCommitExceptionで、登録済みの行のidを返す
+@router.post("/bulk")
+def create_money_flows_bulk(
+    body: Annotated[list[CreateMoneyFlowRequest], Body(min_length=1, max_length=BULK_MAX_ROWS)],
+    session: Annotated[Session, Depends(get_db)],
+    chunk_size: Annotated[int, Query(ge=1, le=5000)] = BULK_INSERT_CHUNK_SIZE,
+    commit_per_chunk: bool = False,
+) -> CreateMoneyFlowsBulkResponse:
+    now = get_now()
+    ids = []
+    committed_ids: list[int] = []  # commit済みのチャンクのid（commit_per_chunk=Trueの場合）
+
+    with write_transaction(session, committed_ids):
+        for start in range(0, len(body), chunk_size):
+            chunk = body[start : start + chunk_size]
+
+            chunk_ids = insert_money_flows(
+                session, [build_money_flow_row(item, now) for item in chunk]
+            )
+            ids.extend(chunk_ids)
+
+            # 月次集計テーブルにも同じトランザクションで反映する
+            apply_monthly_summary_deltas(session, build_monthly_summary_deltas(added=chunk))
+
+            if commit_per_chunk:
+                session.commit()
+                committed_ids.extend(chunk_ids)
+
+    return CreateMoneyFlowsBulkResponse(ids=ids)
+
+
+# 更新するversionを決める（非同期版と共通）
+# 指定したIDが存在しなかった場合の自作エラー（BusinessException）を発動
+# versionが送られてこなかった場合は、今読んだversionで更新する（読んでから更新するまでの間の変更は検知する）
+def get_update_version(snapshot: Row | None, body: UpdateMoneyFlowRequest) -> int:
+    if snapshot is None:
+        raise BusinessException("指定したIDが存在しません。")
+
+    version = body.version if body.version is not None else snapshot.version
+    if snapshot.version != version:
+        raise ConflictException(STALE_VERSION_MESSAGE)
+    return version
+
+
+# 更新した場合のレスポンス（versionは更新前のversion + 1）（非同期版と共通）
+def build_updated_money_flow_response(
+    body: UpdateMoneyFlowRequest, version: int
+) -> UpdateMoneyFlowResponse:
+    return UpdateMoneyFlowResponse(
+        id=body.id,
+        title=body.title,
+        amount=body.amount,
+        occurred_date=body.occurred_date,
+        kind=body.kind,
+        version=version + 1,
     )
 
 
+# 楽観的排他制御：「UPDATE ... WHERE id = :id AND version = :version」の1文で更新し、行はロックしない
+# 月次集計の増減に更新前の値が必要なため、先に対象行の5列だけを読む（ORMのインスタンスは作らない）
 @router.put("")
 def update_money_flows(
     body: UpdateMoneyFlowRequest, session: Annotated[Session, Depends(get_db)]
 ) -> UpdateMoneyFlowResponse:
-    target_money_flow = get_money_flow_by_id(session, id=body.id)
+    snapshot = get_money_flow_snapshot_by_id(session, id=body.id)
+    version = get_update_version(snapshot, body)
+    deltas = build_monthly_summary_deltas(removed=[snapshot], added=[body])
 
-    # 指定したIDが存在しなかった場合の自作エラー（BusinessException）を発動
-    if target_money_flow is None:
-        raise BusinessException("指定したIDが存在しません。")
+    with write_transaction(session):
+        # 0行：読んでから更新するまでの間に、他の人が更新・削除した
+        if update_money_flow(session, body, version) == 0:
+            raise ConflictException(STALE_VERSION_MESSAGE)
+        apply_monthly_summary_deltas(session, deltas)
+    return build_updated_money_flow_response(body, version)
 
-    target_money_flow.title = body.title
-    target_money_flow.amount = body.amount
-    target_money_flow.occurred_date = body.occurred_date
-    target_money_flow.kind = MoneyFlowKind(body.kind)
 
-    try:
-        session.commit()
-    except Exception:
-        session.rollback()
-    return UpdateMoneyFlowResponse(
-        id=target_money_flow.id,
-        title=target_money_flow.title,
-        amount=target_money_flow.amount,
-        occurred_date=target_money_flow.occurred_date,
-        kind=target_money_flow.kind.value,
-    )
+# 一括更新で、同じIDが複数指定されていないことを確認する（非同期版と共通）
+def check_unique_ids(ids: list[int]) -> None:
+    if len(set(ids)) != len(ids):
+        raise BusinessException("同じIDが複数指定されています。")
+
+
+# 一括更新・削除の対象行が、すべて存在することを確認する（非同期版と共通）
+# 指定したIDが1件でも存在しなかった場合は、何も変更せず自作エラー（BusinessException）を発動（存在しないIDをメッセージに含める）
+def check_missing_ids(ids: list[int], snapshots: list[Row]) -> None:
+    missing_ids = set(ids) - {snapshot.id for snapshot in snapshots}
+    if missing_ids:
+        raise BusinessException(
+            f"指定したIDが存在しません。（id: {', '.join(str(id) for id in sorted(missing_ids))}）"
+        )
+
+
+# 一括更新で、versionが送られてきた行は、取得した時から他の人が更新していないことを確認し、
+# idごとの現在のversionを返す（非同期版と共通）
+# （対象行はFOR UPDATEでロックしているため、確認してから更新するまでの間には変更されない）
+def get_bulk_update_versions(
+    body: list[UpdateMoneyFlowRequest], snapshots: list[Row]
+) -> dict[int, int]:
+    versions = {snapshot.id: snapshot.version for snapshot in snapshots}
+    stale_ids = [
+        item.id for item in body if item.version is not None and item.version != versions[item.id]
+    ]
+    if stale_ids:
+        raise ConflictException(
+            f"{STALE_VERSION_MESSAGE}（id: {', '.join(str(id) for id in stale_ids)}）"
+        )
+    return versions
+
+
+# 一括更新・削除の対象行を、BULK_ID_CHUNK_SIZE件ずつ取得する
+def get_bulk_target_snapshots(session: Session, ids: list[int]) -> list[Row]:
+    snapshots = []
+    for start in range(0, len(ids), BULK_ID_CHUNK_SIZE):
+        snapshots.extend(
+            get_money_flow_snapshots_by_ids(session, ids[start : start + BULK_ID_CHUNK_SIZE])
+        )
+    check_missing_ids(ids, snapshots)
+    return snapshots
+
+
+# 一括更新（JSONの配列を受け取る）
+# 1件ずつSELECT → ORMで変更 → commitせず、CASE式を使ったUPDATE文でまとめて更新する
+@router.put("/bulk")
+def update_money_flows_bulk(
+    body: Annotated[list[UpdateMoneyFlowRequest], Body(min_length=1, max_length=BULK_MAX_ROWS)],
+    session: Annotated[Session, Depends(get_db)],
+) -> list[UpdateMoneyFlowResponse]:
+    ids = [item.id for item in body]
+    check_unique_ids(ids)
+
+    snapshots = get_bulk_target_snapshots(session, ids)
+    versions = get_bulk_update_versions(body, snapshots)
+    deltas = build_monthly_summary_deltas(removed=snapshots, added=body)
+
+    with write_transaction(session):
+        for start in range(0, len(body), BULK_ID_CHUNK_SIZE):
+            update_money_flows_by_ids(session, body[start : start + BULK_ID_CHUNK_SIZE])
+        apply_monthly_summary_deltas(session, deltas)
+
+    return [build_updated_money_flow_response(item, versions[item.id]) for item in body]
 
 
 # status_code=204：成功したが、返す情報がない（返信コメントなし）
@@ -109,8 +627,27 @@ def delete_money_flows(
 
     session.delete(target_money_flow)
 
-    try:
-        session.commit()
-    except Exception:
-        session.rollback()
+    with write_transaction(session):
+        apply_monthly_summary_deltas(
+            session, build_monthly_summary_deltas(removed=[target_money_flow])
+        )
+    return Response(status_code=204)
+
+
+# 一括削除（{"ids": [1, 2, 3]} を受け取る）
+# 「DELETE ... WHERE id IN (...)」をBULK_ID_CHUNK_SIZE件ずつ実行し、全体を1トランザクションで削除する
+# Body(embed=True)：bodyを配列そのものではなく{"ids": [...]}の形で受け取る
+@router.delete("/bulk", status_code=204)
+def delete_money_flows_bulk(
+    ids: Annotated[list[int], Body(embed=True, min_length=1, max_length=BULK_MAX_ROWS)],
+    session: Annotated[Session, Depends(get_db)],
+) -> Response:
+    ids = list(dict.fromkeys(ids))  # 重複を除く（順番は保つ）
+    snapshots = get_bulk_target_snapshots(session, ids)
+
+    with write_transaction(session):
+        for start in range(0, len(ids), BULK_ID_CHUNK_SIZE):
+            delete_money_flows_by_ids(session, ids[start : start + BULK_ID_CHUNK_SIZE])
+        apply_monthly_summary_deltas(session, build_monthly_summary_deltas(removed=snapshots))
+
     return Response(status_code=204)
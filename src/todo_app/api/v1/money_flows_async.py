@@ -0,0 +1,351 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Annotated
+
+from fastapi import APIRouter, Body, Depends, Header, Query, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from todo_app.api.v1.money_flows import (
+    STALE_VERSION_MESSAGE,
+    build_aggregate_response,
+    build_created_money_flow_response,
+    build_money_flow_row,
+    build_monthly_summary_deltas,
+    build_monthly_summary_response,
+    build_page_response,
+    build_running_balance_response,
+    build_search_response,
+    build_updated_money_flow_response,
+    build_write_error,
+    check_conditional_get,
+    check_missing_ids,
+    check_unique_ids,
+    get_bulk_update_versions,
+    get_money_flow_filter,
+    get_update_version,
+    parse_page_cursor,
+    parse_running_balance_request,
+    parse_search_request,
+)
+from todo_app.cache.read_cache import read_cache
+from todo_app.core.database import (
+    BULK_ID_CHUNK_SIZE,
+    BULK_INSERT_CHUNK_SIZE,
+    BULK_MAX_ROWS,
+    WRITE_BATCHING_ENABLED,
+)
+from todo_app.exceptions.business_error_exception import BusinessException
+from todo_app.exceptions.conflict_exception import ConflictException
+from todo_app.logic.calculate.calculate_datetime import get_now
+from todo_app.models.db.async_base import get_async_db
+from todo_app.models.db.money_flows import MoneyFlowKind, MoneyFlows
+from todo_app.models.request.v1.money_flows import (
+    AggregatePeriod,
+    CreateMoneyFlowRequest,
+    DeleteMoneyFlowRequest,
+    JstDatetime,
+    Kind,
+    MoneyFlowFilter,
+    TitleMatch,
+    UpdateMoneyFlowRequest,
+)
+from todo_app.models.response.v1.money_flows import (
+    CreateMoneyFlowResponse,
+    CreateMoneyFlowsBulkResponse,
+    GetBalanceResponse,
+    GetMoneyFlowAggregateResponseItem,
+    GetMoneyFlowResponseItem,
+    GetMoneyFlowsPageResponse,
+    GetRunningBalanceResponse,
+    SearchMoneyFlowsResponse,
+    UpdateMoneyFlowResponse,
+)
+from todo_app.repositories.money_flow_balance_async import get_balance, get_running_balance
+from todo_app.repositories.money_flow_monthly_summary_async import (
+    apply_monthly_summary_deltas,
+    get_monthly_summaries,
+)
+from todo_app.repositories.money_flows import MONEY_FLOWS_CACHE_NAMESPACE
+from todo_app.repositories.money_flows_async import (
+    aggregate_money_flows,
+    delete_money_flows_by_ids,
+    get_money_flow_by_id,
+    get_money_flow_items,
+    get_money_flow_snapshot_by_id,
+    get_money_flow_snapshots_by_ids,
+    get_money_flow_version,
+    get_money_flows_page,
+    insert_money_flows,
+    search_money_flows,
+    update_money_flow,
+    update_money_flows_by_ids,
+)
+from todo_app.writers.money_flows_writer import money_flows_writer
+
+# ★money_flows.pyの非同期（async def + AsyncSession）版。DB_MODE=asyncの場合にこちらのルーターを使う。
+# 　同期版はリクエストごとにスレッドプールのスレッドを1つ占有するが、非同期版はDBの応答待ちの間スレッドを手放す。
+# 　パス・リクエスト・レスポンス・エラーは同期版と同じにしている（変更する場合は両方を変更すること）。
+# 　リクエストの確認・レスポンスの組み立てなどは同期版の関数を使い、ここではDBへのアクセスだけをawaitする。
+
+router = APIRouter()
+
+
+# money_flows.pyのwrite_transactionの非同期版
+@asynccontextmanager
+async def write_transaction_async(
+    session: AsyncSession, committed_ids: list[int] | None = None
+) -> AsyncIterator[None]:
+    try:
+        yield
+        await session.commit()
+    except Exception as e:
+        await session.rollback()
+        if (error := build_write_error(e, committed_ids)) is not None:
+            raise error from e
+        raise
+    finally:
+        read_cache.invalidate(MONEY_FLOWS_CACHE_NAMESPACE)
+
+
+@router.get("", response_model=list[GetMoneyFlowResponseItem], response_class=ORJSONResponse)
+async def get_money_flows(
+    session: Annotated[AsyncSession, Depends(get_async_db)],
+    filters: Annotated[MoneyFlowFilter, Depends(get_money_flow_filter)],
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    version = await get_money_flow_version(session, filters=filters)
+    headers, not_modified = check_conditional_get(
+        version, {"route": "list", "filters": filters.model_dump(mode="json")}, if_none_match
+    )
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+
+    return ORJSONResponse(
+        await get_money_flow_items(session, filters=filters, data_version=version), headers=headers
+    )
+
+
+@router.get("/page")
+async def get_money_flows_paginated(
+    session: Annotated[AsyncSession, Depends(get_async_db)],
+    filters: Annotated[MoneyFlowFilter, Depends(get_money_flow_filter)],
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: str | None = None,
+) -> GetMoneyFlowsPageResponse:
+    decoded_cursor = parse_page_cursor(cursor)
+    items = await get_money_flows_page(session, limit=limit, cursor=decoded_cursor, filters=filters)
+    return build_page_response(items, limit)
+
+
+@router.get("/running_balance")
+async def get_money_flows_running_balance(
+    session: Annotated[AsyncSession, Depends(get_async_db)],
+    date_from: Annotated[JstDatetime | None, Query(alias="from")] = None,
+    date_to: Annotated[JstDatetime | None, Query(alias="to")] = None,
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: str | None = None,
+) -> GetRunningBalanceResponse:
+    decoded_cursor = parse_running_balance_request(date_from, date_to, cursor)
+    items = await get_running_balance(
+        session, limit=limit, cursor=decoded_cursor, date_from=date_from, date_to=date_to
+    )
+    return build_running_balance_response(items, limit)
+
+
+@router.get("/balance")
+async def get_money_flows_balance(
+    session: Annotated[AsyncSession, Depends(get_async_db)], as_of: JstDatetime
+) -> GetBalanceResponse:
+    return GetBalanceResponse(as_of=as_of, balance=await get_balance(session, (as_of, None)))
+
+
+@router.get("/search")
+async def search_money_flows_by_title(
+    session: Annotated[AsyncSession, Depends(get_async_db)],
+    q: Annotated[str, Query(min_length=1, max_length=30)],
+    match: TitleMatch = "contains",
+    limit: Annotated[int, Query(ge=1, le=100)] = 20,
+    cursor: str | None = None,
+) -> SearchMoneyFlowsResponse:
+    decoded_cursor = parse_search_request(q, match, cursor)
+    items = await search_money_flows(
+        session, query=q, match=match, limit=limit, cursor=decoded_cursor
+    )
+    return build_search_response(items, limit)
+
+
+@router.get("/aggregates", response_model=list[GetMoneyFlowAggregateResponseItem])
+async def get_money_flow_aggregates(
+    session: Annotated[AsyncSession, Depends(get_async_db)],
+    filters: Annotated[MoneyFlowFilter, Depends(get_money_flow_filter)],
+    response: Response,
+    period: AggregatePeriod = "month",
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response | list[GetMoneyFlowAggregateResponseItem]:
+    # 条件付きGET（一覧と同じ）
+    version = await get_money_flow_version(session, filters=filters)
+    headers, not_modified = check_conditional_get(
+        version,
+        {"route": "aggregates", "period": period, "filters": filters.model_dump(mode="json")},
+        if_none_match,
+    )
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    return build_aggregate_response(
+        await aggregate_money_flows(session, period=period, filters=filters, data_version=version)
+    )
+
+
+@router.get("/monthly_summary")
+async def get_money_flow_monthly_summary(
+    session: Annotated[AsyncSession, Depends(get_async_db)],
+    month_from: Annotated[int | None, Query(ge=100001, le=999912)] = None,
+    month_to: Annotated[int | None, Query(ge=100001, le=999912)] = None,
+    kind: Kind | None = None,
+) -> list[GetMoneyFlowAggregateResponseItem]:
+    summaries = await get_monthly_summaries(
+        session,
+        month_from=month_from,
+        month_to=month_to,
+        kind=MoneyFlowKind(kind) if kind is not None else None,
+    )
+    return build_monthly_summary_response(summaries)
+
+
+@router.post("")
+async def create_money_flows(
+    body: CreateMoneyFlowRequest, session: Annotated[AsyncSession, Depends(get_async_db)]
+) -> CreateMoneyFlowResponse:
+    # 書き込み役は同期のエンジンで書き込むため、commitを待つ間もイベントループは止めない
+    if WRITE_BATCHING_ENABLED:
+        id = await money_flows_writer.submit_and_wait_async(build_money_flow_row(body))
+        return build_created_money_flow_response(id, body)
+
+    new_money_flow = MoneyFlows(
+        title=body.title,
+        amount=body.amount,
+        occurred_date=body.occurred_date,
+        kind=MoneyFlowKind(body.kind),
+    )
+
+    session.add(new_money_flow)  # add()はDBにアクセスしないため、awaitは不要
+
+    async with write_transaction_async(session):
+        # 同期版と同じく、INSERTしてidを採番し、commitの前にidだけ取っておく
+        await session.flush()
+        id = new_money_flow.id
+        await apply_monthly_summary_deltas(session, build_monthly_summary_deltas(added=[body]))
+    return build_created_money_flow_response(id, body)
+
+
+@router.post("/bulk")
+async def create_money_flows_bulk(
+    body: Annotated[list[CreateMoneyFlowRequest], Body(min_length=1, max_length=BULK_MAX_ROWS)],
+    session: Annotated[AsyncSession, Depends(get_async_db)],
+    chunk_size: Annotated[int, Query(ge=1, le=5000)] = BULK_INSERT_CHUNK_SIZE,
+    commit_per_chunk: bool = False,
+) -> CreateMoneyFlowsBulkResponse:
+    now = get_now()
+    ids = []
+    committed_ids: list[int] = []
+
+    async with write_transaction_async(session, committed_ids):
+        for start in range(0, len(body), chunk_size):
+            chunk = body[start : start + chunk_size]
+
+            chunk_ids = await insert_money_flows(
+                session, [build_money_flow_row(item, now) for item in chunk]
+            )
+            ids.extend(chunk_ids)
+            await apply_monthly_summary_deltas(session, build_monthly_summary_deltas(added=chunk))
+
+            if commit_per_chunk:
+                await session.commit()
+                committed_ids.extend(chunk_ids)
+
+    return CreateMoneyFlowsBulkResponse(ids=ids)
+
+
+# 楽観的排他制御：「UPDATE ... WHERE id = :id AND version = :version」の1文で更新し、行はロックしない
+# 月次集計の増減に更新前の値が必要なため、先に対象行の5列だけを読む（ORMのインスタンスは作らない）
+@router.put("")
+async def update_money_flows(
+    body: UpdateMoneyFlowRequest, session: Annotated[AsyncSession, Depends(get_async_db)]
+) -> UpdateMoneyFlowResponse:
+    snapshot = await get_money_flow_snapshot_by_id(session, id=body.id)
+    version = get_update_version(snapshot, body)
+    deltas = build_monthly_summary_deltas(removed=[snapshot], added=[body])
+
+    async with write_transaction_async(session):
+        # 0行：読んでから更新するまでの間に、他の人が更新・削除した
+        if await update_money_flow(session, body, version) == 0:
+            raise ConflictException(STALE_VERSION_MESSAGE)
+        await apply_monthly_summary_deltas(session, deltas)
+    return build_updated_money_flow_response(body, version)
+
+
+async def get_bulk_target_snapshots(session: AsyncSession, ids: list[int]) -> list[Row]:
+    snapshots = []
+    for start in range(0, len(ids), BULK_ID_CHUNK_SIZE):
+        snapshots.extend(
+            await get_money_flow_snapshots_by_ids(session, ids[start : start + BULK_ID_CHUNK_SIZE])
+        )
+    check_missing_ids(ids, snapshots)
+    return snapshots
+
+
+@router.put("/bulk")
+async def update_money_flows_bulk(
+    body: Annotated[list[UpdateMoneyFlowRequest], Body(min_length=1, max_length=BULK_MAX_ROWS)],
+    session: Annotated[AsyncSession, Depends(get_async_db)],
+) -> list[UpdateMoneyFlowResponse]:
+    ids = [item.id for item in body]
+    check_unique_ids(ids)
+
+    snapshots = await get_bulk_target_snapshots(session, ids)
+    versions = get_bulk_update_versions(body, snapshots)
+    deltas = build_monthly_summary_deltas(removed=snapshots, added=body)
+
+    async with write_transaction_async(session):
+        for start in range(0, len(body), BULK_ID_CHUNK_SIZE):
+            await update_money_flows_by_ids(session, body[start : start + BULK_ID_CHUNK_SIZE])
+        await apply_monthly_summary_deltas(session, deltas)
+
+    return [build_updated_money_flow_response(item, versions[item.id]) for item in body]
+
+
+@router.delete("", status_code=204)
+async def delete_money_flows(
+    body: DeleteMoneyFlowRequest, session: Annotated[AsyncSession, Depends(get_async_db)]
+) -> Response:
+    target_money_flow = await get_money_flow_by_id(session, id=body.id)
+    if target_money_flow is None:
+        raise BusinessException("指定したIDが存在しません。")
+
+    await session.delete(target_money_flow)  # AsyncSessionのdelete()はawaitが必要
+
+    async with write_transaction_async(session):
+        await apply_monthly_summary_deltas(
+            session, build_monthly_summary_deltas(removed=[target_money_flow])
+        )
+    return Response(status_code=204)
+
+
+@router.delete("/bulk", status_code=204)
+async def delete_money_flows_bulk(
+    ids: Annotated[list[int], Body(embed=True, min_length=1, max_length=BULK_MAX_ROWS)],
+    session: Annotated[AsyncSession, Depends(get_async_db)],
+) -> Response:
+    ids = list(dict.fromkeys(ids))
+    snapshots = await get_bulk_target_snapshots(session, ids)
+
+    async with write_transaction_async(session):
+        for start in range(0, len(ids), BULK_ID_CHUNK_SIZE):
+            await delete_money_flows_by_ids(session, ids[start : start + BULK_ID_CHUNK_SIZE])
+        await apply_monthly_summary_deltas(session, build_monthly_summary_deltas(removed=snapshots))
+
+    return Response(status_code=204)
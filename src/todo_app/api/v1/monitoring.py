@@ -0,0 +1,41 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from todo_app.cache.read_cache import read_cache
+from todo_app.models.response.v1.monitoring import (
+    GetDbPoolStatisticsResponseItem,
+    GetReadCacheStatisticsResponse,
+    GetSlowQueryResponseItem,
+)
+from todo_app.monitoring.db_pool import get_pool_statistics
+from todo_app.monitoring.metrics import metrics_registry
+from todo_app.monitoring.slow_queries import slow_query_log
+
+router = APIRouter()
+
+
+# コネクションプールの状態（ワーカー（プロセス）ごとの値。複数ワーカーの場合は、応答したワーカーの値）
+@router.get("/db_pool")
+def get_db_pool_statistics() -> list[GetDbPoolStatisticsResponseItem]:
+    return [GetDbPoolStatisticsResponseItem(**statistics) for statistics in get_pool_statistics()]
+
+
+# 読み取りキャッシュの状態（ワーカー（プロセス）ごとの値）
+@router.get("/cache")
+def get_read_cache_statistics() -> GetReadCacheStatisticsResponse:
+    return GetReadCacheStatisticsResponse(**read_cache.stats())
+
+
+# リクエスト・DBクエリのメトリクス（Prometheusのテキスト形式。ワーカー（プロセス）ごとの値）
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+# 遅いクエリ（SLOW_QUERY_THRESHOLD_MS以上かかったもの）をSQLの形ごとに、最大の実行時間が長い順で返す
+# （ワーカー（プロセス）ごとの値）
+@router.get("/slow_queries")
+def get_slow_queries() -> list[GetSlowQueryResponseItem]:
+    return [GetSlowQueryResponseItem(**statistics) for statistics in slow_query_log.snapshot()]
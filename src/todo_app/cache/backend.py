@@ -0,0 +1,140 @@
+import time
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Any
+
+# ★読み取りキャッシュの保存先（バックエンド）
+# 　値はbytes（pickle済み）で受け渡すため、プロセス間で共有するキャッシュ（Redisなど）にも同じ形で差し替えられる。
+# 　差し替える場合は、CacheBackendを継承したクラスを作り、read_cache.backendに設定する。
+# ★namespaceごとに「世代」（無効化した回数）を持つ。
+# 　invalidate()で世代を進め、set()は読み始めた時点の世代と変わっていれば保存しない。
+# 　（書き込み前に読み始めた古い結果を、無効化の後に保存してしまうのを防ぐ）
+
+
+class CacheBackend(ABC):
+    # 有効期限内の値を返す（なければNone）
+    @abstractmethod
+    def get(self, key: str) -> bytes | None: ...
+
+    # generationを渡した場合、キーのnamespaceの世代がgenerationと異なれば保存しない
+    # （世代の確認と保存は、invalidate()と同時に行われないようにすること）
+    @abstractmethod
+    def set(
+        self, key: str, value: bytes, ttl_seconds: float, generation: int | None = None
+    ) -> None: ...
+
+    # namespaceの今の世代
+    @abstractmethod
+    def generation(self, namespace: str) -> int: ...
+
+    # namespace（キーの先頭の「namespace:」）のエントリをすべて無効にし、世代を進める
+    @abstractmethod
+    def invalidate(self, namespace: str) -> None: ...
+
+    @abstractmethod
+    def clear(self) -> None: ...
+
+    # ヒット・ミス・追い出しなどの件数
+    @abstractmethod
+    def stats(self) -> dict[str, Any]: ...
+
+
+# プロセス内のキャッシュ（ワーカーごとに別々に持つ）
+# max_entries（件数）・max_bytes（値のバイト数の合計）を超えたら、最後に使われたのが古い順に追い出す（LRU）
+# 有効期限（TTL）を過ぎたエントリは、読んだ時点で削除する
+class InMemoryCacheBackend(CacheBackend):
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = Lock()
+        # キー → (有効期限（time.monotonic()）, 値)。末尾ほど最近使われたもの
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._bytes = 0
+        self._generations: dict[str, int] = {}  # namespace → 世代
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0  # 件数・バイト数の上限による追い出し
+        self.expirations = 0  # 有効期限切れによる削除
+        self.invalidations = 0  # 書き込みによる無効化（削除したエントリ数）
+        self.stale_skips = 0  # 読んでいる間に無効化されたため、保存しなかった件数
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self, key: str, value: bytes, ttl_seconds: float, generation: int | None = None
+    ) -> None:
+        # 1件で上限を超える値は保存しない（他のエントリをすべて追い出してしまうため）
+        if len(value) > self.max_bytes:
+            return
+
+        with self._lock:
+            namespace = key.split(":", 1)[0]
+            if generation is not None and self._generations.get(namespace, 0) != generation:
+                self.stale_skips += 1
+                return
+
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl_seconds, value)
+            self._bytes += len(value)
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def invalidate(self, namespace: str) -> None:
+        prefix = f"{namespace}:"
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                self._remove(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": type(self).__name__,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "stale_skips": self.stale_skips,
+            }
+
+    # ロックを取った状態で呼ぶ
+    def _remove(self, key: str) -> None:
+        _, value = self._entries.pop(key)
+        self._bytes -= len(value)
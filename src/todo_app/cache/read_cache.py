@@ -0,0 +1,130 @@
+import functools
+import hashlib
+import inspect
+import json
+import pickle
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from pydantic import BaseModel
+
+from todo_app.cache.backend import CacheBackend, InMemoryCacheBackend
+from todo_app.core.cache import (
+    READ_CACHE_ENABLED,
+    READ_CACHE_MAX_BYTES,
+    READ_CACHE_MAX_ENTRIES,
+    READ_CACHE_TTL_SECONDS,
+)
+
+# ★リポジトリの読み取り関数の結果をキャッシュする
+# 　@read_cache.cached("money_flows") を付けた関数は、第1引数（session）以外の引数が同じなら、DBを読まずに前回の結果を返す。
+# 　書き込み後に read_cache.invalidate("money_flows") を呼ぶと、そのnamespaceのキャッシュがすべて消える。
+# 　レプリカで読んだ結果は、プライマリで読んだ結果と別のキーにする（書き込んだ直後にプライマリで読むクライアントに、
+# 　レプリカの遅れた結果を返さないため）。
+# 　関数を呼ぶ前にnamespaceの世代を読んでおき、呼んでいる間にinvalidate()された場合は結果を保存しない
+# 　（書き込みの前に読み始めた古い結果が、無効化の後にキャッシュに残らないようにするため）。
+# 　値はpickleで保存するため、ORMのインスタンスではなく、レスポンスの形（dictなど）の値を返す関数に付けること。
+
+# Session.infoに、接続先（"primary" / "replica"）を入れるキー（get_dbがレプリカのSessionに設定する）
+DB_ROLE_INFO_KEY = "db_role"
+
+
+# 引数を、キャッシュのキーに使える文字列にする（Pydanticのモデルはフィールドの値で比較する）
+def _to_key_part(value: object) -> object:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return str(value)
+
+
+# Sessionの接続先（info[DB_ROLE_INFO_KEY]がなければプライマリ）
+def _get_db_role(session: object) -> str:
+    info = getattr(session, "info", None)
+    if not isinstance(info, dict):
+        return "primary"
+    return info.get(DB_ROLE_INFO_KEY, "primary")
+
+
+class ReadCache:
+    def __init__(self, backend: CacheBackend, ttl_seconds: float, enabled: bool = True) -> None:
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+    # キー：「namespace:関数名:接続先:引数のハッシュ」
+    # 位置引数・キーワード引数のどちらで渡しても同じキーになるよう、関数の引数名に合わせて並べ直す
+    def build_key(
+        self, namespace: str, function: Callable, args: tuple, kwargs: dict[str, Any]
+    ) -> str:
+        bound = inspect.signature(function).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = list(bound.arguments.items())
+        role = _get_db_role(arguments[0][1])
+        params = dict(arguments[1:])  # 第1引数（session）は除く
+
+        payload = json.dumps(params, sort_keys=True, default=_to_key_part)
+        digest = hashlib.sha256(payload.encode()).hexdigest()[:32]
+        return f"{namespace}:{function.__module__}.{function.__qualname__}:{role}:{digest}"
+
+    def cached[**P, R](self, namespace: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+        def decorator(function: Callable[P, R]) -> Callable[P, R]:
+            @functools.wraps(function)
+            def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                if not self.enabled:
+                    return function(*args, **kwargs)
+
+                key = self.build_key(namespace, function, args, kwargs)
+                cached_value = self.backend.get(key)
+                if cached_value is not None:
+                    return pickle.loads(cached_value)
+
+                generation = self.backend.generation(namespace)
+                result = function(*args, **kwargs)
+                self.backend.set(key, pickle.dumps(result), self.ttl_seconds, generation)
+                return result
+
+            return wrapper
+
+        return decorator
+
+    # 非同期（async def）の関数用
+    def cached_async[**P, R](
+        self, namespace: str
+    ) -> Callable[[Callable[P, Awaitable[R]]], Callable[P, Awaitable[R]]]:
+        def decorator(function: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+            @functools.wraps(function)
+            async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+                if not self.enabled:
+                    return await function(*args, **kwargs)
+
+                key = self.build_key(namespace, function, args, kwargs)
+                cached_value = self.backend.get(key)
+                if cached_value is not None:
+                    return pickle.loads(cached_value)
+
+                generation = self.backend.generation(namespace)
+                result = await function(*args, **kwargs)
+                self.backend.set(key, pickle.dumps(result), self.ttl_seconds, generation)
+                return result
+
+            return wrapper
+
+        return decorator
+
+    # 書き込み（commit）の後に呼ぶ
+    # ※commitより前に消すと、commit前の古いデータを他のリクエストが読んでキャッシュしてしまう
+    def invalidate(self, namespace: str) -> None:
+        self.backend.invalidate(namespace)
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {"enabled": self.enabled, "ttl_seconds": self.ttl_seconds} | self.backend.stats()
+
+
+read_cache = ReadCache(
+    InMemoryCacheBackend(max_entries=READ_CACHE_MAX_ENTRIES, max_bytes=READ_CACHE_MAX_BYTES),
+    ttl_seconds=READ_CACHE_TTL_SECONDS,
+    enabled=READ_CACHE_ENABLED,
+)
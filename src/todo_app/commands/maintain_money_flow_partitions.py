@@ -0,0 +1,143 @@
+# money_flowsのパーティション（MySQLのRANGE COLUMNS(occurred_date)、1か月1パーティション）を管理するコマンド
+# 実行例（cronなどで毎日〜毎月実行する）：
+#   python -m todo_app.commands.maintain_money_flow_partitions
+#   python -m todo_app.commands.maintain_money_flow_partitions --retention-months 60 --dry-run
+#
+# ・先の月のパーティションを--months-aheadか月分、先に作っておく（pmaxに行が入ってから分割すると、行のコピーが発生するため）
+# ・保存期間（--retention-monthsか月）より前のパーティションの行を、圧縮したmoney_flows_archiveに移してから、
+# 　パーティションごと削除する（DELETEと違い、インデックスの更新や断片化が発生しない）
+# 　行はEXCHANGE PARTITIONでmoney_flowsから取り出してからコピーするため、コピー中の更新・登録は失われない
+# 　（取り出した後の更新は対象の行がないため、APIのエラーになる）
+# ・月次集計テーブルは変えない（移動した月の合計も、そのまま月次集計APIで返す）
+
+import argparse
+
+from sqlalchemy.orm import Session
+
+from todo_app.loggers.custom_logger import logger
+from todo_app.logic.calculate.calculate_datetime import get_now
+from todo_app.logic.partition.monthly_partitions import (
+    partition_name,
+    plan_archive_partitions,
+    plan_future_partitions,
+)
+from todo_app.models.db.base import session as session_factory
+from todo_app.repositories.money_flow_partitions import (
+    add_money_flow_partitions,
+    copy_exchanged_rows_to_archive,
+    count_unarchived_exchanged_rows,
+    create_exchange_table,
+    delete_exchanged_title_fts_rows,
+    drop_exchange_table,
+    drop_money_flow_partition_if_empty,
+    exchange_partition,
+    exchange_table_exists,
+    get_money_flow_partitions,
+)
+
+# 取り出した後も、パーティションに行が登録され続けた場合に、取り出し直す最大の回数
+EXCHANGE_ATTEMPTS = 3
+
+
+class PartitionNotConfiguredError(Exception):
+    pass
+
+
+class ArchiveIncompleteError(Exception):
+    pass
+
+
+# 取り出した行をmoney_flows_archiveに移し、取り出し用の表を削除する（移した件数を返す）
+# すべての行がコピーできたことを確認してから削除する（削除はロールバックできない）
+def archive_exchanged_rows(session: Session) -> int:
+    copied = copy_exchanged_rows_to_archive(session, archived_at=get_now())
+    session.commit()
+
+    missing = count_unarchived_exchanged_rows(session)
+    if missing:
+        raise ArchiveIncompleteError(
+            f"取り出した{missing}件がmoney_flows_archiveにないため、削除を中止しました"
+        )
+    delete_exchanged_title_fts_rows(session)
+    session.commit()
+    drop_exchange_table(session)
+    return copied
+
+
+# 戻り値：(追加したパーティション名のリスト, アーカイブして削除したパーティション名のリスト)
+# dry_run=Trueの場合は、計画を表示するだけで変更しない
+def run(
+    session: Session, months_ahead: int, retention_months: int, dry_run: bool
+) -> tuple[list[str], list[str]]:
+    if session.get_bind().dialect.name != "mysql":
+        raise PartitionNotConfiguredError("パーティションはMySQLでのみ使えます")
+
+    partitions = get_money_flow_partitions(session)
+    if not partitions:
+        raise PartitionNotConfiguredError(
+            "money_flowsがパーティション分割されていません（alembic upgrade headを実行してください）"
+        )
+
+    today = get_now().replace(tzinfo=None)
+
+    months = plan_future_partitions(partitions, today, months_ahead)
+    added = [partition_name(month) for month in months]
+    if added:
+        logger.info("パーティションを追加します：%s", ", ".join(added))
+        if not dry_run:
+            add_money_flow_partitions(session, months)
+
+    archived = plan_archive_partitions(partitions, today, retention_months)
+    for name in archived:
+        logger.info("パーティションをアーカイブします：%s", name)
+        if dry_run:
+            continue
+
+        # 前回途中で止まった場合は、取り出し済みの行を先に移す
+        if exchange_table_exists(session):
+            archive_exchanged_rows(session)
+
+        copied = 0
+        for _ in range(EXCHANGE_ATTEMPTS):
+            create_exchange_table(session)
+            exchange_partition(session, name)
+            copied += archive_exchanged_rows(session)
+            if drop_money_flow_partition_if_empty(session, name):
+                break
+        else:
+            raise ArchiveIncompleteError(f"{name}に行が登録され続けるため、削除を中止しました")
+        logger.info("%sの%s件をmoney_flows_archiveに移しました", name, copied)
+
+    return added, archived
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="money_flowsのパーティションを追加・アーカイブする"
+    )
+    parser.add_argument(
+        "--months-ahead", type=int, default=3, help="何か月先までパーティションを作っておくか"
+    )
+    parser.add_argument(
+        "--retention-months",
+        type=int,
+        default=36,
+        help="money_flowsに残す月数（これより前のパーティションはアーカイブする）",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="変更せずに計画だけを表示する")
+    args = parser.parse_args(argv)
+
+    db = session_factory()
+    try:
+        run(db, args.months_ahead, args.retention_months, args.dry_run)
+    except (PartitionNotConfiguredError, ArchiveIncompleteError) as e:
+        logger.error("%s", e)
+        return 1
+    finally:
+        db.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,66 @@
+# 月次集計テーブル（money_flow_monthly_summary）をmoney_flowsから作り直すコマンド
+# 実行例：
+#   python -m todo_app.commands.rebuild_monthly_summary          → ズレを表示して作り直す
+#   python -m todo_app.commands.rebuild_monthly_summary --check  → ズレを表示するだけ（ズレがあれば終了コード1）
+# ※作り直している間は、money_flowsなどへの書き込みを止める（LOCK TABLES）ため、APIの登録・更新・削除が待たされる。
+# 　アクセスの少ない時間帯に実行すること（--checkは読むだけのため、止めない）
+
+import argparse
+
+from sqlalchemy.orm import Session
+
+from todo_app.loggers.custom_logger import logger
+from todo_app.models.db.base import session as session_factory
+from todo_app.repositories.money_flow_monthly_summary import (
+    find_monthly_summary_drift,
+    lock_monthly_summary_tables,
+    rebuild_monthly_summaries,
+)
+
+
+# ズレの件数を返す（check_only=Falseの場合は作り直してcommitする）
+def run(session: Session, check_only: bool) -> int:
+    drift = find_monthly_summary_drift(session)
+
+    for (month, kind), (stored, expected) in drift.items():
+        logger.warning(
+            "月次集計のズレ month=%s kind=%s 保存値(合計, 件数)=%s 正しい値(合計, 件数)=%s",
+            month,
+            kind.value,
+            stored,
+            expected,
+        )
+    logger.info("月次集計のズレ：%s件", len(drift))
+
+    if not check_only:
+        with lock_monthly_summary_tables(session):
+            try:
+                rebuild_monthly_summaries(session)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+        logger.info("月次集計テーブルを作り直しました")
+
+    return len(drift)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="月次集計テーブルをmoney_flowsから作り直す")
+    parser.add_argument(
+        "--check", action="store_true", help="作り直さずにズレの確認だけを行う"
+    )
+    args = parser.parse_args(argv)
+
+    db = session_factory()
+    try:
+        drift_count = run(db, check_only=args.check)
+    finally:
+        db.close()
+
+    # --checkでズレがあった場合は、CIなどで検知できるよう終了コード1を返す
+    return 1 if args.check and drift_count > 0 else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+# 負荷試験用に、money_flowsへ大量のデータ（実際の家計簿に近い分布）を登録するコマンド
+# 実行例：
+#   python -m todo_app.commands.seed_money_flows --rows 10000000
+#   python -m todo_app.commands.seed_money_flows --rows 10000000 --method load-data  → MySQLのLOAD DATAで登録
+#
+# ・--seedが同じなら、毎回同じデータになる
+# ・チャンク（--chunk-size行）ごとにcommitし、途中で止まっても同じコマンドで続きから再開できる
+# 　（条件と開始idを--stateのファイルに保存し、登録済みの最大idから再開位置を求める）
+# ・月次集計テーブルにも、チャンクと同じトランザクションで反映する
+
+import argparse
+import csv
+import json
+import tempfile
+import time
+
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session
+
+from todo_app.core.database import DATABASE_URL
+from todo_app.loggers.custom_logger import logger
+from todo_app.logic.calculate.calculate_datetime import to_jst_naive, to_month_key
+from todo_app.logic.calculate.calculate_monthly_summary import MonthlySummaryDeltas
+from todo_app.logic.seed.generate_money_flows import generate_money_flow_rows
+from todo_app.models.db.money_flows import MoneyFlows
+from todo_app.repositories.money_flow_monthly_summary import apply_monthly_summary_deltas
+from todo_app.repositories.money_flows import (
+    BULK_INSERT_SQL_COLUMNS,
+    build_bind_processors,
+    build_bulk_insert_sql,
+    get_max_money_flow_id,
+)
+
+# idも指定して登録する（再開位置を、登録済みの最大idから求めるため）
+# 末尾のoccurred_monthは、occurred_dateから作って付ける
+SEED_COLUMNS = ("id", *BULK_INSERT_SQL_COLUMNS)
+
+
+class SeedStateMismatchError(Exception):
+    pass
+
+
+# 1チャンク分をexecutemanyで登録する（MySQLのドライバは、複数行INSERTにまとめて送る）
+def insert_rows(session: Session, rows: list[tuple]) -> None:
+    connection = session.connection()
+    dialect = connection.dialect
+    processors = build_bind_processors(dialect, SEED_COLUMNS)
+    connection.exec_driver_sql(
+        build_bulk_insert_sql(dialect, 1, SEED_COLUMNS),
+        [
+            tuple(
+                processor(value) if processor is not None else value
+                for processor, value in zip(processors, (*row, to_month_key(row[3])), strict=True)
+            )
+            for row in rows
+        ],
+    )
+
+
+# 1チャンク分をタブ区切りのファイルに書き出し、LOAD DATA LOCAL INFILEで登録する（MySQLのみ）
+# MySQLサーバー側でlocal_infile=ONにしておく必要がある
+def load_rows(session: Session, rows: list[tuple]) -> None:
+    with tempfile.NamedTemporaryFile("w", suffix=".tsv", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file, delimiter="\t", lineterminator="\n", quoting=csv.QUOTE_NONE)
+        for id, title, amount, occurred_date, kind, created_at, updated_at in rows:
+            # kindはORMと同じく名前（EXPENSE / INCOME）で保存する
+            writer.writerow(
+                (
+                    id,
+                    title,
+                    amount,
+                    occurred_date,
+                    kind.name,
+                    created_at,
+                    updated_at,
+                    to_month_key(occurred_date),
+                )
+            )
+        file.flush()
+
+        session.connection().exec_driver_sql(
+            f"LOAD DATA LOCAL INFILE %s INTO TABLE {MoneyFlows.__tablename__} "
+            "CHARACTER SET utf8mb4 FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+            f"({', '.join(SEED_COLUMNS)})",
+            (file.name,),
+        )
+
+
+# 前回の続きであれば保存した状態を返し、初回であれば開始idを決めて保存する
+# 条件（件数・seedなど）が前回と違う場合は、別のデータが混ざらないようエラーにする
+def load_or_create_state(session: Session, state_path: Path, conditions: dict) -> dict:
+    if state_path.exists():
+        state = json.loads(state_path.read_text())
+        if {key: state.get(key) for key in conditions} != conditions:
+            raise SeedStateMismatchError(
+                f"{state_path} の条件が今回の指定と違います（前回：{state}）。"
+                "続きから再開しない場合は、ファイルを削除するか別の--stateを指定してください"
+            )
+        return state
+
+    state = {**conditions, "id_start": (get_max_money_flow_id(session) or 0) + 1}
+    state_path.write_text(json.dumps(state, ensure_ascii=False, indent=2))
+    return state
+
+
+# 登録済みの件数（チャンクごとにcommitしているため、必ずチャンクの区切りになる）
+def count_seeded_rows(session: Session, state: dict) -> int:
+    id_start = state["id_start"]
+    max_id = get_max_money_flow_id(session, id_start, id_start + state["rows"] - 1)
+    return 0 if max_id is None else max_id - id_start + 1
+
+
+# 登録した件数を返す（再開した場合は、今回登録した分だけ）
+def run(engine: Engine, state_path: Path, conditions: dict, method: str) -> int:
+    write_rows = load_rows if method == "load-data" else insert_rows
+    date_from = datetime.fromisoformat(conditions["date_from"])
+    date_to = datetime.fromisoformat(conditions["date_to"])
+    chunk_size = conditions["chunk_size"]
+
+    with Session(engine, autoflush=False) as session:
+        state = load_or_create_state(session, state_path, conditions)
+        seeded = count_seeded_rows(session, state)
+        if seeded:
+            logger.info("%s件目から再開します", seeded + 1)
+
+        # 最後のチャンクは端数になるため、開始・終了のチャンクは切り上げで求める
+        started = time.perf_counter()
+        for chunk_index in range(-(-seeded // chunk_size), -(-state["rows"] // chunk_size)):
+            start = chunk_index * chunk_size
+            count = min(chunk_size, state["rows"] - start)
+            rows = generate_money_flow_rows(state["seed"], chunk_index, count, date_from, date_to)
+
+            deltas = MonthlySummaryDeltas()
+            for _, amount, occurred_date, kind, _, _ in rows:
+                deltas.add(occurred_date, kind, amount)
+
+            try:
+                first_id = state["id_start"] + start
+                write_rows(session, [(first_id + i, *row) for i, row in enumerate(rows)])
+                apply_monthly_summary_deltas(session, deltas)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+
+            done = start + count - seeded
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "%s / %s件（%.0f件/分）",
+                start + count,
+                state["rows"],
+                done / elapsed * 60 if elapsed > 0 else 0,
+            )
+
+    return state["rows"] - seeded
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="負荷試験用にmoney_flowsへ大量のデータを登録する")
+    parser.add_argument("--rows", type=int, required=True, help="登録する件数")
+    parser.add_argument("--seed", type=int, default=42, help="乱数のseed（同じなら同じデータ）")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="1回のcommitで登録する件数")
+    parser.add_argument("--from", dest="date_from", default="2015-01-01", help="発生日の開始")
+    parser.add_argument(
+        "--to", dest="date_to", default="2025-01-01", help="発生日の終了（含まない）"
+    )
+    parser.add_argument(
+        "--method",
+        choices=("insert", "load-data"),
+        default="insert",
+        help="insert：executemanyのINSERT / load-data：MySQLのLOAD DATA LOCAL INFILE",
+    )
+    parser.add_argument(
+        "--state", type=Path, default=Path(".seed_money_flows.json"), help="再開用のファイル"
+    )
+    parser.add_argument(
+        "--database-url", default=DATABASE_URL, help="登録先（デフォルトはアプリと同じDB）"
+    )
+    args = parser.parse_args(argv)
+
+    conditions = {
+        "rows": args.rows,
+        "seed": args.seed,
+        "chunk_size": args.chunk_size,
+        # タイムゾーン付きで指定された場合は、日本時間のタイムゾーンなしにする（DBのoccurred_dateと同じ）
+        "date_from": to_jst_naive(datetime.fromisoformat(args.date_from)).isoformat(),
+        "date_to": to_jst_naive(datetime.fromisoformat(args.date_to)).isoformat(),
+    }
+    # LOAD DATA LOCAL INFILEは、クライアント側でも許可が必要
+    connect_args = {"local_infile": True} if args.method == "load-data" else {}
+    # アプリのエンジン（遅いクエリの記録などを付けたもの）は使わず、登録専用のエンジンを作る
+    engine = create_engine(args.database_url, connect_args=connect_args)
+    try:
+        inserted = run(engine, args.state, conditions, args.method)
+    except SeedStateMismatchError as e:
+        logger.error("%s", e)
+        return 1
+    finally:
+        engine.dispose()
+
+    logger.info("%s件を登録しました", inserted)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,15 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# 読み取りキャッシュ（一覧・集計）の設定
+# READ_CACHE_ENABLED：false にするとキャッシュを使わない
+# READ_CACHE_TTL_SECONDS：有効期限（秒）。ワーカーが複数ある場合、他のワーカーでの書き込みはこの秒数まで反映されない
+# READ_CACHE_MAX_ENTRIES：保存する最大件数
+# READ_CACHE_MAX_BYTES：保存する値（pickle済み）のバイト数の合計の上限
+READ_CACHE_ENABLED = os.getenv("READ_CACHE_ENABLED", "true").lower() == "true"
+READ_CACHE_TTL_SECONDS = float(os.getenv("READ_CACHE_TTL_SECONDS", "30"))
+READ_CACHE_MAX_ENTRIES = int(os.getenv("READ_CACHE_MAX_ENTRIES", "256"))
+READ_CACHE_MAX_BYTES = int(os.getenv("READ_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
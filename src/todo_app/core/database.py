@@ -25,3 +25,73 @@ DATABASE_URL = (
     + "/"
     + DB_DATABASE
 )
+
+# 非同期（async）モードの設定
+# DB_MODE：sync（従来のSession） / async（AsyncSession）。money_flowsのルーターをどちらで動かすかを切り替える
+# DB_ASYNC_CONNECTION：非同期ドライバ（DB_CONNECTIONの代わりにURLの先頭に使う）
+# ASYNC_DATABASE_URL：URLを直接指定する場合（例：ローカルでSQLiteを使う場合 sqlite+aiosqlite:///./budget.db）
+DB_MODE = os.getenv("DB_MODE", "sync")
+DB_ASYNC_CONNECTION = os.getenv("DB_ASYNC_CONNECTION", "mysql+aiomysql")
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (
+    DB_ASYNC_CONNECTION + DATABASE_URL.removeprefix(DB_CONNECTION)
+)
+
+# 一括登録・更新・削除（/money_flows/bulk）の設定
+# BULK_INSERT_CHUNK_SIZE：複数行INSERT1文あたりの行数
+# BULK_ID_CHUNK_SIZE：一括更新・削除で「WHERE id IN (...)」1文に含めるidの数
+# BULK_MAX_ROWS：1リクエストで受け付ける最大行数
+BULK_INSERT_CHUNK_SIZE = int(os.getenv("BULK_INSERT_CHUNK_SIZE", "1000"))
+BULK_ID_CHUNK_SIZE = int(os.getenv("BULK_ID_CHUNK_SIZE", "1000"))
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "100000"))
+
+# コネクションプールの設定（ワーカー（プロセス）ごとに1つのプールを持つ）
+# DB_POOL_SIZE：常に保持しておく接続数
+# DB_MAX_OVERFLOW：DB_POOL_SIZEを超えて一時的に作ってよい接続数（使い終わったら閉じる）
+# DB_POOL_TIMEOUT：空きの接続を待つ最大秒数（超えるとエラー）
+# DB_POOL_RECYCLE：この秒数より古い接続は作り直す（MySQLのwait_timeoutで切られた接続を使わないため）
+# DB_POOL_PRE_PING：接続を貸し出す前に生きているか確認する（切れていれば作り直す）
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# 起動時のウォームアップ（main.pyのlifespan）
+# 最初のリクエストで、接続を開く・SQL文をコンパイルする時間がかからないよう、起動時に済ませておく
+# DB_POOL_WARMUP_SIZE：起動時に開いてプールに入れておく接続数（DB_POOL_SIZEまで。0の場合は開かない）
+# DB_WARMUP_STATEMENTS：true の場合、よく使うSQL文を起動時にコンパイル・実行しておく
+DB_POOL_WARMUP_SIZE = min(int(os.getenv("DB_POOL_WARMUP_SIZE", str(DB_POOL_SIZE))), DB_POOL_SIZE)
+DB_WARMUP_STATEMENTS = os.getenv("DB_WARMUP_STATEMENTS", "true").lower() == "true"
+
+# 遅いクエリの記録（/api/v1/monitoring/slow_queries・CustomLoggerに出力）
+# SLOW_QUERY_THRESHOLD_MS：この時間（ミリ秒）以上かかったクエリを記録する
+# SLOW_QUERY_EXPLAIN：true の場合、SQLの形（フィンガープリント）ごとに最初の1回だけEXPLAINの結果も記録する
+# SLOW_QUERY_SAMPLE_SIZE：p50/p95の計算に使う、SQLの形ごとの直近の件数
+# SLOW_QUERY_MAX_FINGERPRINTS：記録するSQLの形の最大数（超えた分は記録しない）
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "false").lower() == "true"
+SLOW_QUERY_SAMPLE_SIZE = int(os.getenv("SLOW_QUERY_SAMPLE_SIZE", "1000"))
+SLOW_QUERY_MAX_FINGERPRINTS = int(os.getenv("SLOW_QUERY_MAX_FINGERPRINTS", "500"))
+
+# 登録（POST /money_flows）をまとめて書き込むモード（グループコミット）
+# WRITE_BATCHING_ENABLED：true の場合、同時に来た登録を1つの複数行INSERT・1回のcommitにまとめる
+# WRITE_BATCH_MAX_DELAY_MS：最初の1件が届いてから、他の登録を待つ最大の時間（ミリ秒）。登録のレイテンシはこの分増える
+# WRITE_BATCH_MAX_ROWS：1回にまとめる最大の件数（この件数に達したら、待たずに書き込む）
+# WRITE_BATCH_TIMEOUT_MS：登録のリクエストが、commitされるまで待つ最大の時間（ミリ秒）。過ぎた場合はエラーを返す
+WRITE_BATCHING_ENABLED = os.getenv("WRITE_BATCHING_ENABLED", "false").lower() == "true"
+WRITE_BATCH_MAX_DELAY_MS = float(os.getenv("WRITE_BATCH_MAX_DELAY_MS", "5"))
+WRITE_BATCH_MAX_ROWS = int(os.getenv("WRITE_BATCH_MAX_ROWS", "100"))
+WRITE_BATCH_TIMEOUT_MS = float(os.getenv("WRITE_BATCH_TIMEOUT_MS", "10000"))
+
+# 読み取り専用のレプリカ（GETのリクエストをレプリカに振り分け、プライマリの負荷を減らす）
+# ※同期モード（DB_MODE=sync）のget_dbのみ。コマンド・まとめて書き込むモードは常にプライマリを使う
+# DB_REPLICA_URLS：レプリカの接続先URL（カンマ区切り。空の場合はすべてプライマリに接続する）
+# DB_REPLICA_STRATEGY：round_robin（順番に使う） / least_connections（貸し出し中の接続が最も少ないものを使う）
+# DB_REPLICA_EJECT_SECONDS：接続できなかったレプリカを外しておく秒数（経過後にもう一度使ってみる）
+# READ_YOUR_WRITES_SECONDS：書き込んだクライアントは、この秒数の間は読み取りもプライマリで行う
+# 　（レプリカへの反映の遅れで、書き込んだ内容が見えないことを防ぐ。Cookieで覚えておく）
+DB_REPLICA_URLS = [url.strip() for url in os.getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+DB_REPLICA_STRATEGY = os.getenv("DB_REPLICA_STRATEGY", "round_robin")
+DB_REPLICA_EJECT_SECONDS = float(os.getenv("DB_REPLICA_EJECT_SECONDS", "30"))
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
@@ -0,0 +1,13 @@
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# CustomLoggerの出力の設定
+# LOG_FORMAT：text（従来の「レベル : メッセージ」）/ json（1行1JSON。request_id・route・duration_msを含む）
+# LOG_QUEUE_SIZE：出力待ちのログの最大件数。超えた分は捨てる（リクエストの処理を待たせない）
+# HEALTHCHECK_LOG_SAMPLE_EVERY：ヘルスチェックのログを何回に1回出すか（1で毎回）
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+HEALTHCHECK_LOG_SAMPLE_EVERY = int(os.getenv("HEALTHCHECK_LOG_SAMPLE_EVERY", "100"))
@@ -0,0 +1,9 @@
+from fastapi import HTTPException
+
+
+# 他の人が先に更新していた（送られてきたversionが古い）場合のエラー
+# Exception > HTTPException > ConflictException
+# status_code=409：リクエストは正しいが、現在のデータの状態と競合している
+class ConflictException(HTTPException):
+    def __init__(self, message: str) -> None:
+        super().__init__(status_code=409, detail=message)
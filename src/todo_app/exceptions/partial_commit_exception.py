@@ -0,0 +1,10 @@
+from fastapi import HTTPException
+
+
+# 一括登録（commit_per_chunk=True）で、途中のチャンクまではcommitした後に失敗した場合のエラー
+# Exception > HTTPException > PartialCommitException
+# status_code=500：登録に失敗したが、detailのidsには、登録済みの行のidを載せる
+# 　（リクエストの配列の先頭から、同じ順番。ids以降の行は登録されていない）
+class PartialCommitException(HTTPException):
+    def __init__(self, message: str, ids: list[int]) -> None:
+        super().__init__(status_code=500, detail={"message": message, "ids": ids})
@@ -1,16 +1,46 @@
+import atexit
+import contextlib
 import logging  # Pythonに標準で備わっている
+import queue
+
+from logging.handlers import QueueListener
+
+from todo_app.core.logger import LOG_FORMAT, LOG_QUEUE_SIZE
+from todo_app.loggers.handlers import DroppingQueueHandler, RequestContextFilter, SamplingFilter
+from todo_app.loggers.json_formatter import JsonFormatter
 
 # handler：脳みそのようなもの
 handler = logging.StreamHandler()
 # %(levelname)s や %(message)sなど：LogRecord 属性
 # %(levelname)s：メッセージのための文字のロギングレベル ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
 log_format = "%(levelname)s : %(message)s"
-formatter = logging.Formatter(log_format)
+# LOG_FORMAT=jsonの場合は1行1JSON（request_id・route・duration_msを含む）
+formatter = JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(log_format)
 handler.setFormatter(formatter)
 
+# 書き込み（ブロックするI/O）をリクエストのスレッドで行わないよう、
+# ログはキューに入れるだけにして、別スレッド（QueueListener）がhandlerで書き込む
+# キューが一杯の場合はログを捨てる（リクエストを待たせない）
+log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+queue_handler = DroppingQueueHandler(log_queue)
+queue_handler.addFilter(RequestContextFilter())
+listener = QueueListener(log_queue, handler, respect_handler_level=True)
+listener.start()
+
+
+# プロセス終了時に、キューに残っているログを書き出してからスレッドを止める
+@atexit.register
+def _stop_listener() -> None:
+    # キューが一杯で止められない場合は、そのまま終了する（スレッドはデーモンのため）
+    with contextlib.suppress(queue.Full):
+        listener.stop()
+
+
 # loggingからCustomLoggerという子供を作成
 logger = logging.getLogger("CustomLogger")
-# CustomLoggerはhandlerを使って動くイメージ
-logger.addHandler(handler)
+# CustomLoggerはqueue_handlerを使って動くイメージ
+logger.addHandler(queue_handler)
+# 頻繁に出るログ（extra={"sample_every": N}を付けたもの）を、キューに入れる前に間引く
+logger.addFilter(SamplingFilter())
 # info以上のもの（'INFO', 'WARNING', 'ERROR', 'CRITICAL')を表示（'DEBUG'は出さない）
 logger.setLevel(logging.INFO)
@@ -0,0 +1,62 @@
+import logging
+import queue
+
+from collections import Counter
+from logging.handlers import QueueHandler
+from threading import Lock
+
+from todo_app.loggers.request_context import current_request_context
+
+
+# ログを出した時点（リクエストのスレッド・タスク内）で、リクエストの情報をレコードに付ける
+# 出力は別スレッドで行うため、ContextVarはここで読んでおく必要がある
+class RequestContextFilter(logging.Filter):
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = current_request_context.get()
+        record.request_id = context.request_id if context is not None else None
+        record.route = context.route if context is not None else None
+        record.duration_ms = round(context.duration_ms, 3) if context is not None else None
+        return True
+
+
+# 頻繁に出るログを間引くフィルター
+# logger.info("...", extra={"sample_every": 100}) のように指定したログは、同じメッセージ100回につき1回だけ出す
+class SamplingFilter(logging.Filter):
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = Lock()
+        self._counts: Counter[str] = Counter()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        sample_every = getattr(record, "sample_every", 1)
+        if sample_every <= 1:
+            return True
+
+        with self._lock:
+            count = self._counts[record.msg]
+            self._counts[record.msg] = count + 1
+        return count % sample_every == 0
+
+
+# キューが一杯の場合は待たずにログを捨てるQueueHandler（捨てた件数はdroppedで確認できる）
+# 文字列への変換までを呼び出し元で行い、書き込み（ブロックするI/O）はQueueListenerのスレッドで行う
+class DroppingQueueHandler(QueueHandler):
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    # 標準のprepareはフォーマット済みの文字列でmsgを置き換えるため、
+    # 出力側のフォーマッター（text / json）が使えるように、メッセージと例外の文字列だけを確定させる
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
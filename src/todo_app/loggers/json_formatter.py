@@ -0,0 +1,24 @@
+import json
+import logging
+
+from datetime import UTC, datetime
+
+
+# 1行1JSONで出力するフォーマッター（ログの収集基盤で検索・集計しやすくする）
+# request_id・route・duration_msは、RequestContextFilterが付けた値（リクエストの外ではnull）
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "route": getattr(record, "route", None),
+            "duration_ms": getattr(record, "duration_ms", None),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
@@ -0,0 +1,34 @@
+import time
+import uuid
+
+from contextvars import ContextVar
+
+from starlette.types import Scope
+
+from todo_app.monitoring.metrics import get_route_label
+
+
+# ログに載せる、リクエストの情報
+class RequestContext:
+    __slots__ = ("request_id", "scope", "started")
+
+    def __init__(self, scope: Scope, request_id: str | None = None) -> None:
+        self.scope = scope
+        self.request_id = request_id or uuid.uuid4().hex
+        self.started = time.perf_counter()
+
+    # ルーティング前はscope["route"]が無いため、ログを出す時点で求める
+    @property
+    def route(self) -> str:
+        return get_route_label(self.scope)
+
+    # リクエストの開始からの経過時間（ミリ秒）
+    @property
+    def duration_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+# 処理中のリクエスト（RequestContextMiddlewareが設定する。リクエストの外ではNone）
+current_request_context: ContextVar[RequestContext | None] = ContextVar(
+    "current_request_context", default=None
+)
@@ -1,7 +1,28 @@
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
+# occurred_dateなど、DBにタイムゾーンなしで保存している日時は、日本時間（JST）の時刻として扱う
+JST = ZoneInfo("Asia/Tokyo")
+
 
 def get_now() -> datetime:
-    tz = ZoneInfo("Asia/Tokyo")
-    return datetime.now(tz)
+    return datetime.now(JST)
+
+
+# タイムゾーン付きの日時を、日本時間のタイムゾーンなしの日時にする（タイムゾーンなしの日時はそのまま）
+# 例：2025-03-31T15:00:00+00:00 → 2025-04-01T00:00:00
+def to_jst_naive(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(JST).replace(tzinfo=None)
+
+
+# 月次集計のキー（日本時間の月のYYYYMMの整数）に変換する　例：2025-04-01 → 202504
+def to_month_key(value: datetime) -> int:
+    value = to_jst_naive(value)
+    return value.year * 100 + value.month
+
+
+# 月次集計のキー（YYYYMM）の月の1日0時（日本時間のタイムゾーンなし）　例：202504 → 2025-04-01
+def from_month_key(month: int) -> datetime:
+    return datetime(month // 100, month % 100, 1)
@@ -0,0 +1,37 @@
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import datetime
+
+from todo_app.logic.calculate.calculate_datetime import to_month_key
+from todo_app.models.db.money_flows import MoneyFlowKind
+
+
+# 月次集計テーブル（money_flow_monthly_summary）に反映する増減をまとめるクラス
+# 登録・更新・削除された収支を(月, 収支の種類)ごとに足し引きし、最後に1回でDBへ反映する
+class MonthlySummaryDeltas:
+    def __init__(self) -> None:
+        # (月, 収支の種類) → [合計金額の増減, 件数の増減]
+        self._buckets: defaultdict[tuple[int, MoneyFlowKind], list[int]] = defaultdict(
+            lambda: [0, 0]
+        )
+
+    # 収支が1件増えた（登録・更新後の値）
+    def add(self, occurred_date: datetime, kind: MoneyFlowKind, amount: int) -> None:
+        bucket = self._buckets[(to_month_key(occurred_date), kind)]
+        bucket[0] += amount
+        bucket[1] += 1
+
+    # 収支が1件減った（削除・更新前の値）
+    def subtract(self, occurred_date: datetime, kind: MoneyFlowKind, amount: int) -> None:
+        bucket = self._buckets[(to_month_key(occurred_date), kind)]
+        bucket[0] -= amount
+        bucket[1] -= 1
+
+    # 増減が0ではない(月, 収支の種類, 合計金額の増減, 件数の増減)を返す
+    # 例：同じ月・種類のまま金額だけ変わった更新は、件数の増減が0・金額の増減だけが残る
+    def items(self) -> Iterator[tuple[int, MoneyFlowKind, int, int]]:
+        for (month, kind), (amount_delta, count_delta) in sorted(
+            self._buckets.items(), key=lambda item: (item[0][0], item[0][1].value)
+        ):
+            if amount_delta != 0 or count_delta != 0:
+                yield month, kind, amount_delta, count_delta
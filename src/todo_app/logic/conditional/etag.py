@@ -0,0 +1,54 @@
+import hashlib
+import json
+
+from datetime import UTC, datetime
+from email.utils import format_datetime
+from typing import Any
+
+from todo_app.logic.calculate.calculate_datetime import JST
+
+# ★条件付きGET（ETag / If-None-Match → 304 Not Modified）の共通処理
+
+
+# データのバージョン（MAX(updated_at)と件数）とリクエストの条件（params）から、ETagを作る
+# 同じ条件・同じデータなら同じ値、どちらかが変われば別の値になる
+# W/：弱いETag（レスポンスの中身がバイト単位で同じことまでは保証しない）
+def build_etag(max_updated_at: datetime | None, count: int, params: dict[str, Any]) -> str:
+    payload = json.dumps(
+        {
+            "updated_at": max_updated_at.isoformat() if max_updated_at is not None else None,
+            "count": count,
+            "params": params,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return f'W/"{hashlib.sha256(payload.encode()).hexdigest()[:32]}"'
+
+
+# If-None-Matchに、今のETagが含まれているか（含まれていれば304を返してよい）
+# 複数指定（カンマ区切り）と「*」に対応し、W/の有無は区別しない（弱い比較）
+def is_etag_matched(if_none_match: str | None, etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    return etag.removeprefix("W/") in {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }
+
+
+# ETag・Last-Modifiedなどのレスポンスヘッダー
+# updated_atはタイムゾーンなし（日本時間）で保存されているため、日本時間としてGMTに変換する
+# no-cache：ブラウザにキャッシュさせるが、使う前に必ずサーバーに確認（If-None-Match）させる
+# ※If-Modified-Sinceでは304を返さない（削除ではMAX(updated_at)が変わらないため、件数も含むETagで判定する）
+def build_conditional_headers(etag: str, max_updated_at: datetime | None) -> dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if max_updated_at is not None:
+        if max_updated_at.tzinfo is None:
+            max_updated_at = max_updated_at.replace(tzinfo=JST)
+        headers["Last-Modified"] = format_datetime(
+            max_updated_at.astimezone(UTC).replace(microsecond=0), usegmt=True
+        )
+    return headers
@@ -0,0 +1,55 @@
+import base64
+import json
+
+from datetime import datetime
+
+from todo_app.logic.calculate.calculate_datetime import to_jst_naive
+
+
+# カーソルは (occurred_date, id) をJSONにして、URLに載せられるbase64文字列にしたもの
+# クライアントからは中身を意識しない「不透明な文字列」として扱ってもらう
+def encode_cursor(occurred_date: datetime, id: int) -> str:
+    payload = json.dumps({"d": occurred_date.isoformat(), "i": id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+# 不正な文字列が渡された場合はValueErrorを投げる（呼び出し側でBusinessExceptionに変換する）
+# occurred_dateは、タイムゾーン付きの場合は日本時間のタイムゾーンなしにする（DBのoccurred_dateと比べるため）
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        occurred_date = to_jst_naive(datetime.fromisoformat(payload["d"]))
+        id = payload["i"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("invalid cursor") from e
+
+    if not isinstance(id, int):
+        raise ValueError("invalid cursor")
+
+    return occurred_date, id
+
+
+# タイトル検索のカーソル：(順位, occurred_date, id)
+# 並び順が「順位、occurred_dateの降順、idの降順」のため、順位もカーソルに含める
+def encode_search_cursor(rank: int, occurred_date: datetime, id: int) -> str:
+    payload = json.dumps(
+        {"r": rank, "d": occurred_date.isoformat(), "i": id}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[int, datetime, int]:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding))
+        rank = payload["r"]
+        occurred_date = to_jst_naive(datetime.fromisoformat(payload["d"]))
+        id = payload["i"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("invalid cursor") from e
+
+    if not isinstance(rank, int) or not isinstance(id, int):
+        raise ValueError("invalid cursor")
+
+    return rank, occurred_date, id
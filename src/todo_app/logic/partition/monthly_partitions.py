@@ -0,0 +1,49 @@
+from datetime import datetime
+
+# money_flowsのパーティション（MySQLのRANGE COLUMNS(occurred_date)、1か月1パーティション）の計算
+# パーティションは (名前, VALUES LESS THAN の日時) で表す。最後のパーティション（pmax）は上限なし（None）
+# 名前は「その月の値を入れるパーティション」として p + YYYYMM にする　例：p202504 → 2025-05-01より前
+MAXVALUE_PARTITION = "pmax"
+
+Partition = tuple[str, datetime | None]
+
+
+# その月の1日0時（タイムゾーンなし。occurred_dateと同じ）
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+# monthsか月後（マイナスの場合は前）の月の1日0時
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    return f"p{month.year:04d}{month.month:02d}"
+
+
+# 今月からmonths_aheadか月後までのパーティションを作るために、追加が必要な月（1日0時）のリスト
+# pmaxに入る行（まだパーティションがない月の行）が増える前に、先に作っておく
+def plan_future_partitions(
+    partitions: list[Partition], today: datetime, months_ahead: int
+) -> list[datetime]:
+    bounds = [less_than for _, less_than in partitions if less_than is not None]
+    # 既存のパーティションの続きから作る（パーティションがなければ今月から）
+    month = max(bounds) if bounds else month_start(today)
+    until = add_months(month_start(today), months_ahead + 1)
+
+    months = []
+    while month < until:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+# 保存期間（retention_monthsか月）より前の行だけが入っているパーティションの名前（古い順）
+# 例：今日が2025-04-15、retention_months=12 → 2024-04-01より前の行だけのパーティション（p202403まで）
+def plan_archive_partitions(
+    partitions: list[Partition], today: datetime, retention_months: int
+) -> list[str]:
+    cutoff = add_months(month_start(today), -retention_months)
+    return [name for name, less_than in partitions if less_than is not None and less_than <= cutoff]
@@ -0,0 +1,31 @@
+# タイトルの部分一致検索で使う、n-gram（連続するn文字）の組み立て
+# MySQLのFULLTEXTインデックス（ngramパーサー）と同じく、2文字ずつに区切る（ngram_token_sizeの初期値）
+# 日本語は単語の区切りがないため、単語単位の全文検索では「お米」のような部分文字列を検索できない
+NGRAM_TOKEN_SIZE = 2
+
+
+# ASCIIの英字だけを小文字にする（SQLiteのlower()と同じ動き。全角英字などはそのまま）
+def lower_ascii(text: str) -> str:
+    return "".join(char.lower() if char.isascii() else char for char in text)
+
+
+# 文字列を2文字ずつ区切ったn-gramを、16進数の文字列にして返す（"お米券" → ["お米", "米券"]を16進数にしたもの）
+# 16進数にするのは、SQLiteのFTS5のトークナイザーに、空白や記号を含むn-gramを区切らせないため
+def to_title_ngram_tokens(text: str) -> list[str]:
+    text = lower_ascii(text)
+    return [
+        text[i : i + NGRAM_TOKEN_SIZE].encode().hex()
+        for i in range(len(text) - NGRAM_TOKEN_SIZE + 1)
+    ]
+
+
+# SQLiteのFTS5に渡すMATCHの検索式
+# n-gramを連続したフレーズとして検索するため、「queryを部分文字列として含む」と同じ意味になる
+def build_title_ngram_match(query: str) -> str:
+    return '"' + " ".join(to_title_ngram_tokens(query)) + '"'
+
+
+# MySQLのFULLTEXTインデックス（ngramパーサー）に渡すMATCH ... AGAINST（BOOLEAN MODE）の検索式
+# ダブルクォートで囲んだフレーズ検索は、n-gramが連続して並んでいる行（部分一致）だけを返す
+def build_title_fulltext_match(query: str) -> str:
+    return '"' + query.replace('"', " ") + '"'
@@ -0,0 +1,103 @@
+import math
+import random
+
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from itertools import accumulate
+from statistics import NormalDist
+
+from todo_app.logic.partition.monthly_partitions import add_months, month_start
+from todo_app.models.db.money_flows import MoneyFlowKind
+
+# 負荷試験用のデータの分類（実際の家計簿に近い分布にする）
+# (タイトル, 収支の種類, 出現の重み, 金額の中央値, 金額のばらつき（対数正規分布のσ）, 日付を固定する日（Noneなら固定しない）)
+# 日付を固定する日は、どの月にもある28日以下にする
+CATEGORIES: tuple[tuple[str, MoneyFlowKind, int, int, float, int | None], ...] = (
+    ("食費", MoneyFlowKind.EXPENSE, 300, 1200, 0.7, None),
+    ("外食", MoneyFlowKind.EXPENSE, 150, 1500, 0.6, None),
+    ("日用品", MoneyFlowKind.EXPENSE, 120, 800, 0.8, None),
+    ("交通費", MoneyFlowKind.EXPENSE, 100, 400, 0.9, None),
+    ("娯楽", MoneyFlowKind.EXPENSE, 80, 3000, 1.0, None),
+    ("衣服", MoneyFlowKind.EXPENSE, 40, 5000, 0.8, None),
+    ("医療費", MoneyFlowKind.EXPENSE, 20, 2500, 0.9, None),
+    ("通信費", MoneyFlowKind.EXPENSE, 10, 6000, 0.3, 27),
+    ("電気代", MoneyFlowKind.EXPENSE, 10, 7000, 0.4, 20),
+    ("ガス代", MoneyFlowKind.EXPENSE, 10, 4000, 0.4, 20),
+    ("水道代", MoneyFlowKind.EXPENSE, 5, 5000, 0.3, 15),
+    ("家賃", MoneyFlowKind.EXPENSE, 10, 80000, 0.2, 27),
+    ("給料", MoneyFlowKind.INCOME, 10, 250000, 0.15, 25),
+    ("賞与", MoneyFlowKind.INCOME, 2, 500000, 0.3, 10),
+    ("副業", MoneyFlowKind.INCOME, 15, 30000, 0.8, None),
+    ("お小遣い", MoneyFlowKind.INCOME, 10, 5000, 0.5, None),
+)
+_CUMULATIVE_WEIGHTS = list(accumulate(category[2] for category in CATEGORIES))
+
+# ★金額の表（カテゴリごとに、標準正規分布の分位点ごとの金額を先に計算しておく）
+# 　金額は対数正規分布（中央値付近が多く、たまに大きい金額がある）。10円単位に丸める
+# 　1行ずつexp・roundを計算する代わりに、乱数（0〜4095）で表を引くだけにする
+_QUANTILE_BITS = 12
+_QUANTILES = [
+    NormalDist().inv_cdf((index + 0.5) / (1 << _QUANTILE_BITS))
+    for index in range(1 << _QUANTILE_BITS)
+]
+_AMOUNT_TABLES = [
+    [int(max(10, round(median * math.exp(sigma * quantile), -1))) for quantile in _QUANTILES]
+    for _, _, _, median, sigma, _ in CATEGORIES
+]
+
+
+# ★日付を選べる区間（date_fromからの秒数）を、カテゴリごとに作る
+# 　(区間の終わりまでの累積の秒数のリスト, 区間ごとに足す秒数のリスト, 合計の秒数) で表す
+# 　0〜合計の秒数の乱数をbisectで区間に振り分け、足す秒数を足すとdate_fromからの秒数になる
+# 　日付を固定しないカテゴリは、期間全体の1区間
+# 　日付を固定するカテゴリは、期間内にある各月のその日（期間の端で切った部分）。期間内にその日がなければ期間全体
+def _build_windows(
+    day: int | None, date_from: datetime, date_to: datetime
+) -> tuple[list[int], list[int], int]:
+    span_seconds = int((date_to - date_from).total_seconds())
+    ends, shifts, total = [], [], 0
+    if day is not None:
+        month = month_start(date_from)
+        while month < date_to:
+            day_start = month.replace(day=day)
+            start = max(day_start, date_from)
+            end = min(day_start + timedelta(days=1), date_to)
+            if start < end:
+                start_seconds = int((start - date_from).total_seconds())
+                shifts.append(start_seconds - total)
+                total += int((end - start).total_seconds())
+                ends.append(total)
+            month = add_months(month, 1)
+    if total == 0:
+        return [span_seconds], [0], span_seconds
+    return ends, shifts, total
+
+
+# 負荷試験用のmoney_flowsの行を、BULK_INSERT_COLUMNSの順番のタプルで作る
+# 同じ(seed, chunk_index, count, date_from, date_to)なら、何度実行しても同じ行になる（途中から再開できる）
+# 乱数は列ごとに一括で作り（カテゴリはrandom.choices、日付・金額はrandbytes）、
+# 1行ずつの処理は表を引いて足し算するだけにしている
+# （numpyは依存関係にないため、標準ライブラリだけで作る）
+def generate_money_flow_rows(
+    seed: int, chunk_index: int, count: int, date_from: datetime, date_to: datetime
+) -> list[tuple[str, int, datetime, MoneyFlowKind, datetime, datetime]]:
+    rng = random.Random(f"{seed}:{chunk_index}")
+    windows = [_build_windows(category[5], date_from, date_to) for category in CATEGORIES]
+
+    category_indexes = rng.choices(range(len(CATEGORIES)), cum_weights=_CUMULATIVE_WEIGHTS, k=count)
+    # 日付の位置（32ビット）と金額の分位点（16ビットのうち下位12ビット）
+    positions = memoryview(rng.randbytes(4 * count)).cast("I")
+    quantiles = memoryview(rng.randbytes(2 * count)).cast("H")
+    quantile_mask = (1 << _QUANTILE_BITS) - 1
+
+    rows = []
+    for category_index, position, quantile in zip(
+        category_indexes, positions, quantiles, strict=True
+    ):
+        title, kind = CATEGORIES[category_index][:2]
+        ends, shifts, total = windows[category_index]
+        point = position * total >> 32
+        occurred_date = date_from + timedelta(seconds=point + shifts[bisect_right(ends, point)])
+        amount = _AMOUNT_TABLES[category_index][quantile & quantile_mask]
+        rows.append((title, amount, occurred_date, kind, occurred_date, occurred_date))
+    return rows
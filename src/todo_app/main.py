@@ -1,23 +1,132 @@
+import time
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
 
 from todo_app.api import router
+from todo_app.core.database import DB_MODE, DB_POOL_WARMUP_SIZE, DB_WARMUP_STATEMENTS
 from todo_app.handlers.server_exception_handler import handler
-
-app = FastAPI()
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5174",
-        "http://127.0.0.1:5174",
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+from todo_app.loggers.custom_logger import logger
+from todo_app.middlewares.metrics_middleware import MetricsMiddleware
+from todo_app.middlewares.read_your_writes_middleware import ReadYourWritesMiddleware
+from todo_app.middlewares.request_context_middleware import RequestContextMiddleware
+from todo_app.models.db.async_base import (
+    dispose_async_engine,
+    get_async_engine,
+    get_async_session_factory,
+    open_async_pool_connections,
+)
+from todo_app.models.db.base import (
+    dispose_engine,
+    get_engine,
+    get_replica_set,
+    open_pool_connections,
+    session,
 )
+from todo_app.models.db.replicas import ReplicaSet
+from todo_app.repositories import warmup, warmup_async
+from todo_app.writers.money_flows_writer import money_flows_writer
+
+
+# 同期のエンジンのウォームアップ（実行したSQL文の数を返す）
+# 接続・SQL文の実行でブロックするため、lifespanからはスレッドで実行する（イベントループを止めない）
+def warm_up_sync_database() -> int:
+    open_pool_connections(get_engine(), DB_POOL_WARMUP_SIZE)
+    if not DB_WARMUP_STATEMENTS:
+        return 0
+    with session() as db:
+        return warmup.warm_up_statements(db)
+
+
+# レプリカにも接続を開いておく（接続できないレプリカは外して、起動は続ける）
+def open_replica_connections(replicas: ReplicaSet) -> None:
+    for engine in replicas.engines:
+        try:
+            open_pool_connections(engine, DB_POOL_WARMUP_SIZE)
+        except SQLAlchemyError:
+            replicas.eject(engine)
+
+
+# 起動時：エンジンを作り、接続をDB_POOL_WARMUP_SIZE本開いておき、よく使うSQL文を実行しておく
+# （オートスケールで増えたPodでも、最初のリクエストから速く返せるようにする）
+# DBに接続できない場合もAPIは起動する（最初のリクエストで接続し直す）
+async def warm_up_database() -> None:
+    started = time.perf_counter()
+    statement_count = 0
+    try:
+        if DB_MODE == "async":
+            await open_async_pool_connections(get_async_engine(), DB_POOL_WARMUP_SIZE)
+            if DB_WARMUP_STATEMENTS:
+                async with get_async_session_factory()() as db:
+                    statement_count = await warmup_async.warm_up_statements(db)
+        else:
+            statement_count = await run_in_threadpool(warm_up_sync_database)
+    except SQLAlchemyError:
+        logger.warning("起動時のDBのウォームアップに失敗しました", exc_info=True)
+        return
+
+    if DB_MODE != "async" and (replicas := get_replica_set()) is not None:
+        await run_in_threadpool(open_replica_connections, replicas)
+
+    logger.info(
+        "起動時のDBのウォームアップ 接続数=%s SQL文=%s 時間=%.1fms",
+        DB_POOL_WARMUP_SIZE,
+        statement_count,
+        (time.perf_counter() - started) * 1000,
+    )
+
+
+# 終了時：まとめて書き込むモードの残りを書き込んでから、プールの接続をすべて閉じる
+# （書き込み役のスレッドの終了を待つ間も、イベントループは止めない）
+async def shutdown_database() -> None:
+    await run_in_threadpool(money_flows_writer.close)
+    await dispose_async_engine()
+    dispose_engine()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    await warm_up_database()
+    yield
+    await shutdown_database()
+
+
+# アプリを組み立てる（テストなどで、別のアプリとして作り直せるようにする）
+# ※import時にはDBに接続しない。エンジンの作成・接続は、起動時（lifespan）に行う
+def create_app() -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[
+            "http://localhost:5174",
+            "http://127.0.0.1:5174",
+        ],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # レプリカを使う場合、書き込んだクライアントにしばらくプライマリで読むためのCookieを付ける
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    # リクエストごとの処理時間・DBクエリ数を記録する（/api/v1/monitoring/metricsで確認）
+    app.add_middleware(MetricsMiddleware)
+
+    # リクエストごとのrequest_idを決めて、ログとレスポンスヘッダー（X-Request-ID）に載せる
+    app.add_middleware(RequestContextMiddleware)
+
+    app.include_router(router, prefix="/api")
+
+    # 引数；反応してほしいもの, 反応した際の処理
+    app.add_exception_handler(Exception, handler)
+
+    return app
 
-app.include_router(router, prefix="/api")
 
-# 引数；反応してほしいもの, 反応した際の処理
-app.add_exception_handler(Exception, handler)
+app = create_app()
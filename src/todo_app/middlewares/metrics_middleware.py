@@ -0,0 +1,50 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from todo_app.monitoring.metrics import (
+    RequestMetrics,
+    current_request_metrics,
+    get_route_label,
+    metrics_registry,
+)
+
+
+# リクエストごとの処理時間・DBクエリ数・行数を記録するASGIミドルウェア
+# BaseHTTPMiddlewareはレスポンスを別タスクで中継するため、軽いASGIミドルウェアとして書いている
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500  # レスポンスを返す前に例外が起きた場合
+        request_metrics = RequestMetrics(scope)
+        token = current_request_metrics.set(request_metrics)
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            current_request_metrics.reset(token)
+            route = get_route_label(scope)  # ルーティング後にscope["route"]が入る
+            metrics_registry.observe(
+                metrics_registry.request_duration,
+                (scope["method"], route, str(status)),
+                time.perf_counter() - started,
+            )
+            metrics_registry.observe(
+                metrics_registry.queries_per_request, (route,), request_metrics.queries
+            )
+            metrics_registry.observe(
+                metrics_registry.rows_per_request, (route,), request_metrics.rows
+            )
@@ -0,0 +1,31 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from todo_app.models.db.replicas import READ_YOUR_WRITES_STATE, build_read_your_writes_cookie
+
+
+# レプリカを使う場合に、書き込みが成功したレスポンスへ、しばらくプライマリで読むためのCookieを付ける
+# 書き込みかどうかはget_dbが決める（request.stateに印を付ける）
+# ハンドラーがResponseを直接返す場合（DELETEの204など）も付けられるよう、送信するレスポンスのヘッダーに足す
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # request.stateはscope["state"]のdictに保存される（先に作っておき、同じdictを見る）
+        state = scope.setdefault("state", {})
+
+        async def send_with_cookie(message: Message) -> None:
+            if (
+                message["type"] == "http.response.start"
+                and state.get(READ_YOUR_WRITES_STATE)
+                and message["status"] < 400
+            ):
+                MutableHeaders(scope=message).append("set-cookie", build_read_your_writes_cookie())
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,36 @@
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from todo_app.loggers.request_context import RequestContext, current_request_context
+
+REQUEST_ID_HEADER = "x-request-id"
+
+
+# リクエストごとにrequest_idを決めて、ログ（CustomLogger）とレスポンスヘッダー（X-Request-ID）に載せる
+# クライアント・ロードバランサーがX-Request-IDを付けてきた場合はその値を使う
+class RequestContextMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                request_id = value.decode("latin-1")[:128]
+                break
+        context = RequestContext(scope, request_id)
+        token = current_request_context.set(context)
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = context.request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            current_request_context.reset(token)
@@ -0,0 +1,26 @@
+"""add occurred id index to money_flows
+
+Revision ID: 5f1c2a7d9e40
+Revises: 263dc2b5892e
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1c2a7d9e40'
+down_revision: str | None = '263dc2b5892e'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_money_flows_occurred_id', 'money_flows', ['occurred_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_money_flows_occurred_id', table_name='money_flows')
@@ -0,0 +1,42 @@
+"""create money_flow_monthly_summary
+
+Revision ID: 8b3e6d1f2a57
+Revises: 5f1c2a7d9e40
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3e6d1f2a57'
+down_revision: str | None = '5f1c2a7d9e40'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('money_flow_monthly_summary',
+    sa.Column('month', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.Enum('EXPENSE', 'INCOME', name='money_flow_kind'), nullable=False),
+    sa.Column('total_amount', sa.BigInteger(), nullable=False),
+    sa.Column('flow_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('month', 'kind')
+    )
+    # 既存のデータから集計して初期値を入れる
+    op.execute(
+        "INSERT INTO money_flow_monthly_summary (month, kind, total_amount, flow_count, updated_at) "
+        "SELECT YEAR(occurred_date) * 100 + MONTH(occurred_date), kind, SUM(amount), COUNT(*), NOW() "
+        "FROM money_flows "
+        "GROUP BY YEAR(occurred_date) * 100 + MONTH(occurred_date), kind"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('money_flow_monthly_summary')
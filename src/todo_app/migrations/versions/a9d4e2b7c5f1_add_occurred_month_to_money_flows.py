@@ -0,0 +1,41 @@
+"""add occurred_month (JST YYYYMM) to money_flows and money_flows_archive
+
+Revision ID: a9d4e2b7c5f1
+Revises: f3b8d2e6a4c1
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d4e2b7c5f1'
+down_revision: str | None = 'f3b8d2e6a4c1'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TABLES = ('money_flows', 'money_flows_archive')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NULL可で追加 → 既存の行を埋める → NOT NULLにする
+    # occurred_dateは日本時間のタイムゾーンなしで保存しているため、そのまま年・月を取り出せばよい
+    for table in TABLES:
+        op.add_column(table, sa.Column('occurred_month', sa.Integer(), nullable=True))
+        op.execute(
+            f"UPDATE {table} SET occurred_month = YEAR(occurred_date) * 100 + MONTH(occurred_date)"
+        )
+        op.alter_column(table, 'occurred_month', existing_type=sa.Integer(), nullable=False)
+
+    op.create_index('ix_money_flows_month_kind', 'money_flows', ['occurred_month', 'kind'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_money_flows_month_kind', table_name='money_flows')
+    for table in TABLES:
+        op.drop_column(table, 'occurred_month')
@@ -0,0 +1,40 @@
+"""add updated_at precision and index to money_flows
+
+Revision ID: c4d7e9a1b2f3
+Revises: 8b3e6d1f2a57
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d7e9a1b2f3'
+down_revision: str | None = '8b3e6d1f2a57'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # MySQLのMODIFYは、指定しなかったNULL可否も書き換えるため、明示する
+    # updated_atは2493b19c62a2ではNULL可で作ったが、263dc2b5892eでNOT NULLにしている（モデルもNOT NULL）
+    # ※existing_nullable=Trueにすると、このMODIFYでNULL可に戻ってしまう
+    op.alter_column('money_flows', 'updated_at',
+               type_=mysql.DATETIME(fsp=6),
+               existing_type=mysql.DATETIME(),
+               existing_nullable=False,
+               nullable=False)
+    op.create_index('ix_money_flows_updated_at', 'money_flows', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_money_flows_updated_at', table_name='money_flows')
+    op.alter_column('money_flows', 'updated_at',
+               type_=mysql.DATETIME(),
+               existing_type=mysql.DATETIME(fsp=6),
+               existing_nullable=False,
+               nullable=False)
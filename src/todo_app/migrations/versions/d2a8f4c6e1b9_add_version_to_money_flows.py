@@ -0,0 +1,28 @@
+"""add version column to money_flows
+
+Revision ID: d2a8f4c6e1b9
+Revises: c4d7e9a1b2f3
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a8f4c6e1b9'
+down_revision: str | None = 'c4d7e9a1b2f3'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('money_flows', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('money_flows', 'version')
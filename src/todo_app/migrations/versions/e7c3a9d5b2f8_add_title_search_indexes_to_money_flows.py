@@ -0,0 +1,28 @@
+"""add title search indexes to money_flows
+
+Revision ID: e7c3a9d5b2f8
+Revises: d2a8f4c6e1b9
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c3a9d5b2f8'
+down_revision: str | None = 'd2a8f4c6e1b9'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_money_flows_title', 'money_flows', ['title'], unique=False)
+    op.create_index('ix_money_flows_title_fulltext', 'money_flows', ['title'], unique=False, mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_money_flows_title_fulltext', table_name='money_flows')
+    op.drop_index('ix_money_flows_title', table_name='money_flows')
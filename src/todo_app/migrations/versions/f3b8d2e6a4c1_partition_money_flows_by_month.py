@@ -0,0 +1,104 @@
+"""partition money_flows by occurred_date month and add archive table
+
+Revision ID: f3b8d2e6a4c1
+Revises: e7c3a9d5b2f8
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from collections.abc import Sequence
+from datetime import datetime
+
+import sqlalchemy as sa
+
+from alembic import op
+from sqlalchemy.dialects import mysql
+
+from todo_app.logic.calculate.calculate_datetime import JST
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8d2e6a4c1'
+down_revision: str | None = 'e7c3a9d5b2f8'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# 最初のパーティションの作成時に、何か月先まで作っておくか（以降はmaintain-money-flow-partitionsで追加する）
+MONTHS_AHEAD = 3
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 保存期間を過ぎた行の移動先（圧縮して保存する）
+    op.create_table('money_flows_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(length=30), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.Column('occurred_date', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', mysql.DATETIME(fsp=6), nullable=True),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.Enum('EXPENSE', 'INCOME', name='money_flow_kind'), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    mysql_row_format='COMPRESSED',
+    mysql_key_block_size='8',
+    )
+    op.create_index('ix_money_flows_archive_occurred_date', 'money_flows_archive', ['occurred_date'], unique=False)
+
+    # パーティション分割したテーブルにはFULLTEXTインデックスを張れないため、タイトルの全文検索は別の表に移す
+    op.execute("""CREATE TABLE money_flows_title_fts (
+        id INTEGER NOT NULL PRIMARY KEY,
+        title VARCHAR(30) NOT NULL,
+        FULLTEXT INDEX ix_money_flows_title_fts_title (title) WITH PARSER ngram
+    )""")
+    op.execute("INSERT INTO money_flows_title_fts (id, title) SELECT id, title FROM money_flows")
+    op.execute("""CREATE TRIGGER money_flows_title_fts_ai AFTER INSERT ON money_flows FOR EACH ROW
+        INSERT INTO money_flows_title_fts (id, title) VALUES (NEW.id, NEW.title)""")
+    op.execute("""CREATE TRIGGER money_flows_title_fts_au AFTER UPDATE ON money_flows FOR EACH ROW
+        UPDATE money_flows_title_fts SET title = NEW.title
+        WHERE id = NEW.id AND NOT (OLD.title <=> NEW.title)""")
+    op.execute("""CREATE TRIGGER money_flows_title_fts_ad AFTER DELETE ON money_flows FOR EACH ROW
+        DELETE FROM money_flows_title_fts WHERE id = OLD.id""")
+    op.drop_index('ix_money_flows_title_fulltext', table_name='money_flows')
+
+    # パーティション分割したテーブルの主キーには、分割に使うカラム（occurred_date）が必要
+    op.execute("ALTER TABLE money_flows DROP PRIMARY KEY, ADD PRIMARY KEY (id, occurred_date)")
+
+    # 最も古い行の月から、MONTHS_AHEADか月先までを1か月1パーティションにする（行数に比例して時間がかかる）
+    # パーティション名はその月（p202504 → 2025-05-01より前）。最初のパーティションには、それより前の行もすべて入る
+    oldest = op.get_bind().execute(sa.text("SELECT MIN(occurred_date) FROM money_flows")).scalar()
+    # occurred_dateは日本時間で保存しているため、今月も日本時間で決める（サーバーのタイムゾーンによらない）
+    now = datetime.now(JST)
+    month_index = (oldest or now).year * 12 + (oldest or now).month - 1
+    until_index = now.year * 12 + now.month - 1 + MONTHS_AHEAD
+    definitions = []
+    for index in range(month_index, until_index + 1):
+        year, month = divmod(index, 12)
+        next_year, next_month = divmod(index + 1, 12)
+        definitions.append(
+            f"PARTITION p{year:04d}{month + 1:02d} "
+            f"VALUES LESS THAN ('{next_year:04d}-{next_month + 1:02d}-01 00:00:00')"
+        )
+    definitions.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+    op.execute(
+        "ALTER TABLE money_flows PARTITION BY RANGE COLUMNS(occurred_date) ("
+        + ", ".join(definitions)
+        + ")"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE money_flows REMOVE PARTITIONING")
+    op.execute("ALTER TABLE money_flows DROP PRIMARY KEY, ADD PRIMARY KEY (id)")
+
+    op.create_index('ix_money_flows_title_fulltext', 'money_flows', ['title'], unique=False, mysql_prefix='FULLTEXT', mysql_with_parser='ngram')
+    op.execute("DROP TRIGGER money_flows_title_fts_ad")
+    op.execute("DROP TRIGGER money_flows_title_fts_au")
+    op.execute("DROP TRIGGER money_flows_title_fts_ai")
+    op.execute("DROP TABLE money_flows_title_fts")
+
+    # アーカイブした行はmoney_flowsに戻す
+    columns = 'id, title, amount, occurred_date, created_at, updated_at, version, kind'
+    op.execute(f"INSERT INTO money_flows ({columns}) SELECT {columns} FROM money_flows_archive")
+    op.drop_index('ix_money_flows_archive_occurred_date', table_name='money_flows_archive')
+    op.drop_table('money_flows_archive')
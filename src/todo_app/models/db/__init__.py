@@ -1,3 +1,5 @@
+from .money_flow_monthly_summary import MoneyFlowMonthlySummary
 from .money_flows import MoneyFlows
+from .money_flows_archive import MoneyFlowsArchive
 
-__all__=["MoneyFlows"]
\ No newline at end of file
+__all__=["MoneyFlowMonthlySummary", "MoneyFlows", "MoneyFlowsArchive"]
@@ -0,0 +1,67 @@
+from collections.abc import AsyncGenerator
+from functools import cache
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from todo_app.core.database import (
+    ASYNC_DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+)
+from todo_app.monitoring.db_pool import InstrumentedAsyncAdaptedQueuePool, instrument_engine
+from todo_app.monitoring.metrics import instrument_engine_queries
+from todo_app.monitoring.slow_queries import instrument_slow_queries
+
+
+# 非同期エンジン（DB_MODE=asyncの場合のみ使うため、最初に使われた時点で作る）
+# 同期モードでは非同期ドライバ（aiomysql）を読み込まない
+# コネクションプールの設定・統計、クエリのメトリクス、遅いクエリの記録は同期版（base.py）と同じ
+@cache
+def get_async_engine() -> AsyncEngine:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=False,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    instrument_engine(async_engine.sync_engine, "async")
+    instrument_engine_queries(async_engine.sync_engine)
+    instrument_slow_queries(async_engine.sync_engine)
+    return async_engine
+
+
+# expire_on_commit=False：commit後に属性を読んでも再取得（＝awaitが必要なDBアクセス）が走らないようにする
+# （非同期では、暗黙のDBアクセスはMissingGreenletエラーになる）
+@cache
+def get_async_session_factory() -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=get_async_engine(), autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession]:
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+# 起動時に、count本の接続を同時に開いてからプールに返す（同期版はbase.pyのopen_pool_connections）
+async def open_async_pool_connections(engine: AsyncEngine, count: int) -> None:
+    connections = [await engine.connect() for _ in range(count)]
+    for connection in connections:
+        await connection.close()
+
+
+# 終了時に、プールの接続をすべて閉じる（エンジンを作っていなければ何もしない）
+async def dispose_async_engine() -> None:
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
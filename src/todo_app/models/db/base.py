@@ -1,18 +1,124 @@
 from collections.abc import Generator
+from functools import cache
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from fastapi import Request
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
+
+from todo_app.cache.read_cache import DB_ROLE_INFO_KEY
+from todo_app.core.database import (
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_REPLICA_EJECT_SECONDS,
+    DB_REPLICA_STRATEGY,
+    DB_REPLICA_URLS,
+)
+from todo_app.models.db.replicas import ReplicaSet, is_replica_request, mark_read_your_writes
+from todo_app.monitoring.db_pool import InstrumentedQueuePool, instrument_engine
+from todo_app.monitoring.metrics import instrument_engine_queries
+from todo_app.monitoring.slow_queries import instrument_slow_queries
+
+
+# コネクションプールの設定（core/database.py）を反映したエンジンを作り、
+# プールの統計・クエリのメトリクス・遅いクエリを記録するようにする
+def create_db_engine(url: str, name: str) -> Engine:
+    db_engine = create_engine(
+        url,
+        echo=False,
+        poolclass=InstrumentedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_pre_ping=DB_POOL_PRE_PING,
+    )
+    instrument_engine(db_engine, name)
+    instrument_engine_queries(db_engine)
+    instrument_slow_queries(db_engine)
+    return db_engine
+
+
+# 同期エンジン（最初に使われた時点で作る）
+# import時にはDBのドライバを読み込まず、接続もしない（APIではmain.pyのlifespanで、起動時に作って接続を開いておく）
+@cache
+def get_engine() -> Engine:
+    return create_db_engine(DATABASE_URL, "sync")
+
+
+# レプリカのエンジン（DB_REPLICA_URLSが空の場合はNone。エンジンと同じく最初に使われた時点で作る）
+@cache
+def get_replica_set() -> ReplicaSet | None:
+    if not DB_REPLICA_URLS:
+        return None
+    return ReplicaSet(
+        [create_db_engine(url, f"replica{i}") for i, url in enumerate(DB_REPLICA_URLS, 1)],
+        DB_REPLICA_STRATEGY,
+        DB_REPLICA_EJECT_SECONDS,
+    )
 
-from todo_app.core.database import DATABASE_URL
 
-engine = create_engine(DATABASE_URL, echo=False)
 Base = declarative_base()
 
-session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+_session_factory = sessionmaker(autocommit=False, autoflush=False)
+
+
+# 新しいSessionを作る（sessionmakerと同じ使い方。エンジンはget_engine()のもの）
+def session() -> Session:
+    return _session_factory(bind=get_engine())
+
+
+# 起動時に、count本の接続を同時に開いてからプールに返す（プールに接続がcount本たまった状態にする）
+def open_pool_connections(engine: Engine, count: int) -> None:
+    connections = [engine.connect() for _ in range(count)]
+    for connection in connections:
+        connection.close()
+
+
+# 終了時に、プールの接続をすべて閉じる（エンジンを作っていなければ何もしない）
+def dispose_engine() -> None:
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
+    if get_replica_set.cache_info().currsize and (replicas := get_replica_set()) is not None:
+        for engine in replicas.engines:
+            engine.dispose()
+
+
+# レプリカに接続したSessionを作る（使えるレプリカがなければNone）
+# 先に接続しておき、接続できなければそのレプリカを外して、次のレプリカを試す
+def replica_session(replicas: ReplicaSet) -> Session | None:
+    for _ in replicas.engines:
+        engine = replicas.choose()
+        if engine is None:
+            return None
+
+        db = _session_factory(bind=engine, info={DB_ROLE_INFO_KEY: "replica"})
+        try:
+            db.connection()
+        except DBAPIError:
+            db.close()
+            replicas.eject(engine)
+            continue
+        return db
+    return None
+
 
-def get_db() -> Generator:
-    db = session()
+# GETのリクエストはレプリカ、それ以外（書き込み）と書き込んだ直後の読み取りはプライマリに接続する
+# 書き込みのリクエストでは、しばらくプライマリで読むようにCookieを付ける（レプリカを使う場合のみ）
+def get_db(request: Request) -> Generator:
+    db = None
+    if (replicas := get_replica_set()) is not None:
+        if is_replica_request(request):
+            db = replica_session(replicas)
+        else:
+            mark_read_your_writes(request)
+    if db is None:
+        db = session()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
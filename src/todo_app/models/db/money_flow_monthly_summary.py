@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Enum, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from todo_app.logic.calculate.calculate_datetime import get_now
+from todo_app.models.db.base import Base
+from todo_app.models.db.money_flows import MoneyFlowKind
+
+
+# 月・収支の種類ごとの合計金額と件数（money_flowsから集計した結果を保持するテーブル）
+# money_flowsへの登録・更新・削除と同じトランザクションで増減させるため、
+# 集計結果を読むときはmoney_flowsの行数ではなく月数分の行だけを読めばよい
+class MoneyFlowMonthlySummary(Base):
+    __tablename__ = "money_flow_monthly_summary"
+
+    # 主キーは(month, kind)の複合主キー
+    month: Mapped[int] = mapped_column(Integer, primary_key=True)  # YYYYMM 例：202504
+    kind: Mapped[MoneyFlowKind] = mapped_column(
+        Enum(MoneyFlowKind, name="money_flow_kind"), primary_key=True
+    )
+    total_amount: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    flow_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=get_now, onupdate=get_now)
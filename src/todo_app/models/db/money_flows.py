@@ -4,12 +4,14 @@ from datetime import datetime
 from enum import Enum as PyEnum
 
 # SQLAlchemyのEnum機能を使うためのインポート
-from sqlalchemy import DateTime, Enum, Index, Integer, String
+from sqlalchemy import DDL, DateTime, Enum, Index, Integer, String, event
+from sqlalchemy.dialects import mysql
 
 # SQLAlchemy 2.0形式（最新）の書き方　Mapped：カラムになるものであることを示す　mapped_column：カラムの条件を指定するもの
-from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.orm import Mapped, mapped_column, validates
 
-from todo_app.logic.calculate.calculate_datetime import get_now
+from todo_app.logic.calculate.calculate_datetime import get_now, to_jst_naive, to_month_key
+from todo_app.logic.search.title_ngrams import NGRAM_TOKEN_SIZE
 from todo_app.models.db.base import Base
 
 
@@ -35,8 +37,21 @@ class MoneyFlows(Base):
     title: Mapped[str] = mapped_column(String(30), nullable=False)
     amount: Mapped[int] = mapped_column(Integer, nullable=False)
     occurred_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    # occurred_dateの月（日本時間のYYYYMMの整数）。月での絞り込み・集計で、occurred_dateを日付関数で包まずに
+    # インデックス（ix_money_flows_month_kind）の範囲スキャンで済ませるために保存する
+    # ORMではoccurred_dateを設定した時に自動で設定される。ORMを通さない登録・更新では、呼び出し側で設定すること
+    occurred_month: Mapped[int] = mapped_column(Integer, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=get_now)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=get_now, onupdate=get_now)
+    # MySQLのDATETIMEは秒までしか保存しないため、マイクロ秒まで保存する（DATETIME(6)）
+    # 一覧のETag（MAX(updated_at)から作る）が、同じ秒の中の更新でも変わるようにするため
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql"), default=get_now, onupdate=get_now
+    )
+
+    # 楽観的排他制御用のバージョン（更新のたびに1増える）
+    # 更新は「UPDATE ... WHERE id = :id AND version = :version」で行い、更新できなかった場合は他の人が先に更新している
+    # server_default：ORMを通さない複数行INSERT（一括登録）でも1が入るようにする
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
 
     # Enum型のカラム定義（追加）
     kind: Mapped[MoneyFlowKind] = mapped_column(
@@ -49,9 +64,100 @@ class MoneyFlows(Base):
         index=True,  # 索引を張る指定。WHERE kind='income' のような絞り込み検索が速くなる
     )
 
+    # occurred_dateは日本時間のタイムゾーンなしの日時で保存し、occurred_monthも同じ月にする
+    @validates("occurred_date")
+    def _set_occurred_month(self, key: str, value: datetime) -> datetime:
+        value = to_jst_naive(value)
+        self.occurred_month = to_month_key(value)
+        return value
+
+    # ※MySQLでは、occurred_dateの月ごとにパーティション分割するため、主キーは(id, occurred_date)にしている
+    # 　（パーティション分割したテーブルの主キーには、分割に使うカラムが必要）。
+    # 　idはAUTO_INCREMENTで一意のため、ORMではidだけを主キーとして扱う
+
+    # version_id_col：ORMでの登録時に1を入れ、更新・削除時は「WHERE version = 読み込んだ時の値」を付けて1増やす
+    # （他の人が先に更新・削除していた場合は、StaleDataErrorになる）
+    __mapper_args__ = {"version_id_col": version}
+
 
 # 発生月や収支で絞り込めるようにする。
 # Index(...)：インデックスを作る関数。
 # ix_money_flows_occurred_kind：インデックス名（慣例でix_から始める）
 # MoneyFlows.occurred_date, MoneyFlows.kind：どの列をキーにするかの指定
 Index("ix_money_flows_occurred_kind", MoneyFlows.occurred_date, MoneyFlows.kind)
+
+# カーソル（キーセット）ページネーション用。ORDER BY occurred_date, id をそのままインデックスで辿れるようにする。
+# ix_money_flows_occurred_kind は間にkindが挟まるため、(occurred_date, id)の順序を保証できない
+Index("ix_money_flows_occurred_id", MoneyFlows.occurred_date, MoneyFlows.id)
+
+# 月での絞り込み・集計（月・収支ごと）用
+Index("ix_money_flows_month_kind", MoneyFlows.occurred_month, MoneyFlows.kind)
+
+# 一覧・集計のETag（条件付きGET）用。MAX(updated_at)とCOUNT(*)を、テーブルを読まずインデックスだけで求められるようにする
+Index("ix_money_flows_updated_at", MoneyFlows.updated_at)
+
+# タイトル検索用（前方一致）。「title LIKE 'お米%'」を範囲スキャンで検索できるようにする
+Index("ix_money_flows_title", MoneyFlows.title)
+
+# タイトル検索用（部分一致）の全文検索表
+# money_flowsはパーティション分割する（MySQL）ため、FULLTEXTインデックスを張れない → 別の表に持つ
+# money_flowsのトリガーで自動で更新するため、アプリから直接書き込む必要はない
+# MySQL：id・titleと、ngramパーサーのFULLTEXTインデックス（日本語も2文字ずつ区切って索引する）
+# SQLite（ローカル・テスト）：FTS5の表。rowidにmoney_flows.idを、
+# 　gramsにタイトルを2文字ずつ区切って16進数にしたもの（logic/search/title_ngrams.py）を入れる
+MONEY_FLOWS_TITLE_FTS_TABLE = "money_flows_title_fts"
+TITLE_MAX_LENGTH = 30
+
+
+# タイトルの列（SQL）から、FTS5に入れるgramsの文字列を作るSQL式
+# トリガーの中ではWITH句（再帰）が使えないため、タイトルの最大文字数分のsubstr()を並べる
+# ※SQLiteのlower()はASCIIだけを小文字にする（to_title_ngram_tokens()と同じ）
+def build_title_ngrams_sql(title_column: str) -> str:
+    return " || ".join(
+        f"CASE WHEN length({title_column}) > {i + NGRAM_TOKEN_SIZE - 2} "
+        f"THEN lower(hex(lower(substr({title_column}, {i}, {NGRAM_TOKEN_SIZE})))) || ' ' ELSE '' END"
+        for i in range(1, TITLE_MAX_LENGTH - NGRAM_TOKEN_SIZE + 2)
+    )
+
+
+# SQLiteでmoney_flowsを作った後に、FTS5の表・トリガーを作るDDL（Base.metadata.create_all()で実行される）
+MONEY_FLOWS_TITLE_FTS_DDL = [
+    f"CREATE VIRTUAL TABLE {MONEY_FLOWS_TITLE_FTS_TABLE} USING fts5(grams)",
+    f"""CREATE TRIGGER {MONEY_FLOWS_TITLE_FTS_TABLE}_ai AFTER INSERT ON money_flows BEGIN
+        INSERT INTO {MONEY_FLOWS_TITLE_FTS_TABLE}(rowid, grams)
+        VALUES (new.id, {build_title_ngrams_sql("new.title")});
+    END""",
+    f"""CREATE TRIGGER {MONEY_FLOWS_TITLE_FTS_TABLE}_au AFTER UPDATE OF title ON money_flows BEGIN
+        UPDATE {MONEY_FLOWS_TITLE_FTS_TABLE} SET grams = {build_title_ngrams_sql("new.title")}
+        WHERE rowid = new.id;
+    END""",
+    f"""CREATE TRIGGER {MONEY_FLOWS_TITLE_FTS_TABLE}_ad AFTER DELETE ON money_flows BEGIN
+        DELETE FROM {MONEY_FLOWS_TITLE_FTS_TABLE} WHERE rowid = old.id;
+    END""",
+]
+
+# MySQLでmoney_flowsを作った後に、全文検索の表・トリガーを作るDDL（本番はalembicのマイグレーションで作る）
+MONEY_FLOWS_TITLE_FULLTEXT_DDL = [
+    f"""CREATE TABLE {MONEY_FLOWS_TITLE_FTS_TABLE} (
+        id INTEGER NOT NULL PRIMARY KEY,
+        title VARCHAR(30) NOT NULL,
+        FULLTEXT INDEX ix_{MONEY_FLOWS_TITLE_FTS_TABLE}_title (title) WITH PARSER ngram
+    )""",
+    f"""CREATE TRIGGER {MONEY_FLOWS_TITLE_FTS_TABLE}_ai AFTER INSERT ON money_flows FOR EACH ROW
+        INSERT INTO {MONEY_FLOWS_TITLE_FTS_TABLE} (id, title) VALUES (NEW.id, NEW.title)""",
+    f"""CREATE TRIGGER {MONEY_FLOWS_TITLE_FTS_TABLE}_au AFTER UPDATE ON money_flows FOR EACH ROW
+        UPDATE {MONEY_FLOWS_TITLE_FTS_TABLE} SET title = NEW.title
+        WHERE id = NEW.id AND NOT (OLD.title <=> NEW.title)""",
+    f"""CREATE TRIGGER {MONEY_FLOWS_TITLE_FTS_TABLE}_ad AFTER DELETE ON money_flows FOR EACH ROW
+        DELETE FROM {MONEY_FLOWS_TITLE_FTS_TABLE} WHERE id = OLD.id""",
+]
+
+for ddl in MONEY_FLOWS_TITLE_FTS_DDL:
+    event.listen(MoneyFlows.__table__, "after_create", DDL(ddl).execute_if(dialect="sqlite"))
+for ddl in MONEY_FLOWS_TITLE_FULLTEXT_DDL:
+    event.listen(MoneyFlows.__table__, "after_create", DDL(ddl).execute_if(dialect="mysql"))
+event.listen(
+    MoneyFlows.__table__,
+    "after_drop",
+    DDL(f"DROP TABLE IF EXISTS {MONEY_FLOWS_TITLE_FTS_TABLE}"),
+)
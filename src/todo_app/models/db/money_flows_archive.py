@@ -0,0 +1,57 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, Enum, Index, Integer, String
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Mapped, mapped_column, validates
+
+from todo_app.logic.calculate.calculate_datetime import to_jst_naive, to_month_key
+from todo_app.models.db.base import Base
+from todo_app.models.db.money_flows import MoneyFlowKind
+
+
+# 保存期間を過ぎたmoney_flowsの行の移動先（commands/maintain_money_flow_partitions.py）
+# APIからは読まないため、MySQLでは圧縮（ROW_FORMAT=COMPRESSED）して保存する
+# 月次集計テーブルは移動しても変えない（作り直す場合は、このテーブルの行も集計する）
+class MoneyFlowsArchive(Base):
+    __tablename__ = "money_flows_archive"
+    __table_args__ = {"mysql_row_format": "COMPRESSED", "mysql_key_block_size": "8"}
+
+    # money_flowsと同じカラム（idはmoney_flowsで採番された値をそのまま入れる）
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    title: Mapped[str] = mapped_column(String(30), nullable=False)
+    amount: Mapped[int] = mapped_column(Integer, nullable=False)
+    occurred_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    occurred_month: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime | None] = mapped_column(DateTime)
+    updated_at: Mapped[datetime | None] = mapped_column(
+        DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+    )
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    kind: Mapped[MoneyFlowKind] = mapped_column(
+        Enum(MoneyFlowKind, name="money_flow_kind"), nullable=False
+    )
+    archived_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # 移動した日時
+
+    # money_flowsと同じく、occurred_dateを設定した時にoccurred_monthも設定する
+    @validates("occurred_date")
+    def _set_occurred_month(self, key: str, value: datetime) -> datetime:
+        value = to_jst_naive(value)
+        self.occurred_month = to_month_key(value)
+        return value
+
+
+# 残高（その月の途中まで）の計算用
+Index("ix_money_flows_archive_occurred_date", MoneyFlowsArchive.occurred_date)
+
+# money_flowsからINSERT ... SELECTで移動するカラム（archived_at以外）
+MONEY_FLOWS_ARCHIVE_COLUMNS = (
+    "id",
+    "title",
+    "amount",
+    "occurred_date",
+    "occurred_month",
+    "created_at",
+    "updated_at",
+    "version",
+    "kind",
+)
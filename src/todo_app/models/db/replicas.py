@@ -0,0 +1,118 @@
+import itertools
+import time
+
+from collections.abc import Callable
+from threading import Lock
+
+from fastapi import Request
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import ExceptionContext
+
+from todo_app.core.database import READ_YOUR_WRITES_SECONDS
+from todo_app.loggers.custom_logger import logger
+
+# ★読み取り専用のレプリカへの振り分け（get_dbで使う）。
+# 　GETのリクエストはレプリカ、書き込みと、書き込んだ直後のクライアントの読み取りはプライマリに接続する。
+# 　接続できなかったレプリカは、DB_REPLICA_EJECT_SECONDS秒の間は外しておく（その間は他のレプリカかプライマリを使う）。
+
+REPLICA_STRATEGIES = ("round_robin", "least_connections")
+
+# 書き込んだクライアントに付けるCookie（値はプライマリで読む期限のUNIX時刻）
+READ_PRIMARY_COOKIE = "db_read_primary_until"
+
+# クライアントが付けると、GETでもプライマリで読む（Cookieを使えないクライアント向け）
+READ_PRIMARY_HEADER = "X-Read-Primary"
+
+# 書き込みのリクエストであることを、ReadYourWritesMiddlewareに伝えるためのrequest.stateの名前
+READ_YOUR_WRITES_STATE = "read_your_writes"
+
+
+# レプリカのエンジンの一覧と、どのレプリカを使うかの選び方・外しているレプリカ
+# 複数のスレッドから同時に使われるため、Lockで守る
+class ReplicaSet:
+    def __init__(
+        self,
+        engines: list[Engine],
+        strategy: str = "round_robin",
+        eject_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if strategy not in REPLICA_STRATEGIES:
+            raise ValueError(f"DB_REPLICA_STRATEGYが不正です：{strategy}")
+
+        self._lock = Lock()
+        self._counter = itertools.count()
+        self._clock = clock
+        self._ejected_until: dict[int, float] = {}  # 外したレプリカの番号：使い直す時刻
+        self.engines = engines
+        self.strategy = strategy
+        self.eject_seconds = eject_seconds
+        self.ejections = 0  # レプリカを外した回数
+
+        # 使用中に接続が切れた場合も外す
+        for engine in engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    # 今使えるレプリカ（外している期間が過ぎたものは、もう一度使ってみる）
+    def healthy_engines(self) -> list[Engine]:
+        now = self._clock()
+        with self._lock:
+            return [
+                engine
+                for index, engine in enumerate(self.engines)
+                if self._ejected_until.get(index, 0.0) <= now
+            ]
+
+    # 使うレプリカを選ぶ（使えるレプリカがなければNone）
+    def choose(self) -> Engine | None:
+        engines = self.healthy_engines()
+        if not engines:
+            return None
+        if self.strategy == "least_connections":
+            return min(engines, key=lambda engine: engine.pool.checkedout())
+        return engines[next(self._counter) % len(engines)]
+
+    def eject(self, engine: Engine) -> None:
+        index = self.engines.index(engine)
+        with self._lock:
+            self._ejected_until[index] = self._clock() + self.eject_seconds
+            self.ejections += 1
+        logger.warning(
+            "レプリカに接続できないため、%s秒の間外します url=%s",
+            self.eject_seconds,
+            engine.url.render_as_string(hide_password=True),
+        )
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        if context.is_disconnect and context.engine in self.engines:
+            self.eject(context.engine)
+
+
+# レプリカで読んでよいリクエストか（GET・HEADで、書き込んだ直後でないもの）
+def is_replica_request(request: Request) -> bool:
+    if request.method not in ("GET", "HEAD"):
+        return False
+    if request.headers.get(READ_PRIMARY_HEADER, "").lower() in ("1", "true"):
+        return False
+
+    try:
+        read_primary_until = float(request.cookies.get(READ_PRIMARY_COOKIE, "0"))
+    except ValueError:
+        read_primary_until = 0.0
+    return read_primary_until <= time.time()
+
+
+# 書き込んだクライアントが、READ_YOUR_WRITES_SECONDS秒の間はプライマリで読むようにする
+# Cookieはハンドラーが返したレスポンスに、ReadYourWritesMiddlewareが付ける
+# （ハンドラーがResponseを直接返す場合、Depends()で受け取ったResponseのCookieは使われないため）
+def mark_read_your_writes(request: Request) -> None:
+    setattr(request.state, READ_YOUR_WRITES_STATE, True)
+
+
+# プライマリで読む期限を入れたCookie（Set-Cookieヘッダーの値）
+def build_read_your_writes_cookie() -> str:
+    read_primary_until = int(time.time()) + READ_YOUR_WRITES_SECONDS
+    return (
+        f"{READ_PRIMARY_COOKIE}={read_primary_until}; HttpOnly; "
+        f"Max-Age={READ_YOUR_WRITES_SECONDS}; Path=/; SameSite=lax"
+    )
@@ -1,11 +1,27 @@
 from datetime import datetime
-from typing import Literal
+from typing import Annotated, Literal
 
-from pydantic import BaseModel
+from pydantic import AfterValidator, BaseModel, ConfigDict
+
+from todo_app.logic.calculate.calculate_datetime import to_jst_naive
 
 # "expense" か "income"のどちらかに限定される
 Kind = Literal["expense", "income"]
 
+# 並び順（occurred_date, idの昇順 or 降順）
+SortOrder = Literal["asc", "desc"]
+
+# 集計の単位（月 / 週 / 年）
+AggregatePeriod = Literal["month", "week", "year"]
+
+# タイトル検索の一致方法（前方一致 / 部分一致）
+TitleMatch = Literal["prefix", "contains"]
+
+# occurred_dateと比べる日時（登録・更新の値、絞り込み・残高のクエリパラメータ）
+# タイムゾーン付き（例：2025-01-31T16:00:00Z）で送られた場合は、日本時間のタイムゾーンなしに変換する
+# DBのoccurred_dateは日本時間のタイムゾーンなしで保存し、月（occurred_month）も日本時間で決めるため
+JstDatetime = Annotated[datetime, AfterValidator(to_jst_naive)]
+
 # ✴︎DB側で制約を設けるよりも、以下APIのリクエスト・レスポンスで制約を設ける方が一般的（こちらでmax_lengthなど指定可能）
 
 
@@ -13,7 +29,7 @@ Kind = Literal["expense", "income"]
 class MoneyFlowBase(BaseModel):
     title: str
     amount: int
-    occurred_date: datetime
+    occurred_date: JstDatetime
     kind: Kind = "expense"  # 今回特別：開発効率を上げるため、自動で"expense"が入るよう設定（＝支出扱い）。バグの発見が遅れる要因となるため、本来初期値の設定は非推奨
 
 
@@ -25,8 +41,26 @@ class CreateMoneyFlowRequest(MoneyFlowBase):
 # PUTリクエストを定義
 class UpdateMoneyFlowRequest(MoneyFlowBase):
     id: int  # MoneyFlowBaseのフィールド + idを追加
+    # 取得した時のversion（GETレスポンスのversion）。DBの値と違う場合は、他の人が先に更新しているため409を返す
+    # 省略した場合はversionを確認しない（後から更新した方が残る）
+    version: int | None = None
 
 
 # DELETEリクエストを定義
 class DeleteMoneyFlowRequest(BaseModel):
     id: int
+
+
+# 一覧取得時の絞り込み条件を定義（GETのクエリパラメータから組み立てる）
+# frozen=True：作成後に変更できない＆ハッシュ可能にする
+class MoneyFlowFilter(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    date_from: JstDatetime | None = None  # この日時以降（含む）
+    date_to: JstDatetime | None = None  # この日時より前（含まない）
+    month_from: int | None = None  # この月（YYYYMM）以降（含む）
+    month_to: int | None = None  # この月（YYYYMM）まで（含む）
+    kind: Kind | None = None
+    amount_min: int | None = None  # 含む
+    amount_max: int | None = None  # 含む
+    order: SortOrder = "asc"
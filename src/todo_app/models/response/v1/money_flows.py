@@ -15,6 +15,7 @@ class MoneyFlowBase(BaseModel):
     amount: int
     occurred_date: datetime
     kind: Kind
+    version: int  # 更新のたびに1増える。PUTリクエストに付けて送ると、他の人の更新を上書きしない
 
 
 # GETレスポンスを定義
@@ -22,11 +23,56 @@ class GetMoneyFlowResponseItem(MoneyFlowBase):
     pass  # MoneyFlowBaseのフィールドのみ
 
 
+# GETレスポンス（カーソルページネーション）を定義
+class GetMoneyFlowsPageResponse(BaseModel):
+    items: list[GetMoneyFlowResponseItem]
+    next_cursor: str | None  # 次のページがない場合はNone
+
+
+# GETレスポンス（1行ごとの残高）を定義
+class GetRunningBalanceResponseItem(MoneyFlowBase):
+    balance: int  # この行までの残高（収入 - 支出の累計。occurred_date, idの順）
+
+
+class GetRunningBalanceResponse(BaseModel):
+    items: list[GetRunningBalanceResponseItem]
+    next_cursor: str | None  # 次のページがない場合はNone
+
+
+# GETレスポンス（ある時点の残高）を定義
+class GetBalanceResponse(BaseModel):
+    as_of: datetime
+    balance: int  # as_ofより前の収支の残高（収入 - 支出の累計）
+
+
+# GETレスポンス（タイトル検索）を定義
+class SearchMoneyFlowResponseItem(MoneyFlowBase):
+    rank: int  # 0：タイトルが完全一致、1：前方一致、2：部分一致（小さいほど上に並ぶ）
+
+
+class SearchMoneyFlowsResponse(BaseModel):
+    items: list[SearchMoneyFlowResponseItem]
+    next_cursor: str | None  # 次のページがない場合はNone
+
+
+# GETレスポンス（期間・収支ごとの集計）を定義
+class GetMoneyFlowAggregateResponseItem(BaseModel):
+    period: str  # 月："2025-04"、週：週の始まり（月曜日）"2025-03-31"、年："2025"
+    kind: Kind
+    total_amount: int
+    count: int
+
+
 # POSTレスポンスを定義
 class CreateMoneyFlowResponse(MoneyFlowBase):
     pass
 
 
+# POSTレスポンス（一括登録）を定義
+class CreateMoneyFlowsBulkResponse(BaseModel):
+    ids: list[int]  # リクエストの配列と同じ順番で、採番されたid
+
+
 # PUTレスポンスを定義
 class UpdateMoneyFlowResponse(MoneyFlowBase):
     pass
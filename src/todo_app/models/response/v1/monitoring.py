@@ -0,0 +1,53 @@
+from pydantic import BaseModel
+
+
+# GETレスポンス（コネクションプールの状態）を定義
+# size〜overflow：現在の状態（QueuePool以外のプールではNone）
+# checkouts〜overflow_max：プロセス起動からの累計
+class GetDbPoolStatisticsResponseItem(BaseModel):
+    name: str  # sync / async
+    pool_class: str
+    size: int | None
+    checked_in: int | None
+    checked_out: int | None
+    overflow: int | None
+    checkouts: int
+    checkins: int
+    connects: int
+    invalidations: int
+    soft_invalidations: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    overflow_max: int
+
+
+# GETレスポンス（読み取りキャッシュの状態）を定義
+# hits〜invalidations：プロセス起動からの累計（ワーカーごとの値）
+class GetReadCacheStatisticsResponse(BaseModel):
+    enabled: bool
+    ttl_seconds: float
+    backend: str
+    entries: int
+    bytes: int
+    max_entries: int
+    max_bytes: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+
+
+# GETレスポンス（遅いクエリ：SQLの形（フィンガープリント）ごとの集計）を定義
+# p50_ms・p95_ms：直近SLOW_QUERY_SAMPLE_SIZE件から計算。count・max_ms・total_ms：プロセス起動からの累計
+# explain：SLOW_QUERY_EXPLAIN=trueの場合に、最初の1回だけ取得したEXPLAINの結果（SELECT文のみ）
+class GetSlowQueryResponseItem(BaseModel):
+    fingerprint: str
+    example: str
+    count: int
+    p50_ms: float
+    p95_ms: float
+    max_ms: float
+    total_ms: float
+    explain: list[str] | None
@@ -0,0 +1,142 @@
+import time
+
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool, QueuePool
+
+# ★コネクションプールの利用状況を記録し、/api/v1/monitoring/db_poolで確認できるようにする。
+# 　プールの大きさ（DB_POOL_SIZE、DB_MAX_OVERFLOW）を、推測ではなく実際の数値から決めるために使う。
+
+
+# 1つのプール（エンジン）の累計の統計
+# 複数のスレッドから同時に記録されるため、Lockで守る
+class PoolStatistics:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.checkouts = 0  # 接続の貸し出し回数
+        self.checkins = 0  # 接続の返却回数
+        self.connects = 0  # 新しく接続を作った回数（初回・オーバーフロー・作り直し）
+        self.invalidations = 0  # 接続が使えなくなり破棄された回数（切断の検知・pre_pingの失敗など）
+        self.soft_invalidations = 0  # 返却時に破棄される予定になった回数（recycleなど）
+        self.timeouts = 0  # DB_POOL_TIMEOUT秒待っても空きがなかった回数
+        self.wait_seconds_total = 0.0  # 貸し出しまでに待った秒数の合計
+        self.wait_seconds_max = 0.0  # 貸し出しまでに待った秒数の最大
+        self.overflow_max = 0  # オーバーフロー（DB_POOL_SIZEを超えた接続数）の最大
+
+    def record_wait(self, seconds: float, overflow: int) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            self.overflow_max = max(self.overflow_max, overflow)
+
+    def increment(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "soft_invalidations": self.soft_invalidations,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "overflow_max": self.overflow_max,
+            }
+
+
+# 空きの接続を待つ時間を計るためのプール
+# SQLAlchemyのプールイベントには「待ち始め」がないため、プールから接続を取り出す処理（_do_get）の時間を計る
+# ※オーバーフローで新しく接続を作った場合は、接続を作る時間も含まれる
+class InstrumentedPoolMixin:
+    statistics: PoolStatistics | None = None
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            if self.statistics is not None:
+                self.statistics.increment("timeouts")
+            raise
+        finally:
+            if self.statistics is not None:
+                self.statistics.record_wait(time.perf_counter() - started, max(self.overflow(), 0))
+
+    # engine.dispose()でプールが作り直されても、同じ統計に記録し続ける
+    def recreate(self) -> Pool:
+        pool = super().recreate()
+        pool.statistics = self.statistics
+        return pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+# エンジン名 → (エンジン, 統計)
+_instrumented_engines: dict[str, tuple[Engine, PoolStatistics]] = {}
+
+
+# エンジンのプールにイベントを登録し、統計を記録するようにする
+# 非同期エンジンの場合は、engine.sync_engineを渡す
+def instrument_engine(engine: Engine, name: str) -> PoolStatistics:
+    statistics = PoolStatistics()
+    if isinstance(engine.pool, InstrumentedPoolMixin):
+        engine.pool.statistics = statistics
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection: object, connection_record: object) -> None:
+        statistics.increment("connects")
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection: object, connection_record: object, proxy: object) -> None:
+        statistics.increment("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection: object, connection_record: object) -> None:
+        statistics.increment("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_connection: object, connection_record: object, exception: object) -> None:
+        statistics.increment("invalidations")
+
+    @event.listens_for(engine, "soft_invalidate")
+    def _soft_invalidate(
+        dbapi_connection: object, connection_record: object, exception: object
+    ) -> None:
+        statistics.increment("soft_invalidations")
+
+    _instrumented_engines[name] = (engine, statistics)
+    return statistics
+
+
+# 登録したすべてのエンジンについて、現在のプールの状態と累計の統計を返す
+def get_pool_statistics() -> list[dict[str, Any]]:
+    results = []
+    for name, (engine, statistics) in _instrumented_engines.items():
+        pool = engine.pool
+        is_queue_pool = isinstance(pool, QueuePool)
+        results.append(
+            {
+                "name": name,
+                "pool_class": type(pool).__name__,
+                # 現在の状態（QueuePool以外のプールではNone）
+                "size": pool.size() if is_queue_pool else None,
+                "checked_in": pool.checkedin() if is_queue_pool else None,
+                "checked_out": pool.checkedout() if is_queue_pool else None,
+                "overflow": max(pool.overflow(), 0) if is_queue_pool else None,
+            }
+            | statistics.snapshot()
+        )
+    return results
@@ -0,0 +1,189 @@
+from bisect import bisect_left
+from collections.abc import Iterable
+from contextvars import ContextVar
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import Connection, Engine
+from sqlalchemy.engine.interfaces import DBAPICursor
+
+from todo_app.monitoring.query_timer import add_query_observer
+
+# ★リクエスト・DBクエリのメトリクスを集計し、Prometheusのテキスト形式で返す
+# 　リクエストごとの処理の中で使うため、軽さを優先している
+# 　・ヒストグラムのバケツ（区切り）は最初に決めて、数値のリストを確保しておく
+# 　・ロックは数値を足す間だけ取る（awaitをまたいでロックを持たない）
+
+# リクエストの処理時間（秒）
+REQUEST_DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# 1文のクエリの実行時間（秒）
+QUERY_DURATION_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+# 1リクエストあたりのクエリ数
+QUERIES_PER_REQUEST_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# 1リクエストあたりの行数（取得・変更した行数の合計）
+ROWS_PER_REQUEST_BUCKETS = (0, 1, 10, 100, 1000, 10000, 100000)
+
+# リクエストの外（コマンドなど）で実行されたクエリのrouteラベル
+NO_ROUTE = "none"
+
+
+class Histogram:
+    __slots__ = ("bounds", "bucket_counts", "count", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.bucket_counts = [0] * (len(bounds) + 1)  # 最後は+Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        # bisect_left：value <= bound となる最初のバケツ（Prometheusのleと同じ）
+        self.bucket_counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+# 同じ名前・ラベル名を持つヒストグラムの集まり（ラベルの値ごとに1つのヒストグラム）
+class HistogramFamily:
+    def __init__(
+        self, name: str, help_text: str, label_names: tuple[str, ...], bounds: tuple[float, ...]
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.bounds = bounds
+        self.series: dict[tuple[str, ...], Histogram] = {}
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self.request_duration = HistogramFamily(
+            "http_request_duration_seconds",
+            "HTTP request latency in seconds.",
+            ("method", "route", "status"),
+            REQUEST_DURATION_BUCKETS,
+        )
+        self.query_duration = HistogramFamily(
+            "db_query_duration_seconds",
+            "Database statement execution time in seconds.",
+            ("route",),
+            QUERY_DURATION_BUCKETS,
+        )
+        self.queries_per_request = HistogramFamily(
+            "db_queries_per_request",
+            "Number of database statements executed per HTTP request.",
+            ("route",),
+            QUERIES_PER_REQUEST_BUCKETS,
+        )
+        self.rows_per_request = HistogramFamily(
+            "db_rows_per_request",
+            "Rows returned or affected (cursor.rowcount) per HTTP request.",
+            ("route",),
+            ROWS_PER_REQUEST_BUCKETS,
+        )
+        self.families = (
+            self.request_duration,
+            self.query_duration,
+            self.queries_per_request,
+            self.rows_per_request,
+        )
+
+    def observe(self, family: HistogramFamily, labels: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            histogram = family.series.get(labels)
+            if histogram is None:
+                histogram = family.series[labels] = Histogram(family.bounds)
+            histogram.observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            for family in self.families:
+                family.series.clear()
+
+    # Prometheusのテキスト形式（text/plain; version=0.0.4）
+    # バケツの件数は累積（le以下の件数）で出力する
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for family in self.families:
+                lines.append(f"# HELP {family.name} {family.help_text}")
+                lines.append(f"# TYPE {family.name} histogram")
+                for labels, histogram in sorted(family.series.items()):
+                    label_text = _format_labels(zip(family.label_names, labels, strict=True))
+                    cumulative = 0
+                    for bound, bucket_count in zip(
+                        [*family.bounds, float("inf")], histogram.bucket_counts, strict=True
+                    ):
+                        cumulative += bucket_count
+                        le = "+Inf" if bound == float("inf") else _format_number(bound)
+                        lines.append(f'{family.name}_bucket{{{label_text},le="{le}"}} {cumulative}')
+                    lines.append(
+                        f"{family.name}_sum{{{label_text}}} {_format_number(histogram.sum)}"
+                    )
+                    lines.append(f"{family.name}_count{{{label_text}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# ラベルの値の「\」「"」「改行」はエスケープする
+def _format_labels(pairs: Iterable[tuple[str, str]]) -> str:
+    formatted = []
+    for name, value in pairs:
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        formatted.append(f'{name}="{escaped}"')
+    return ",".join(formatted)
+
+
+metrics_registry = MetricsRegistry()
+
+
+# 1リクエストの中で実行したクエリの集計（ミドルウェアが作り、エンジンのイベントが足していく）
+# scope：ASGIのscope。ルーティング後にscope["route"]が入るため、クエリの時点でrouteを取り出す
+class RequestMetrics:
+    __slots__ = ("queries", "rows", "scope")
+
+    def __init__(self, scope: dict[str, Any]) -> None:
+        self.scope = scope
+        self.queries = 0
+        self.rows = 0
+
+
+# 同期のルート（スレッドプールで実行）にもコンテキストがコピーされるため、同じRequestMetricsに足される
+current_request_metrics: ContextVar[RequestMetrics | None] = ContextVar(
+    "current_request_metrics", default=None
+)
+
+
+# ルートのパスのテンプレート（例：/api/v1/money_flows/{id}）。IDなどでラベルの種類が増えないようにする
+def get_route_label(scope: dict[str, Any]) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+# クエリの実行時間・件数・行数を記録する（query_timerのオブザーバー）
+def record_query_metrics(
+    conn: Connection,
+    cursor: DBAPICursor,
+    statement: str,
+    parameters: object,
+    executemany: bool,
+    seconds: float,
+) -> None:
+    request_metrics = current_request_metrics.get()
+    route = get_route_label(request_metrics.scope) if request_metrics else NO_ROUTE
+    metrics_registry.observe(metrics_registry.query_duration, (route,), seconds)
+
+    if request_metrics is not None:
+        request_metrics.queries += 1
+        # rowcount：MySQLはSELECTの件数・変更した行数、SQLiteのSELECTは-1（数えない）
+        request_metrics.rows += max(cursor.rowcount, 0)
+
+
+# エンジンにクエリのイベントを登録し、実行時間・件数・行数を記録するようにする
+# 非同期エンジンの場合は、engine.sync_engineを渡す
+def instrument_engine_queries(engine: Engine) -> None:
+    add_query_observer(engine, record_query_metrics)
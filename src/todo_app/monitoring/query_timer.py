@@ -0,0 +1,63 @@
+import time
+
+from collections.abc import Callable
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import Connection, Engine, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.engine.interfaces import DBAPICursor
+
+# ★クエリの実行時間を計るエンジンのイベント（メトリクス・遅いクエリの記録で共通）
+# 　エンジンごとにイベントを1組だけ登録し、計った時間を登録された関数（オブザーバー）に渡す。
+# 　開始時刻は接続のinfoに積み、after_cursor_executeで取り出す。
+# 　クエリが失敗した場合はafter_cursor_executeが呼ばれないため、handle_errorで開始時刻を消す
+# 　（残したままにすると、次のクエリが古い開始時刻を取り出してしまう）
+
+# (接続, カーソル, SQL, パラメータ, executemany, 実行時間（秒）) を受け取る関数
+QueryObserver = Callable[[Connection, DBAPICursor, str, object, bool, float], None]
+
+_STARTED_KEY = "query_timer_started"
+
+# エンジン → オブザーバー（エンジンが破棄されたら、一緒に消える）
+_observers: WeakKeyDictionary[Engine, list[QueryObserver]] = WeakKeyDictionary()
+
+
+# エンジンにオブザーバーを登録する（最初の登録の時に、エンジンにイベントを登録する）
+# 非同期エンジンの場合は、engine.sync_engineを渡す
+def add_query_observer(engine: Engine, observer: QueryObserver) -> None:
+    observers = _observers.get(engine)
+    if observers is None:
+        observers = _observers[engine] = []
+        _listen(engine, observers)
+    observers.append(observer)
+
+
+def _listen(engine: Engine, observers: list[QueryObserver]) -> None:
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(
+        conn: Connection,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(
+        conn: Connection,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        seconds = time.perf_counter() - conn.info[_STARTED_KEY].pop()
+        for observer in observers:
+            observer(conn, cursor, statement, parameters, executemany, seconds)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context: ExceptionContext) -> None:
+        if context.connection is not None:
+            context.connection.info.pop(_STARTED_KEY, None)
@@ -0,0 +1,172 @@
+import re
+
+from collections import deque
+from collections.abc import Sequence
+from threading import Lock
+from typing import Any
+
+from sqlalchemy import Connection, Engine
+from sqlalchemy.engine.interfaces import DBAPICursor
+
+from todo_app.core.database import (
+    SLOW_QUERY_EXPLAIN,
+    SLOW_QUERY_MAX_FINGERPRINTS,
+    SLOW_QUERY_SAMPLE_SIZE,
+    SLOW_QUERY_THRESHOLD_MS,
+)
+from todo_app.loggers.custom_logger import logger
+from todo_app.monitoring.query_timer import add_query_observer
+
+# ★遅いクエリを、SQLの形（フィンガープリント：値を取り除いたSQL）ごとに集計する
+# 　例：get_money_flows_allのような全件取得が遅くなった場合に、どのSQLが・何回・どれだけ遅いかが分かる
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_NAMED_PARAMETER = re.compile(r"(?<!:):\w+|%\(\w+\)s|%s|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\bVALUES\s*(\([^()]*\))(?:\s*,\s*\([^()]*\))*", re.IGNORECASE)
+
+
+# SQLから値を取り除き、同じ形のSQLが同じ文字列になるようにする
+# ・文字列・数値・バインドパラメータ → ?
+# ・IN (?, ?, ...) → IN (...)、VALUES (...), (...), ... → VALUES (...)（件数が違っても同じ形にする）
+def fingerprint_statement(statement: str) -> str:
+    normalized = _WHITESPACE.sub(" ", statement).strip()
+    normalized = _STRING_LITERAL.sub("?", normalized)
+    normalized = _NAMED_PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("IN (...)", normalized)
+    return _VALUES_LIST.sub("VALUES (...)", normalized)
+
+
+# 並べ替えた値から、パーセンタイル（最も近い順位の値）を取り出す
+def percentile(sorted_values: Sequence[float], ratio: float) -> float:
+    index = max(int(len(sorted_values) * ratio + 0.999999) - 1, 0)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+class SlowQueryStatistics:
+    __slots__ = ("count", "durations", "example", "explain", "fingerprint", "max", "total")
+
+    def __init__(self, fingerprint: str, example: str, sample_size: int) -> None:
+        self.fingerprint = fingerprint
+        self.example = example  # 最初に記録したSQL（バインドパラメータは含まない）
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.durations: deque[float] = deque(maxlen=sample_size)  # 直近の実行時間（秒）
+        self.explain: list[str] | None = None
+
+
+class SlowQueryLog:
+    def __init__(
+        self, threshold_ms: float, explain: bool, sample_size: int, max_fingerprints: int
+    ) -> None:
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.sample_size = sample_size
+        self.max_fingerprints = max_fingerprints
+        self._lock = Lock()
+        self._statistics: dict[str, SlowQueryStatistics] = {}
+
+    # 記録したうえで、そのSQLの形で初めての遅いクエリかどうかを返す（EXPLAINを取るかの判定に使う）
+    def record(self, statement: str, seconds: float) -> tuple[str, bool]:
+        fingerprint = fingerprint_statement(statement)
+        with self._lock:
+            statistics = self._statistics.get(fingerprint)
+            is_first = statistics is None
+            if statistics is None:
+                if len(self._statistics) >= self.max_fingerprints:
+                    return fingerprint, False
+                statistics = self._statistics[fingerprint] = SlowQueryStatistics(
+                    fingerprint, statement, self.sample_size
+                )
+            statistics.count += 1
+            statistics.total += seconds
+            statistics.max = max(statistics.max, seconds)
+            statistics.durations.append(seconds)
+        return fingerprint, is_first
+
+    def set_explain(self, fingerprint: str, explain: list[str]) -> None:
+        with self._lock:
+            if fingerprint in self._statistics:
+                self._statistics[fingerprint].explain = explain
+
+    def reset(self) -> None:
+        with self._lock:
+            self._statistics.clear()
+
+    # 最大の実行時間が長い順（単位はミリ秒）
+    def snapshot(self) -> list[dict[str, Any]]:
+        with self._lock:
+            results = []
+            for statistics in self._statistics.values():
+                durations = sorted(statistics.durations)
+                results.append(
+                    {
+                        "fingerprint": statistics.fingerprint,
+                        "example": statistics.example,
+                        "count": statistics.count,
+                        "p50_ms": percentile(durations, 0.5) * 1000,
+                        "p95_ms": percentile(durations, 0.95) * 1000,
+                        "max_ms": statistics.max * 1000,
+                        "total_ms": statistics.total * 1000,
+                        "explain": statistics.explain,
+                    }
+                )
+        return sorted(results, key=lambda result: result["max_ms"], reverse=True)
+
+
+# プロセス全体で1つ（同期・非同期のエンジンで共有する）
+slow_query_log = SlowQueryLog(
+    threshold_ms=SLOW_QUERY_THRESHOLD_MS,
+    explain=SLOW_QUERY_EXPLAIN,
+    sample_size=SLOW_QUERY_SAMPLE_SIZE,
+    max_fingerprints=SLOW_QUERY_MAX_FINGERPRINTS,
+)
+
+
+# EXPLAINを実行する（SQLiteはEXPLAIN QUERY PLAN）
+# イベントを発生させないよう、DBAPIのカーソルで直接実行する。失敗しても元のクエリには影響させない
+def _explain(conn: Connection, statement: str, parameters: object) -> list[str] | None:
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return None
+
+    prefix = "EXPLAIN QUERY PLAN" if conn.dialect.name == "sqlite" else "EXPLAIN"
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"{prefix} {statement}", parameters)
+            return [" | ".join(str(value) for value in row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except Exception as e:
+        logger.warning("遅いクエリのEXPLAINに失敗しました：%s", e)
+        return None
+
+
+# エンジンにイベントを登録し、しきい値以上かかったクエリを記録するようにする
+# 非同期エンジンの場合は、engine.sync_engineを渡す
+def instrument_slow_queries(engine: Engine, log: SlowQueryLog = slow_query_log) -> None:
+    def _record_slow_query(
+        conn: Connection,
+        cursor: DBAPICursor,
+        statement: str,
+        parameters: object,
+        executemany: bool,
+        seconds: float,
+    ) -> None:
+        if seconds * 1000 < log.threshold_ms:
+            return
+
+        fingerprint, is_first = log.record(statement, seconds)
+        logger.warning("遅いクエリ（%.1fms）：%s", seconds * 1000, fingerprint)
+
+        if log.explain and is_first and not executemany:
+            explain = _explain(conn, statement, parameters)
+            if explain is not None:
+                log.set_explain(fingerprint, explain)
+                logger.warning("遅いクエリのEXPLAIN：%s\n%s", fingerprint, "\n".join(explain))
+
+    add_query_observer(engine, _record_slow_query)
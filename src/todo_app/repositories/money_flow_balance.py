@@ -0,0 +1,117 @@
+from datetime import datetime
+
+from sqlalchemy import ColumnElement, Select, and_, case, func, or_, select
+from sqlalchemy.orm import Session
+
+from todo_app.logic.calculate.calculate_datetime import to_jst_naive, to_month_key
+from todo_app.logic.partition.monthly_partitions import month_start
+from todo_app.models.db.money_flow_monthly_summary import MoneyFlowMonthlySummary
+from todo_app.models.db.money_flows import MoneyFlowKind, MoneyFlows
+from todo_app.models.db.money_flows_archive import MoneyFlowsArchive
+from todo_app.models.request.v1.money_flows import MoneyFlowFilter
+from todo_app.repositories.money_flows import build_kind_value, build_money_flows_page_statement
+
+# ★残高（収入 - 支出の累計）の計算
+# 　月次集計テーブル（money_flow_monthly_summary）を「月ごとのチェックポイント」として使う。
+# 　ある時点の残高 ＝ その月より前の月次集計の合計（月数分の行） ＋ その月の1日からその時点までの収支（1か月分以内の行）
+# 　月次集計テーブルは、登録・更新（金額・収支・発生日時の変更）・削除と同じトランザクションで
+# 　変わった月の分だけ増減させているため、残高のために別の更新は不要。
+
+# (occurred_date, id)：この行より前の残高を求める（idがNoneの場合は、occurred_dateより前）
+BalancePosition = tuple[datetime, int | None]
+
+
+# 収入はプラス、支出はマイナスの金額
+def build_signed_amount(
+    kind: ColumnElement[MoneyFlowKind], amount: ColumnElement[int]
+) -> ColumnElement[int]:
+    return case((kind == MoneyFlowKind.INCOME, amount), else_=-amount)
+
+
+# その月の1日から、positionより前までの収支の合計（ix_money_flows_occurred_idの範囲スキャン）
+def build_partial_month_sum(
+    model: type[MoneyFlows] | type[MoneyFlowsArchive], position: BalancePosition
+) -> Select:
+    occurred_date, id = position
+    before = model.occurred_date < occurred_date
+    if id is not None:
+        before = or_(before, and_(model.occurred_date == occurred_date, model.id < id))
+
+    return select(func.coalesce(func.sum(build_signed_amount(model.kind, model.amount)), 0)).where(
+        model.occurred_date >= month_start(occurred_date), before
+    )
+
+
+# positionより前の残高を1回のSELECTで求める
+# (1) その月より前の月次集計の合計 (2) その月の残りの部分（money_flows・money_flows_archiveのどちらか）
+# タイムゾーン付きの日時は、先に日本時間のタイムゾーンなしにする（月次集計の月・occurred_dateと同じ基準で比べるため）
+def build_balance_statement(position: BalancePosition) -> Select:
+    position = (to_jst_naive(position[0]), position[1])
+    checkpoint = select(
+        func.coalesce(
+            func.sum(
+                build_signed_amount(
+                    MoneyFlowMonthlySummary.kind, MoneyFlowMonthlySummary.total_amount
+                )
+            ),
+            0,
+        )
+    ).where(MoneyFlowMonthlySummary.month < to_month_key(position[0]))
+
+    return select(
+        checkpoint.scalar_subquery()
+        + build_partial_month_sum(MoneyFlows, position).scalar_subquery()
+        + build_partial_month_sum(MoneyFlowsArchive, position).scalar_subquery()
+    )
+
+
+def get_balance(session: Session, position: BalancePosition) -> int:
+    return int(session.execute(build_balance_statement(position)).scalar_one())
+
+
+# 発生日時の順（occurred_date, id）に、1行ごとの累計を付けたSELECT文（キーセットページネーション）
+# 先にページ分（limit + 1件）だけをインデックスで取得し、その行だけにウィンドウ関数（SUM() OVER）をかける
+# runningは「ページの先頭の行より前の残高」を含まない累計（残高は呼び出し側でget_balance()の値を足す）
+def build_running_balance_statement(
+    limit: int,
+    cursor: tuple[datetime, int] | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> Select:
+    page = build_money_flows_page_statement(
+        limit, cursor, MoneyFlowFilter(date_from=date_from, date_to=date_to)
+    ).subquery()
+    order = (page.c.occurred_date, page.c.id)
+
+    return select(
+        page.c.id,
+        page.c.title,
+        page.c.amount,
+        page.c.occurred_date,
+        build_kind_value(page.c.kind).label("kind"),
+        page.c.version,
+        func.sum(build_signed_amount(page.c.kind, page.c.amount))
+        .over(order_by=order, rows=(None, 0))
+        .label("running"),
+    ).order_by(*order)
+
+
+# 戻り値：1行ごとの残高（balance）を付けた、レスポンスの形のdict（limit + 1件まで）
+def get_running_balance(
+    session: Session,
+    limit: int,
+    cursor: tuple[datetime, int] | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> list[dict]:
+    rows = session.execute(
+        build_running_balance_statement(limit, cursor, date_from, date_to)
+    ).mappings()
+    items = [dict(row) for row in rows]
+    if not items:
+        return []
+
+    opening = get_balance(session, (items[0]["occurred_date"], items[0]["id"]))
+    for item in items:
+        item["balance"] = opening + int(item.pop("running"))
+    return items
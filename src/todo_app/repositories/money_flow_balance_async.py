@@ -0,0 +1,35 @@
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from todo_app.repositories.money_flow_balance import (
+    BalancePosition,
+    build_balance_statement,
+    build_running_balance_statement,
+)
+
+# ★money_flow_balance.pyの非同期（AsyncSession）版
+
+
+async def get_balance(session: AsyncSession, position: BalancePosition) -> int:
+    return int((await session.execute(build_balance_statement(position))).scalar_one())
+
+
+async def get_running_balance(
+    session: AsyncSession,
+    limit: int,
+    cursor: tuple[datetime, int] | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+) -> list[dict]:
+    rows = (
+        await session.execute(build_running_balance_statement(limit, cursor, date_from, date_to))
+    ).mappings()
+    items = [dict(row) for row in rows]
+    if not items:
+        return []
+
+    opening = await get_balance(session, (items[0]["occurred_date"], items[0]["id"]))
+    for item in items:
+        item["balance"] = opening + int(item.pop("running"))
+    return items
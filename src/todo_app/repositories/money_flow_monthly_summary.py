@@ -0,0 +1,178 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import Insert, Select, delete, func, insert, select, text
+from sqlalchemy.dialects import mysql, sqlite
+from sqlalchemy.orm import Session
+
+from todo_app.logic.calculate.calculate_datetime import get_now
+from todo_app.logic.calculate.calculate_monthly_summary import MonthlySummaryDeltas
+from todo_app.models.db.money_flow_monthly_summary import MoneyFlowMonthlySummary
+from todo_app.models.db.money_flows import MoneyFlowKind, MoneyFlows
+from todo_app.models.db.money_flows_archive import MoneyFlowsArchive
+
+# (月, 収支の種類) → (合計金額, 件数)
+MonthlySummaryTotals = dict[tuple[int, MoneyFlowKind], tuple[int, int]]
+
+
+# 増減を月次集計テーブルに反映するUPSERT文（増減がなければNone）
+# 行がなければINSERT、あれば加算するUPSERTを、複数の(月, 収支の種類)分まとめて1文にする
+def build_monthly_summary_upsert(deltas: MonthlySummaryDeltas, dialect_name: str) -> Insert | None:
+    now = get_now()
+    values = [
+        {
+            "month": month,
+            "kind": kind,
+            "total_amount": amount_delta,
+            "flow_count": count_delta,
+            "updated_at": now,
+        }
+        for month, kind, amount_delta, count_delta in deltas.items()
+    ]
+    if not values:
+        return None
+
+    table = MoneyFlowMonthlySummary.__table__
+
+    # UPSERTの書き方はDBごとに異なる
+    if dialect_name == "sqlite":
+        statement = sqlite.insert(table).values(values)
+        return statement.on_conflict_do_update(
+            index_elements=[table.c.month, table.c.kind],
+            set_={
+                "total_amount": table.c.total_amount + statement.excluded.total_amount,
+                "flow_count": table.c.flow_count + statement.excluded.flow_count,
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+
+    statement = mysql.insert(table).values(values)
+    return statement.on_duplicate_key_update(
+        total_amount=table.c.total_amount + statement.inserted.total_amount,
+        flow_count=table.c.flow_count + statement.inserted.flow_count,
+        updated_at=statement.inserted.updated_at,
+    )
+
+
+# 増減を月次集計テーブルに反映する（呼び出し側のトランザクション内で実行し、commitは呼び出し側で行う）
+def apply_monthly_summary_deltas(session: Session, deltas: MonthlySummaryDeltas) -> None:
+    statement = build_monthly_summary_upsert(deltas, session.get_bind().dialect.name)
+    if statement is not None:
+        session.execute(statement)
+
+
+# 月次集計テーブルから取得するSELECT文（月数分の行だけを読む）
+# month_from, month_to：YYYYMM（どちらも含む）
+# 削除により件数が0になった行は返さない
+def build_monthly_summaries_statement(
+    month_from: int | None = None,
+    month_to: int | None = None,
+    kind: MoneyFlowKind | None = None,
+) -> Select:
+    statement = select(MoneyFlowMonthlySummary).where(MoneyFlowMonthlySummary.flow_count > 0)
+
+    if month_from is not None:
+        statement = statement.where(MoneyFlowMonthlySummary.month >= month_from)
+    if month_to is not None:
+        statement = statement.where(MoneyFlowMonthlySummary.month <= month_to)
+    if kind is not None:
+        statement = statement.where(MoneyFlowMonthlySummary.kind == kind)
+
+    return statement.order_by(MoneyFlowMonthlySummary.month, MoneyFlowMonthlySummary.kind)
+
+
+def get_monthly_summaries(
+    session: Session,
+    month_from: int | None = None,
+    month_to: int | None = None,
+    kind: MoneyFlowKind | None = None,
+) -> list[MoneyFlowMonthlySummary]:
+    return session.scalars(build_monthly_summaries_statement(month_from, month_to, kind)).all()
+
+
+# money_flowsから月次集計を計算し直す（再構築・ズレの確認用。全件を集計するため通常のAPIでは使わない）
+# 保存期間を過ぎてmoney_flows_archiveに移動した行も、月次集計には含まれたままのため一緒に集計する
+def calculate_monthly_summaries(session: Session) -> MonthlySummaryTotals:
+    totals: MonthlySummaryTotals = {}
+
+    for model in (MoneyFlows, MoneyFlowsArchive):
+        rows = (
+            session.query(model.occurred_month, model.kind, func.sum(model.amount), func.count())
+            .group_by(model.occurred_month, model.kind)
+            .all()
+        )
+        for month, kind, total_amount, count in rows:
+            stored_amount, stored_count = totals.get((month, kind), (0, 0))
+            totals[(month, kind)] = (stored_amount + int(total_amount), stored_count + count)
+
+    return totals
+
+
+# 月次集計テーブルに保存されている値（件数0の行は除く）
+def get_stored_monthly_summaries(session: Session) -> MonthlySummaryTotals:
+    return {
+        (summary.month, summary.kind): (summary.total_amount, summary.flow_count)
+        for summary in get_monthly_summaries(session)
+    }
+
+
+# 保存されている値と、money_flowsから計算し直した値のズレを返す
+# 戻り値：(月, 収支の種類) → (保存されている値, 正しい値)。行が存在しない側は(0, 0)
+def find_monthly_summary_drift(
+    session: Session,
+) -> dict[tuple[int, MoneyFlowKind], tuple[tuple[int, int], tuple[int, int]]]:
+    expected = calculate_monthly_summaries(session)
+    stored = get_stored_monthly_summaries(session)
+
+    return {
+        key: (stored.get(key, (0, 0)), expected.get(key, (0, 0)))
+        for key in sorted(expected.keys() | stored.keys(), key=lambda key: (key[0], key[1].value))
+        if stored.get(key, (0, 0)) != expected.get(key, (0, 0))
+    }
+
+
+# 作り直している間、money_flows・money_flows_archive・月次集計テーブルへの書き込みを止める（MySQLのみ）
+# 止めないと、集計してから月次集計テーブルを入れ替えるまでの間に登録・更新されたデータの増減
+# （apply_monthly_summary_deltas）が、入れ替えで消えてしまう。
+# LOCK TABLESは、書き込み中のトランザクションが終わるのを待ってから取得する。
+# ロック中は、この接続からもロックした表しか読み書きできない。commitしてから抜けること
+# ※SQLiteは開発・テスト用のため、ロックしない
+@contextmanager
+def lock_monthly_summary_tables(session: Session) -> Iterator[None]:
+    if session.get_bind().dialect.name != "mysql":
+        yield
+        return
+
+    session.execute(
+        text(
+            "LOCK TABLES money_flow_monthly_summary WRITE,"
+            " money_flows READ, money_flows_archive READ"
+        )
+    )
+    try:
+        yield
+    finally:
+        session.execute(text("UNLOCK TABLES"))
+
+
+# 月次集計テーブルを空にして、money_flowsから作り直す（commitは呼び出し側で行う）
+# 他の書き込みと同時に実行しないこと（lock_monthly_summary_tablesの中で呼ぶ）
+def rebuild_monthly_summaries(session: Session) -> None:
+    now = get_now()
+    expected = calculate_monthly_summaries(session)
+
+    session.execute(delete(MoneyFlowMonthlySummary))
+    if expected:
+        session.execute(
+            insert(MoneyFlowMonthlySummary),
+            [
+                {
+                    "month": month,
+                    "kind": kind,
+                    "total_amount": total_amount,
+                    "flow_count": flow_count,
+                    "updated_at": now,
+                }
+                for (month, kind), (total_amount, flow_count) in expected.items()
+            ],
+        )
@@ -0,0 +1,28 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from todo_app.logic.calculate.calculate_monthly_summary import MonthlySummaryDeltas
+from todo_app.models.db.money_flow_monthly_summary import MoneyFlowMonthlySummary
+from todo_app.models.db.money_flows import MoneyFlowKind
+from todo_app.repositories.money_flow_monthly_summary import (
+    build_monthly_summaries_statement,
+    build_monthly_summary_upsert,
+)
+
+# ★money_flow_monthly_summary.pyの非同期（AsyncSession）版（APIから使う関数のみ）
+
+
+async def apply_monthly_summary_deltas(session: AsyncSession, deltas: MonthlySummaryDeltas) -> None:
+    statement = build_monthly_summary_upsert(deltas, session.get_bind().dialect.name)
+    if statement is not None:
+        await session.execute(statement)
+
+
+async def get_monthly_summaries(
+    session: AsyncSession,
+    month_from: int | None = None,
+    month_to: int | None = None,
+    kind: MoneyFlowKind | None = None,
+) -> list[MoneyFlowMonthlySummary]:
+    return (
+        await session.scalars(build_monthly_summaries_statement(month_from, month_to, kind))
+    ).all()
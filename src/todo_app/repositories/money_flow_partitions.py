@@ -0,0 +1,178 @@
+import re
+
+from datetime import datetime
+
+from sqlalchemy import TextClause, text
+from sqlalchemy.orm import Session
+
+from todo_app.logic.partition.monthly_partitions import (
+    MAXVALUE_PARTITION,
+    Partition,
+    add_months,
+    partition_name,
+)
+from todo_app.models.db.money_flows import MONEY_FLOWS_TITLE_FTS_TABLE
+from todo_app.models.db.money_flows_archive import MONEY_FLOWS_ARCHIVE_COLUMNS
+
+# ★money_flowsのパーティション（MySQLのみ）の操作。
+# 　パーティションは RANGE COLUMNS(occurred_date) で1か月1パーティション（logic/partition/monthly_partitions.py）。
+# 　WHERE句でoccurred_dateを関数で包まずに比較していれば（build_money_flow_conditions）、
+# 　MySQLは条件に当てはまる月のパーティションだけを読む（パーティションプルーニング）。
+# ★ALTER TABLEは暗黙的にcommitされるため、ロールバックできない。
+
+# パーティション名はSQLに埋め込むため、決まった形のものだけを受け付ける
+PARTITION_NAME_PATTERN = re.compile(r"p\d{6}")
+
+
+def validate_partition_name(name: str) -> str:
+    if PARTITION_NAME_PATTERN.fullmatch(name) is None:
+        raise ValueError(f"invalid partition name: {name}")
+    return name
+
+
+# money_flowsのパーティションの一覧を取得するSELECT文（作った順＝古い順）
+def build_partitions_statement() -> TextClause:
+    return text(
+        "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS"
+        " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'money_flows'"
+        " AND PARTITION_NAME IS NOT NULL"
+        " ORDER BY PARTITION_ORDINAL_POSITION"
+    )
+
+
+# PARTITION_DESCRIPTION（VALUES LESS THANの値）を日時にする　例："'2025-05-01 00:00:00'" → 2025-05-01
+def parse_partition_description(description: str) -> datetime | None:
+    if description == "MAXVALUE":
+        return None
+    return datetime.fromisoformat(description.strip("'"))
+
+
+# パーティション分割されていない場合は空のリスト
+def get_money_flow_partitions(session: Session) -> list[Partition]:
+    rows = session.execute(build_partitions_statement()).all()
+    return [(name, parse_partition_description(description)) for name, description in rows]
+
+
+# 月（1日0時）ごとのパーティションの定義　例：PARTITION p202504 VALUES LESS THAN ('2025-05-01 00:00:00')
+def build_partition_definitions(months: list[datetime]) -> list[str]:
+    definitions = [
+        f"PARTITION {partition_name(month)} VALUES LESS THAN ('{add_months(month, 1):%Y-%m-%d %H:%M:%S}')"
+        for month in months
+    ]
+    # まだパーティションがない先の月の行は、pmaxに入る
+    definitions.append(f"PARTITION {MAXVALUE_PARTITION} VALUES LESS THAN (MAXVALUE)")
+    return definitions
+
+
+# pmaxを分割して、先の月のパーティションを追加するALTER文
+# pmaxに行がなければ、行のコピーは発生しない（そのため、行が入る前に作っておく）
+def build_add_partitions_sql(months: list[datetime]) -> str:
+    return (
+        f"ALTER TABLE money_flows REORGANIZE PARTITION {MAXVALUE_PARTITION} INTO ("
+        + ", ".join(build_partition_definitions(months))
+        + ")"
+    )
+
+
+def add_money_flow_partitions(session: Session, months: list[datetime]) -> None:
+    session.execute(text(build_add_partitions_sql(months)))
+
+
+# ★保存期間を過ぎたパーティションのアーカイブ
+# 　行を直接コピーしてからDROP PARTITIONすると、コピーの後に更新・登録された行が失われるため、
+# 　先にEXCHANGE PARTITIONで、パーティションの行をパーティション分割していない同じ構造の表（MONEY_FLOWS_EXCHANGE_TABLE）と
+# 　入れ替える（一瞬で、実行中のトランザクションが終わるのを待ってから入れ替わる）。
+# 　入れ替えた後の行はmoney_flowsから見えず、誰も変更しないため、そこからmoney_flows_archiveにコピーする。
+# 　空になったパーティションは、money_flowsへの書き込みを止めた（LOCK TABLES）状態で、空であることを確かめてから削除する。
+
+# パーティションの行を取り出すための表（パーティション分割していないmoney_flowsと同じ構造）
+MONEY_FLOWS_EXCHANGE_TABLE = "money_flows_exchange"
+
+
+def exchange_table_exists(session: Session) -> bool:
+    return bool(
+        session.execute(
+            text(
+                "SELECT COUNT(*) FROM information_schema.TABLES"
+                " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :name"
+            ),
+            {"name": MONEY_FLOWS_EXCHANGE_TABLE},
+        ).scalar_one()
+    )
+
+
+# money_flowsと同じ構造（カラム・インデックス）で作る。構造が変わっても合うよう、パーティションごとに作り直す
+def create_exchange_table(session: Session) -> None:
+    session.execute(text(f"CREATE TABLE {MONEY_FLOWS_EXCHANGE_TABLE} LIKE money_flows"))
+    session.execute(text(f"ALTER TABLE {MONEY_FLOWS_EXCHANGE_TABLE} REMOVE PARTITIONING"))
+
+
+def drop_exchange_table(session: Session) -> None:
+    session.execute(text(f"DROP TABLE IF EXISTS {MONEY_FLOWS_EXCHANGE_TABLE}"))
+
+
+# パーティションの行と、（空の）取り出し用の表の行を入れ替える
+def build_exchange_partition_sql(name: str) -> str:
+    return (
+        f"ALTER TABLE money_flows EXCHANGE PARTITION {validate_partition_name(name)}"
+        f" WITH TABLE {MONEY_FLOWS_EXCHANGE_TABLE}"
+    )
+
+
+def exchange_partition(session: Session, name: str) -> None:
+    session.execute(text(build_exchange_partition_sql(name)))
+
+
+# 取り出した行を、圧縮したmoney_flows_archiveにコピーするINSERT文
+# INSERT IGNORE：途中で止まって再実行した場合も、コピー済みの行は重複させない
+# （取り出した行は誰も変更しないため、コピー済みの行は同じ値のまま）
+def build_copy_exchanged_rows_sql() -> str:
+    columns = ", ".join(MONEY_FLOWS_ARCHIVE_COLUMNS)
+    return (
+        f"INSERT IGNORE INTO money_flows_archive ({columns}, archived_at)"
+        f" SELECT {columns}, :archived_at FROM {MONEY_FLOWS_EXCHANGE_TABLE}"
+    )
+
+
+# 取り出した行の件数を返す（commitは呼び出し側で行う）
+def copy_exchanged_rows_to_archive(session: Session, archived_at: datetime) -> int:
+    session.execute(text(build_copy_exchanged_rows_sql()), {"archived_at": archived_at})
+    return session.execute(text(f"SELECT COUNT(*) FROM {MONEY_FLOWS_EXCHANGE_TABLE}")).scalar_one()
+
+
+# 取り出した行のうち、money_flows_archiveにまだない行の件数（0でなければ取り出した行を消してはいけない）
+def count_unarchived_exchanged_rows(session: Session) -> int:
+    return session.execute(
+        text(
+            f"SELECT COUNT(*) FROM {MONEY_FLOWS_EXCHANGE_TABLE} AS m"
+            " LEFT JOIN money_flows_archive AS a ON a.id = m.id WHERE a.id IS NULL"
+        )
+    ).scalar_one()
+
+
+# 取り出した行の全文検索の表の行を消す（EXCHANGE PARTITIONではトリガーが動かないため）
+def delete_exchanged_title_fts_rows(session: Session) -> None:
+    session.execute(
+        text(
+            f"DELETE f FROM {MONEY_FLOWS_TITLE_FTS_TABLE} AS f"
+            f" JOIN {MONEY_FLOWS_EXCHANGE_TABLE} AS m ON m.id = f.id"
+        )
+    )
+
+
+# パーティションが空の場合だけ削除する（削除した場合はTrue）
+# 確認してから削除するまでの間に行が入らないよう、money_flowsへの書き込みを止めておく
+# （空のパーティションの確認・削除は一瞬で終わる。LOCK TABLESは接続ごとのため、途中でcommitしない）
+def drop_money_flow_partition_if_empty(session: Session, name: str) -> bool:
+    name = validate_partition_name(name)
+    session.execute(text("LOCK TABLES money_flows WRITE"))
+    try:
+        remaining = session.execute(
+            text(f"SELECT COUNT(*) FROM money_flows PARTITION ({name})")
+        ).scalar_one()
+        if remaining == 0:
+            session.execute(text(f"ALTER TABLE money_flows DROP PARTITION {name}"))
+    finally:
+        session.execute(text("UNLOCK TABLES"))
+        session.commit()
+    return remaining == 0
@@ -1,12 +1,611 @@
+from collections.abc import Callable
+from datetime import datetime
+from functools import lru_cache
+from typing import Any
+
+from sqlalchemy import (
+    ColumnElement,
+    Connection,
+    Delete,
+    Dialect,
+    Row,
+    Select,
+    String,
+    Update,
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    type_coerce,
+    update,
+)
 from sqlalchemy.orm import Session
 
-from todo_app.models.db.money_flows import MoneyFlows
+from todo_app.cache.read_cache import read_cache
+from todo_app.loggers.custom_logger import logger
+from todo_app.logic.calculate.calculate_datetime import from_month_key, get_now, to_month_key
+from todo_app.logic.partition.monthly_partitions import add_months
+from todo_app.logic.search.title_ngrams import build_title_fulltext_match, build_title_ngram_match
+from todo_app.models.db.money_flows import MONEY_FLOWS_TITLE_FTS_TABLE, MoneyFlowKind, MoneyFlows
+from todo_app.models.request.v1.money_flows import (
+    AggregatePeriod,
+    MoneyFlowFilter,
+    TitleMatch,
+    UpdateMoneyFlowRequest,
+)
+
+# ★SQL文の組み立て（build_〜）と実行を分けている。
+# 　同じSQL文を、同期版（このファイル）と非同期版（money_flows_async.py）の両方から実行するため。
+# ★@read_cache.cached(...)を付けた読み取り関数は、結果をキャッシュする（cache/read_cache.py）。
+# 　money_flowsに書き込んだ場合は、commitの後に read_cache.invalidate(MONEY_FLOWS_CACHE_NAMESPACE) を呼ぶこと。
+
+MONEY_FLOWS_CACHE_NAMESPACE = "money_flows"
+
+
+# 絞り込み条件をWHERE句の条件に変換する
+# カラムを関数で包まず「カラム 比較演算子 値」の形だけにすることで、インデックスを使える（サーガブルな）条件になる
+# occurred_date：ix_money_flows_occurred_kind / ix_money_flows_occurred_id、kind：ix_money_flows_kind
+# occurred_month：ix_money_flows_month_kind
+# ※MySQLではoccurred_dateの月ごとにパーティション分割しているため、occurred_dateの条件がこの形であれば、
+# 　条件に当てはまる月のパーティションだけを読む（パーティションプルーニング）。関数で包むと全パーティションを読む
+def build_money_flow_conditions(filters: MoneyFlowFilter) -> list[ColumnElement[bool]]:
+    conditions = []
+
+    if filters.date_from is not None:
+        conditions.append(MoneyFlows.occurred_date >= filters.date_from)
+    if filters.date_to is not None:
+        conditions.append(MoneyFlows.occurred_date < filters.date_to)
+    # 月の条件には、同じ範囲のoccurred_dateの条件も付ける（occurred_monthだけではパーティションプルーニングされない）
+    if filters.month_from is not None:
+        conditions.append(MoneyFlows.occurred_month >= filters.month_from)
+        conditions.append(MoneyFlows.occurred_date >= from_month_key(filters.month_from))
+    if filters.month_to is not None:
+        conditions.append(MoneyFlows.occurred_month <= filters.month_to)
+        conditions.append(
+            MoneyFlows.occurred_date < add_months(from_month_key(filters.month_to), 1)
+        )
+    if filters.kind is not None:
+        conditions.append(MoneyFlows.kind == MoneyFlowKind(filters.kind))
+    if filters.amount_min is not None:
+        conditions.append(MoneyFlows.amount >= filters.amount_min)
+    if filters.amount_max is not None:
+        conditions.append(MoneyFlows.amount <= filters.amount_max)
+
+    return conditions
+
+
+# 絞り込み・並び替え（(occurred_date, id)で一意に決まる順番）をSELECT文に付ける
+def apply_money_flow_filter(statement: Select, filters: MoneyFlowFilter) -> Select:
+    statement = statement.where(*build_money_flow_conditions(filters))
+    if filters.order == "desc":
+        return statement.order_by(MoneyFlows.occurred_date.desc(), MoneyFlows.id.desc())
+    return statement.order_by(MoneyFlows.occurred_date, MoneyFlows.id)
+
+
+# 一覧取得のSELECT文
+# filtersを指定した場合は、DB側で絞り込み・並び替えをする
+def build_money_flows_statement(filters: MoneyFlowFilter | None = None) -> Select:
+    statement = select(MoneyFlows)
+    if filters is None:
+        return statement
+    return apply_money_flow_filter(statement, filters)
+
+
+# データ取得する　.scalars()：1列目（MoneyFlows）だけを取り出す　.all()：データすべて指定
+def get_money_flows_all(
+    session: Session, filters: MoneyFlowFilter | None = None
+) -> list[MoneyFlows]:
+    return session.scalars(build_money_flows_statement(filters)).all()
+
+
+# kindをEnumの変換（名前 → MoneyFlowKind → .value）をせず、レスポンスの値（"expense"など）で返すCASE式
+def build_kind_value(kind_column: ColumnElement[MoneyFlowKind]) -> ColumnElement[str]:
+    return case(
+        {kind.name: kind.value for kind in MoneyFlowKind},
+        value=type_coerce(kind_column, String),  # DBには名前（EXPENSEなど）で保存されている
+    )
+
+
+# 一覧APIのレスポンスに必要な6列（MONEY_FLOW_ITEM_KEYSの順）
+# kindはCASE式でDB側からレスポンスの値（"expense"など）を返す
+def build_money_flow_item_columns() -> tuple[ColumnElement[Any], ...]:
+    return (
+        MoneyFlows.id,
+        MoneyFlows.title,
+        MoneyFlows.amount,
+        MoneyFlows.occurred_date,
+        build_kind_value(MoneyFlows.kind).label("kind"),
+        MoneyFlows.version,
+    )
+
+
+# 一覧APIのレスポンスに必要な6列だけを、ORMのインスタンスを作らずに取得するSELECT文
+def build_money_flow_items_statement(filters: MoneyFlowFilter) -> Select:
+    return apply_money_flow_filter(select(*build_money_flow_item_columns()), filters)
+
+
+MONEY_FLOW_ITEM_KEYS = ("id", "title", "amount", "occurred_date", "kind", "version")
+
+
+# 一覧APIのレスポンスの形（GetMoneyFlowResponseItemと同じキーのdict）で返す
+# ORMのインスタンスやPydanticのモデルを1行ずつ作らないため、件数が多い場合に速い
+# data_version：get_money_flow_versionの値。キャッシュのキーに含めるためだけに受け取る
+# （他のワーカーで書き込まれた場合も、バージョンが変わればキャッシュを使わず読み直す。ETagと中身を食い違わせない）
+@read_cache.cached(MONEY_FLOWS_CACHE_NAMESPACE)
+def get_money_flow_items(
+    session: Session,
+    filters: MoneyFlowFilter,
+    data_version: tuple[datetime | None, int] | None = None,
+) -> list[dict[str, Any]]:
+    rows = session.execute(build_money_flow_items_statement(filters)).tuples()
+    return [dict(zip(MONEY_FLOW_ITEM_KEYS, row, strict=True)) for row in rows]
+
+
+# 絞り込み条件に当てはまるデータの「バージョン」：(MAX(updated_at), 件数)
+# 登録・更新ではMAX(updated_at)が、削除では件数が変わるため、どちらかが変わればデータが変わったと判定できる
+# 行そのものは読まないため、一覧より十分に軽い（条件付きGETのETagに使う）
+# ※キャッシュしない。キャッシュはワーカーごとのため、他のワーカーで書き込まれた後も
+# 　有効期限まで古いETagで304を返し続けてしまう
+def build_money_flow_version_statement(filters: MoneyFlowFilter) -> Select:
+    return select(func.max(MoneyFlows.updated_at), func.count()).where(
+        *build_money_flow_conditions(filters)
+    )
+
+
+def get_money_flow_version(
+    session: Session, filters: MoneyFlowFilter
+) -> tuple[datetime | None, int]:
+    max_updated_at, count = session.execute(build_money_flow_version_statement(filters)).one()
+    return max_updated_at, count
 
 
-# データ取得する　.query()：参照するテーブルを指定　.all()：データすべて指定
-def get_money_flows_all(session: Session) -> list[MoneyFlows]:
-    return session.query(MoneyFlows).all()
+def build_money_flow_by_id_statement(id: int) -> Select:
+    return select(MoneyFlows).where(MoneyFlows.id == id)
 
 
 def get_money_flow_by_id(session: Session, id: int) -> MoneyFlows:
-    return session.query(MoneyFlows).where(MoneyFlows.id == id).first()
+    return session.scalars(build_money_flow_by_id_statement(id)).first()
+
+
+# キーセット（カーソル）ページネーション
+# OFFSETを使わず「前のページの最後の(occurred_date, id)より後ろ」をix_money_flows_occurred_idでシークするため、
+# 何ページ目でも1ページ目と同じコストで取得できる
+# 次のページがあるかを判定するため、limit + 1件まで取得する（判定は呼び出し側で行う）
+def build_money_flows_page_statement(
+    limit: int,
+    cursor: tuple[datetime, int] | None = None,
+    filters: MoneyFlowFilter | None = None,
+) -> Select:
+    filters = filters or MoneyFlowFilter()
+    statement = build_money_flows_statement(filters)
+
+    if cursor is not None:
+        cursor_date, cursor_id = cursor
+        # 先頭の occurred_date >= (<=) は冗長だが、インデックスの範囲スキャンの開始位置をDBに明示するために付ける
+        if filters.order == "desc":
+            statement = statement.where(
+                MoneyFlows.occurred_date <= cursor_date,
+                or_(
+                    MoneyFlows.occurred_date < cursor_date,
+                    and_(MoneyFlows.occurred_date == cursor_date, MoneyFlows.id < cursor_id),
+                ),
+            )
+        else:
+            statement = statement.where(
+                MoneyFlows.occurred_date >= cursor_date,
+                or_(
+                    MoneyFlows.occurred_date > cursor_date,
+                    and_(MoneyFlows.occurred_date == cursor_date, MoneyFlows.id > cursor_id),
+                ),
+            )
+
+    return statement.limit(limit + 1)
+
+
+# ページの行を、一覧APIのレスポンスの形（MONEY_FLOW_ITEM_KEYSのdict）で取得するSELECT文
+def build_money_flow_items_page_statement(
+    limit: int,
+    cursor: tuple[datetime, int] | None = None,
+    filters: MoneyFlowFilter | None = None,
+) -> Select:
+    return build_money_flows_page_statement(limit, cursor, filters).with_only_columns(
+        *build_money_flow_item_columns()
+    )
+
+
+# ページと検索の結果はキャッシュしない
+# （キャッシュのキーにget_money_flow_versionの値を含めると、1ページ分を読むよりバージョンの集計の方が重い。
+# 　含めないと、他のワーカーで書き込まれた後も、TTLの間は古い結果を返してしまう）
+def get_money_flows_page(
+    session: Session,
+    limit: int,
+    cursor: tuple[datetime, int] | None = None,
+    filters: MoneyFlowFilter | None = None,
+) -> list[dict[str, Any]]:
+    rows = session.execute(build_money_flow_items_page_statement(limit, cursor, filters)).tuples()
+    return [dict(zip(MONEY_FLOW_ITEM_KEYS, row, strict=True)) for row in rows]
+
+
+# 集計の単位（期間）ごとのキーを作るSQL式
+# 日付関数はDBごとに異なるため、接続先のDB（dialect）に合わせて組み立てる
+# 週は「その週の月曜日の日付」をキーにする
+# 月・年は、occurred_dateを日付関数で包まず、保存済みのoccurred_month（YYYYMM）から作る
+# （occurred_month // 100：SQLiteでは整数同士の / 、MySQLでは FLOOR(... / 100) になる）
+def build_period_bucket(period: AggregatePeriod, dialect_name: str) -> ColumnElement[str]:
+    occurred_date = MoneyFlows.occurred_date
+    year = MoneyFlows.occurred_month // 100
+    month = MoneyFlows.occurred_month % 100
+
+    if dialect_name == "sqlite":
+        if period == "week":
+            # 6日前に戻してから「次の月曜日（当日が月曜日なら当日）」に進める → その週の月曜日
+            return func.strftime("%Y-%m-%d", occurred_date, "-6 days", "weekday 1")
+        if period == "month":
+            return func.printf("%04d-%02d", year, month)
+        return func.printf("%04d", year)
+
+    # MySQL
+    if period == "week":
+        # WEEKDAY()：月曜日=0〜日曜日=6 → その日数だけ戻すと月曜日
+        return func.date_format(
+            func.subdate(occurred_date, func.weekday(occurred_date)), "%Y-%m-%d"
+        )
+    if period == "month":
+        return func.concat(year, "-", func.lpad(month, 2, "0"))
+    return cast(year, String)
+
+
+# 期間・収支ごとの合計金額と件数をDB側で集計する（GROUP BY）
+# 全件をアプリに持ってこず、集計結果の数十行だけを受け取る
+def build_aggregate_statement(
+    period: AggregatePeriod, filters: MoneyFlowFilter, dialect_name: str
+) -> Select:
+    bucket = build_period_bucket(period, dialect_name).label("period")
+
+    statement = (
+        select(
+            bucket,
+            MoneyFlows.kind,
+            func.sum(MoneyFlows.amount).label("total_amount"),
+            func.count().label("flow_count"),  # Rowはタプルのため、countだとtuple.countと衝突する
+        )
+        .where(*build_money_flow_conditions(filters))
+        .group_by(bucket, MoneyFlows.kind)
+    )
+
+    if filters.order == "desc":
+        return statement.order_by(bucket.desc(), MoneyFlows.kind)
+    return statement.order_by(bucket, MoneyFlows.kind)
+
+
+# data_version：get_money_flow_itemsと同じく、キャッシュのキーに含めるためだけに受け取る
+@read_cache.cached(MONEY_FLOWS_CACHE_NAMESPACE)
+def aggregate_money_flows(
+    session: Session,
+    period: AggregatePeriod,
+    filters: MoneyFlowFilter,
+    data_version: tuple[datetime | None, int] | None = None,
+) -> list[Row]:
+    dialect_name = session.get_bind().dialect.name
+    return session.execute(build_aggregate_statement(period, filters, dialect_name)).all()
+
+
+# 前方一致のLIKEのパターン（%と_をエスケープする）
+# startswith()はパターンをconcat(?, '%')で組み立てるため、値そのものを渡してインデックスの範囲スキャンを確実にする
+def build_title_prefix_condition(query: str) -> ColumnElement[bool]:
+    escaped = query.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return MoneyFlows.title.like(f"{escaped}%", escape="/")
+
+
+# タイトル検索で、候補をインデックスから絞り込む条件
+# prefix：ix_money_flows_title（B-tree）の範囲スキャン
+# contains：全文検索の表（money_flows_title_fts。MySQLはFULLTEXT（ngram）インデックス、SQLiteはFTS5）で絞り込む
+def build_title_search_condition(
+    query: str, match: TitleMatch, dialect_name: str
+) -> ColumnElement[bool]:
+    if match == "prefix":
+        if dialect_name == "sqlite":
+            # SQLiteのLIKEは大文字・小文字を区別しないため、通常のインデックスを使えない → 範囲の条件にする
+            return and_(MoneyFlows.title >= query, MoneyFlows.title < query + "\U0010ffff")
+        return build_title_prefix_condition(query)  # LIKE 'お米%'
+
+    if dialect_name == "sqlite":
+        fts = table(MONEY_FLOWS_TITLE_FTS_TABLE, column("rowid"))
+        return MoneyFlows.id.in_(
+            select(fts.c.rowid).where(
+                literal_column(MONEY_FLOWS_TITLE_FTS_TABLE).op("MATCH")(
+                    build_title_ngram_match(query)
+                )
+            )
+        )
+    fulltext = table(MONEY_FLOWS_TITLE_FTS_TABLE, column("id"), column("title"))
+    return MoneyFlows.id.in_(
+        select(fulltext.c.id).where(
+            fulltext.c.title.match(build_title_fulltext_match(query))  # MATCH ... AGAINST
+        )
+    )
+
+
+# タイトル検索の順位：0：完全一致、1：前方一致、2：部分一致
+# 絞り込んだ候補の行だけで計算するため、インデックスは不要
+def build_title_search_rank(query: str) -> ColumnElement[int]:
+    return case(
+        (MoneyFlows.title == query, 0),
+        (build_title_prefix_condition(query), 1),
+        else_=2,
+    )
+
+
+# タイトル検索のSELECT文（順位、occurred_dateの降順（新しい順）、idの降順で並べる）
+# キーセットページネーション：前のページの最後の(順位, occurred_date, id)より後ろを取得する
+# 次のページがあるかを判定するため、limit + 1件まで取得する（判定は呼び出し側で行う）
+def build_money_flows_search_statement(
+    query: str,
+    match: TitleMatch,
+    dialect_name: str,
+    limit: int,
+    cursor: tuple[int, datetime, int] | None = None,
+) -> Select:
+    rank = build_title_search_rank(query)
+    statement = (
+        build_money_flow_items_statement(MoneyFlowFilter())
+        .add_columns(rank.label("rank"))
+        .where(build_title_search_condition(query, match, dialect_name))
+        .order_by(None)
+        .order_by(rank, MoneyFlows.occurred_date.desc(), MoneyFlows.id.desc())
+    )
+
+    if cursor is not None:
+        cursor_rank, cursor_date, cursor_id = cursor
+        statement = statement.where(
+            or_(
+                rank > cursor_rank,
+                and_(
+                    rank == cursor_rank,
+                    or_(
+                        MoneyFlows.occurred_date < cursor_date,
+                        and_(MoneyFlows.occurred_date == cursor_date, MoneyFlows.id < cursor_id),
+                    ),
+                ),
+            )
+        )
+
+    return statement.limit(limit + 1)
+
+
+MONEY_FLOW_SEARCH_ITEM_KEYS = (*MONEY_FLOW_ITEM_KEYS, "rank")
+
+
+# 検索APIのレスポンスの形（SearchMoneyFlowResponseItemと同じキーのdict）で返す
+# get_money_flows_pageと同じ理由でキャッシュしない
+def search_money_flows(
+    session: Session,
+    query: str,
+    match: TitleMatch,
+    limit: int,
+    cursor: tuple[int, datetime, int] | None = None,
+) -> list[dict[str, Any]]:
+    dialect_name = session.get_bind().dialect.name
+    rows = session.execute(
+        build_money_flows_search_statement(query, match, dialect_name, limit, cursor)
+    ).tuples()
+    return [dict(zip(MONEY_FLOW_SEARCH_ITEM_KEYS, row, strict=True)) for row in rows]
+
+
+# 一括登録で呼び出し側が渡すカラム（idはDBが採番する）
+BULK_INSERT_COLUMNS = ("title", "amount", "occurred_date", "kind", "created_at", "updated_at")
+
+# 実際にINSERTするカラム（occurred_monthはoccurred_dateから作って末尾に付ける）
+BULK_INSERT_SQL_COLUMNS = (*BULK_INSERT_COLUMNS, "occurred_month")
+
+
+# 「INSERT INTO money_flows (...) VALUES (...), (...), ...」の文字列を組み立てる
+# SQLAlchemyで行数分のバインドパラメータを持つ文をコンパイルすると1000行で約100msかかるため、
+# SQL文字列は行数ごとにキャッシュして使い回す
+@lru_cache(maxsize=16)
+def build_bulk_insert_sql(
+    dialect: Dialect, row_count: int, columns: tuple[str, ...] = BULK_INSERT_SQL_COLUMNS
+) -> str:
+    quote = dialect.identifier_preparer.quote
+    placeholder = "?" if dialect.paramstyle == "qmark" else "%s"
+    row = "(" + ", ".join([placeholder] * len(columns)) + ")"
+
+    return (
+        f"INSERT INTO {quote(MoneyFlows.__tablename__)} "
+        f"({', '.join(quote(name) for name in columns)}) "
+        f"VALUES {', '.join([row] * row_count)}"
+    )
+
+
+# 列ごとに、ORMと同じ値の変換（Enumは名前に、SQLiteの日時は文字列に、など）を行う関数（不要な列はNone）
+def build_bind_processors(
+    dialect: Dialect, columns: tuple[str, ...] = BULK_INSERT_SQL_COLUMNS
+) -> list[Callable[[Any], Any] | None]:
+    table = MoneyFlows.__table__
+    return [table.c[name].type.dialect_impl(dialect).bind_processor(dialect) for name in columns]
+
+
+# 複数行INSERTに渡すパラメータ（全行の値を1列に並べたタプル）
+# rows：BULK_INSERT_COLUMNSの順番に値を並べたタプルのリスト（occurred_dateは日本時間のタイムゾーンなし）
+# Enum（名前で保存）や日時など、ORMと同じ変換をして値をDBに渡す
+def build_bulk_insert_parameters(dialect: Dialect, rows: list[tuple[Any, ...]]) -> tuple[Any, ...]:
+    processors = build_bind_processors(dialect)
+    return tuple(
+        processor(value) if processor is not None else value
+        for row in rows
+        for processor, value in zip(processors, (*row, to_month_key(row[2])), strict=True)
+    )
+
+
+AUTOINC_LOCK_MODE_INFO_KEY = "innodb_autoinc_lock_mode"
+
+
+# 複数行INSERT1文の中で、idが連番で採番されるか
+# MySQLは innodb_autoinc_lock_mode が0・1の場合だけ連番になる（MySQL 8の既定値の2では、同時に実行された
+# 他のINSERTと採番が混ざり、飛び飛びになる。docker-compose.ymlでは1を指定している）
+# 設定はサーバーの起動時に決まるため、接続ごとに1回だけ確認し、接続のinfoに覚えておく
+def has_consecutive_insert_ids(connection: Connection) -> bool:
+    if connection.dialect.name != "mysql":
+        return True
+    if AUTOINC_LOCK_MODE_INFO_KEY not in connection.info:
+        mode = int(connection.exec_driver_sql("SELECT @@innodb_autoinc_lock_mode").scalar_one())
+        if mode > 1:
+            logger.warning(
+                "innodb_autoinc_lock_mode=%sのため、複数行INSERTをやめ、1行ずつ登録します", mode
+            )
+        connection.info[AUTOINC_LOCK_MODE_INFO_KEY] = mode
+    return connection.info[AUTOINC_LOCK_MODE_INFO_KEY] <= 1
+
+
+# 複数行INSERT1文の中で採番されたid（has_consecutive_insert_idsがTrueの場合だけ使える）
+# MySQL：lastrowidは1行目のid、SQLite：lastrowidは最後の行のid
+def calculate_inserted_ids(dialect: Dialect, lastrowid: int, row_count: int) -> list[int]:
+    last_row_is_reported = dialect.name == "sqlite"
+    first_id = lastrowid - row_count + 1 if last_row_is_reported else lastrowid
+    return list(range(first_id, first_id + row_count))
+
+
+# 複数行INSERT1文で登録し、採番されたidを登録した順番通りに返す（commitは呼び出し側で行う）
+# idが連番にならない設定のDBでは、1行ずつINSERTし、それぞれのlastrowidを返す
+def insert_money_flows(session: Session, rows: list[tuple[Any, ...]]) -> list[int]:
+    if not rows:
+        return []
+
+    connection = session.connection()
+    dialect = connection.dialect
+
+    if not has_consecutive_insert_ids(connection):
+        sql = build_bulk_insert_sql(dialect, 1)
+        return [
+            connection.exec_driver_sql(sql, build_bulk_insert_parameters(dialect, [row])).lastrowid
+            for row in rows
+        ]
+
+    result = connection.exec_driver_sql(
+        build_bulk_insert_sql(dialect, len(rows)), build_bulk_insert_parameters(dialect, rows)
+    )
+    return calculate_inserted_ids(dialect, result.lastrowid, len(rows))
+
+
+# id_from〜id_to（どちらも含む）の範囲で最大のid（範囲に行がなければNone。範囲の指定がなければテーブル全体）
+# 大量データの投入コマンドが、どこまで登録できたかを確認するために使う
+def build_max_money_flow_id_statement(
+    id_from: int | None = None, id_to: int | None = None
+) -> Select:
+    statement = select(func.max(MoneyFlows.id))
+    if id_from is not None:
+        statement = statement.where(MoneyFlows.id >= id_from)
+    if id_to is not None:
+        statement = statement.where(MoneyFlows.id <= id_to)
+    return statement
+
+
+def get_max_money_flow_id(
+    session: Session, id_from: int | None = None, id_to: int | None = None
+) -> int | None:
+    return session.scalar(build_max_money_flow_id_statement(id_from, id_to))
+
+
+MONEY_FLOW_SNAPSHOT_COLUMNS = (
+    MoneyFlows.id,
+    MoneyFlows.occurred_date,
+    MoneyFlows.kind,
+    MoneyFlows.amount,
+    MoneyFlows.version,
+)
+
+
+# 一括更新・削除の前に、対象行の(id, occurred_date, kind, amount, version)だけを取得する
+# ORMのインスタンスは作らず、存在しないidの確認と月次集計の増減の計算に必要な列だけを読む
+# FOR UPDATE：commitまで対象行をロックし、確認してから更新・削除するまでの間に他から変更されないようにする
+def build_money_flow_snapshots_statement(ids: list[int]) -> Select:
+    return select(*MONEY_FLOW_SNAPSHOT_COLUMNS).where(MoneyFlows.id.in_(ids)).with_for_update()
+
+
+def get_money_flow_snapshots_by_ids(session: Session, ids: list[int]) -> list[Row]:
+    return session.execute(build_money_flow_snapshots_statement(ids)).all()
+
+
+# 1件更新の前に、対象行の(id, occurred_date, kind, amount, version)だけを取得する（存在しない場合はNone）
+# 行はロックしない（他から変更されていないかは、UPDATEのWHERE句のversionで確認する）
+def build_money_flow_snapshot_statement(id: int) -> Select:
+    return select(*MONEY_FLOW_SNAPSHOT_COLUMNS).where(MoneyFlows.id == id)
+
+
+def get_money_flow_snapshot_by_id(session: Session, id: int) -> Row | None:
+    return session.execute(build_money_flow_snapshot_statement(id)).first()
+
+
+# 「UPDATE ... WHERE id = :id AND version = :version」の1文で更新し、versionを1増やす
+# 他の人が先に更新・削除していた場合は、WHERE句に当てはまらず0行の更新になる
+def build_update_money_flow_statement(item: UpdateMoneyFlowRequest, version: int) -> Update:
+    table = MoneyFlows.__table__
+    return (
+        update(table)
+        .where(table.c.id == item.id, table.c.version == version)
+        .values(
+            title=item.title,
+            amount=item.amount,
+            occurred_date=item.occurred_date,
+            occurred_month=to_month_key(item.occurred_date),
+            kind=MoneyFlowKind(item.kind),
+            version=table.c.version + 1,
+            updated_at=get_now(),
+        )
+    )
+
+
+# 更新した行数（1：更新できた、0：versionが古い・削除された）を返す（commitは呼び出し側で行う）
+def update_money_flow(session: Session, item: UpdateMoneyFlowRequest, version: int) -> int:
+    return session.execute(build_update_money_flow_statement(item, version)).rowcount
+
+
+# 複数行を「UPDATE ... SET カラム = CASE id WHEN ... THEN ... END WHERE id IN (...)」の1文で更新する
+def build_update_money_flows_by_ids_statement(items: list[UpdateMoneyFlowRequest]) -> Update:
+    table = MoneyFlows.__table__
+    values = {
+        "title": {item.id: item.title for item in items},
+        "amount": {item.id: item.amount for item in items},
+        "occurred_date": {item.id: item.occurred_date for item in items},
+        "occurred_month": {item.id: to_month_key(item.occurred_date) for item in items},
+        "kind": {item.id: MoneyFlowKind(item.kind) for item in items},
+    }
+
+    return (
+        update(table)
+        .where(table.c.id.in_([item.id for item in items]))
+        .values(
+            {
+                # literal(値, カラムの型)：Enumや日時をカラムと同じ変換でDBに渡す
+                name: case(
+                    {id: literal(value, table.c[name].type) for id, value in values_by_id.items()},
+                    value=table.c.id,
+                )
+                for name, values_by_id in values.items()
+            }
+            | {"version": table.c.version + 1, "updated_at": get_now()}
+        )
+    )
+
+
+# 更新した行数を返す（commitは呼び出し側で行う）
+def update_money_flows_by_ids(session: Session, items: list[UpdateMoneyFlowRequest]) -> int:
+    return session.execute(build_update_money_flows_by_ids_statement(items)).rowcount
+
+
+# 複数行を「DELETE ... WHERE id IN (...)」の1文で削除する
+def build_delete_money_flows_by_ids_statement(ids: list[int]) -> Delete:
+    table = MoneyFlows.__table__
+    return delete(table).where(table.c.id.in_(ids))
+
+
+# 削除した行数を返す（commitは呼び出し側で行う）
+def delete_money_flows_by_ids(session: Session, ids: list[int]) -> int:
+    return session.execute(build_delete_money_flows_by_ids_statement(ids)).rowcount
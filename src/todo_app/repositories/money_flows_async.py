@@ -0,0 +1,151 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from todo_app.cache.read_cache import read_cache
+from todo_app.models.db.money_flows import MoneyFlows
+from todo_app.models.request.v1.money_flows import (
+    AggregatePeriod,
+    MoneyFlowFilter,
+    TitleMatch,
+    UpdateMoneyFlowRequest,
+)
+from todo_app.repositories.money_flows import (
+    MONEY_FLOW_ITEM_KEYS,
+    MONEY_FLOW_SEARCH_ITEM_KEYS,
+    MONEY_FLOWS_CACHE_NAMESPACE,
+    build_aggregate_statement,
+    build_bulk_insert_parameters,
+    build_bulk_insert_sql,
+    build_delete_money_flows_by_ids_statement,
+    build_money_flow_by_id_statement,
+    build_money_flow_items_page_statement,
+    build_money_flow_items_statement,
+    build_money_flow_snapshot_statement,
+    build_money_flow_snapshots_statement,
+    build_money_flow_version_statement,
+    build_money_flows_search_statement,
+    build_money_flows_statement,
+    build_update_money_flow_statement,
+    build_update_money_flows_by_ids_statement,
+    calculate_inserted_ids,
+    has_consecutive_insert_ids,
+)
+
+# ★money_flows.pyの非同期（AsyncSession）版。SQL文はmoney_flows.pyのbuild_〜を使い回し、実行だけをawaitする。
+
+
+async def get_money_flows_all(
+    session: AsyncSession, filters: MoneyFlowFilter | None = None
+) -> list[MoneyFlows]:
+    return (await session.scalars(build_money_flows_statement(filters))).all()
+
+
+@read_cache.cached_async(MONEY_FLOWS_CACHE_NAMESPACE)
+async def get_money_flow_items(
+    session: AsyncSession,
+    filters: MoneyFlowFilter,
+    data_version: tuple[datetime | None, int] | None = None,
+) -> list[dict[str, Any]]:
+    rows = (await session.execute(build_money_flow_items_statement(filters))).tuples()
+    return [dict(zip(MONEY_FLOW_ITEM_KEYS, row, strict=True)) for row in rows]
+
+
+async def get_money_flow_version(
+    session: AsyncSession, filters: MoneyFlowFilter
+) -> tuple[datetime | None, int]:
+    max_updated_at, count = (
+        await session.execute(build_money_flow_version_statement(filters))
+    ).one()
+    return max_updated_at, count
+
+
+async def get_money_flow_by_id(session: AsyncSession, id: int) -> MoneyFlows:
+    return (await session.scalars(build_money_flow_by_id_statement(id))).first()
+
+
+async def get_money_flows_page(
+    session: AsyncSession,
+    limit: int,
+    cursor: tuple[datetime, int] | None = None,
+    filters: MoneyFlowFilter | None = None,
+) -> list[dict[str, Any]]:
+    rows = (
+        await session.execute(build_money_flow_items_page_statement(limit, cursor, filters))
+    ).tuples()
+    return [dict(zip(MONEY_FLOW_ITEM_KEYS, row, strict=True)) for row in rows]
+
+
+async def search_money_flows(
+    session: AsyncSession,
+    query: str,
+    match: TitleMatch,
+    limit: int,
+    cursor: tuple[int, datetime, int] | None = None,
+) -> list[dict[str, Any]]:
+    dialect_name = session.get_bind().dialect.name
+    rows = (
+        await session.execute(
+            build_money_flows_search_statement(query, match, dialect_name, limit, cursor)
+        )
+    ).tuples()
+    return [dict(zip(MONEY_FLOW_SEARCH_ITEM_KEYS, row, strict=True)) for row in rows]
+
+
+@read_cache.cached_async(MONEY_FLOWS_CACHE_NAMESPACE)
+async def aggregate_money_flows(
+    session: AsyncSession,
+    period: AggregatePeriod,
+    filters: MoneyFlowFilter,
+    data_version: tuple[datetime | None, int] | None = None,
+) -> list[Row]:
+    dialect_name = session.get_bind().dialect.name
+    return (await session.execute(build_aggregate_statement(period, filters, dialect_name))).all()
+
+
+async def insert_money_flows(session: AsyncSession, rows: list[tuple[Any, ...]]) -> list[int]:
+    if not rows:
+        return []
+
+    connection = await session.connection()
+    dialect = connection.dialect
+
+    if not await connection.run_sync(has_consecutive_insert_ids):
+        sql = build_bulk_insert_sql(dialect, 1)
+        return [
+            (
+                await connection.exec_driver_sql(sql, build_bulk_insert_parameters(dialect, [row]))
+            ).lastrowid
+            for row in rows
+        ]
+
+    result = await connection.exec_driver_sql(
+        build_bulk_insert_sql(dialect, len(rows)), build_bulk_insert_parameters(dialect, rows)
+    )
+    return calculate_inserted_ids(dialect, result.lastrowid, len(rows))
+
+
+async def get_money_flow_snapshots_by_ids(session: AsyncSession, ids: list[int]) -> list[Row]:
+    return (await session.execute(build_money_flow_snapshots_statement(ids))).all()
+
+
+async def get_money_flow_snapshot_by_id(session: AsyncSession, id: int) -> Row | None:
+    return (await session.execute(build_money_flow_snapshot_statement(id))).first()
+
+
+async def update_money_flow(
+    session: AsyncSession, item: UpdateMoneyFlowRequest, version: int
+) -> int:
+    return (await session.execute(build_update_money_flow_statement(item, version))).rowcount
+
+
+async def update_money_flows_by_ids(
+    session: AsyncSession, items: list[UpdateMoneyFlowRequest]
+) -> int:
+    return (await session.execute(build_update_money_flows_by_ids_statement(items))).rowcount
+
+
+async def delete_money_flows_by_ids(session: AsyncSession, ids: list[int]) -> int:
+    return (await session.execute(build_delete_money_flows_by_ids_statement(ids))).rowcount
@@ -0,0 +1,67 @@
+from datetime import datetime
+
+from sqlalchemy import Executable, Select
+from sqlalchemy.orm import Session, configure_mappers
+
+from todo_app.models.request.v1.money_flows import MoneyFlowFilter, UpdateMoneyFlowRequest
+from todo_app.repositories.money_flow_monthly_summary import build_monthly_summaries_statement
+from todo_app.repositories.money_flows import (
+    build_aggregate_statement,
+    build_money_flow_by_id_statement,
+    build_money_flow_items_statement,
+    build_money_flow_snapshot_statement,
+    build_money_flow_version_statement,
+    build_money_flows_page_statement,
+    build_update_money_flow_statement,
+    has_consecutive_insert_ids,
+)
+
+# ★起動時（main.pyのlifespan）に、よく使うSQL文を先に実行しておく。
+# 　最初のリクエストで、ORMのマッパーの設定やSQL文のコンパイルの時間がかからないようにするため。
+# 　SQL文をコンパイルしただけでは、エンジンのコンパイル済みSQLのキャッシュには載らないため、接続で実行する。
+# 　同期版（このファイル）と非同期版（warmup_async.py）で、同じSQL文を使う。
+
+# 全件を読むSQL文は、行のない期間（インデックスで0行だけ読む）に絞り込んで実行する
+WARM_UP_FILTER = MoneyFlowFilter(date_from=datetime(2000, 1, 1), date_to=datetime(2000, 1, 2))
+
+
+# 実行しても軽い（インデックスで数行だけ読む）SELECT文
+# APIと同じ形（バインドパラメータの値だけが違う）で実行し、エンジンのコンパイル済みSQLのキャッシュに載せる
+def build_warm_up_queries(dialect_name: str) -> list[Select]:
+    return [
+        build_money_flows_page_statement(limit=1, filters=MoneyFlowFilter()),
+        build_money_flow_by_id_statement(0),
+        build_money_flow_snapshot_statement(0),
+        build_monthly_summaries_statement(),
+        build_money_flow_items_statement(WARM_UP_FILTER),
+        build_money_flow_version_statement(WARM_UP_FILTER),
+        build_aggregate_statement("month", WARM_UP_FILTER, dialect_name),
+    ]
+
+
+# 書き込むSQL文。存在しないidで実行し、最後にロールバックするため、データは変わらない
+# ※月次集計のUPSERT（build_monthly_summary_upsert）は、複数行のVALUESのため、
+# 　SQLAlchemyがコンパイル済みSQLをキャッシュしない（実行しても効果がないため、含めない）
+def build_warm_up_writes() -> list[Executable]:
+    item = UpdateMoneyFlowRequest(id=0, title="", amount=0, occurred_date=datetime(2000, 1, 1))
+    return [build_update_money_flow_statement(item, version=1)]
+
+
+# 実行したSQL文の数を返す
+def warm_up_statements(session: Session) -> int:
+    configure_mappers()
+    dialect_name = session.get_bind().dialect.name
+
+    queries = build_warm_up_queries(dialect_name)
+    writes = build_warm_up_writes()
+    try:
+        # 複数行INSERTでidが連番になる設定かも、最初の登録より前に確認しておく（連番にならない場合はログに出す）
+        has_consecutive_insert_ids(session.connection())
+        for statement in queries:
+            session.execute(statement).all()
+        for statement in writes:
+            session.execute(statement)
+    finally:
+        session.rollback()
+
+    return len(queries) + len(writes)
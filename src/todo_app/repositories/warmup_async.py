@@ -0,0 +1,25 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import configure_mappers
+
+from todo_app.repositories.money_flows import has_consecutive_insert_ids
+from todo_app.repositories.warmup import build_warm_up_queries, build_warm_up_writes
+
+# ★warmup.pyの非同期（AsyncSession）版。SQL文はwarmup.pyのものを使い回し、実行だけをawaitする。
+
+
+async def warm_up_statements(session: AsyncSession) -> int:
+    configure_mappers()
+    dialect_name = session.get_bind().dialect.name
+
+    queries = build_warm_up_queries(dialect_name)
+    writes = build_warm_up_writes()
+    try:
+        await (await session.connection()).run_sync(has_consecutive_insert_ids)
+        for statement in queries:
+            (await session.execute(statement)).all()
+        for statement in writes:
+            await session.execute(statement)
+    finally:
+        await session.rollback()
+
+    return len(queries) + len(writes)
@@ -0,0 +1,192 @@
+import asyncio
+import queue
+import threading
+import time
+
+from collections.abc import Callable
+from concurrent.futures import Future
+from contextlib import AbstractContextManager
+
+from sqlalchemy.orm import Session
+
+from todo_app.loggers.custom_logger import logger
+
+_STOP = object()
+
+
+# 複数のリクエストの書き込みを、1つのトランザクション（1回のcommit）にまとめる書き込み役（プロセスに1つ）
+# ・submit()した値はキューに入り、専用のスレッドが「最初の1件からmax_delay_ms経過」か「max_rows件」でまとめて書き込む
+# ・write(session, 値のリスト)は、値と同じ順番で結果（採番されたidなど）を返す。commitはこのクラスが行う
+# ・まとめた書き込みが失敗した場合は、1件ずつ書き込み直し、失敗した値のFutureにだけ例外を設定する
+# 　（1件の不正な値のせいで、同じバッチの他のリクエストまで失敗しないようにする）
+# ・スレッドが予期しない例外で止まった場合は、待っている依頼をすべて失敗させ、次のsubmit()でスレッドを起動し直す
+# 　（Futureが完了しないまま、呼び出し元が待ち続けないようにする）
+class GroupCommitWriter[T, R]:
+    def __init__(
+        self,
+        name: str,
+        session_factory: Callable[[], AbstractContextManager[Session]],
+        write: Callable[[Session, list[T]], list[R]],
+        max_delay_ms: float,
+        max_rows: int,
+        after_commit: Callable[[], None] | None = None,
+        timeout_ms: float = 10_000,
+    ) -> None:
+        self.name = name
+        self.session_factory = session_factory
+        self.write = write
+        self.max_delay_ms = max_delay_ms
+        self.max_rows = max_rows
+        self.after_commit = after_commit  # commitできた後に呼ぶ処理（キャッシュの削除など）
+        self.timeout_ms = timeout_ms  # submit_and_wait()で、commitを待つ最大の時間（ミリ秒）
+        self._queue: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._in_flight: list[tuple[T, Future[R]]] = []  # 書き込み中のバッチ
+        self.batches = 0  # commitした回数（1件ずつの書き直しも含む）
+        self.rows = 0  # 書き込めた件数
+        self.failures = 0  # 失敗した件数
+
+    # 書き込みを依頼し、結果を受け取るFutureを返す（スレッドは最初の依頼で起動する）
+    # close()の後に依頼した場合は、書き込まれないためRuntimeErrorにする
+    def submit(self, item: T) -> Future[R]:
+        future: Future[R] = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"書き込み役（{self.name}）は停止しています。")
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"group-commit-{self.name}", daemon=True
+                )
+                self._thread.start()
+            self._queue.put((item, future))
+        return future
+
+    # 書き込みを依頼し、commitされるまで待って結果を返す
+    # timeout_msを過ぎた場合はTimeoutError（まだ書き込み始めていない依頼は取り消し、後から書き込まれないようにする）
+    def submit_and_wait(self, item: T) -> R:
+        future = self.submit(item)
+        try:
+            return future.result(timeout=self.timeout_ms / 1000)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    # submit_and_wait()の非同期版（待つ間もイベントループを止めない）
+    # タイムアウトした場合は、asyncio.wait_forがFutureを取り消す
+    async def submit_and_wait_async(self, item: T) -> R:
+        return await asyncio.wait_for(
+            asyncio.wrap_future(self.submit(item)), timeout=self.timeout_ms / 1000
+        )
+
+    # キューに残っている依頼を書き込んでから、スレッドを止める（以降のsubmit()はエラーにする）
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(_STOP)
+        if thread is not None:
+            thread.join()
+
+    def _run(self) -> None:
+        try:
+            self._process()
+        except BaseException as e:
+            logger.exception("書き込み役（%s）のスレッドが停止しました", self.name)
+            self._fail_pending(e)
+            if not isinstance(e, Exception):
+                raise
+
+    def _process(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = [first]
+            deadline = time.monotonic() + self.max_delay_ms / 1000
+            stopping = False
+            while len(batch) < self.max_rows:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+
+            # 待っている間に取り消された依頼（タイムアウトしたもの）は書き込まない
+            batch = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+            if batch:
+                self._flush(batch)
+            if stopping:
+                return
+
+    # 書き込み中のバッチと、キューに残っている依頼をすべて失敗させる
+    # ロックの中で、スレッドを外してからキューを空にする（以降の依頼は、新しいスレッドが書き込む）
+    def _fail_pending(self, cause: BaseException) -> None:
+        error = RuntimeError(f"書き込み役（{self.name}）のスレッドが停止しました。")
+        error.__cause__ = cause
+        with self._lock:
+            if self._thread is threading.current_thread():
+                self._thread = None
+            pending = [future for _, future in self._in_flight]
+            while True:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is not _STOP and entry[1].set_running_or_notify_cancel():
+                    pending.append(entry[1])
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    # commitできた依頼があれば、after_commitを1回だけ呼んでから、呼び出し元に結果を返す
+    # （呼び出し元がレスポンスを返した後に、古いキャッシュを読まないようにする）
+    def _flush(self, batch: list[tuple[T, Future[R]]]) -> None:
+        self._in_flight = batch
+        committed = self._commit(batch)
+        if committed and self.after_commit is not None:
+            try:
+                self.after_commit()
+            except Exception:
+                # 書き込みはcommit済みのため、呼び出し元には成功を返す
+                logger.exception("書き込み役（%s）のcommit後の処理に失敗しました", self.name)
+        for future, result in committed:
+            future.set_result(result)
+        self._in_flight = []
+
+    # バッチを1回のcommitで書き込み、commitできた依頼のFutureと結果を返す
+    # 失敗した依頼のFutureには、ここで例外を設定する
+    def _commit(self, batch: list[tuple[T, Future[R]]]) -> list[tuple[Future[R], R]]:
+        items = [item for item, _ in batch]
+        try:
+            with self.session_factory() as session:
+                try:
+                    results = self.write(session, items)
+                    session.commit()
+                except Exception:
+                    session.rollback()
+                    raise
+        except Exception as e:
+            if len(batch) > 1:
+                logger.warning(
+                    "まとめた書き込み（%s件）に失敗したため、1件ずつ書き込み直します：%s",
+                    len(batch),
+                    e,
+                )
+                return [done for entry in batch for done in self._commit([entry])]
+            self.failures += 1
+            batch[0][1].set_exception(e)
+            return []
+
+        self.batches += 1
+        self.rows += len(batch)
+        return [(future, result) for (_, future), result in zip(batch, results, strict=True)]
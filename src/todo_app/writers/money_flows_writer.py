@@ -0,0 +1,43 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from todo_app.cache.read_cache import read_cache
+from todo_app.core.database import (
+    WRITE_BATCH_MAX_DELAY_MS,
+    WRITE_BATCH_MAX_ROWS,
+    WRITE_BATCH_TIMEOUT_MS,
+)
+from todo_app.logic.calculate.calculate_monthly_summary import MonthlySummaryDeltas
+from todo_app.models.db.base import session as session_factory
+from todo_app.models.db.money_flows import MoneyFlowKind
+from todo_app.repositories.money_flow_monthly_summary import apply_monthly_summary_deltas
+from todo_app.repositories.money_flows import MONEY_FLOWS_CACHE_NAMESPACE, insert_money_flows
+from todo_app.writers.group_commit import GroupCommitWriter
+
+# BULK_INSERT_COLUMNSの順番：(title, amount, occurred_date, kind, created_at, updated_at)
+MoneyFlowRow = tuple[str, int, datetime, MoneyFlowKind, datetime, datetime]
+
+
+# 複数のリクエストの登録を、複数行INSERT1文と月次集計のUPSERT1文で書き込み、採番されたidを同じ順番で返す
+def write_money_flows(session: Session, rows: list[MoneyFlowRow]) -> list[int]:
+    ids = insert_money_flows(session, rows)
+
+    deltas = MonthlySummaryDeltas()
+    for _, amount, occurred_date, kind, _, _ in rows:
+        deltas.add(occurred_date, kind, amount)
+    apply_monthly_summary_deltas(session, deltas)
+
+    return ids
+
+
+# WRITE_BATCHING_ENABLED=trueの場合に、POST /money_flowsが使う（同期・非同期のどちらのモードでも共通）
+money_flows_writer: GroupCommitWriter[MoneyFlowRow, int] = GroupCommitWriter(
+    name="money_flows",
+    session_factory=session_factory,
+    write=write_money_flows,
+    max_delay_ms=WRITE_BATCH_MAX_DELAY_MS,
+    max_rows=WRITE_BATCH_MAX_ROWS,
+    after_commit=lambda: read_cache.invalidate(MONEY_FLOWS_CACHE_NAMESPACE),
+    timeout_ms=WRITE_BATCH_TIMEOUT_MS,
+)
@@ -5,6 +5,8 @@ from collections.abc import Iterator  # iterator：順番に取り出せるも
 
 import pytest  # pytest本体(テスト用ライブラリ)
 
+from sqlalchemy.orm import Session
+
 from todo_app.main import app  # アプリ本体(FastAPIで作ったインスタンス)を読み込み
 from todo_app.models.db.base import get_db
 from todo_app.models.db.money_flows import MoneyFlows
@@ -25,12 +27,17 @@ class FakeSessionOK:  # FakeSession → 本物のDBセッションっぽく振
         instance.id = (
             1  # 追加されたインスタンスにIDを設定(今回はID=1)する(本来はDBが自動で設定する)
         )
+        instance.version = 1  # 本来はSQLAlchemy（version_id_col）が登録時に設定する
 
     # 削除命令のフリをするメソッド
     # session.delete(obj)の代役
     def delete(self, obj: object) -> None:
         self.deleted = obj  # 削除されたオブジェクトを記録
 
+    # INSERTのフリ（idはadd()で設定済み）
+    def flush(self) -> None:
+        pass
+
     def commit(self) -> None:
         self.commit_called = True
 
@@ -70,10 +77,14 @@ class FakeSessionError:
 
     def add(self, instance: MoneyFlows) -> None:
         instance.id = 1
+        instance.version = 1
 
     def delete(self, obj: object) -> None:
         self.deleted = obj
 
+    def flush(self) -> None:
+        pass
+
     def commit(self) -> None:
         self.commit_called = True  # commitが呼ばれたことを記録
         raise Exception(
@@ -101,3 +112,17 @@ def override_get_db_error(error_session: FakeSessionError) -> Iterator[FakeSessi
     yield error_session
 
     app.dependency_overrides.pop(get_db, None)
+
+
+# 【本物のDB（インメモリSQLite）を使うパターン】
+# sqlite_sessionはtests/conftest.pyのフィクスチャ
+@pytest.fixture
+def override_get_db_sqlite(sqlite_session: Session) -> Iterator[Session]:
+    def _sqlite_db() -> Iterator[Session]:
+        yield sqlite_session
+
+    app.dependency_overrides[get_db] = _sqlite_db
+
+    yield sqlite_session
+
+    app.dependency_overrides.pop(get_db, None)
@@ -10,3 +10,12 @@ def test_healthcheck() -> None:
 
     assert response.json() == "お疲れ様です！！"
     assert response.status_code == 200
+
+
+# レスポンスにX-Request-IDが付き、リクエストで指定された場合はその値を返す
+def test_healthcheck_request_id() -> None:
+    assert len(client.get("/api/v1/healthcheck").headers["x-request-id"]) == 32
+
+    response = client.get("/api/v1/healthcheck", headers={"X-Request-ID": "lb-request-1"})
+
+    assert response.headers["x-request-id"] == "lb-request-1"
@@ -1,4 +1,5 @@
 from dataclasses import dataclass  # テスト用の「ダミーのデータ型」を簡単に作るためのライブラリ
+from datetime import datetime
 from typing import (
     TYPE_CHECKING,  # 型チェック専用のフラグ。型チェックのときだけTrue、実行時はFalseになる特別なフラグ
 )
@@ -6,13 +7,20 @@ from typing import (
 import pytest  # pytest本体(テスト用ライブラリ)
 
 from fastapi.testclient import TestClient  # FastAPIが用意しているテスト専用のクライアント
+from sqlalchemy.orm.exc import StaleDataError
 
 import todo_app.api.v1.money_flows as api_money_flows
 
+from todo_app.logic.pagination.cursor import decode_cursor, encode_cursor
 from todo_app.main import app  # アプリ本体(FastAPIで作ったインスタンス)を読み込み
+from todo_app.models.db.money_flows import MoneyFlowKind
+from todo_app.models.request.v1.money_flows import MoneyFlowFilter
 
 client = TestClient(app)  # 読み込んだappを渡して、擬似的なHTTPクライアントを作成
 
+# 例外を500のレスポンスとして受け取るクライアント（DBのエラーのテスト用）
+error_client = TestClient(app, raise_server_exceptions=False)
+
 # if TYPE_CHECKING: ブロックの中は、実行時には動かないため、副作用や循環を起こさない。
 # 型の参照だけ。conftest.pyはpytest専用の自動読み込みファイルで直importはNG
 if TYPE_CHECKING:
@@ -30,8 +38,33 @@ class DummyFlow:  # 収支データを表すクラス
     id: int
     title: str
     amount: int
-    occurred_date: str
-    kind: DummyKind
+    occurred_date: str | datetime
+    kind: DummyKind | MoneyFlowKind
+    version: int = 1
+
+
+# 月次集計テーブルへの反映は本物のDBが必要なため、このファイルの全テストで差し替える
+# autouse=True：各テストで指定しなくても自動で使われる
+# 反映しようとした増減は、戻り値のリストに記録される
+@pytest.fixture(autouse=True)
+def applied_summary_deltas(monkeypatch: pytest.MonkeyPatch) -> list[list[tuple]]:
+    applied = []
+    monkeypatch.setattr(
+        api_money_flows,
+        "apply_monthly_summary_deltas",
+        lambda _session, deltas: applied.append(list(deltas.items())),
+    )
+    return applied
+
+
+# 条件付きGET（ETag）用のデータのバージョン取得も本物のDBが必要なため、このファイルの全テストで差し替える
+@pytest.fixture(autouse=True)
+def fake_money_flow_version(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        api_money_flows,
+        "get_money_flow_version",
+        lambda _session, filters: (datetime(2025, 4, 30, 12), 2),
+    )
 
 
 # GETテスト
@@ -40,27 +73,33 @@ class DummyFlow:  # 収支データを表すクラス
 # monkeypatch：pytestが標準で用意しているテスト用の置き換えツール(フィクスチャ)。今回は関数の差し替えに使用
 # pytest.MonkeyPatch：monkeypatchのクラス型
 def test_get_money_flows(monkeypatch: pytest.MonkeyPatch) -> None:
-    # テスト用の既存データを用意
+    # テスト用の既存データを用意（一覧取得は、リポジトリがレスポンスの形のdictを返す）
     existing_data = [
-        DummyFlow(
-            1,
-            "お米",
-            4200,
-            "2025-04-01T00:00:00",
-            DummyKind("expense"),
-        ),
-        DummyFlow(
-            2,
-            "給料",
-            2000,
-            "2025-04-01T00:00:00",
-            DummyKind("income"),
-        ),
+        {
+            "id": 1,
+            "title": "お米",
+            "amount": 4200,
+            "occurred_date": datetime(2025, 4, 1),
+            "kind": "expense",
+            "version": 1,
+        },
+        {
+            "id": 2,
+            "title": "給料",
+            "amount": 2000,
+            "occurred_date": datetime(2025, 4, 1),
+            "kind": "income",
+            "version": 3,
+        },
     ]
     # .setattr(対象, "差し替えたい属性名(関数名)", 置き換える値)：対象のモジュール/オブジェクトにある属性(今回は関数)を、別のものに入れ替える
     # lambda ... : ... → 無名関数を作るキーワード
-    # lambda _session: items → 引数_sessionを受け取るけど使わず、常にitemsを返す
-    monkeypatch.setattr(api_money_flows, "get_money_flows_all", lambda _session: existing_data)
+    # lambda _session, filters: items → 引数_session, filtersを受け取るけど使わず、常にitemsを返す
+    monkeypatch.setattr(
+        api_money_flows,
+        "get_money_flow_items",
+        lambda _session, filters, data_version: existing_data,
+    )
 
     # 実行
     response = client.get("/api/v1/money_flows/")
@@ -76,6 +115,7 @@ def test_get_money_flows(monkeypatch: pytest.MonkeyPatch) -> None:
                 "amount": 4200,
                 "occurred_date": "2025-04-01T00:00:00",
                 "kind": "expense",
+                "version": 1,
             },
             {
                 "id": 2,
@@ -83,15 +123,184 @@ def test_get_money_flows(monkeypatch: pytest.MonkeyPatch) -> None:
                 "amount": 2000,
                 "occurred_date": "2025-04-01T00:00:00",
                 "kind": "income",
+                "version": 3,
             },
         ]
     )
 
 
+# GETテスト（絞り込み条件がクエリパラメータから組み立てられて、リポジトリに渡ること）
+@pytest.mark.usefixtures("override_get_db_success")
+def test_get_money_flows_with_filter(monkeypatch: pytest.MonkeyPatch) -> None:
+    called_with = {}
+
+    def fake_get_money_flow_items(
+        _session: object, filters: MoneyFlowFilter, data_version: tuple[datetime, int]
+    ) -> list[dict]:
+        called_with.update(filters=filters, data_version=data_version)
+        return []
+
+    monkeypatch.setattr(api_money_flows, "get_money_flow_items", fake_get_money_flow_items)
+
+    response = client.get(
+        "/api/v1/money_flows",
+        params={
+            "from": "2025-04-01T00:00:00",
+            "to": "2025-05-01T00:00:00",
+            "month_from": 202504,
+            "month_to": 202506,
+            "kind": "income",
+            "amount_min": 100,
+            "amount_max": 5000,
+            "order": "desc",
+        },
+    )
+
+    assert response.status_code == 200
+    assert called_with["filters"] == MoneyFlowFilter(
+        date_from=datetime(2025, 4, 1),
+        date_to=datetime(2025, 5, 1),
+        month_from=202504,
+        month_to=202506,
+        kind="income",
+        amount_min=100,
+        amount_max=5000,
+        order="desc",
+    )
+    # キャッシュのキーに含めるため、ETagと同じバージョンを渡す
+    assert called_with["data_version"] == (datetime(2025, 4, 30, 12), 2)
+
+
+# GETテスト（タイムゾーン付きの絞り込み条件は、日本時間のタイムゾーンなしにしてリポジトリに渡すこと）
+# タイムゾーンなしの値と混ぜて指定しても、比べられること
+@pytest.mark.usefixtures("override_get_db_success")
+def test_get_money_flows_with_timezone_filter(monkeypatch: pytest.MonkeyPatch) -> None:
+    called_with = {}
+
+    def fake_get_money_flow_items(
+        _session: object, filters: MoneyFlowFilter, data_version: tuple[datetime, int]
+    ) -> list[dict]:
+        called_with["filters"] = filters
+        return []
+
+    monkeypatch.setattr(api_money_flows, "get_money_flow_items", fake_get_money_flow_items)
+
+    response = client.get(
+        "/api/v1/money_flows", params={"from": "2025-03-31T15:00:00Z", "to": "2025-05-01T00:00:00"}
+    )
+
+    assert response.status_code == 200
+    assert called_with["filters"] == MoneyFlowFilter(
+        date_from=datetime(2025, 4, 1), date_to=datetime(2025, 5, 1)
+    )
+
+
+# GETテスト（絞り込み条件の範囲が不正な場合：BusinessException）
+@pytest.mark.usefixtures("override_get_db_success")
+@pytest.mark.parametrize(
+    ("params", "detail"),
+    [
+        (
+            {"from": "2025-05-01T00:00:00", "to": "2025-04-01T00:00:00"},
+            "fromにはtoより前の日時を指定してください。",
+        ),
+        (
+            {"month_from": 202505, "month_to": 202504},
+            "month_fromにはmonth_to以前の月を指定してください。",
+        ),
+        (
+            {"amount_min": 5000, "amount_max": 100},
+            "amount_minにはamount_max以下の値を指定してください。",
+        ),
+    ],
+)
+def test_get_money_flows_with_invalid_filter(params: dict, detail: str) -> None:
+    response = client.get("/api/v1/money_flows", params=params)
+
+    assert response.status_code == 422
+    assert response.json() == {"detail": detail}
+
+
+# GETテスト（期間・収支ごとの集計）
+@pytest.mark.usefixtures("override_get_db_success")
+def test_get_money_flow_aggregates(monkeypatch: pytest.MonkeyPatch) -> None:
+    @dataclass
+    class DummyAggregate:
+        period: str
+        kind: DummyKind
+        total_amount: int
+        flow_count: int
+
+    called_with = {}
+
+    def fake_aggregate_money_flows(
+        _session: object,
+        period: str,
+        filters: MoneyFlowFilter,
+        data_version: tuple[datetime, int],
+    ) -> list[DummyAggregate]:
+        called_with.update(period=period, filters=filters)
+        return [
+            DummyAggregate("2025-04", DummyKind("expense"), 4200, 2),
+            DummyAggregate("2025-04", DummyKind("income"), 200000, 1),
+        ]
+
+    monkeypatch.setattr(api_money_flows, "aggregate_money_flows", fake_aggregate_money_flows)
+
+    response = client.get(
+        "/api/v1/money_flows/aggregates",
+        params={"period": "week", "from": "2025-04-01T00:00:00"},
+    )
+
+    assert response.status_code == 200
+    assert called_with == {
+        "period": "week",
+        "filters": MoneyFlowFilter(date_from=datetime(2025, 4, 1)),
+    }
+    assert response.json() == [
+        {"period": "2025-04", "kind": "expense", "total_amount": 4200, "count": 2},
+        {"period": "2025-04", "kind": "income", "total_amount": 200000, "count": 1},
+    ]
+
+
+# GETテスト（月次集計テーブルからの取得）
+@pytest.mark.usefixtures("override_get_db_success")
+def test_get_money_flow_monthly_summary(monkeypatch: pytest.MonkeyPatch) -> None:
+    @dataclass
+    class DummySummary:
+        month: int
+        kind: MoneyFlowKind
+        total_amount: int
+        flow_count: int
+
+    called_with = {}
+
+    def fake_get_monthly_summaries(
+        _session: object, month_from: int, month_to: int, kind: MoneyFlowKind
+    ) -> list[DummySummary]:
+        called_with.update(month_from=month_from, month_to=month_to, kind=kind)
+        return [DummySummary(202504, MoneyFlowKind.INCOME, 200000, 1)]
+
+    monkeypatch.setattr(api_money_flows, "get_monthly_summaries", fake_get_monthly_summaries)
+
+    response = client.get(
+        "/api/v1/money_flows/monthly_summary",
+        params={"month_from": 202504, "month_to": 202506, "kind": "income"},
+    )
+
+    assert response.status_code == 200
+    assert called_with == {"month_from": 202504, "month_to": 202506, "kind": MoneyFlowKind.INCOME}
+    assert response.json() == [
+        {"period": "2025-04", "kind": "income", "total_amount": 200000, "count": 1}
+    ]
+
+
 # POSTテスト
 # テスト関数の引数にoverride_get_db_commit_okを書くと、フィクスチャでyieldされたFakeSessionが渡ってくる。
 @pytest.mark.usefixtures("override_get_db_success")
-def test_create_money_flows(success_session: "FakeSessionOK") -> None:
+def test_create_money_flows(
+    success_session: "FakeSessionOK", applied_summary_deltas: list[list[tuple]]
+) -> None:
     # APIに送るJSONデータを用意(辞書型)
     body = {
         "title": "お米",
@@ -112,10 +321,26 @@ def test_create_money_flows(success_session: "FakeSessionOK") -> None:
         "amount": 4200,
         "occurred_date": "2025-04-01T00:00:00",
         "kind": "expense",
+        "version": 1,
     }
+    # 月次集計テーブルに1件分が加算されること
+    assert applied_summary_deltas == [[(202504, MoneyFlowKind.EXPENSE, 4200, 1)]]
+
+
+# POSTテスト（タイムゾーン付きの日時は、日本時間のタイムゾーンなしに変換して、日本時間の月で集計すること）
+@pytest.mark.usefixtures("override_get_db_success")
+def test_create_money_flows_with_timezone(applied_summary_deltas: list[list[tuple]]) -> None:
+    body = {"title": "お米", "amount": 4200, "occurred_date": "2025-03-31T15:30:00Z"}
+
+    response = client.post("/api/v1/money_flows", json=body)
+
+    assert response.status_code == 200
+    assert response.json()["occurred_date"] == "2025-04-01T00:30:00"
+    assert applied_summary_deltas == [[(202504, MoneyFlowKind.EXPENSE, 4200, 1)]]
 
 
 # POSTテスト（コミットに失敗した場合）
+# ロールバックしたうえで500を返し、登録できなかったidを返さないこと
 @pytest.mark.usefixtures("override_get_db_error")
 def test_create_money_flows_commit_error(error_session: "FakeSessionError") -> None:
     body = {
@@ -126,28 +351,61 @@ def test_create_money_flows_commit_error(error_session: "FakeSessionError") -> N
     }
 
     # 実行
-    client.post("/api/v1/money_flows", json=body)
+    response = error_client.post("/api/v1/money_flows", json=body)
 
     # 検証
+    assert response.status_code == 500
     assert error_session.commit_called is True
     assert error_session.rolled_back is True  # rollbackが呼ばれたことを確認
 
 
+# POSTテスト（INSERT（flush）に失敗した場合）
+# commitせずにロールバックし、500を返すこと
+@pytest.mark.usefixtures("override_get_db_error")
+def test_create_money_flows_flush_error(
+    error_session: "FakeSessionError", monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def _failing_flush() -> None:
+        raise Exception("INSERTに失敗しました")
+
+    monkeypatch.setattr(error_session, "flush", _failing_flush)
+
+    response = error_client.post(
+        "/api/v1/money_flows",
+        json={"title": "お米", "amount": 4200, "occurred_date": "2025-04-01T00:00:00"},
+    )
+
+    assert response.status_code == 500
+    assert error_session.commit_called is False
+    assert error_session.rolled_back is True
+
+
 # PUTテスト
 @pytest.mark.usefixtures("override_get_db_success")
 def test_update_money_flows(
-    success_session: "FakeSessionOK", monkeypatch: pytest.MonkeyPatch
+    success_session: "FakeSessionOK",
+    monkeypatch: pytest.MonkeyPatch,
+    applied_summary_deltas: list[list[tuple]],
 ) -> None:
     # テスト用の既存データを用意
     existing_data = DummyFlow(
         1,
         "古いタイトル",
         1000,
-        "2025-04-01T00:00:00",
-        DummyKind("expense"),
+        datetime(2025, 4, 1),
+        MoneyFlowKind.EXPENSE,
     )
 
-    monkeypatch.setattr(api_money_flows, "get_money_flow_by_id", lambda _session, id: existing_data)
+    monkeypatch.setattr(
+        api_money_flows, "get_money_flow_snapshot_by_id", lambda _session, id: existing_data
+    )
+    # 「UPDATE ... WHERE id AND version」に渡したversionを記録し、1行更新できたことにする
+    updated_with = []
+    monkeypatch.setattr(
+        api_money_flows,
+        "update_money_flow",
+        lambda _session, item, version: updated_with.append((item.id, version)) or 1,
+    )
 
     body = {
         "id": 1,
@@ -155,6 +413,7 @@ def test_update_money_flows(
         "amount": 2000,
         "occurred_date": "2025-04-02T00:00:00",
         "kind": "income",
+        "version": 1,
     }
 
     # 実行
@@ -163,13 +422,22 @@ def test_update_money_flows(
     # 検証
     assert response.status_code == 200
     assert success_session.commit_called is True
+    assert updated_with == [(1, 1)]
     assert response.json() == {
         "id": 1,
         "title": "新しいタイトル",
         "amount": 2000,
         "occurred_date": "2025-04-02T00:00:00",
         "kind": "income",
+        "version": 2,  # 更新したため1増える
     }
+    # 収支の種類が変わったため、更新前の種類から引いて、更新後の種類に足すこと
+    assert applied_summary_deltas == [
+        [
+            (202504, MoneyFlowKind.EXPENSE, -1000, -1),
+            (202504, MoneyFlowKind.INCOME, 2000, 1),
+        ]
+    ]
 
 
 # PUTテスト（コミットに失敗した場合）
@@ -182,11 +450,14 @@ def test_update_money_flows_commit_error(
         1,
         "古いタイトル",
         1000,
-        "2025-04-01T00:00:00",
-        DummyKind("expense"),
+        datetime(2025, 4, 1),
+        MoneyFlowKind.EXPENSE,
     )
 
-    monkeypatch.setattr(api_money_flows, "get_money_flow_by_id", lambda _session, id: existing_data)
+    monkeypatch.setattr(
+        api_money_flows, "get_money_flow_snapshot_by_id", lambda _session, id: existing_data
+    )
+    monkeypatch.setattr(api_money_flows, "update_money_flow", lambda _session, item, version: 1)
 
     body = {
         "id": 1,
@@ -197,9 +468,10 @@ def test_update_money_flows_commit_error(
     }
 
     # 実行
-    client.put("/api/v1/money_flows", json=body)
+    response = error_client.put("/api/v1/money_flows", json=body)
 
-    # 検証
+    # 検証（更新していない値・versionを成功として返さないこと）
+    assert response.status_code == 500
     assert error_session.commit_called is True
     assert error_session.rolled_back is True
 
@@ -208,7 +480,7 @@ def test_update_money_flows_commit_error(
 @pytest.mark.usefixtures("override_get_db_success")
 def test_update_money_flows_not_found(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr(
-        api_money_flows, "get_money_flow_by_id", lambda _session, id: None
+        api_money_flows, "get_money_flow_snapshot_by_id", lambda _session, id: None
     )  # 指定したIDが見つからない想定のためNoneを返す
 
     body = {
@@ -229,17 +501,56 @@ def test_update_money_flows_not_found(monkeypatch: pytest.MonkeyPatch) -> None:
     }  # 設定したメッセージが返ることを確認
 
 
+# PUTテスト（他の人が先に更新していた場合：ConflictException）
+# 取得した時のversionが古い場合と、読んでからUPDATEするまでの間に更新された（0行の更新になった）場合
+@pytest.mark.usefixtures("override_get_db_success")
+@pytest.mark.parametrize(("version", "updated_rows"), [(1, 1), (2, 0), (None, 0)])
+def test_update_money_flows_conflict(
+    success_session: "FakeSessionOK",
+    monkeypatch: pytest.MonkeyPatch,
+    applied_summary_deltas: list[list[tuple]],
+    version: int | None,
+    updated_rows: int,
+) -> None:
+    existing_data = DummyFlow(
+        1, "古いタイトル", 1000, datetime(2025, 4, 1), MoneyFlowKind.EXPENSE, 2
+    )
+    monkeypatch.setattr(
+        api_money_flows, "get_money_flow_snapshot_by_id", lambda _session, id: existing_data
+    )
+    monkeypatch.setattr(
+        api_money_flows, "update_money_flow", lambda _session, item, version: updated_rows
+    )
+
+    body = {
+        "id": 1,
+        "title": "新しいタイトル",
+        "amount": 2000,
+        "occurred_date": "2025-04-02T00:00:00",
+        "version": version,
+    }
+
+    response = client.put("/api/v1/money_flows", json=body)
+
+    assert response.status_code == 409
+    assert response.json() == {"detail": api_money_flows.STALE_VERSION_MESSAGE}
+    assert success_session.commit_called is False
+    assert applied_summary_deltas == []
+
+
 # DELETEテスト
 @pytest.mark.usefixtures("override_get_db_success")
 def test_delete_money_flows(
-    success_session: "FakeSessionOK", monkeypatch: pytest.MonkeyPatch
+    success_session: "FakeSessionOK",
+    monkeypatch: pytest.MonkeyPatch,
+    applied_summary_deltas: list[list[tuple]],
 ) -> None:
     target_data = DummyFlow(
         1,
         "削除用タイトル",
         100,
-        "2025-04-01T00:00:00",
-        DummyKind("expense"),
+        datetime(2025, 4, 1),
+        MoneyFlowKind.EXPENSE,
     )
 
     monkeypatch.setattr(api_money_flows, "get_money_flow_by_id", lambda _session, id: target_data)
@@ -255,6 +566,7 @@ def test_delete_money_flows(
         success_session.deleted is target_data
     )  # session.delete()に正しい対象（target_data）が渡されたことを確認
     assert success_session.commit_called is True
+    assert applied_summary_deltas == [[(202504, MoneyFlowKind.EXPENSE, -100, -1)]]
 
 
 # DELETEテスト（コミットに失敗した場合）
@@ -266,21 +578,42 @@ def test_delete_money_flows_commit_error(
         1,
         "削除用タイトル",
         100,
-        "2025-04-01T00:00:00",
-        kind=DummyKind("expense"),
+        datetime(2025, 4, 1),
+        kind=MoneyFlowKind.EXPENSE,
     )
 
     monkeypatch.setattr(api_money_flows, "get_money_flow_by_id", lambda _session, id: target_data)
 
     # 実行
-    client.request("DELETE", "/api/v1/money_flows", json={"id": 1})
+    response = error_client.request("DELETE", "/api/v1/money_flows", json={"id": 1})
 
-    # 検証
+    # 検証（削除できなかったのに204を返さないこと）
+    assert response.status_code == 500
     assert error_session.deleted is target_data
     assert error_session.commit_called is True
     assert error_session.rolled_back is True
 
 
+# DELETEテスト（読んでから削除するまでの間に、他の人が更新・削除していた場合：ConflictException）
+@pytest.mark.usefixtures("override_get_db_error")
+def test_delete_money_flows_stale(
+    error_session: "FakeSessionError", monkeypatch: pytest.MonkeyPatch
+) -> None:
+    target_data = DummyFlow(1, "削除用タイトル", 100, datetime(2025, 4, 1), MoneyFlowKind.EXPENSE)
+    monkeypatch.setattr(api_money_flows, "get_money_flow_by_id", lambda _session, id: target_data)
+
+    def _stale_commit() -> None:
+        raise StaleDataError("DELETE statement on table 'money_flows' expected to delete 1 row(s)")
+
+    monkeypatch.setattr(error_session, "commit", _stale_commit)
+
+    response = client.request("DELETE", "/api/v1/money_flows", json={"id": 1})
+
+    assert response.status_code == 409
+    assert response.json() == {"detail": api_money_flows.STALE_VERSION_MESSAGE}
+    assert error_session.rolled_back is True
+
+
 # DELETEテスト（指定IDが存在しない場合：BusinessException）
 @pytest.mark.usefixtures("override_get_db_success")
 def test_delete_money_flows_not_found(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -290,3 +623,84 @@ def test_delete_money_flows_not_found(monkeypatch: pytest.MonkeyPatch) -> None:
 
     assert response.status_code == 422
     assert response.json() == {"detail": "指定したIDが存在しません。"}
+
+
+# ページの1行（リポジトリは、一覧APIのレスポンスの形のdictを返す）
+def build_item(id: int, title: str, amount: int, occurred_date: datetime, kind: str) -> dict:
+    return {
+        "id": id,
+        "title": title,
+        "amount": amount,
+        "occurred_date": occurred_date,
+        "kind": kind,
+        "version": 1,
+    }
+
+
+# GETテスト（カーソルページネーション：次のページがある場合）
+@pytest.mark.usefixtures("override_get_db_success")
+def test_get_money_flows_paginated(monkeypatch: pytest.MonkeyPatch) -> None:
+    # limit=2に対して3件返す → 次のページがある
+    existing_data = [
+        build_item(1, "お米", 4200, datetime(2025, 4, 1), "expense"),
+        build_item(2, "給料", 2000, datetime(2025, 4, 2), "income"),
+        build_item(3, "電気代", 5000, datetime(2025, 4, 3), "expense"),
+    ]
+    called_with = {}
+
+    def fake_get_money_flows_page(
+        _session: object,
+        limit: int,
+        cursor: tuple[datetime, int] | None,
+        filters: MoneyFlowFilter,
+    ) -> list[dict]:
+        called_with.update(limit=limit, cursor=cursor)
+        return existing_data
+
+    monkeypatch.setattr(api_money_flows, "get_money_flows_page", fake_get_money_flows_page)
+
+    cursor = encode_cursor(datetime(2025, 3, 31), 10)
+    response = client.get("/api/v1/money_flows/page", params={"limit": 2, "cursor": cursor})
+
+    assert response.status_code == 200
+    assert called_with == {"limit": 2, "cursor": (datetime(2025, 3, 31), 10)}
+    assert [item["id"] for item in response.json()["items"]] == [1, 2]
+    # 次のカーソルはページ最後の要素（id=2）から作られる
+    assert decode_cursor(response.json()["next_cursor"]) == (datetime(2025, 4, 2), 2)
+
+
+# GETテスト（カーソルページネーション：最後のページ）
+@pytest.mark.usefixtures("override_get_db_success")
+def test_get_money_flows_paginated_last_page(monkeypatch: pytest.MonkeyPatch) -> None:
+    existing_data = [build_item(1, "お米", 4200, datetime(2025, 4, 1), "expense")]
+    monkeypatch.setattr(
+        api_money_flows,
+        "get_money_flows_page",
+        lambda _session, limit, cursor, filters: existing_data,
+    )
+
+    response = client.get("/api/v1/money_flows/page", params={"limit": 2})
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "items": [
+            {
+                "id": 1,
+                "title": "お米",
+                "amount": 4200,
+                "occurred_date": "2025-04-01T00:00:00",
+                "kind": "expense",
+                "version": 1,
+            }
+        ],
+        "next_cursor": None,
+    }
+
+
+# GETテスト（カーソルページネーション：不正なカーソル）
+@pytest.mark.usefixtures("override_get_db_success")
+def test_get_money_flows_paginated_invalid_cursor() -> None:
+    response = client.get("/api/v1/money_flows/page", params={"cursor": "不正なカーソル"})
+
+    assert response.status_code == 422
+    assert response.json() == {"detail": "カーソルが不正です。"}
@@ -0,0 +1,367 @@
+# 非同期版のルーター（DB_MODE=async）を、非同期ドライバ（aiosqlite）のSQLiteで動かしてテストする
+# main.pyのappはDB_MODE=sync（デフォルト）で起動するため、非同期版のルーターだけを載せたappを作る
+
+import inspect
+
+from collections.abc import AsyncIterator, Iterator
+from datetime import datetime
+
+import pytest
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from todo_app.api.v1.money_flows import router as money_flows_sync_router
+from todo_app.api.v1.money_flows_async import router as money_flows_async_router
+from todo_app.handlers.server_exception_handler import handler
+from todo_app.models.db.async_base import get_async_db
+from todo_app.models.db.money_flows import MoneyFlowKind, MoneyFlows
+from todo_app.repositories.money_flow_monthly_summary import (
+    get_stored_monthly_summaries,
+    rebuild_monthly_summaries,
+)
+
+async_app = FastAPI()
+async_app.include_router(money_flows_async_router, prefix="/api/v1/money_flows")
+async_app.add_exception_handler(Exception, handler)
+
+client = TestClient(async_app)
+
+
+# get_async_dbを、aiosqliteのSQLite（async_sqlite_engine：tests/conftest.pyのフィクスチャ）に差し替える
+# 戻り値：テスト側でデータを確認するための、同じDBファイルに接続した同期のセッション
+@pytest.fixture
+def sqlite_db(async_sqlite_engine: AsyncEngine) -> Iterator[Session]:
+    session_factory = async_sessionmaker(bind=async_sqlite_engine, expire_on_commit=False)
+
+    async def _sqlite_db() -> AsyncIterator[AsyncSession]:
+        async with session_factory() as db:
+            yield db
+
+    async_app.dependency_overrides[get_async_db] = _sqlite_db
+
+    sync_engine = create_engine(async_sqlite_engine.url.set(drivername="sqlite"))
+    with Session(sync_engine) as db:
+        yield db
+    sync_engine.dispose()
+
+    async_app.dependency_overrides.pop(get_async_db, None)
+
+
+def add_money_flows(session: Session) -> list[int]:
+    items = [
+        MoneyFlows(
+            title="お米",
+            amount=4200,
+            occurred_date=datetime(2025, 4, 1),
+            kind=MoneyFlowKind.EXPENSE,
+        ),
+        MoneyFlows(
+            title="給料",
+            amount=200000,
+            occurred_date=datetime(2025, 4, 25),
+            kind=MoneyFlowKind.INCOME,
+        ),
+        MoneyFlows(
+            title="電気代",
+            amount=5000,
+            occurred_date=datetime(2025, 5, 1),
+            kind=MoneyFlowKind.EXPENSE,
+        ),
+    ]
+    session.add_all(items)
+    session.commit()
+    return [item.id for item in items]
+
+
+# 同期版と同じパス・メソッドのルートが、すべてasync defで定義されていること
+def test_async_router_matches_sync_router() -> None:
+    def route_keys(routes: list[APIRoute]) -> set[tuple[str, str]]:
+        return {(route.path, method) for route in routes for method in route.methods}
+
+    assert route_keys(money_flows_async_router.routes) == route_keys(money_flows_sync_router.routes)
+    assert all(
+        inspect.iscoroutinefunction(route.endpoint) for route in money_flows_async_router.routes
+    )
+
+
+# GETテスト（絞り込み）
+def test_get_money_flows(sqlite_db: Session) -> None:
+    add_money_flows(sqlite_db)
+
+    response = client.get("/api/v1/money_flows", params={"kind": "expense", "order": "desc"})
+
+    assert response.status_code == 200
+    assert [item["title"] for item in response.json()] == ["電気代", "お米"]
+
+
+# GETテスト（カーソルページネーション）
+def test_get_money_flows_paginated(sqlite_db: Session) -> None:
+    add_money_flows(sqlite_db)
+
+    first = client.get("/api/v1/money_flows/page", params={"limit": 2}).json()
+    second = client.get(
+        "/api/v1/money_flows/page", params={"limit": 2, "cursor": first["next_cursor"]}
+    ).json()
+
+    assert [item["title"] for item in first["items"]] == ["お米", "給料"]
+    assert [item["title"] for item in second["items"]] == ["電気代"]
+    assert second["next_cursor"] is None
+
+
+# GETテスト（タイトル検索）
+def test_search_money_flows(sqlite_db: Session) -> None:
+    add_money_flows(sqlite_db)
+
+    response = client.get("/api/v1/money_flows/search", params={"q": "電気"})
+
+    assert response.status_code == 200
+    assert [(item["title"], item["rank"]) for item in response.json()["items"]] == [("電気代", 1)]
+
+
+# GETテスト（残高）
+def test_get_money_flows_balance(sqlite_db: Session) -> None:
+    add_money_flows(sqlite_db)
+    rebuild_monthly_summaries(sqlite_db)
+    sqlite_db.commit()
+
+    balance = client.get("/api/v1/money_flows/balance", params={"as_of": "2025-05-01T00:00:00"})
+    running = client.get("/api/v1/money_flows/running_balance")
+
+    assert balance.json() == {"as_of": "2025-05-01T00:00:00", "balance": 195800}
+    assert [item["balance"] for item in running.json()["items"]] == [-4200, 195800, 190800]
+
+
+# GETテスト（集計）
+def test_get_money_flow_aggregates(sqlite_db: Session) -> None:
+    add_money_flows(sqlite_db)
+
+    response = client.get("/api/v1/money_flows/aggregates", params={"period": "month"})
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"period": "2025-04", "kind": "expense", "total_amount": 4200, "count": 1},
+        {"period": "2025-04", "kind": "income", "total_amount": 200000, "count": 1},
+        {"period": "2025-05", "kind": "expense", "total_amount": 5000, "count": 1},
+    ]
+
+
+# POST → PUT → DELETEで、money_flowsと月次集計テーブルが同じトランザクションで更新されること
+def test_create_update_delete_money_flow(sqlite_db: Session) -> None:
+    created = client.post(
+        "/api/v1/money_flows",
+        json={
+            "title": "お米",
+            "amount": 4200,
+            "occurred_date": "2025-04-01T00:00:00",
+            "kind": "expense",
+        },
+    )
+    assert created.status_code == 200
+    id = created.json()["id"]
+    assert id is not None
+
+    updated = client.put(
+        "/api/v1/money_flows",
+        json={
+            "id": id,
+            "title": "お米（5kg）",
+            "amount": 4500,
+            "occurred_date": "2025-05-01T00:00:00",
+            "kind": "expense",
+        },
+    )
+    assert updated.status_code == 200
+    assert updated.json()["title"] == "お米（5kg）"
+    assert (created.json()["version"], updated.json()["version"]) == (1, 2)
+    assert get_stored_monthly_summaries(sqlite_db) == {
+        (202505, MoneyFlowKind.EXPENSE): (4500, 1),
+    }
+
+    # 古いversionでの更新は409で、上書きしない
+    stale = client.put(
+        "/api/v1/money_flows",
+        json={
+            "id": id,
+            "title": "古い",
+            "amount": 1,
+            "occurred_date": "2025-05-01T00:00:00",
+            "version": 1,
+        },
+    )
+    assert stale.status_code == 409
+    assert get_stored_monthly_summaries(sqlite_db) == {
+        (202505, MoneyFlowKind.EXPENSE): (4500, 1),
+    }
+
+    deleted = client.request("DELETE", "/api/v1/money_flows", json={"id": id})
+    assert deleted.status_code == 204
+    assert sqlite_db.query(MoneyFlows).count() == 0
+    assert get_stored_monthly_summaries(sqlite_db) == {}
+
+
+# POSTテスト（コミットに失敗した場合）
+# ロールバックしたうえで500を返し、登録も月次集計への反映もされないこと
+def test_create_money_flow_commit_error(
+    sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def _failing_commit(self: AsyncSession) -> None:
+        raise Exception("コミットに失敗しました")
+
+    monkeypatch.setattr(AsyncSession, "commit", _failing_commit)
+
+    response = TestClient(async_app, raise_server_exceptions=False).post(
+        "/api/v1/money_flows",
+        json={"title": "お米", "amount": 4200, "occurred_date": "2025-04-01T00:00:00"},
+    )
+
+    assert response.status_code == 500
+    assert sqlite_db.query(MoneyFlows).count() == 0
+    assert get_stored_monthly_summaries(sqlite_db) == {}
+
+
+# PUTテスト（コミットに失敗した場合）
+# 更新していない値・versionを成功として返さず、500を返すこと
+def test_update_money_flow_commit_error(
+    sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    id = add_money_flows(sqlite_db)[0]
+
+    async def _failing_commit(self: AsyncSession) -> None:
+        raise Exception("コミットに失敗しました")
+
+    monkeypatch.setattr(AsyncSession, "commit", _failing_commit)
+
+    response = TestClient(async_app, raise_server_exceptions=False).put(
+        "/api/v1/money_flows",
+        json={
+            "id": id,
+            "title": "お米",
+            "amount": 2,
+            "occurred_date": "2025-04-01T00:00:00",
+            "kind": "expense",
+        },
+    )
+
+    assert response.status_code == 500
+    sqlite_db.expire_all()
+    assert sqlite_db.get(MoneyFlows, id).version == 1
+
+
+# DELETEテスト（コミットに失敗した場合）
+# 削除できなかったのに204を返さず、行も月次集計もそのまま残ること
+def test_delete_money_flow_commit_error(
+    sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    id = add_money_flows(sqlite_db)[0]
+    summaries = get_stored_monthly_summaries(sqlite_db)
+
+    async def _failing_commit(self: AsyncSession) -> None:
+        raise Exception("コミットに失敗しました")
+
+    monkeypatch.setattr(AsyncSession, "commit", _failing_commit)
+
+    response = TestClient(async_app, raise_server_exceptions=False).request(
+        "DELETE", "/api/v1/money_flows", json={"id": id}
+    )
+
+    assert response.status_code == 500
+    assert sqlite_db.query(MoneyFlows).count() == 3
+    assert get_stored_monthly_summaries(sqlite_db) == summaries
+
+
+# POSTテスト（一括登録：commit_per_chunk=Trueで2つ目のチャンクのcommitに失敗した場合）
+# 同期版と同じく500にしたうえで、1つ目のチャンクのidを返すこと
+def test_create_money_flows_bulk_partial_commit(
+    sqlite_db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    commit = AsyncSession.commit
+    calls = []
+
+    async def _fail_second_commit(self: AsyncSession) -> None:
+        calls.append(None)
+        if len(calls) == 2:
+            raise Exception("コミットに失敗しました")
+        await commit(self)
+
+    monkeypatch.setattr(AsyncSession, "commit", _fail_second_commit)
+    body = [
+        {"title": f"タイトル{i}", "amount": 100, "occurred_date": "2025-04-01T00:00:00"}
+        for i in range(2)
+    ]
+
+    response = TestClient(async_app, raise_server_exceptions=False).post(
+        "/api/v1/money_flows/bulk", json=body, params={"chunk_size": 1, "commit_per_chunk": True}
+    )
+
+    assert response.status_code == 500
+    assert response.json()["detail"]["ids"] == [
+        item.id for item in sqlite_db.query(MoneyFlows).all()
+    ]
+    assert [item.title for item in sqlite_db.query(MoneyFlows).all()] == ["タイトル0"]
+
+
+# PUTテスト（存在しないID → BusinessException）
+@pytest.mark.usefixtures("sqlite_db")
+def test_update_money_flow_not_found() -> None:
+    response = client.put(
+        "/api/v1/money_flows",
+        json={
+            "id": 999,
+            "title": "お米",
+            "amount": 4200,
+            "occurred_date": "2025-04-01T00:00:00",
+            "kind": "expense",
+        },
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == "指定したIDが存在しません。"
+
+
+# 一括登録・更新・削除（複数行INSERTのidの採番もaiosqliteで同じになること）
+def test_bulk_money_flows(sqlite_db: Session) -> None:
+    existing_ids = add_money_flows(sqlite_db)
+
+    created = client.post(
+        "/api/v1/money_flows/bulk",
+        json=[
+            {
+                "title": f"タイトル{i}",
+                "amount": 100,
+                "occurred_date": "2025-06-01T00:00:00",
+                "kind": "expense",
+            }
+            for i in range(3)
+        ],
+        params={"chunk_size": 2},
+    )
+    assert created.status_code == 200
+    ids = created.json()["ids"]
+    assert ids == [existing_ids[-1] + 1, existing_ids[-1] + 2, existing_ids[-1] + 3]
+
+    updated = client.put(
+        "/api/v1/money_flows/bulk",
+        json=[
+            {
+                "id": id,
+                "title": "更新後",
+                "amount": 300,
+                "occurred_date": "2025-06-02T00:00:00",
+                "kind": "income",
+            }
+            for id in ids
+        ],
+    )
+    assert updated.status_code == 200
+    assert {item.title for item in sqlite_db.query(MoneyFlows).where(MoneyFlows.id.in_(ids))} == {
+        "更新後"
+    }
+
+    deleted = client.request("DELETE", "/api/v1/money_flows/bulk", json={"ids": ids})
+    assert deleted.status_code == 204
+    assert sqlite_db.query(MoneyFlows).count() == len(existing_ids)
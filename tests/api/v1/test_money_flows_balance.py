@@ -0,0 +1,89 @@
+# 残高のテスト（GET /api/v1/money_flows/balance、/running_balance）
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from todo_app.main import app
+
+client = TestClient(app)
+
+
+def post_money_flow(title: str, amount: int, occurred_date: str, kind: str) -> dict:
+    return client.post(
+        "/api/v1/money_flows",
+        json={"title": title, "amount": amount, "occurred_date": occurred_date, "kind": kind},
+    ).json()
+
+
+def get_balance(as_of: str) -> int:
+    return client.get("/api/v1/money_flows/balance", params={"as_of": as_of}).json()["balance"]
+
+
+# 金額・収支・発生日時を変更・削除すると、変わった月のチェックポイント（月次集計）が増減し、残高に反映されること
+def test_balance_follows_edits(override_get_db_sqlite: Session) -> None:
+    post_money_flow("給料", 200000, "2025-03-25T00:00:00", "income")
+    rice = post_money_flow("お米", 4200, "2025-04-01T00:00:00", "expense")
+
+    assert get_balance("2025-05-01T00:00:00") == 195800
+
+    # 3月に移して、金額を変え、収入にする
+    client.put(
+        "/api/v1/money_flows",
+        json=rice | {"amount": 1000, "occurred_date": "2025-03-01T00:00:00", "kind": "income"},
+    )
+    assert get_balance("2025-03-02T00:00:00") == 1000
+    assert get_balance("2025-05-01T00:00:00") == 201000
+
+    client.request("DELETE", "/api/v1/money_flows", json={"id": rice["id"]})
+    assert get_balance("2025-05-01T00:00:00") == 200000
+
+
+# タイムゾーン付きのas_of（Z）も、日本時間の同じ時刻の残高を返すこと
+def test_balance_with_timezone(override_get_db_sqlite: Session) -> None:
+    post_money_flow("給料", 300, "2025-03-25T00:00:00", "income")
+    post_money_flow("お米", 150, "2025-04-01T00:00:00", "expense")
+
+    assert get_balance("2025-03-31T15:30:00Z") == 150
+    assert get_balance("2025-04-01T00:30:00+09:00") == 150
+    assert get_balance("2025-04-01T00:30:00") == 150
+    assert get_balance("2025-03-31T14:30:00Z") == 300
+
+
+def test_running_balance(override_get_db_sqlite: Session) -> None:
+    post_money_flow("給料", 200000, "2025-03-25T00:00:00", "income")
+    post_money_flow("お米", 4200, "2025-04-01T00:00:00", "expense")
+    post_money_flow("お菓子", 300, "2025-04-02T00:00:00", "expense")
+
+    first = client.get(
+        "/api/v1/money_flows/running_balance", params={"from": "2025-04-01T00:00:00", "limit": 1}
+    ).json()
+    second = client.get(
+        "/api/v1/money_flows/running_balance",
+        params={"from": "2025-04-01T00:00:00", "limit": 1, "cursor": first["next_cursor"]},
+    ).json()
+
+    assert first["items"] == [
+        {
+            "id": 2,
+            "title": "お米",
+            "amount": 4200,
+            "occurred_date": "2025-04-01T00:00:00",
+            "kind": "expense",
+            "version": 1,
+            "balance": 195800,
+        }
+    ]
+    assert [item["balance"] for item in second["items"]] == [195500]
+    assert second["next_cursor"] is None
+
+
+# タイムゾーン付きのfrom（日本時間の2025-04-01 00:00）でも、日本時間の同じ時刻から返すこと
+def test_running_balance_with_timezone(override_get_db_sqlite: Session) -> None:
+    post_money_flow("給料", 200000, "2025-03-25T00:00:00", "income")
+    post_money_flow("お米", 4200, "2025-04-01T00:00:00", "expense")
+
+    response = client.get(
+        "/api/v1/money_flows/running_balance", params={"from": "2025-03-31T15:00:00Z"}
+    ).json()
+
+    assert [(item["title"], item["balance"]) for item in response["items"]] == [("お米", 195800)]
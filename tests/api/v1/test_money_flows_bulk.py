@@ -0,0 +1,222 @@
+# 一括系のAPIは、複数行INSERTなど実際のSQLの動きを確認するため、インメモリSQLiteを使ってテストする
+
+from datetime import datetime
+
+import pytest
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from todo_app.api.v1 import money_flows as money_flows_router
+from todo_app.main import app
+from todo_app.models.db.money_flows import MoneyFlowKind, MoneyFlows
+from todo_app.repositories.money_flow_monthly_summary import get_stored_monthly_summaries
+
+client = TestClient(app)
+
+
+def build_body(count: int) -> list[dict]:
+    return [
+        {
+            "title": f"タイトル{i}",
+            "amount": 100 * (i + 1),
+            "occurred_date": f"2025-04-{i + 1:02d}T00:00:00",
+            "kind": "income" if i % 2 else "expense",
+        }
+        for i in range(count)
+    ]
+
+
+# POSTテスト（一括登録）
+# チャンクに分けて登録しても、採番されたidがリクエストと同じ順番で返ること
+@pytest.mark.parametrize("commit_per_chunk", [False, True])
+def test_create_money_flows_bulk(
+    override_get_db_sqlite: Session, commit_per_chunk: bool
+) -> None:
+    body = build_body(5)
+
+    response = client.post(
+        "/api/v1/money_flows/bulk",
+        json=body,
+        params={"chunk_size": 2, "commit_per_chunk": commit_per_chunk},
+    )
+
+    assert response.status_code == 200
+    ids = response.json()["ids"]
+    assert len(ids) == 5
+
+    saved = {item.id: item for item in override_get_db_sqlite.query(MoneyFlows).all()}
+    assert [saved[id].title for id in ids] == [item["title"] for item in body]
+    assert saved[ids[0]].occurred_date == datetime(2025, 4, 1)
+    assert saved[ids[1]].kind == MoneyFlowKind.INCOME
+
+    # 月次集計テーブルにも反映されていること
+    assert get_stored_monthly_summaries(override_get_db_sqlite) == {
+        (202504, MoneyFlowKind.EXPENSE): (100 + 300 + 500, 3),
+        (202504, MoneyFlowKind.INCOME): (200 + 400, 2),
+    }
+
+
+# POSTテスト（一括登録：commit_per_chunk=Trueで途中のチャンクが失敗した場合）
+# 500にしたうえで、commit済みのチャンクの行のidを返すこと
+def test_create_money_flows_bulk_partial_commit(
+    override_get_db_sqlite: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    apply_deltas = money_flows_router.apply_monthly_summary_deltas
+    calls = []
+
+    def fail_on_second_chunk(session: Session, deltas: object) -> None:
+        calls.append(None)
+        if len(calls) == 2:
+            raise RuntimeError("2つ目のチャンクで失敗")
+        apply_deltas(session, deltas)
+
+    monkeypatch.setattr(money_flows_router, "apply_monthly_summary_deltas", fail_on_second_chunk)
+
+    response = TestClient(app, raise_server_exceptions=False).post(
+        "/api/v1/money_flows/bulk",
+        json=build_body(5),
+        params={"chunk_size": 2, "commit_per_chunk": True},
+    )
+
+    assert response.status_code == 500
+    ids = response.json()["detail"]["ids"]
+    assert [item.title for item in override_get_db_sqlite.query(MoneyFlows).all()] == [
+        "タイトル0",
+        "タイトル1",
+    ]
+    assert ids == [item.id for item in override_get_db_sqlite.query(MoneyFlows).all()]
+
+
+# POSTテスト（一括登録：1件でもバリデーションエラーがあれば、何も登録されない）
+def test_create_money_flows_bulk_validation_error(override_get_db_sqlite: Session) -> None:
+    body = build_body(3)
+    body[2]["kind"] = "unknown"
+
+    response = client.post("/api/v1/money_flows/bulk", json=body)
+
+    assert response.status_code == 422
+    assert override_get_db_sqlite.query(MoneyFlows).count() == 0
+
+
+# POSTテスト（一括登録：空の配列は受け付けない）
+@pytest.mark.usefixtures("override_get_db_sqlite")
+def test_create_money_flows_bulk_empty() -> None:
+    response = client.post("/api/v1/money_flows/bulk", json=[])
+
+    assert response.status_code == 422
+
+
+# 一括更新・削除のテスト用に、事前にデータを登録しておく（月次集計テーブルにも反映される）
+def create_existing(count: int) -> list[int]:
+    response = client.post("/api/v1/money_flows/bulk", json=build_body(count))
+    return response.json()["ids"]
+
+
+# PUTテスト（一括更新）
+# CASE式を使ったUPDATE文1文で更新され、月・種類が変わった行は両方の月次集計が増減すること
+def test_update_money_flows_bulk(override_get_db_sqlite: Session) -> None:
+    ids = create_existing(2)  # 4/1 expense 100, 4/2 income 200
+    statements = []
+
+    @event.listens_for(override_get_db_sqlite.get_bind(), "before_cursor_execute")
+    def _collect(
+        conn: object,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    body = [
+        {
+            "id": ids[0],
+            "title": "更新後1",
+            "amount": 150,
+            "occurred_date": "2025-05-10T00:00:00",  # 月が変わる
+            "kind": "expense",
+        },
+        {
+            "id": ids[1],
+            "title": "更新後2",
+            "amount": 250,
+            "occurred_date": "2025-04-02T00:00:00",
+            "kind": "expense",  # 種類が変わる
+        },
+    ]
+
+    response = client.put("/api/v1/money_flows/bulk", json=body)
+
+    assert response.status_code == 200
+    assert response.json() == [{**item, "version": 2} for item in body]
+
+    override_get_db_sqlite.expire_all()
+    saved = {item.id: item for item in override_get_db_sqlite.query(MoneyFlows).all()}
+    assert (saved[ids[0]].title, saved[ids[0]].occurred_date) == ("更新後1", datetime(2025, 5, 10))
+    assert (saved[ids[1]].amount, saved[ids[1]].kind) == (250, MoneyFlowKind.EXPENSE)
+    assert [saved[id].version for id in ids] == [2, 2]  # 一括更新でもversionが1増える
+
+    assert get_stored_monthly_summaries(override_get_db_sqlite) == {
+        (202504, MoneyFlowKind.EXPENSE): (250, 1),
+        (202505, MoneyFlowKind.EXPENSE): (150, 1),
+    }
+
+    updates = [statement for statement in statements if statement.startswith("UPDATE money_flows ")]
+    assert len(updates) == 1
+    assert "CASE money_flows.id WHEN" in updates[0]
+
+
+# PUTテスト（一括更新：存在しないIDが含まれる場合は、何も更新せずBusinessException）
+def test_update_money_flows_bulk_not_found(override_get_db_sqlite: Session) -> None:
+    ids = create_existing(1)
+    body = [
+        {"id": id, "title": "更新後", "amount": 1, "occurred_date": "2025-04-01T00:00:00"}
+        for id in [ids[0], 998, 999]
+    ]
+
+    response = client.put("/api/v1/money_flows/bulk", json=body)
+
+    assert response.status_code == 422
+    assert response.json() == {"detail": "指定したIDが存在しません。（id: 998, 999）"}
+    override_get_db_sqlite.expire_all()
+    assert override_get_db_sqlite.get(MoneyFlows, ids[0]).title == "タイトル0"
+
+
+# PUTテスト（一括更新：同じIDが複数含まれる場合）
+@pytest.mark.usefixtures("override_get_db_sqlite")
+def test_update_money_flows_bulk_duplicate_id() -> None:
+    body = [{"id": 1, "title": "更新後", "amount": 1, "occurred_date": "2025-04-01T00:00:00"}] * 2
+
+    response = client.put("/api/v1/money_flows/bulk", json=body)
+
+    assert response.status_code == 422
+    assert response.json() == {"detail": "同じIDが複数指定されています。"}
+
+
+# DELETEテスト（一括削除）
+def test_delete_money_flows_bulk(override_get_db_sqlite: Session) -> None:
+    ids = create_existing(3)
+
+    response = client.request(
+        "DELETE", "/api/v1/money_flows/bulk", json={"ids": [ids[0], ids[2], ids[0]]}
+    )
+
+    assert response.status_code == 204
+    assert [item.id for item in override_get_db_sqlite.query(MoneyFlows).all()] == [ids[1]]
+    assert get_stored_monthly_summaries(override_get_db_sqlite) == {
+        (202504, MoneyFlowKind.INCOME): (200, 1),
+    }
+
+
+# DELETEテスト（一括削除：存在しないIDが含まれる場合は、何も削除せずBusinessException）
+def test_delete_money_flows_bulk_not_found(override_get_db_sqlite: Session) -> None:
+    ids = create_existing(1)
+
+    response = client.request("DELETE", "/api/v1/money_flows/bulk", json={"ids": [ids[0], 999]})
+
+    assert response.status_code == 422
+    assert response.json() == {"detail": "指定したIDが存在しません。（id: 999）"}
+    assert override_get_db_sqlite.query(MoneyFlows).count() == 1
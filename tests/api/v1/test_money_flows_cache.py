@@ -0,0 +1,93 @@
+# 読み取りキャッシュのテスト（同じ条件の一覧・集計はDBを読まず、書き込み後は読み直す）
+
+from datetime import datetime
+
+import pytest
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from todo_app.main import app
+from todo_app.models.db.money_flows import MoneyFlowKind
+from todo_app.repositories.money_flows import insert_money_flows
+
+client = TestClient(app)
+
+
+def test_read_cache_and_invalidation(override_get_db_sqlite: Session) -> None:
+    body = {"title": "お米", "amount": 4200, "occurred_date": "2025-04-01T00:00:00"}
+    client.post("/api/v1/money_flows", json=body | {"kind": "expense"})
+    statements = []
+
+    @event.listens_for(override_get_db_sqlite.get_bind(), "before_cursor_execute")
+    def _collect(
+        conn: object,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    first = client.get("/api/v1/money_flows/aggregates")
+    count_after_first = len(statements)
+    second = client.get("/api/v1/money_flows/aggregates")
+
+    # 2回目は集計を読まず、ETag用のバージョンだけを読む（バージョンはキャッシュしない）
+    assert second.json() == first.json()
+    assert len(statements) == count_after_first + 1
+    assert "max(money_flows.updated_at)" in statements[-1]
+
+    # 書き込み後は、キャッシュが消えて最新のデータを返す
+    client.post("/api/v1/money_flows", json=body | {"kind": "income"})
+    third = client.get("/api/v1/money_flows/aggregates")
+
+    assert [item["kind"] for item in third.json()] == ["expense", "income"]
+
+    stats = client.get("/api/v1/monitoring/cache").json()
+    assert stats["hits"] >= 1  # 集計
+    assert stats["invalidations"] >= 1
+
+
+# 他のワーカーで書き込まれた場合（このワーカーのキャッシュは無効化されない）も、
+# 古いETag・古い一覧を返さないこと（バージョンはキャッシュせず、一覧のキャッシュのキーに含める）
+def test_read_cache_after_write_in_other_worker(override_get_db_sqlite: Session) -> None:
+    body = {"title": "お米", "amount": 4200, "occurred_date": "2025-04-01T00:00:00"}
+    client.post("/api/v1/money_flows", json=body)
+    first = client.get("/api/v1/money_flows")
+
+    insert_money_flows(
+        override_get_db_sqlite,
+        [("給料", 2000, datetime(2025, 4, 2), MoneyFlowKind.INCOME, *[datetime(2025, 4, 30)] * 2)],
+    )
+    override_get_db_sqlite.commit()
+
+    second = client.get("/api/v1/money_flows", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert [item["title"] for item in second.json()] == ["お米", "給料"]
+
+
+# ページ・検索はキャッシュしないため、他のワーカーで書き込まれた行もすぐに返すこと
+@pytest.mark.parametrize(
+    "path", ["/api/v1/money_flows/page", "/api/v1/money_flows/search?q=%E3%81%8A&match=prefix"]
+)
+def test_page_and_search_after_write_in_other_worker(
+    override_get_db_sqlite: Session, path: str
+) -> None:
+    body = {"title": "お米", "amount": 4200, "occurred_date": "2025-04-01T00:00:00"}
+    client.post("/api/v1/money_flows", json=body)
+    client.get(path)
+
+    insert_money_flows(
+        override_get_db_sqlite,
+        [("お茶", 300, datetime(2025, 4, 2), MoneyFlowKind.EXPENSE, *[datetime(2025, 4, 30)] * 2)],
+    )
+    override_get_db_sqlite.commit()
+
+    response = client.get(path)
+
+    assert sorted(item["title"] for item in response.json()["items"]) == ["お米", "お茶"]
@@ -0,0 +1,104 @@
+# 条件付きGET（ETag / If-None-Match → 304）のテスト
+# データのバージョン（MAX(updated_at)と件数）を実際のSQLで確認するため、インメモリSQLiteを使う
+
+import pytest
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from todo_app.main import app
+
+client = TestClient(app)
+
+
+def create_money_flow(occurred_date: str = "2025-04-01T00:00:00") -> int:
+    response = client.post(
+        "/api/v1/money_flows",
+        json={"title": "お米", "amount": 4200, "occurred_date": occurred_date, "kind": "expense"},
+    )
+    return response.json()["id"]
+
+
+def collect_statements(session: Session) -> list[str]:
+    statements = []
+
+    @event.listens_for(session.get_bind(), "before_cursor_execute")
+    def _collect(
+        conn: object,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    return statements
+
+
+# 変更がなければ、行を読まずに304（中身なし）を返す
+@pytest.mark.parametrize("path", ["/api/v1/money_flows", "/api/v1/money_flows/aggregates"])
+def test_get_not_modified(override_get_db_sqlite: Session, path: str) -> None:
+    create_money_flow()
+
+    first = client.get(path)
+    assert first.status_code == 200
+    assert first.headers["ETag"].startswith('W/"')
+    assert "Last-Modified" in first.headers
+    assert first.headers["Cache-Control"] == "no-cache"
+
+    statements = collect_statements(override_get_db_sqlite)
+    second = client.get(path, headers={"If-None-Match": first.headers["ETag"]})
+
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["ETag"] == first.headers["ETag"]
+    # 行は読んでいない（バージョン（MAX(updated_at), COUNT(*)）は読み取りキャッシュから返ることもある）
+    assert all(
+        statement.startswith("SELECT max(money_flows.updated_at)") for statement in statements
+    )
+
+
+# 登録・更新・削除でETagが変わり、200で最新のデータを返す
+def test_get_modified_after_write(override_get_db_sqlite: Session) -> None:
+    id = create_money_flow()
+    etags = [client.get("/api/v1/money_flows").headers["ETag"]]
+
+    create_money_flow()
+    etags.append(client.get("/api/v1/money_flows").headers["ETag"])
+
+    client.put(
+        "/api/v1/money_flows",
+        json={
+            "id": id,
+            "title": "お米（5kg）",
+            "amount": 4500,
+            "occurred_date": "2025-04-01T00:00:00",
+            "kind": "expense",
+        },
+    )
+    etags.append(client.get("/api/v1/money_flows").headers["ETag"])
+
+    client.request("DELETE", "/api/v1/money_flows", json={"id": id})
+    response = client.get("/api/v1/money_flows", headers={"If-None-Match": etags[-1]})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    etags.append(response.headers["ETag"])
+    assert len(set(etags)) == 4
+
+
+# 絞り込み条件・集計の単位が違えば、データが同じでもETagは別になる
+@pytest.mark.usefixtures("override_get_db_sqlite")
+def test_etag_depends_on_params() -> None:
+    create_money_flow()
+
+    etags = {
+        client.get("/api/v1/money_flows").headers["ETag"],
+        client.get("/api/v1/money_flows", params={"order": "desc"}).headers["ETag"],
+        client.get("/api/v1/money_flows/aggregates").headers["ETag"],
+        client.get("/api/v1/money_flows/aggregates", params={"period": "year"}).headers["ETag"],
+    }
+
+    assert len(etags) == 4
@@ -0,0 +1,172 @@
+# エンドポイントごとのクエリ数の上限（クエリバジェット）のテスト
+# 1リクエストで発行するSQLの数が上限を超えないこと、件数が増えてもSQLの数が増えないこと（N+1になっていないこと）を確認する
+# 上限を変える場合は、増えた理由をコメントに書くこと
+
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta
+
+import pytest
+
+from fastapi.testclient import TestClient
+from httpx import Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from todo_app.cache.read_cache import read_cache
+from todo_app.main import app
+from todo_app.models.db.money_flows import MoneyFlowKind
+from todo_app.repositories.money_flow_monthly_summary import rebuild_monthly_summaries
+from todo_app.repositories.money_flows import insert_money_flows
+
+client = TestClient(app)
+
+SEED_START = datetime(2025, 4, 1)
+
+# (リクエスト, 上限)
+# リクエスト：登録済みのidのリストを受け取り、APIを1回呼ぶ関数
+BUDGETS: dict[str, tuple[Callable[[list[int]], Response], int]] = {
+    # バージョン（ETag用）と一覧
+    "GET /money_flows": (lambda ids: client.get("/api/v1/money_flows"), 2),
+    "GET /money_flows/page": (
+        lambda ids: client.get("/api/v1/money_flows/page", params={"limit": 5}),
+        1,
+    ),
+    # 1行ごとの累計と、ページの先頭より前の残高
+    "GET /money_flows/running_balance": (
+        lambda ids: client.get("/api/v1/money_flows/running_balance", params={"limit": 5}),
+        2,
+    ),
+    "GET /money_flows/balance": (
+        lambda ids: client.get("/api/v1/money_flows/balance", params={"as_of": "2025-05-01"}),
+        1,
+    ),
+    "GET /money_flows/search": (
+        lambda ids: client.get("/api/v1/money_flows/search", params={"q": "タイトル"}),
+        1,
+    ),
+    # バージョン（ETag用）と集計
+    "GET /money_flows/aggregates": (
+        lambda ids: client.get("/api/v1/money_flows/aggregates", params={"period": "month"}),
+        2,
+    ),
+    "GET /money_flows/monthly_summary": (
+        lambda ids: client.get("/api/v1/money_flows/monthly_summary"),
+        1,
+    ),
+    # 登録と月次集計のUPSERT
+    "POST /money_flows": (
+        lambda ids: client.post(
+            "/api/v1/money_flows",
+            json={"title": "お米", "amount": 4200, "occurred_date": "2025-04-01T00:00:00"},
+        ),
+        2,
+    ),
+    # 複数行INSERTと月次集計のUPSERT（BULK_INSERT_CHUNK_SIZE件ごとに1文）
+    "POST /money_flows/bulk": (
+        lambda ids: client.post(
+            "/api/v1/money_flows/bulk",
+            json=[
+                {"title": f"お米{i}", "amount": 100, "occurred_date": "2025-04-01T00:00:00"}
+                for i in range(len(ids))
+            ],
+        ),
+        2,
+    ),
+    # 更新前の値の取得・UPDATE・月次集計のUPSERT
+    "PUT /money_flows": (
+        lambda ids: client.put(
+            "/api/v1/money_flows",
+            json={
+                "id": ids[0],
+                "title": "お米",
+                "amount": 3800,
+                "occurred_date": "2025-04-01T00:00:00",
+            },
+        ),
+        3,
+    ),
+    "PUT /money_flows/bulk": (
+        lambda ids: client.put(
+            "/api/v1/money_flows/bulk",
+            json=[
+                {"id": id, "title": "お米", "amount": 3800, "occurred_date": "2025-04-01T00:00:00"}
+                for id in ids
+            ],
+        ),
+        3,
+    ),
+    # 削除前の値の取得・DELETE・月次集計のUPSERT
+    "DELETE /money_flows": (
+        lambda ids: client.request("DELETE", "/api/v1/money_flows", json={"id": ids[0]}),
+        3,
+    ),
+    "DELETE /money_flows/bulk": (
+        lambda ids: client.request("DELETE", "/api/v1/money_flows/bulk", json={"ids": ids}),
+        3,
+    ),
+}
+
+
+@pytest.fixture
+def statements(
+    override_get_db_sqlite: Session, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[list[str]]:
+    monkeypatch.setattr(read_cache, "enabled", False)  # 毎回DBから読む
+    collected: list[str] = []
+    engine = override_get_db_sqlite.get_bind()
+
+    def _collect(
+        conn: object,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        collected.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _collect)
+    yield collected
+    event.remove(engine, "before_cursor_execute", _collect)
+
+
+def seed(session: Session, count: int) -> list[int]:
+    now = datetime(2025, 4, 30)
+    ids = insert_money_flows(
+        session,
+        [
+            (
+                f"タイトル{i}",
+                100 * (i + 1),
+                SEED_START + timedelta(hours=i),
+                MoneyFlowKind.INCOME if i % 2 else MoneyFlowKind.EXPENSE,
+                now,
+                now,
+            )
+            for i in range(count)
+        ],
+    )
+    rebuild_monthly_summaries(session)
+    session.commit()
+    return ids
+
+
+# 1件でも20件でも、SQLの数が同じで、上限以内であること
+@pytest.mark.parametrize("endpoint", BUDGETS.keys())
+def test_query_budget(
+    override_get_db_sqlite: Session, statements: list[str], endpoint: str
+) -> None:
+    request, budget = BUDGETS[endpoint]
+    counts = []
+
+    for count in (1, 20):
+        ids = seed(override_get_db_sqlite, count)
+        statements.clear()
+
+        response = request(ids)
+
+        assert response.status_code < 400, response.text
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1], f"{endpoint}：件数によってSQLの数が変わる（N+1）：{counts}"
+    assert counts[1] <= budget, f"{endpoint}：SQLの数が上限を超えた：{statements}"
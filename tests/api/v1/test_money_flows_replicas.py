@@ -0,0 +1,224 @@
+# レプリカへの振り分け（get_db）のテスト
+# プライマリとレプリカを別々のSQLiteのファイルにし、違う行を入れておくことで、どちらで読んだかを確認する
+
+import time
+
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session
+
+from todo_app.cache.read_cache import read_cache
+from todo_app.main import app
+from todo_app.models.db import base
+from todo_app.models.db.base import Base
+from todo_app.models.db.money_flows import MoneyFlowKind
+from todo_app.models.db.replicas import READ_PRIMARY_COOKIE, READ_PRIMARY_HEADER, ReplicaSet
+from todo_app.repositories.money_flows import insert_money_flows
+
+
+# テーブルを作り、titleの行を1件入れたSQLiteのエンジン
+def create_sqlite_engine(path: Path, title: str) -> Engine:
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    now = datetime(2025, 4, 30)
+    with Session(engine) as db:
+        insert_money_flows(
+            db, [(title, 100, datetime(2025, 4, 1), MoneyFlowKind.EXPENSE, now, now)]
+        )
+        db.commit()
+    return engine
+
+
+@pytest.fixture
+def primary(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Engine]:
+    monkeypatch.setattr(read_cache, "enabled", False)  # 毎回DBから読む
+    engine = create_sqlite_engine(tmp_path / "primary.db", "プライマリ")
+    monkeypatch.setattr(base, "get_engine", lambda: engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def replica(tmp_path: Path) -> Iterator[Engine]:
+    engine = create_sqlite_engine(tmp_path / "replica.db", "レプリカ")
+    yield engine
+    engine.dispose()
+
+
+# 時刻を進められる時計（レプリカを外す期間の確認用）
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def use_replicas(monkeypatch: pytest.MonkeyPatch, replicas: ReplicaSet | None) -> TestClient:
+    monkeypatch.setattr(base, "get_replica_set", lambda: replicas)
+    return TestClient(app)
+
+
+def read_titles(client: TestClient, headers: dict[str, str] | None = None) -> list[str]:
+    response = client.get("/api/v1/money_flows/page", headers=headers)
+    assert response.status_code == 200
+    return [item["title"] for item in response.json()["items"]]
+
+
+# GETはレプリカで読むこと
+def test_get_reads_from_replica(
+    primary: Engine, replica: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    client = use_replicas(monkeypatch, ReplicaSet([replica]))
+
+    assert read_titles(client) == ["レプリカ"]
+    assert read_titles(client, headers={READ_PRIMARY_HEADER: "1"}) == ["プライマリ"]
+
+
+# 書き込みはプライマリで行い、その後しばらくは同じクライアントの読み取りもプライマリで行うこと
+def test_read_your_writes(
+    primary: Engine, replica: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    client = use_replicas(monkeypatch, ReplicaSet([replica]))
+
+    response = client.post(
+        "/api/v1/money_flows",
+        json={"title": "お米", "amount": 4200, "occurred_date": "2025-04-02T00:00:00"},
+    )
+
+    assert response.status_code == 200
+    assert READ_PRIMARY_COOKIE in response.cookies
+    assert read_titles(client) == ["プライマリ", "お米"]
+
+    # 期限が過ぎたら、レプリカに戻る
+    client.cookies.set(READ_PRIMARY_COOKIE, str(int(time.time()) - 1))
+    assert read_titles(client) == ["レプリカ"]
+
+
+# 読み取りキャッシュを使う場合も、書き込んだクライアントには、他のクライアントがレプリカで読んで
+# キャッシュした結果を返さないこと（レプリカとプライマリで、キャッシュのキーを分ける）
+def test_read_your_writes_with_read_cache(
+    primary: Engine, replica: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    writer = use_replicas(monkeypatch, ReplicaSet([replica]))
+    other = TestClient(app)
+    monkeypatch.setattr(read_cache, "enabled", True)
+
+    response = writer.post(
+        "/api/v1/money_flows",
+        json={"title": "お米", "amount": 4200, "occurred_date": "2025-04-02T00:00:00"},
+    )
+    assert response.status_code == 200
+
+    # 一覧（キャッシュするAPI）で確認する
+    def read_list_titles(client: TestClient) -> list[str]:
+        response = client.get("/api/v1/money_flows")
+        assert response.status_code == 200
+        return [item["title"] for item in response.json()]
+
+    assert read_list_titles(other) == [
+        "レプリカ"
+    ]  # レプリカへの反映が遅れている間に読み、キャッシュされる
+    assert read_list_titles(writer) == ["プライマリ", "お米"]
+    assert read_list_titles(other) == ["レプリカ"]  # キャッシュから返す
+
+
+# 削除（ハンドラーがResponseを直接返す）でも、Cookieを付けてプライマリで読むようにすること
+@pytest.mark.parametrize(
+    ("path", "body"),
+    [("/api/v1/money_flows", {"id": 1}), ("/api/v1/money_flows/bulk", {"ids": [1]})],
+)
+def test_read_your_writes_after_delete(
+    primary: Engine,
+    replica: Engine,
+    monkeypatch: pytest.MonkeyPatch,
+    path: str,
+    body: dict[str, object],
+) -> None:
+    client = use_replicas(monkeypatch, ReplicaSet([replica]))
+
+    response = client.request("DELETE", path, json=body)
+
+    assert response.status_code == 204
+    assert READ_PRIMARY_COOKIE in response.cookies
+    assert read_titles(client) == []
+
+
+# 書き込みに失敗した場合は、Cookieを付けないこと
+def test_no_read_your_writes_on_error(
+    primary: Engine, replica: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    client = use_replicas(monkeypatch, ReplicaSet([replica]))
+
+    response = client.request("DELETE", "/api/v1/money_flows", json={"id": 999})
+
+    assert response.status_code == 422
+    assert READ_PRIMARY_COOKIE not in response.cookies
+
+
+# レプリカを使わない場合は、すべてプライマリで読み書きし、Cookieも付けないこと
+def test_without_replicas(primary: Engine, monkeypatch: pytest.MonkeyPatch) -> None:
+    client = use_replicas(monkeypatch, None)
+
+    response = client.request("DELETE", "/api/v1/money_flows", json={"id": 1})
+
+    assert response.status_code == 204
+    assert READ_PRIMARY_COOKIE not in response.cookies
+    assert read_titles(client) == []
+
+
+# 接続できないレプリカは外し、他のレプリカ（なければプライマリ）で読むこと
+# 外す期間が過ぎたら、もう一度使ってみること
+def test_unhealthy_replica_is_ejected(
+    primary: Engine, replica: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    broken = create_engine("sqlite:////nonexistent/replica.db")
+    replicas = ReplicaSet([broken, replica])
+    client = use_replicas(monkeypatch, replicas)
+
+    assert read_titles(client) == ["レプリカ"]
+    assert replicas.ejections == 1
+    assert replicas.healthy_engines() == [replica]
+
+    clock = FakeClock()
+    replicas = ReplicaSet([broken], eject_seconds=30, clock=clock)
+    client = use_replicas(monkeypatch, replicas)
+
+    assert read_titles(client) == ["プライマリ"]
+    assert read_titles(client) == ["プライマリ"]  # 外している間は試さない
+    assert replicas.ejections == 1
+
+    clock.now = 31
+    assert read_titles(client) == ["プライマリ"]  # もう一度試し、また外す
+    assert replicas.ejections == 2
+
+
+def test_round_robin(replica: Engine, tmp_path: Path) -> None:
+    other = create_sqlite_engine(tmp_path / "other.db", "レプリカ2")
+    replicas = ReplicaSet([replica, other])
+
+    assert [replicas.choose() for _ in range(4)] == [replica, other, replica, other]
+    other.dispose()
+
+
+# 貸し出し中の接続が最も少ないレプリカを選ぶこと
+def test_least_connections(replica: Engine, tmp_path: Path) -> None:
+    other = create_sqlite_engine(tmp_path / "other.db", "レプリカ2")
+    replicas = ReplicaSet([replica, other], strategy="least_connections")
+
+    with replica.connect():
+        assert replicas.choose() is other
+    with other.connect():
+        assert replicas.choose() is replica
+    other.dispose()
+
+
+def test_invalid_strategy() -> None:
+    with pytest.raises(ValueError):
+        ReplicaSet([], strategy="random")
@@ -0,0 +1,66 @@
+# タイトル検索のテスト（GET /api/v1/money_flows/search）
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from todo_app.main import app
+
+client = TestClient(app)
+
+
+def post_money_flows(titles: list[str]) -> None:
+    for day, title in enumerate(titles, start=1):
+        client.post(
+            "/api/v1/money_flows",
+            json={"title": title, "amount": 100, "occurred_date": f"2025-04-{day:02d}T00:00:00"},
+        )
+
+
+# 日本語の部分一致で検索でき、カーソルで次のページを取得できること
+def test_search_money_flows(override_get_db_sqlite: Session) -> None:
+    post_money_flows(["お米券", "新米のお米", "お米", "お菓子"])
+
+    first = client.get("/api/v1/money_flows/search", params={"q": "お米", "limit": 2}).json()
+    second = client.get(
+        "/api/v1/money_flows/search",
+        params={"q": "お米", "limit": 2, "cursor": first["next_cursor"]},
+    ).json()
+
+    assert [(item["title"], item["rank"]) for item in first["items"]] == [
+        ("お米", 0),
+        ("お米券", 1),
+    ]
+    assert first["items"][0] == {
+        "id": 3,
+        "title": "お米",
+        "amount": 100,
+        "occurred_date": "2025-04-03T00:00:00",
+        "kind": "expense",
+        "version": 1,
+        "rank": 0,
+    }
+    assert [item["title"] for item in second["items"]] == ["新米のお米"]
+    assert second["next_cursor"] is None
+
+
+def test_search_money_flows_prefix(override_get_db_sqlite: Session) -> None:
+    post_money_flows(["お米券", "新米のお米"])
+
+    response = client.get("/api/v1/money_flows/search", params={"q": "新", "match": "prefix"})
+
+    assert [item["title"] for item in response.json()["items"]] == ["新米のお米"]
+
+
+# 部分一致は2文字以上（n-gramのインデックスで検索するため）
+def test_search_money_flows_contains_too_short(override_get_db_sqlite: Session) -> None:
+    response = client.get("/api/v1/money_flows/search", params={"q": "米"})
+
+    assert response.status_code == 422
+    assert "2文字以上" in response.json()["detail"]
+
+
+def test_search_money_flows_invalid_cursor(override_get_db_sqlite: Session) -> None:
+    response = client.get("/api/v1/money_flows/search", params={"q": "お米", "cursor": "abc"})
+
+    assert response.status_code == 422
+    assert response.json() == {"detail": "カーソルが不正です。"}
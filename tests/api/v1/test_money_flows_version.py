@@ -0,0 +1,107 @@
+# 楽観的排他制御（version）は、UPDATE文のWHERE句と更新行数で判定するため、インメモリSQLiteを使ってテストする
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from todo_app.api.v1.money_flows import STALE_VERSION_MESSAGE
+from todo_app.main import app
+from todo_app.models.db.money_flows import MoneyFlows
+from todo_app.repositories.money_flow_monthly_summary import get_stored_monthly_summaries
+
+client = TestClient(app)
+
+
+def create_money_flow() -> dict:
+    response = client.post(
+        "/api/v1/money_flows",
+        json={"title": "お米", "amount": 4200, "occurred_date": "2025-04-01T00:00:00"},
+    )
+    return response.json()
+
+
+def build_update_body(created: dict, **fields: object) -> dict:
+    return {
+        "id": created["id"],
+        "title": "お米（5kg）",
+        "amount": 3800,
+        "occurred_date": "2025-04-01T00:00:00",
+        **fields,
+    }
+
+
+# PUTテスト：「UPDATE ... WHERE id AND version」の1文で更新され、versionが1増えること
+def test_update_money_flows_with_version(override_get_db_sqlite: Session) -> None:
+    created = create_money_flow()
+    assert created["version"] == 1
+    statements = []
+
+    @event.listens_for(override_get_db_sqlite.get_bind(), "before_cursor_execute")
+    def _collect(
+        conn: object,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    response = client.put("/api/v1/money_flows", json=build_update_body(created, version=1))
+
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+    [update] = [statement for statement in statements if statement.startswith("UPDATE money_flows")]
+    assert "WHERE money_flows.id = ? AND money_flows.version = ?" in update
+    assert not any("FOR UPDATE" in statement for statement in statements)  # 行をロックしない
+
+    override_get_db_sqlite.expire_all()
+    saved = override_get_db_sqlite.get(MoneyFlows, created["id"])
+    assert (saved.amount, saved.version) == (3800, 2)
+    assert get_stored_monthly_summaries(override_get_db_sqlite) == {(202504, saved.kind): (3800, 1)}
+
+
+# PUTテスト：取得した後に他の人が更新していた場合は409で、上書きしないこと
+def test_update_money_flows_with_stale_version(override_get_db_sqlite: Session) -> None:
+    created = create_money_flow()
+    first = client.put("/api/v1/money_flows", json=build_update_body(created, version=1))
+    assert first.status_code == 200
+
+    # 同じversion（1）を持っている別の人の更新
+    response = client.put(
+        "/api/v1/money_flows", json=build_update_body(created, amount=1, version=1)
+    )
+
+    assert response.status_code == 409
+    assert response.json() == {"detail": STALE_VERSION_MESSAGE}
+    override_get_db_sqlite.expire_all()
+    saved = override_get_db_sqlite.get(MoneyFlows, created["id"])
+    assert (saved.amount, saved.version) == (3800, 2)
+
+
+# PUTテスト：削除済みの場合は、409ではなく「存在しない」（422）になること
+def test_update_money_flows_deleted(override_get_db_sqlite: Session) -> None:
+    created = create_money_flow()
+    client.request("DELETE", "/api/v1/money_flows", json={"id": created["id"]})
+
+    response = client.put("/api/v1/money_flows", json=build_update_body(created, version=1))
+
+    assert response.status_code == 422
+    assert response.json() == {"detail": "指定したIDが存在しません。"}
+
+
+# PUTテスト（一括更新）：versionが古い行が含まれる場合は409で、何も更新しないこと
+def test_update_money_flows_bulk_with_stale_version(override_get_db_sqlite: Session) -> None:
+    first = create_money_flow()
+    second = create_money_flow()
+    client.put("/api/v1/money_flows", json=build_update_body(second, version=1))
+
+    response = client.put(
+        "/api/v1/money_flows/bulk",
+        json=[build_update_body(first, version=1), build_update_body(second, version=1)],
+    )
+
+    assert response.status_code == 409
+    assert response.json() == {"detail": f"{STALE_VERSION_MESSAGE}（id: {second['id']}）"}
+    override_get_db_sqlite.expire_all()
+    assert override_get_db_sqlite.get(MoneyFlows, first["id"]).amount == 4200
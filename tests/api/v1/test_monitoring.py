@@ -0,0 +1,69 @@
+import pytest
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from todo_app.main import app
+from todo_app.models.db.base import get_engine
+from todo_app.monitoring.metrics import instrument_engine_queries, metrics_registry
+from todo_app.monitoring.slow_queries import instrument_slow_queries, slow_query_log
+
+client = TestClient(app)
+
+
+# GETテスト（コネクションプールの状態：アプリのエンジンが登録されていること）
+def test_get_db_pool_statistics() -> None:
+    get_engine()  # エンジンは起動時（lifespan）か、最初に使われた時点で作られる
+
+    response = client.get("/api/v1/monitoring/db_pool")
+
+    assert response.status_code == 200
+    [sync_pool] = [item for item in response.json() if item["name"] == "sync"]
+    assert sync_pool["pool_class"] == "InstrumentedQueuePool"
+    assert sync_pool["size"] == 5  # DB_POOL_SIZEのデフォルト
+    assert sync_pool["timeouts"] == 0
+
+
+# GETテスト（メトリクス：ルートのテンプレート・ステータスごとの処理時間と、リクエストごとのクエリ数）
+def test_get_metrics(override_get_db_sqlite: Session) -> None:
+    metrics_registry.reset()
+    instrument_engine_queries(override_get_db_sqlite.get_bind())
+
+    client.get("/api/v1/money_flows")
+    client.get("/api/v1/money_flows", params={"from": "2025-05-01", "to": "2025-04-01"})
+    response = client.get("/api/v1/monitoring/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/v1/money_flows",status="200"} 1'
+        in lines
+    )
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/v1/money_flows",status="422"} 1'
+        in lines
+    )
+    # 1回目：バージョンと一覧の2文、2回目：バリデーションエラーで0文
+    assert 'db_queries_per_request_sum{route="/api/v1/money_flows"} 2.0' in lines
+    assert 'db_queries_per_request_count{route="/api/v1/money_flows"} 2' in lines
+
+
+# GETテスト（遅いクエリ：しきい値以上かかったクエリが、SQLの形ごとに返ること）
+def test_get_slow_queries(override_get_db_sqlite: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    slow_query_log.reset()
+    monkeypatch.setattr(slow_query_log, "threshold_ms", 0)
+    instrument_slow_queries(override_get_db_sqlite.get_bind())
+
+    # 絞り込みの値だけが違う2回のリクエスト → 同じSQLの形として数える
+    client.get("/api/v1/money_flows", params={"kind": "income"})
+    client.get("/api/v1/money_flows", params={"kind": "expense"})
+    response = client.get("/api/v1/monitoring/slow_queries")
+
+    assert response.status_code == 200
+    items = response.json()
+    assert items == sorted(items, key=lambda item: item["max_ms"], reverse=True)
+    [version] = [item for item in items if "max(money_flows.updated_at)" in item["fingerprint"]]
+    assert version["count"] == 2
+    assert version["explain"] is None  # SLOW_QUERY_EXPLAINのデフォルトはfalse
+    slow_query_log.reset()
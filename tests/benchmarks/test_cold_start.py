@@ -0,0 +1,138 @@
+# 起動の速さ（コールドスタート）のベンチマーク：新しいPythonのプロセスで、毎回最初から計測する
+# 時間がかかるため、通常のテストでは実行しない（RUN_BENCHMARKS=1 pytest tests/benchmarks -s で実行）
+#
+# ・import：todo_app.mainのimportにかかる時間（DBには接続しない）
+# ・startup：起動時の処理（lifespan。接続を開く・よく使うSQL文のコンパイルと実行）にかかる時間
+# ・first / second：起動後、1回目・2回目のリクエストにかかる時間
+# ウォームアップあり・なしの両方で計測し、ありの方が1回目のリクエストが速いことを確認する
+# ・COLD_START_IMPORT_BUDGET_MS：importにかかる時間の上限（デフォルトは1500ms）
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from todo_app.models.db.base import Base
+from todo_app.models.db.money_flows import MoneyFlowKind
+from todo_app.repositories.money_flow_monthly_summary import rebuild_monthly_summaries
+from todo_app.repositories.money_flows import insert_money_flows
+
+pytestmark = pytest.mark.skipif(
+    os.getenv("RUN_BENCHMARKS") != "1", reason="RUN_BENCHMARKS=1 の場合のみ実行"
+)
+
+ROW_COUNT = 10_000
+RUNS = 5
+IMPORT_BUDGET_MS = float(os.getenv("COLD_START_IMPORT_BUDGET_MS", "1500"))
+
+# 新しいプロセスで実行するスクリプト：アプリのエンジンを、引数のSQLiteのファイルに差し替えて起動する
+SCRIPT = """
+import json
+import sys
+import time
+
+started = time.perf_counter()
+from todo_app import main
+imported = time.perf_counter()
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from todo_app.models.db.base import create_db_engine, get_db
+
+database_path, warm_up = sys.argv[1], sys.argv[2] == "1"
+engine = create_db_engine(f"sqlite:///{database_path}", "benchmark")
+
+
+def _get_db():
+    with Session(engine, autoflush=False) as db:
+        yield db
+
+
+main.get_engine = lambda: engine
+main.session = lambda: Session(engine)
+main.DB_POOL_WARMUP_SIZE = main.DB_POOL_WARMUP_SIZE if warm_up else 0
+main.DB_WARMUP_STATEMENTS = warm_up
+main.app.dependency_overrides[get_db] = _get_db
+
+timings = {"import": imported - started}
+with TestClient(main.app) as client:
+    timings["startup"] = time.perf_counter() - imported
+    for name in ("first", "second"):
+        request_started = time.perf_counter()
+        assert client.get("/api/v1/money_flows/page", params={"limit": 50}).status_code == 200
+        timings[name] = time.perf_counter() - request_started
+
+print(json.dumps({name: round(seconds * 1000, 3) for name, seconds in timings.items()}))
+"""
+
+
+@pytest.fixture(scope="module")
+def database_path(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    path = tmp_path_factory.mktemp("cold_start") / "budget.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+
+    now = datetime(2025, 4, 30)
+    with Session(engine) as db:
+        insert_money_flows(
+            db,
+            [
+                (
+                    f"タイトル{i}",
+                    i,
+                    datetime(2020, 1, 1) + timedelta(minutes=i),
+                    MoneyFlowKind.INCOME if i % 5 == 0 else MoneyFlowKind.EXPENSE,
+                    now,
+                    now,
+                )
+                for i in range(ROW_COUNT)
+            ],
+        )
+        rebuild_monthly_summaries(db)
+        db.commit()
+    engine.dispose()
+    return path
+
+
+# 新しいプロセスでRUNS回起動し、項目ごとの中央値（ミリ秒）を返す
+def measure(database_path: Path, warm_up: bool) -> dict[str, float]:
+    runs = [
+        json.loads(
+            subprocess.run(
+                [sys.executable, "-c", SCRIPT, str(database_path), "1" if warm_up else "0"],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.splitlines()[-1]
+        )
+        for _ in range(RUNS)
+    ]
+    return {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+
+
+def test_cold_start_benchmark(database_path: Path) -> None:
+    results = {
+        "ウォームアップなし": measure(database_path, warm_up=False),
+        "ウォームアップあり": measure(database_path, warm_up=True),
+    }
+
+    print(f"\n{ROW_COUNT}件（{RUNS}回の中央値）")
+    for case, result in results.items():
+        print(
+            f"  {case}  import {result['import']:>8.1f}ms  startup {result['startup']:>8.1f}ms  "
+            f"1回目 {result['first']:>8.1f}ms  2回目 {result['second']:>8.1f}ms"
+        )
+
+    cold, warm = results["ウォームアップなし"], results["ウォームアップあり"]
+    assert warm["import"] <= IMPORT_BUDGET_MS, f"importに{warm['import']}msかかりました"
+    assert warm["first"] < cold["first"]  # 接続・コンパイルを起動時に済ませた分、1回目が速い
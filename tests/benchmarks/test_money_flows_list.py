@@ -0,0 +1,112 @@
+# 一覧取得（GET /api/v1/money_flows）のベンチマーク：10万件
+# 時間がかかるため、通常のテストでは実行しない（RUN_BENCHMARKS=1 pytest tests/benchmarks -s で実行）
+#
+# 変更前：ORMのインスタンス → GetMoneyFlowResponseItem → FastAPIの戻り値の検証・JSONResponse
+# 変更後：Coreのselect()で6列のタプル → dict → ORJSONResponse
+
+import os
+import time
+
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from todo_app.cache.read_cache import read_cache
+from todo_app.models.db.base import Base
+from todo_app.models.db.money_flows import MoneyFlowKind
+from todo_app.models.request.v1.money_flows import MoneyFlowFilter
+from todo_app.models.response.v1.money_flows import GetMoneyFlowResponseItem
+from todo_app.repositories.money_flows import (
+    get_money_flow_items,
+    get_money_flows_all,
+    insert_money_flows,
+)
+
+pytestmark = pytest.mark.skipif(
+    os.getenv("RUN_BENCHMARKS") != "1", reason="RUN_BENCHMARKS=1 の場合のみ実行"
+)
+
+ROW_COUNT = 100_000
+
+
+@pytest.fixture(scope="module")
+def session(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Session]:
+    database_path: Path = tmp_path_factory.mktemp("benchmark") / "budget.db"
+    engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(engine)
+
+    with Session(engine) as db:
+        now = datetime(2025, 4, 30)
+        for start in range(0, ROW_COUNT, 1000):
+            insert_money_flows(
+                db,
+                [
+                    (
+                        f"タイトル{i}",
+                        i % 10000,
+                        datetime(2020, 1, 1) + timedelta(minutes=i),
+                        MoneyFlowKind.INCOME if i % 5 == 0 else MoneyFlowKind.EXPENSE,
+                        now,
+                        now,
+                    )
+                    for i in range(start, start + 1000)
+                ],
+            )
+        db.commit()
+
+        yield db
+    engine.dispose()
+
+
+# 変更前の一覧取得（ORM → Pydantic → FastAPIの戻り値の検証 → JSONResponse）を再現する
+def list_with_orm(session: Session) -> bytes:
+    items = [
+        GetMoneyFlowResponseItem(
+            id=item.id,
+            title=item.title,
+            amount=item.amount,
+            occurred_date=item.occurred_date,
+            kind=item.kind.value,
+            version=item.version,
+        )
+        for item in get_money_flows_all(session, filters=MoneyFlowFilter())
+    ]
+    validated = TypeAdapter(list[GetMoneyFlowResponseItem]).validate_python(items)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+
+def list_with_core(session: Session) -> bytes:
+    return ORJSONResponse(get_money_flow_items(session, filters=MoneyFlowFilter())).body
+
+
+# 3回実行した最短の秒数
+def measure(function: Callable[[Session], bytes], session: Session) -> tuple[float, bytes]:
+    timings = []
+    for _ in range(3):
+        session.expunge_all()
+        started = time.perf_counter()
+        body = function(session)
+        timings.append(time.perf_counter() - started)
+    return min(timings), body
+
+
+def test_money_flows_list_benchmark(session: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(read_cache, "enabled", False)  # 毎回DBから読む時間を計る
+
+    orm_seconds, orm_body = measure(list_with_orm, session)
+    core_seconds, core_body = measure(list_with_core, session)
+
+    print(
+        f"\n一覧取得 {ROW_COUNT}件：変更前 {orm_seconds:.3f}秒 / 変更後 {core_seconds:.3f}秒 "
+        f"（{orm_seconds / core_seconds:.1f}倍）"
+    )
+    assert orm_body == core_body  # レスポンスのJSONは変わらない
+    assert core_seconds < orm_seconds
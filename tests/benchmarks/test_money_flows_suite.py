@@ -0,0 +1,247 @@
+# APIとリポジトリ層のベンチマーク：ファイルのSQLiteに10k / 100k / 1M件を登録し、実際のルート・SQLで計測する
+# 時間がかかるため、通常のテストでは実行しない（RUN_BENCHMARKS=1 pytest tests/benchmarks -s で実行）
+#
+# 経路ごとに、スループット（回/秒）とp50・p99のレイテンシ（ミリ秒）を計測し、baseline.jsonと比較する
+# ・p50が基準値の (1 + BENCHMARK_TOLERANCE) 倍を超えた、またはスループットが基準値の 1 / (1 + BENCHMARK_TOLERANCE) を
+# 　下回った場合は失敗にする（デフォルトは0.5。マシンの差・ぶれを吸収するため、緩めにしている）
+# ・BENCHMARK_UPDATE_BASELINE=1：比較せず、計測結果でbaseline.jsonを書き換える
+# ・BENCHMARK_ROW_COUNTS=10000,100000：計測する件数を絞る（デフォルトは10000,100000,1000000）
+# ※性能が変わる変更（意図したもの）を入れた場合は、BENCHMARK_UPDATE_BASELINE=1で取り直し、理由をコミットに書くこと
+# 　例：タイトル検索のFTS5のトリガー・occurred_month（インデックス付き）を追加した後は、
+# 　1行ごとにトリガーとインデックスの更新が増えるため、登録（特にbulk_create）が遅くなっている
+
+import json
+import os
+import time
+
+from collections.abc import Callable, Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session
+
+from todo_app.cache.read_cache import read_cache
+from todo_app.main import app
+from todo_app.models.db.base import Base, get_db
+from todo_app.models.db.money_flows import MoneyFlowKind
+from todo_app.models.request.v1.money_flows import MoneyFlowFilter
+from todo_app.repositories.money_flow_monthly_summary import rebuild_monthly_summaries
+from todo_app.repositories.money_flows import (
+    aggregate_money_flows,
+    get_money_flow_items,
+    get_money_flows_page,
+    insert_money_flows,
+)
+
+pytestmark = pytest.mark.skipif(
+    os.getenv("RUN_BENCHMARKS") != "1", reason="RUN_BENCHMARKS=1 の場合のみ実行"
+)
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+ROW_COUNTS = [
+    int(row_count)
+    for row_count in os.getenv("BENCHMARK_ROW_COUNTS", "10000,100000,1000000").split(",")
+]
+TOLERANCE = float(os.getenv("BENCHMARK_TOLERANCE", "0.5"))
+UPDATE_BASELINE = os.getenv("BENCHMARK_UPDATE_BASELINE") == "1"
+
+SEED_CHUNK_SIZE = 1000
+BULK_SIZE = 100
+SEED_START = datetime(2020, 1, 1)
+
+
+def seed(engine: Engine, row_count: int) -> None:
+    now = datetime(2025, 4, 30)
+    with Session(engine) as db:
+        for start in range(0, row_count, SEED_CHUNK_SIZE):
+            insert_money_flows(
+                db,
+                [
+                    (
+                        f"タイトル{i}",
+                        i % 10000,
+                        SEED_START + timedelta(minutes=i),
+                        MoneyFlowKind.INCOME if i % 5 == 0 else MoneyFlowKind.EXPENSE,
+                        now,
+                        now,
+                    )
+                    for i in range(start, min(start + SEED_CHUNK_SIZE, row_count))
+                ],
+            )
+        rebuild_monthly_summaries(db)
+        db.commit()
+
+
+@pytest.fixture(scope="module", params=ROW_COUNTS, ids=lambda row_count: f"{row_count}rows")
+def seeded_engine(
+    request: pytest.FixtureRequest, tmp_path_factory: pytest.TempPathFactory
+) -> Iterator[tuple[Engine, int]]:
+    row_count = request.param
+    database_path = tmp_path_factory.mktemp(f"benchmark_{row_count}") / "budget.db"
+    engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(engine)
+    seed(engine, row_count)
+
+    yield engine, row_count
+    engine.dispose()
+
+
+# 実際のルートを、リクエストごとに新しいセッションで実行する（本番のget_dbと同じ）
+@pytest.fixture
+def client(
+    seeded_engine: tuple[Engine, int], monkeypatch: pytest.MonkeyPatch
+) -> Iterator[TestClient]:
+    engine, _ = seeded_engine
+    monkeypatch.setattr(read_cache, "enabled", False)  # 毎回DBから読む時間を計る
+
+    def _benchmark_db() -> Iterator[Session]:
+        with Session(engine, autoflush=False) as db:
+            yield db
+
+    app.dependency_overrides[get_db] = _benchmark_db
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_db, None)
+
+
+# function(i)をiterations回実行し、スループットとp50・p99を返す（最初の1回は計測しないウォームアップ）
+def measure(function: Callable[[int], object], iterations: int) -> dict[str, float]:
+    function(-1)
+    timings = []
+    for i in range(iterations):
+        started = time.perf_counter()
+        function(i)
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    return {
+        "iterations": iterations,
+        "throughput": round(iterations / sum(timings), 2),
+        "p50_ms": round(timings[int(iterations * 0.5)] * 1000, 3),
+        "p99_ms": round(timings[min(int(iterations * 0.99), iterations - 1)] * 1000, 3),
+    }
+
+
+def find_regressions(row_count: int, results: dict[str, dict[str, float]]) -> list[str]:
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    regressions = []
+    for case, result in results.items():
+        expected = baseline.get(str(row_count), {}).get(case)
+        if expected is None:
+            print(f"  {case}: 基準値がないため比較しません")
+            continue
+        if result["p50_ms"] > expected["p50_ms"] * (1 + TOLERANCE):
+            regressions.append(f"{case}: p50 {expected['p50_ms']}ms → {result['p50_ms']}ms")
+        if result["throughput"] < expected["throughput"] / (1 + TOLERANCE):
+            regressions.append(
+                f"{case}: スループット {expected['throughput']}回/秒 → {result['throughput']}回/秒"
+            )
+    return regressions
+
+
+def update_baseline(row_count: int, results: dict[str, dict[str, float]]) -> None:
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else {}
+    baseline[str(row_count)] = results
+    baseline = dict(sorted(baseline.items(), key=lambda item: int(item[0])))
+    BASELINE_PATH.write_text(json.dumps(baseline, ensure_ascii=False, indent=2) + "\n")
+
+
+def test_money_flows_benchmark(client: TestClient, seeded_engine: tuple[Engine, int]) -> None:
+    engine, row_count = seeded_engine
+    # 一覧は全件を返すため、件数が多いほど回数を減らす
+    list_iterations = max(3, min(30, 300_000 // row_count))
+    # 絞り込み：登録したデータの範囲内の1か月（1分ごとに登録しているため、約43,200件）
+    month_from = SEED_START + timedelta(minutes=row_count // 2)
+    filter_params = {
+        "from": month_from.isoformat(),
+        "to": (month_from + timedelta(days=30)).isoformat(),
+        "kind": "income",
+    }
+    created_ids: list[int] = []
+    bulk_ids: list[list[int]] = []
+
+    def list_all(i: int) -> None:
+        assert client.get("/api/v1/money_flows").status_code == 200
+
+    def list_filtered(i: int) -> None:
+        assert client.get("/api/v1/money_flows", params=filter_params).status_code == 200
+
+    def aggregate(i: int) -> None:
+        response = client.get("/api/v1/money_flows/aggregates", params={"period": "month"})
+        assert response.status_code == 200
+
+    def create(i: int) -> None:
+        response = client.post(
+            "/api/v1/money_flows",
+            json={"title": f"ベンチ{i}", "amount": 100, "occurred_date": "2025-04-01T00:00:00"},
+        )
+        assert response.status_code == 200
+        created_ids.append(response.json()["id"])
+
+    def create_bulk(i: int) -> None:
+        body = [
+            {"title": f"一括{i}-{j}", "amount": j, "occurred_date": "2025-04-01T00:00:00"}
+            for j in range(BULK_SIZE)
+        ]
+        response = client.post("/api/v1/money_flows/bulk", json=body)
+        assert response.status_code == 200
+        bulk_ids.append(response.json()["ids"])
+
+    def delete(i: int) -> None:
+        response = client.request("DELETE", "/api/v1/money_flows", json={"id": created_ids.pop()})
+        assert response.status_code == 204
+
+    def delete_bulk(i: int) -> None:
+        response = client.request(
+            "DELETE", "/api/v1/money_flows/bulk", json={"ids": bulk_ids.pop()}
+        )
+        assert response.status_code == 204
+
+    def repository_call(function: Callable[[Session], object]) -> Callable[[int], object]:
+        def _call(i: int) -> object:
+            with Session(engine) as db:
+                return function(db)
+
+        return _call
+
+    results = {
+        "list": measure(list_all, list_iterations),
+        "filter": measure(list_filtered, 20),
+        "aggregate": measure(aggregate, 10),
+        "create": measure(create, 200),
+        "bulk_create": measure(create_bulk, 20),
+        "delete": measure(delete, 200),
+        "bulk_delete": measure(delete_bulk, 20),
+        "repository_items": measure(
+            repository_call(lambda db: get_money_flow_items(db, filters=MoneyFlowFilter())),
+            list_iterations,
+        ),
+        "repository_page": measure(
+            repository_call(lambda db: get_money_flows_page(db, limit=100)), 200
+        ),
+        "repository_aggregate": measure(
+            repository_call(
+                lambda db: aggregate_money_flows(db, period="month", filters=MoneyFlowFilter())
+            ),
+            10,
+        ),
+    }
+
+    print(f"\n{row_count}件")
+    for case, result in results.items():
+        print(
+            f"  {case:<22} {result['throughput']:>10.2f}回/秒  "
+            f"p50 {result['p50_ms']:>10.3f}ms  p99 {result['p99_ms']:>10.3f}ms"
+        )
+
+    if UPDATE_BASELINE:
+        update_baseline(row_count, results)
+        return
+
+    regressions = find_regressions(row_count, results)
+    assert not regressions, f"{row_count}件で性能が基準値より悪化しました：\n" + "\n".join(
+        regressions
+    )
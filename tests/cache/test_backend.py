@@ -0,0 +1,76 @@
+import pytest
+
+from todo_app.cache import backend as backend_module
+from todo_app.cache.backend import InMemoryCacheBackend
+
+
+# 件数の上限を超えたら、最後に使われたのが古いものから追い出す（LRU）
+def test_evicts_least_recently_used_by_entries() -> None:
+    cache = InMemoryCacheBackend(max_entries=2, max_bytes=1000)
+    cache.set("ns:a", b"a", 60)
+    cache.set("ns:b", b"b", 60)
+    cache.get("ns:a")  # aを使ったため、bの方が古くなる
+    cache.set("ns:c", b"c", 60)
+
+    assert cache.get("ns:b") is None
+    assert cache.get("ns:a") == b"a"
+    assert cache.get("ns:c") == b"c"
+    assert cache.stats()["evictions"] == 1
+
+
+# バイト数の上限を超えたら追い出し、上限より大きい値は保存しない
+def test_evicts_by_bytes() -> None:
+    cache = InMemoryCacheBackend(max_entries=10, max_bytes=10)
+    cache.set("ns:a", b"12345", 60)
+    cache.set("ns:b", b"12345", 60)
+    cache.set("ns:c", b"123", 60)
+    cache.set("ns:big", b"12345678901", 60)
+
+    assert cache.get("ns:a") is None
+    assert cache.get("ns:big") is None
+    assert cache.stats()["bytes"] == 8
+
+
+# 有効期限を過ぎたら返さない
+def test_expires_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(backend_module.time, "monotonic", lambda: now[0])
+    cache = InMemoryCacheBackend(max_entries=10, max_bytes=100)
+    cache.set("ns:a", b"a", 30)
+
+    now[0] = 129.9
+    assert cache.get("ns:a") == b"a"
+    now[0] = 130.0
+    assert cache.get("ns:a") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"]) == (1, 1, 1)
+    assert stats["entries"] == 0
+
+
+# 指定したnamespaceのエントリだけを消す
+def test_invalidate_namespace() -> None:
+    cache = InMemoryCacheBackend(max_entries=10, max_bytes=100)
+    cache.set("money_flows:a", b"a", 60)
+    cache.set("money_flows:b", b"b", 60)
+    cache.set("other:a", b"a", 60)
+
+    cache.invalidate("money_flows")
+
+    assert cache.get("money_flows:a") is None
+    assert cache.get("other:a") == b"a"
+    assert cache.stats()["invalidations"] == 2
+
+
+# 読み始めた時点の世代（generation）から無効化された場合は、保存しない
+def test_set_skips_stale_generation() -> None:
+    cache = InMemoryCacheBackend(max_entries=10, max_bytes=100)
+    generation = cache.generation("money_flows")
+
+    cache.invalidate("money_flows")
+    cache.set("money_flows:a", b"old", 60, generation)
+    cache.set("money_flows:b", b"new", 60, cache.generation("money_flows"))
+
+    assert cache.get("money_flows:a") is None
+    assert cache.get("money_flows:b") == b"new"
+    assert cache.stats()["stale_skips"] == 1
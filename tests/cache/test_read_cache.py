@@ -0,0 +1,114 @@
+import asyncio
+
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from todo_app.cache.backend import InMemoryCacheBackend
+from todo_app.cache.read_cache import DB_ROLE_INFO_KEY, ReadCache
+from todo_app.models.request.v1.money_flows import MoneyFlowFilter
+
+
+def build_cache(enabled: bool = True) -> ReadCache:
+    return ReadCache(
+        InMemoryCacheBackend(max_entries=10, max_bytes=10000), ttl_seconds=60, enabled=enabled
+    )
+
+
+# 第1引数（session）以外の引数が同じなら、関数を呼ばずにキャッシュから返す
+def test_cached_returns_cached_result() -> None:
+    cache = build_cache()
+    calls = []
+
+    @cache.cached("money_flows")
+    def load(session: object, filters: MoneyFlowFilter, limit: int = 20) -> list[dict]:
+        calls.append((filters, limit))
+        return [{"occurred_date": datetime(2025, 4, 1), "limit": limit}]
+
+    filters = MoneyFlowFilter(kind="income")
+    first = load("session1", filters)
+    second = load("session2", filters=MoneyFlowFilter(kind="income"), limit=20)
+    load("session1", MoneyFlowFilter(kind="expense"))
+
+    assert first == second == [{"occurred_date": datetime(2025, 4, 1), "limit": 20}]
+    assert len(calls) == 2  # 2回目は引数の渡し方が違っても同じキー
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 2)
+
+
+# 書き込み後に無効化すると、次は関数を呼び直す
+def test_invalidate() -> None:
+    cache = build_cache()
+    calls = []
+
+    @cache.cached("money_flows")
+    def load(session: object) -> int:
+        calls.append(1)
+        return len(calls)
+
+    assert load(None) == 1
+    assert load(None) == 1
+    cache.invalidate("money_flows")
+    assert load(None) == 2
+
+
+# キャッシュを無効にした場合は、毎回関数を呼ぶ
+def test_disabled() -> None:
+    cache = build_cache(enabled=False)
+    calls = []
+
+    @cache.cached("money_flows")
+    def load(session: object) -> int:
+        calls.append(1)
+        return len(calls)
+
+    assert [load(None), load(None)] == [1, 2]
+
+
+# 非同期（async def）の関数もキャッシュできる
+def test_cached_async() -> None:
+    cache = build_cache()
+    calls = []
+
+    @cache.cached_async("money_flows")
+    async def load(session: object, limit: int) -> list[int]:
+        calls.append(limit)
+        return [limit]
+
+    async def run() -> list[list[int]]:
+        return [await load(None, 1), await load(None, 1), await load(None, 2)]
+
+    assert asyncio.run(run()) == [[1], [1], [2]]
+    assert calls == [1, 2]
+
+
+# レプリカのSession（info["db_role"] = "replica"）で読んだ結果は、プライマリとは別にキャッシュする
+def test_cached_per_db_role() -> None:
+    cache = build_cache()
+    calls = []
+
+    @cache.cached("money_flows")
+    def load(session: Session) -> int:
+        calls.append(1)
+        return len(calls)
+
+    primary = Session()
+    replica = Session(info={DB_ROLE_INFO_KEY: "replica"})
+
+    assert [load(replica), load(primary), load(replica), load(primary)] == [1, 2, 1, 2]
+
+
+# 読んでいる間に書き込まれて無効化された場合は、読んだ（古い）結果をキャッシュしない
+def test_invalidate_while_loading() -> None:
+    cache = build_cache()
+    calls = []
+
+    @cache.cached("money_flows")
+    def load(session: object) -> int:
+        calls.append(1)
+        if len(calls) == 1:
+            cache.invalidate("money_flows")  # 読んでいる間の書き込み
+        return len(calls)
+
+    assert load(None) == 1
+    assert load(None) == 2  # 1回目の結果は保存されていない
+    assert load(None) == 2
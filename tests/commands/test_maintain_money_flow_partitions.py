@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+
+import pytest
+
+from sqlalchemy.orm import Session
+
+import todo_app.commands.maintain_money_flow_partitions as command
+
+from todo_app.commands.maintain_money_flow_partitions import (
+    ArchiveIncompleteError,
+    PartitionNotConfiguredError,
+    run,
+)
+
+
+# パーティションはMySQLのみ（SQLiteでは何も変更せずにエラーにする）
+def test_run_requires_mysql(sqlite_session: Session) -> None:
+    with pytest.raises(PartitionNotConfiguredError):
+        run(sqlite_session, months_ahead=3, retention_months=36, dry_run=True)
+
+
+# MySQLの代わりに、呼ばれた操作を記録するSession
+class FakeMySQLSession:
+    def get_bind(self) -> SimpleNamespace:
+        return SimpleNamespace(dialect=SimpleNamespace(name="mysql"))
+
+    def commit(self) -> None:
+        pass
+
+
+# アーカイブの操作を記録に差し替える
+# remaining：EXCHANGE PARTITIONの後にパーティションへ登録された件数（1回ごと）
+def patch_archive_steps(
+    monkeypatch: pytest.MonkeyPatch, remaining: list[int], exchange_table_exists: bool = False
+) -> list[str]:
+    calls = []
+    monkeypatch.setattr(command, "get_money_flow_partitions", lambda _s: [("p202201", None)])
+    monkeypatch.setattr(command, "plan_future_partitions", lambda *_args: [])
+    monkeypatch.setattr(command, "plan_archive_partitions", lambda *_args: ["p202201"])
+    monkeypatch.setattr(command, "exchange_table_exists", lambda _s: exchange_table_exists)
+    monkeypatch.setattr(command, "create_exchange_table", lambda _s: calls.append("create"))
+    monkeypatch.setattr(
+        command, "exchange_partition", lambda _s, name: calls.append(f"exchange {name}")
+    )
+    monkeypatch.setattr(
+        command,
+        "copy_exchanged_rows_to_archive",
+        lambda _s, archived_at: calls.append("copy") or 10,
+    )
+    monkeypatch.setattr(command, "count_unarchived_exchanged_rows", lambda _s: 0)
+    monkeypatch.setattr(command, "delete_exchanged_title_fts_rows", lambda _s: calls.append("fts"))
+    monkeypatch.setattr(command, "drop_exchange_table", lambda _s: calls.append("drop exchange"))
+
+    def _drop_if_empty(_s: object, name: str) -> bool:
+        calls.append(f"drop {name}")
+        return remaining.pop(0) == 0
+
+    monkeypatch.setattr(command, "drop_money_flow_partition_if_empty", _drop_if_empty)
+    return calls
+
+
+# 行を取り出してからコピーし、パーティションが空であることを確かめてから削除すること
+# 取り出した後に行が登録された場合は、もう一度取り出すこと
+def test_run_archives_with_exchange_partition(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = patch_archive_steps(monkeypatch, remaining=[1, 0])
+
+    run(FakeMySQLSession(), months_ahead=3, retention_months=36, dry_run=False)
+
+    steps = ["create", "exchange p202201", "copy", "fts", "drop exchange", "drop p202201"]
+    assert calls == steps * 2
+
+
+# 前回途中で止まった場合は、取り出し済みの行を先に移すこと
+def test_run_resumes_exchanged_rows(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = patch_archive_steps(monkeypatch, remaining=[0], exchange_table_exists=True)
+
+    run(FakeMySQLSession(), months_ahead=3, retention_months=36, dry_run=False)
+
+    assert calls[:3] == ["copy", "fts", "drop exchange"]
+    assert calls[-1] == "drop p202201"
+
+
+# 取り出し直しても空にならない場合は、削除せずにエラーにすること
+def test_run_gives_up_when_rows_keep_arriving(monkeypatch: pytest.MonkeyPatch) -> None:
+    patch_archive_steps(monkeypatch, remaining=[1] * command.EXCHANGE_ATTEMPTS)
+
+    with pytest.raises(ArchiveIncompleteError):
+        run(FakeMySQLSession(), months_ahead=3, retention_months=36, dry_run=False)
@@ -0,0 +1,95 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from sqlalchemy.orm import Session
+
+import todo_app.commands.rebuild_monthly_summary as command
+
+from todo_app.commands.rebuild_monthly_summary import run
+from todo_app.models.db.money_flows import MoneyFlowKind, MoneyFlows
+from todo_app.repositories.money_flow_monthly_summary import get_stored_monthly_summaries
+
+
+def add_money_flow(session: Session) -> None:
+    session.add(
+        MoneyFlows(
+            title="お米",
+            amount=4200,
+            occurred_date=datetime(2025, 4, 1),
+            kind=MoneyFlowKind.EXPENSE,
+        )
+    )
+    session.commit()
+
+
+# --check：ズレの件数を返すだけで、作り直さない
+def test_run_check_only(sqlite_session: Session) -> None:
+    add_money_flow(sqlite_session)
+
+    assert run(sqlite_session, check_only=True) == 1
+    assert get_stored_monthly_summaries(sqlite_session) == {}
+
+
+# 作り直すと、次の確認ではズレがなくなる
+def test_run_rebuild(sqlite_session: Session) -> None:
+    add_money_flow(sqlite_session)
+
+    assert run(sqlite_session, check_only=False) == 1
+    assert run(sqlite_session, check_only=True) == 0
+    assert get_stored_monthly_summaries(sqlite_session) == {
+        (202504, MoneyFlowKind.EXPENSE): (4200, 1)
+    }
+
+
+# MySQLの代わりに、実行したSQLとcommitを記録するSession
+class FakeMySQLSession:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def get_bind(self) -> SimpleNamespace:
+        return SimpleNamespace(dialect=SimpleNamespace(name="mysql"))
+
+    def execute(self, statement: object) -> None:
+        self.calls.append(str(statement))
+
+    def commit(self) -> None:
+        self.calls.append("COMMIT")
+
+    def rollback(self) -> None:
+        self.calls.append("ROLLBACK")
+
+
+# MySQLでは、書き込みを止めてから作り直し、commitしてからロックを外す
+def test_run_rebuild_locks_tables(monkeypatch: pytest.MonkeyPatch) -> None:
+    session = FakeMySQLSession()
+    monkeypatch.setattr(command, "find_monthly_summary_drift", lambda _session: {})
+    monkeypatch.setattr(
+        command, "rebuild_monthly_summaries", lambda _session: session.calls.append("REBUILD")
+    )
+
+    run(session, check_only=False)
+
+    assert session.calls == [
+        "LOCK TABLES money_flow_monthly_summary WRITE, money_flows READ, money_flows_archive READ",
+        "REBUILD",
+        "COMMIT",
+        "UNLOCK TABLES",
+    ]
+
+
+# 作り直しに失敗した場合も、ロールバックしてからロックを外す
+def test_run_rebuild_unlocks_on_error(monkeypatch: pytest.MonkeyPatch) -> None:
+    session = FakeMySQLSession()
+    monkeypatch.setattr(command, "find_monthly_summary_drift", lambda _session: {})
+
+    def _fail(_session: object) -> None:
+        raise RuntimeError("rebuild failed")
+
+    monkeypatch.setattr(command, "rebuild_monthly_summaries", _fail)
+
+    with pytest.raises(RuntimeError):
+        run(session, check_only=False)
+
+    assert session.calls[1:] == ["ROLLBACK", "UNLOCK TABLES"]
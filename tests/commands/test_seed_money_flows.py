@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from todo_app.commands import seed_money_flows
+from todo_app.commands.seed_money_flows import SeedStateMismatchError, run
+from todo_app.models.db.money_flows import MoneyFlows
+from todo_app.repositories.money_flow_monthly_summary import find_monthly_summary_drift
+
+CONDITIONS = {
+    "rows": 250,
+    "seed": 42,
+    "chunk_size": 100,
+    "date_from": "2024-01-01T00:00:00",
+    "date_to": "2025-01-01T00:00:00",
+}
+
+
+def select_rows(session: Session) -> list[tuple]:
+    columns = (MoneyFlows.id, MoneyFlows.title, MoneyFlows.amount, MoneyFlows.occurred_date)
+    return [tuple(row) for row in session.execute(select(*columns).order_by(MoneyFlows.id))]
+
+
+# チャンクごとに登録され、月次集計テーブルにも反映される
+def test_run(sqlite_session: Session, tmp_path: Path) -> None:
+    inserted = run(sqlite_session.get_bind(), tmp_path / "state.json", CONDITIONS, "insert")
+
+    assert inserted == 250
+    assert [row[0] for row in select_rows(sqlite_session)] == list(range(1, 251))
+    assert find_monthly_summary_drift(sqlite_session) == {}
+
+    # 完了後にもう一度実行しても、重複して登録しない
+    assert run(sqlite_session.get_bind(), tmp_path / "state.json", CONDITIONS, "insert") == 0
+
+
+# 途中で止まっても、同じ条件で実行すると続きから登録し、止まらなかった場合と同じデータになる
+def test_run_resumes(
+    sqlite_session: Session, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    state_path = tmp_path / "state.json"
+    generate = seed_money_flows.generate_money_flow_rows
+
+    def _fail_on_second_chunk(seed: int, chunk_index: int, *args: object) -> list[tuple]:
+        if chunk_index == 1:
+            raise KeyboardInterrupt
+        return generate(seed, chunk_index, *args)
+
+    monkeypatch.setattr(seed_money_flows, "generate_money_flow_rows", _fail_on_second_chunk)
+    with pytest.raises(KeyboardInterrupt):
+        run(sqlite_session.get_bind(), state_path, CONDITIONS, "insert")
+    assert len(select_rows(sqlite_session)) == 100  # 1チャンク目だけcommitされている
+
+    monkeypatch.setattr(seed_money_flows, "generate_money_flow_rows", generate)
+    assert run(sqlite_session.get_bind(), state_path, CONDITIONS, "insert") == 150
+
+    resumed = select_rows(sqlite_session)
+    sqlite_session.execute(MoneyFlows.__table__.delete())
+    sqlite_session.commit()
+    run(sqlite_session.get_bind(), tmp_path / "fresh.json", CONDITIONS, "insert")
+    assert [row[1:] for row in select_rows(sqlite_session)] == [row[1:] for row in resumed]
+
+
+# 前回と条件が違う場合は、別のデータが混ざらないようエラーにする
+def test_run_with_different_conditions(sqlite_session: Session, tmp_path: Path) -> None:
+    run(sqlite_session.get_bind(), tmp_path / "state.json", CONDITIONS, "insert")
+
+    with pytest.raises(SeedStateMismatchError):
+        run(
+            sqlite_session.get_bind(),
+            tmp_path / "state.json",
+            {**CONDITIONS, "seed": 43},
+            "insert",
+        )
@@ -0,0 +1,58 @@
+# ★tests/配下の全テストで使う共通フィクスチャ
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, StaticPool
+
+from todo_app.cache.read_cache import read_cache
+from todo_app.models.db import *  # noqa: F403 テーブル定義をBase.metadataに登録するため
+from todo_app.models.db.base import Base
+
+
+# 読み取りキャッシュはプロセス全体で共有されるため、テストごとに空にする（前のテストの結果を返さないように）
+@pytest.fixture(autouse=True)
+def clear_read_cache() -> Iterator[None]:
+    read_cache.clear()
+    yield
+    read_cache.clear()
+
+
+# 本物のSQLを実行して確認したいテスト用の、インメモリSQLiteのセッション
+# StaticPool：同じ接続を使い回す（インメモリDBは接続ごとに別DBになるため）
+@pytest.fixture
+def sqlite_session() -> Iterator[Session]:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield db
+    finally:
+        db.close()
+        engine.dispose()
+
+
+# 非同期版（AsyncSession）のテスト用の、ファイルに保存するSQLite（aiosqliteドライバ）
+# テーブルは同期エンジンで作り、非同期エンジンは同じファイルに接続する
+# NullPool：TestClientはリクエストごとにイベントループが変わるため、接続を使い回さない
+@pytest.fixture
+def async_sqlite_engine(tmp_path: Path) -> Iterator[AsyncEngine]:
+    database_path = tmp_path / "budget.db"
+
+    sync_engine = create_engine(f"sqlite:///{database_path}")
+    Base.metadata.create_all(sync_engine)
+    sync_engine.dispose()
+
+    engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}", poolclass=NullPool)
+    yield engine
+    engine.sync_engine.dispose()
@@ -0,0 +1,62 @@
+import json
+import logging
+import queue
+
+from todo_app.loggers.handlers import DroppingQueueHandler, RequestContextFilter, SamplingFilter
+from todo_app.loggers.json_formatter import JsonFormatter
+from todo_app.loggers.request_context import RequestContext, current_request_context
+
+
+def make_record(msg: str, **extra: object) -> logging.LogRecord:
+    record = logging.LogRecord("CustomLogger", logging.INFO, __file__, 1, msg, None, None)
+    record.__dict__.update(extra)
+    return record
+
+
+# キューが一杯の場合は待たずに捨て、捨てた件数を数える
+def test_dropping_queue_handler_drops_when_full() -> None:
+    log_queue: queue.Queue = queue.Queue(maxsize=2)
+    handler = DroppingQueueHandler(log_queue)
+
+    for i in range(5):
+        handler.handle(make_record(f"ログ{i}"))
+
+    assert log_queue.qsize() == 2
+    assert handler.dropped == 3
+    assert log_queue.get_nowait().msg == "ログ0"
+
+
+# sample_everyを付けたログは、同じメッセージN回につき1回だけ通す
+def test_sampling_filter() -> None:
+    sampling_filter = SamplingFilter()
+
+    passed = [
+        sampling_filter.filter(make_record("ヘルスチェック", sample_every=3)) for _ in range(7)
+    ]
+
+    assert passed == [True, False, False, True, False, False, True]
+    assert sampling_filter.filter(make_record("通常のログ"))  # sample_everyなしは毎回通す
+
+
+# JSONには、ログを出した時点のリクエストの情報（request_id・route・経過時間）が入る
+def test_json_formatter_with_request_context() -> None:
+    context_filter = RequestContextFilter()
+    token = current_request_context.set(RequestContext({"type": "http"}, "abc123"))
+    try:
+        record = make_record("ヘルスチェックの中身です")
+        context_filter.filter(record)
+    finally:
+        current_request_context.reset(token)
+
+    payload = json.loads(JsonFormatter().format(record))
+
+    assert payload["message"] == "ヘルスチェックの中身です"
+    assert payload["level"] == "INFO"
+    assert payload["request_id"] == "abc123"
+    assert payload["route"] == "unmatched"  # ルーティング前
+    assert payload["duration_ms"] >= 0
+
+    # リクエストの外ではnull
+    record = make_record("バッチ")
+    context_filter.filter(record)
+    assert json.loads(JsonFormatter().format(record))["request_id"] is None
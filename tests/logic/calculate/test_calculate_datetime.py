@@ -3,7 +3,7 @@ from zoneinfo import ZoneInfo
 
 from freezegun import freeze_time
 
-from todo_app.logic.calculate.calculate_datetime import get_now
+from todo_app.logic.calculate.calculate_datetime import get_now, to_jst_naive, to_month_key
 
 
 @freeze_time("2025-04-01 12:00:00")
@@ -21,3 +21,20 @@ def test_get_now() -> None:
 
     assert result == expected
     assert result.tzinfo == ZoneInfo("Asia/Tokyo")
+
+
+def test_to_month_key() -> None:
+    assert to_month_key(datetime(2025, 4, 30, 23, 59)) == 202504
+    assert to_month_key(datetime(2025, 12, 1)) == 202512
+
+
+# タイムゾーン付きの日時は、日本時間の月にする（UTCの3/31 15:00は、日本時間の4/1 0:00）
+def test_to_month_key_with_timezone() -> None:
+    assert to_month_key(datetime(2025, 3, 31, 15, tzinfo=ZoneInfo("UTC"))) == 202504
+    assert to_month_key(datetime(2025, 3, 31, 14, 59, tzinfo=ZoneInfo("UTC"))) == 202503
+
+
+def test_to_jst_naive() -> None:
+    assert to_jst_naive(datetime(2025, 3, 31, 15, tzinfo=ZoneInfo("UTC"))) == datetime(2025, 4, 1)
+    # タイムゾーンなしはそのまま
+    assert to_jst_naive(datetime(2025, 4, 1, 9)) == datetime(2025, 4, 1, 9)
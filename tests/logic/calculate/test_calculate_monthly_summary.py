@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from todo_app.logic.calculate.calculate_monthly_summary import MonthlySummaryDeltas
+from todo_app.models.db.money_flows import MoneyFlowKind
+
+
+# 別の月・種類に移動した更新 → 移動元は減り、移動先は増える
+def test_monthly_summary_deltas_move_bucket() -> None:
+    deltas = MonthlySummaryDeltas()
+    deltas.subtract(datetime(2025, 3, 31), MoneyFlowKind.EXPENSE, 1000)
+    deltas.add(datetime(2025, 4, 1), MoneyFlowKind.INCOME, 1200)
+
+    assert list(deltas.items()) == [
+        (202503, MoneyFlowKind.EXPENSE, -1000, -1),
+        (202504, MoneyFlowKind.INCOME, 1200, 1),
+    ]
+
+
+# 同じ月・種類のままの更新 → 金額の差分だけが残る
+def test_monthly_summary_deltas_same_bucket() -> None:
+    deltas = MonthlySummaryDeltas()
+    deltas.subtract(datetime(2025, 4, 1), MoneyFlowKind.EXPENSE, 1000)
+    deltas.add(datetime(2025, 4, 20), MoneyFlowKind.EXPENSE, 1200)
+
+    assert list(deltas.items()) == [(202504, MoneyFlowKind.EXPENSE, 200, 0)]
+
+
+# 何も変わらない更新 → 反映するものがない
+def test_monthly_summary_deltas_no_change() -> None:
+    deltas = MonthlySummaryDeltas()
+    deltas.subtract(datetime(2025, 4, 1), MoneyFlowKind.EXPENSE, 1000)
+    deltas.add(datetime(2025, 4, 1), MoneyFlowKind.EXPENSE, 1000)
+
+    assert list(deltas.items()) == []
@@ -0,0 +1,46 @@
+from datetime import datetime
+
+import pytest
+
+from todo_app.logic.conditional.etag import (
+    build_conditional_headers,
+    build_etag,
+    is_etag_matched,
+)
+
+
+# データのバージョン・条件のどれかが変わればETagも変わる
+def test_build_etag() -> None:
+    etag = build_etag(datetime(2025, 4, 1, 9), 3, {"period": "month"})
+
+    assert etag.startswith('W/"')
+    assert etag == build_etag(datetime(2025, 4, 1, 9), 3, {"period": "month"})
+    assert etag != build_etag(datetime(2025, 4, 1, 9, 0, 0, 1), 3, {"period": "month"})
+    assert etag != build_etag(datetime(2025, 4, 1, 9), 2, {"period": "month"})
+    assert etag != build_etag(datetime(2025, 4, 1, 9), 3, {"period": "week"})
+    assert build_etag(None, 0, {}) == build_etag(None, 0, {})
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "expected"),
+    [
+        (None, False),
+        ('W/"abc"', True),
+        ('"abc"', True),  # W/の有無は区別しない
+        ('"xyz", W/"abc"', True),
+        ("*", True),
+        ('W/"xyz"', False),
+    ],
+)
+def test_is_etag_matched(if_none_match: str | None, expected: bool) -> None:
+    assert is_etag_matched(if_none_match, 'W/"abc"') is expected
+
+
+# Last-Modifiedは、日本時間で保存されているupdated_atをGMTに変換する
+def test_build_conditional_headers() -> None:
+    assert build_conditional_headers('W/"abc"', datetime(2025, 4, 1, 9, 0, 0, 123)) == {
+        "ETag": 'W/"abc"',
+        "Cache-Control": "no-cache",
+        "Last-Modified": "Tue, 01 Apr 2025 00:00:00 GMT",
+    }
+    assert "Last-Modified" not in build_conditional_headers('W/"abc"', None)
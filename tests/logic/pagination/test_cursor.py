@@ -0,0 +1,49 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from todo_app.logic.pagination.cursor import (
+    decode_cursor,
+    decode_search_cursor,
+    encode_cursor,
+    encode_search_cursor,
+)
+
+
+def test_encode_decode_cursor() -> None:
+    cursor = encode_cursor(datetime(2025, 4, 1, 12, 30), 42)
+
+    assert decode_cursor(cursor) == (datetime(2025, 4, 1, 12, 30), 42)
+
+
+# タイムゾーン付きの日時のカーソルは、日本時間のタイムゾーンなしに戻す（DBのoccurred_dateと比べるため）
+def test_decode_cursor_with_timezone() -> None:
+    cursor = encode_cursor(datetime(2025, 3, 31, 15, 30, tzinfo=UTC), 42)
+
+    assert decode_cursor(cursor) == (datetime(2025, 4, 1, 0, 30), 42)
+    assert decode_search_cursor(
+        encode_search_cursor(1, datetime(2025, 3, 31, 15, 30, tzinfo=UTC), 42)
+    ) == (
+        1,
+        datetime(2025, 4, 1, 0, 30),
+        42,
+    )
+
+
+# 不正なカーソルはValueErrorになる
+@pytest.mark.parametrize("cursor", ["", "abc", "bm90LWpzb24", "eyJkIjoiMjAyNS0wNC0wMSJ9"])
+def test_decode_cursor_invalid(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+
+def test_encode_decode_search_cursor() -> None:
+    cursor = encode_search_cursor(1, datetime(2025, 4, 1, 12, 30), 42)
+
+    assert decode_search_cursor(cursor) == (1, datetime(2025, 4, 1, 12, 30), 42)
+
+
+# 順位のないカーソル（一覧のカーソル）は、検索のカーソルとしては不正
+def test_decode_search_cursor_invalid() -> None:
+    with pytest.raises(ValueError):
+        decode_search_cursor(encode_cursor(datetime(2025, 4, 1), 42))
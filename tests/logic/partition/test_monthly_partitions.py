@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import pytest
+
+from todo_app.logic.partition.monthly_partitions import (
+    Partition,
+    add_months,
+    month_start,
+    partition_name,
+    plan_archive_partitions,
+    plan_future_partitions,
+)
+
+# 2025-01〜2025-04のパーティションとpmaxがある状態
+PARTITIONS: list[Partition] = [
+    ("p202501", datetime(2025, 2, 1)),
+    ("p202502", datetime(2025, 3, 1)),
+    ("p202503", datetime(2025, 4, 1)),
+    ("p202504", datetime(2025, 5, 1)),
+    ("pmax", None),
+]
+
+
+def test_month_start() -> None:
+    assert month_start(datetime(2025, 4, 30, 23, 59)) == datetime(2025, 4, 1)
+
+
+@pytest.mark.parametrize(
+    ("months", "expected"),
+    [(1, datetime(2025, 5, 1)), (9, datetime(2026, 1, 1)), (-4, datetime(2024, 12, 1))],
+)
+def test_add_months(months: int, expected: datetime) -> None:
+    assert add_months(datetime(2025, 4, 1), months) == expected
+
+
+def test_partition_name() -> None:
+    assert partition_name(datetime(2025, 4, 1)) == "p202504"
+
+
+# 既存のパーティションの続きから、今月のmonths_aheadか月後までを作る
+def test_plan_future_partitions() -> None:
+    assert plan_future_partitions(PARTITIONS, datetime(2025, 4, 15), months_ahead=2) == [
+        datetime(2025, 5, 1),
+        datetime(2025, 6, 1),
+    ]
+
+
+# 既に十分先まで作ってある場合は何もしない
+def test_plan_future_partitions_nothing_to_add() -> None:
+    assert plan_future_partitions(PARTITIONS, datetime(2025, 3, 15), months_ahead=1) == []
+
+
+# 保存期間より前の行だけが入っているパーティション（pmaxは対象外）
+@pytest.mark.parametrize(
+    ("retention_months", "expected"),
+    [(1, ["p202501", "p202502"]), (3, []), (0, ["p202501", "p202502", "p202503"])],
+)
+def test_plan_archive_partitions(retention_months: int, expected: list[str]) -> None:
+    assert plan_archive_partitions(PARTITIONS, datetime(2025, 4, 15), retention_months) == expected
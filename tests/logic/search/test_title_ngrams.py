@@ -0,0 +1,33 @@
+import pytest
+
+from todo_app.logic.search.title_ngrams import (
+    build_title_fulltext_match,
+    build_title_ngram_match,
+    lower_ascii,
+    to_title_ngram_tokens,
+)
+
+
+def test_to_title_ngram_tokens() -> None:
+    assert to_title_ngram_tokens("お米券") == ["お米".encode().hex(), "米券".encode().hex()]
+
+
+# 2文字未満はn-gramを作れない
+@pytest.mark.parametrize("text", ["", "米"])
+def test_to_title_ngram_tokens_too_short(text: str) -> None:
+    assert to_title_ngram_tokens(text) == []
+
+
+# ASCIIの英字だけを小文字にする（SQLiteのlower()と同じ）
+def test_lower_ascii() -> None:
+    assert lower_ascii("Rice ＡＢ") == "rice ＡＢ"
+
+
+# 空白や記号を含んでいても、FTS5のフレーズとして1つの検索式になる
+def test_build_title_ngram_match() -> None:
+    assert build_title_ngram_match("A 米") == f'"{b"a ".hex()} {" 米".encode().hex()}"'
+
+
+# ダブルクォートはフレーズの区切りになるため、空白に置き換える
+def test_build_title_fulltext_match() -> None:
+    assert build_title_fulltext_match('お"米') == '"お 米"'
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from todo_app.logic.seed.generate_money_flows import CATEGORIES, generate_money_flow_rows
+from todo_app.models.db.money_flows import MoneyFlowKind
+
+DATE_FROM = datetime(2024, 1, 1)
+DATE_TO = datetime(2025, 1, 1)
+
+
+# 同じseed・チャンクなら同じ行、チャンクが違えば違う行になる（途中から再開しても同じデータになる）
+def test_generate_money_flow_rows_is_deterministic() -> None:
+    rows = generate_money_flow_rows(42, 3, 100, DATE_FROM, DATE_TO)
+
+    assert rows == generate_money_flow_rows(42, 3, 100, DATE_FROM, DATE_TO)
+    assert rows != generate_money_flow_rows(42, 4, 100, DATE_FROM, DATE_TO)
+    assert rows != generate_money_flow_rows(43, 3, 100, DATE_FROM, DATE_TO)
+
+
+# 期間内の日付・10円単位の金額で、支出が多く収入が少ない分布になる
+def test_generate_money_flow_rows_distribution() -> None:
+    rows = generate_money_flow_rows(42, 0, 10000, DATE_FROM, DATE_TO)
+    titles = {category[0]: category for category in CATEGORIES}
+
+    assert len(rows) == 10000
+    for title, amount, occurred_date, kind, created_at, updated_at in rows:
+        assert DATE_FROM <= occurred_date < DATE_TO
+        assert amount >= 10 and amount % 10 == 0
+        assert kind == titles[title][1]
+        assert created_at == updated_at == occurred_date
+        if titles[title][5] is not None:
+            assert occurred_date.day == titles[title][5]  # 給料・家賃などは毎月同じ日
+
+    income_count = sum(1 for row in rows if row[3] == MoneyFlowKind.INCOME)
+    assert 0.03 < income_count / len(rows) < 0.08
+
+
+# 月の途中で始まり・終わる期間でも、期間外の日付にならない
+# 固定する日が期間内にあれば、その日になる（期間内にない賞与（10日）は期間内のどこか）
+def test_generate_money_flow_rows_stays_within_partial_months() -> None:
+    date_from, date_to = datetime(2024, 1, 26, 12), datetime(2024, 2, 25, 6)
+    rows = generate_money_flow_rows(42, 0, 10000, date_from, date_to)
+    titles = {category[0]: category for category in CATEGORIES}
+
+    for title, _, occurred_date, _, _, _ in rows:
+        assert date_from <= occurred_date < date_to
+        if title in ("通信費", "家賃", "電気代", "ガス代", "水道代"):
+            assert occurred_date.day == titles[title][5]
+    # 給料（25日）は1/25が期間外なので、2/25の0時〜6時だけになる
+    salaries = [row[2] for row in rows if row[0] == "給料"]
+    assert salaries and all(date.date() == date_to.date() for date in salaries)
@@ -0,0 +1,91 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from sqlalchemy import Engine, create_engine, exc
+from sqlalchemy.pool import NullPool
+
+from todo_app.monitoring import db_pool
+from todo_app.monitoring.db_pool import (
+    InstrumentedQueuePool,
+    get_pool_statistics,
+    instrument_engine,
+)
+
+
+# プールの大きさ1、オーバーフロー1、待ち時間0.05秒のエンジン
+@pytest.fixture
+def engine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Engine]:
+    monkeypatch.setattr(db_pool, "_instrumented_engines", {})
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+# 貸し出し・返却・新規接続・オーバーフロー・タイムアウトが記録されること
+def test_instrument_engine_records_checkouts(engine: Engine) -> None:
+    statistics = instrument_engine(engine, "test")
+
+    first = engine.connect()
+    second = engine.connect()  # オーバーフロー
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()  # 空きがない
+
+    [current] = get_pool_statistics()
+    assert current["checked_out"] == 2
+    assert current["overflow"] == 1
+
+    first.close()
+    second.close()
+
+    assert statistics.snapshot() | {"wait_seconds_total": 0, "wait_seconds_max": 0} == {
+        "checkouts": 2,
+        "checkins": 2,
+        "connects": 2,
+        "invalidations": 0,
+        "soft_invalidations": 0,
+        "timeouts": 1,
+        "wait_seconds_total": 0,
+        "wait_seconds_max": 0,
+        "overflow_max": 1,
+    }
+    assert statistics.wait_seconds_max >= 0.05  # タイムアウトまで待った時間
+
+
+# 接続の破棄（invalidate）が記録され、engine.dispose()の後も同じ統計に記録され続けること
+def test_instrument_engine_records_invalidations(engine: Engine) -> None:
+    statistics = instrument_engine(engine, "test")
+
+    with engine.connect() as connection:
+        connection.invalidate()
+    engine.dispose()
+    with engine.connect():
+        pass
+
+    assert statistics.invalidations == 1
+    assert statistics.checkouts == 2
+    assert statistics.wait_seconds_total > 0
+
+
+# QueuePool以外のプールでは、現在の状態はNoneになる
+def test_get_pool_statistics_without_queue_pool(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(db_pool, "_instrumented_engines", {})
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=NullPool)
+    instrument_engine(engine, "null")
+
+    with engine.connect():
+        pass
+
+    [current] = get_pool_statistics()
+    assert current["pool_class"] == "NullPool"
+    assert current["size"] is None
+    assert current["checkouts"] == 1
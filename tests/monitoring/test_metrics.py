@@ -0,0 +1,59 @@
+from sqlalchemy import create_engine, text
+
+from todo_app.monitoring.metrics import (
+    MetricsRegistry,
+    RequestMetrics,
+    current_request_metrics,
+    instrument_engine_queries,
+    metrics_registry,
+)
+
+
+# バケツの件数は累積（le以下の件数）で、_sum・_countと一緒に出力される
+def test_render_histogram() -> None:
+    registry = MetricsRegistry()
+    labels = ("GET", "/api/v1/money_flows", "200")
+    for seconds in (0.004, 0.02, 0.02, 20.0):
+        registry.observe(registry.request_duration, labels, seconds)
+
+    lines = registry.render().splitlines()
+
+    prefix = (
+        'http_request_duration_seconds_bucket{method="GET",route="/api/v1/money_flows",status="200"'
+    )
+    assert f'{prefix},le="0.005"}} 1' in lines
+    assert f'{prefix},le="0.025"}} 3' in lines
+    assert f'{prefix},le="10.0"}} 3' in lines
+    assert f'{prefix},le="+Inf"}} 4' in lines
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/v1/money_flows",status="200"} 4'
+        in lines
+    )
+    assert "# TYPE http_request_duration_seconds histogram" in lines
+
+
+# リクエストの中で実行したクエリの件数・行数が、リクエストの集計に足される
+def test_instrument_engine_queries() -> None:
+    metrics_registry.reset()
+    engine = create_engine("sqlite://")
+    instrument_engine_queries(engine)
+    request_metrics = RequestMetrics({"type": "http"})
+    token = current_request_metrics.set(request_metrics)
+
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE t (id INTEGER)"))
+            connection.execute(text("INSERT INTO t VALUES (1), (2)"))
+            connection.execute(text("SELECT * FROM t")).all()
+    finally:
+        current_request_metrics.reset(token)
+
+    assert request_metrics.queries == 3
+    assert request_metrics.rows == 2  # INSERTの2行（SQLiteのSELECTは数えない）
+    assert 'db_query_duration_seconds_count{route="unmatched"} 3' in metrics_registry.render()
+
+    # リクエストの外で実行したクエリは route="none" になる
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert 'db_query_duration_seconds_count{route="none"} 1' in metrics_registry.render()
+    engine.dispose()
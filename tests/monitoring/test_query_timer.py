@@ -0,0 +1,51 @@
+import pytest
+
+from sqlalchemy import Connection, create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from todo_app.monitoring.metrics import instrument_engine_queries, metrics_registry
+from todo_app.monitoring.query_timer import add_query_observer
+from todo_app.monitoring.slow_queries import SlowQueryLog, instrument_slow_queries
+
+
+# メトリクスと遅いクエリの記録を両方登録しても、開始時刻は1つだけ積まれ、両方に同じ実行時間が渡ること
+def test_one_timer_for_all_observers() -> None:
+    engine = create_engine("sqlite://")
+    durations: list[tuple[str, float]] = []
+    add_query_observer(engine, lambda *args: durations.append(("first", args[-1])))
+    add_query_observer(engine, lambda *args: durations.append(("second", args[-1])))
+    stacks = []
+
+    def _observe_stack(conn: Connection, *args: object) -> None:
+        stacks.append(list(conn.info["query_timer_started"]))
+
+    add_query_observer(engine, _observe_stack)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert [name for name, _ in durations] == ["first", "second"]
+    assert durations[0][1] == durations[1][1]
+    assert stacks == [[]]  # 取り出した後に、オブザーバーを呼ぶ
+    engine.dispose()
+
+
+# 失敗したクエリの開始時刻が接続に残らず、次のクエリの実行時間が正しく計られること
+def test_failed_statement_does_not_leave_timer() -> None:
+    metrics_registry.reset()
+    engine = create_engine("sqlite://")
+    instrument_engine_queries(engine)
+    instrument_slow_queries(
+        engine, SlowQueryLog(threshold_ms=0, explain=False, sample_size=10, max_fingerprints=10)
+    )
+
+    with engine.connect() as connection:
+        with pytest.raises(OperationalError):
+            connection.execute(text("SELECT * FROM missing_table"))
+        assert not connection.info.get("query_timer_started")
+
+        connection.execute(text("SELECT 1"))
+        assert not connection.info.get("query_timer_started")
+
+    assert 'db_query_duration_seconds_count{route="none"} 1' in metrics_registry.render()
+    engine.dispose()
@@ -0,0 +1,89 @@
+import logging
+
+import pytest
+
+from sqlalchemy import create_engine, text
+
+from todo_app.monitoring.slow_queries import (
+    SlowQueryLog,
+    fingerprint_statement,
+    instrument_slow_queries,
+)
+
+
+# 値・件数が違っても、同じ形のSQLは同じフィンガープリントになる
+@pytest.mark.parametrize(
+    ("statement", "expected"),
+    [
+        (
+            "SELECT * FROM money_flows\n  WHERE id = 12 AND title = 'お''米'",
+            "SELECT * FROM money_flows WHERE id = ? AND title = ?",
+        ),
+        (
+            "SELECT * FROM money_flows WHERE money_flows.id IN (%s, %s, %s)",
+            "SELECT * FROM money_flows WHERE money_flows.id IN (...)",
+        ),
+        (
+            "INSERT INTO money_flows (title, amount) VALUES (?, ?), (?, ?), (?, ?)",
+            "INSERT INTO money_flows (title, amount) VALUES (...)",
+        ),
+        (
+            "SELECT * FROM money_flows WHERE amount >= :amount_1 LIMIT -1.5",
+            "SELECT * FROM money_flows WHERE amount >= ? LIMIT ?",
+        ),
+    ],
+)
+def test_fingerprint_statement(statement: str, expected: str) -> None:
+    assert fingerprint_statement(statement) == expected
+
+
+# しきい値以上のクエリだけがSQLの形ごとに集計され、最初の1回だけEXPLAINを取得する
+def test_instrument_slow_queries(caplog: pytest.LogCaptureFixture) -> None:
+    slow_query_log = SlowQueryLog(threshold_ms=0, explain=True, sample_size=10, max_fingerprints=2)
+    engine = create_engine("sqlite://")
+    instrument_slow_queries(engine, slow_query_log)
+
+    with caplog.at_level(logging.WARNING, logger="CustomLogger"), engine.begin() as connection:
+        connection.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("INSERT INTO t VALUES (1), (2)"))
+        for id in (1, 2, 3):
+            connection.execute(text("SELECT * FROM t WHERE id = :id"), {"id": id}).all()
+    engine.dispose()
+
+    # SQLの形の最大数（2）を超えた3つ目の形（SELECT）は記録しない
+    assert sorted(item["fingerprint"] for item in slow_query_log.snapshot()) == [
+        "CREATE TABLE t (id INTEGER PRIMARY KEY)",
+        "INSERT INTO t VALUES (...)",
+    ]
+    assert any("遅いクエリ" in record.getMessage() for record in caplog.records)
+
+    slow_query_log.reset()
+    slow_query_log.max_fingerprints = 10
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+        for id in (1, 2, 3):
+            connection.execute(text("SELECT * FROM t WHERE id = :id"), {"id": id}).all()
+
+    [select] = [
+        item for item in slow_query_log.snapshot() if item["fingerprint"].startswith("SELECT")
+    ]
+    assert select["count"] == 3
+    assert select["p50_ms"] <= select["p95_ms"] <= select["max_ms"]
+    assert select["explain"] is not None
+    assert "SEARCH t USING INTEGER PRIMARY KEY" in " ".join(select["explain"])
+    engine.dispose()
+
+
+# しきい値未満のクエリは記録しない
+def test_instrument_slow_queries_below_threshold() -> None:
+    slow_query_log = SlowQueryLog(
+        threshold_ms=60_000, explain=False, sample_size=10, max_fingerprints=10
+    )
+    engine = create_engine("sqlite://")
+    instrument_slow_queries(engine, slow_query_log)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert slow_query_log.snapshot() == []
+    engine.dispose()
@@ -0,0 +1,167 @@
+from datetime import UTC, datetime
+
+import pytest
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from todo_app.logic.calculate.calculate_datetime import JST
+from todo_app.models.db.money_flows import MoneyFlowKind, MoneyFlows
+from todo_app.models.db.money_flows_archive import MoneyFlowsArchive
+from todo_app.repositories.money_flow_balance import get_balance, get_running_balance
+from todo_app.repositories.money_flow_monthly_summary import rebuild_monthly_summaries
+
+# (occurred_date, kind, amount)
+FLOWS = [
+    (datetime(2025, 3, 25), MoneyFlowKind.INCOME, 200000),
+    (datetime(2025, 3, 31, 23, 59), MoneyFlowKind.EXPENSE, 80000),
+    (datetime(2025, 4, 1), MoneyFlowKind.EXPENSE, 4200),
+    (datetime(2025, 4, 1), MoneyFlowKind.EXPENSE, 300),  # 同じ日時 → idの順
+    (datetime(2025, 4, 10), MoneyFlowKind.INCOME, 1000),
+    (datetime(2025, 5, 1), MoneyFlowKind.EXPENSE, 5000),
+]
+
+
+# money_flowsに登録し、月次集計テーブル（チェックポイント）も作る
+@pytest.fixture
+def money_flows(sqlite_session: Session) -> Session:
+    sqlite_session.add_all(
+        [
+            MoneyFlows(title=f"タイトル{i}", amount=amount, occurred_date=occurred_date, kind=kind)
+            for i, (occurred_date, kind, amount) in enumerate(FLOWS)
+        ]
+    )
+    sqlite_session.flush()
+    rebuild_monthly_summaries(sqlite_session)
+    sqlite_session.commit()
+    return sqlite_session
+
+
+# Pythonで全件から計算した残高（テストの正解）
+def expected_balance(as_of: datetime) -> int:
+    return sum(
+        amount if kind == MoneyFlowKind.INCOME else -amount
+        for occurred_date, kind, amount in FLOWS
+        if occurred_date < as_of
+    )
+
+
+@pytest.mark.parametrize(
+    "as_of",
+    [
+        datetime(2025, 3, 1),  # 最初の収支より前
+        datetime(2025, 3, 31, 23, 59),  # 同じ日時の収支は含まない
+        datetime(2025, 4, 1),  # 月の初め（チェックポイントだけ）
+        datetime(2025, 4, 5),  # チェックポイント + その月の途中まで
+        datetime(2025, 6, 1),  # 最後の収支より後
+    ],
+)
+def test_get_balance(money_flows: Session, as_of: datetime) -> None:
+    assert get_balance(money_flows, (as_of, None)) == expected_balance(as_of)
+
+
+# タイムゾーン付きの日時は、日本時間の同じ時刻として計算すること（月の境目をまたいでも二重に数えない）
+@pytest.mark.parametrize(
+    "as_of",
+    [
+        datetime(2025, 3, 31, 15, 30, tzinfo=UTC),
+        datetime(2025, 4, 1, 0, 30, tzinfo=JST),
+        datetime(2025, 4, 1, 0, 30),
+    ],
+)
+def test_get_balance_with_timezone(money_flows: Session, as_of: datetime) -> None:
+    assert get_balance(money_flows, (as_of, None)) == expected_balance(datetime(2025, 4, 1, 0, 30))
+
+
+# 月次集計テーブル（月数分の行）とその月の行だけを、1回のSELECTで読むこと
+def test_get_balance_reads_checkpoint_and_one_month(money_flows: Session) -> None:
+    statements = []
+
+    @event.listens_for(money_flows.get_bind(), "before_cursor_execute")
+    def _collect(
+        conn: object,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    get_balance(money_flows, (datetime(2025, 4, 5), None))
+
+    assert len(statements) == 1
+    assert "money_flow_monthly_summary.month < ?" in statements[0]
+    assert "money_flows.occurred_date >= ?" in statements[0]  # その月の1日から
+
+
+# カーソルを渡しながら最後のページまで辿ると、全件の残高が全件から計算した値と一致すること
+def test_get_running_balance_walks_all_pages(money_flows: Session) -> None:
+    seen = []
+    cursor = None
+    while True:
+        items = get_running_balance(money_flows, limit=4, cursor=cursor)
+        seen.extend((item["id"], item["balance"]) for item in items[:4])
+        if len(items) <= 4:
+            break
+        cursor = (items[3]["occurred_date"], items[3]["id"])
+
+    balance = 0
+    expected = []
+    for id, (_, kind, amount) in enumerate(FLOWS, start=1):
+        balance += amount if kind == MoneyFlowKind.INCOME else -amount
+        expected.append((id, balance))
+    assert seen == expected
+
+
+# 期間で絞り込んでも、残高はそれより前の収支を含めた値になること。累計はウィンドウ関数で計算する
+def test_get_running_balance_with_range(money_flows: Session) -> None:
+    statements = []
+
+    @event.listens_for(money_flows.get_bind(), "before_cursor_execute")
+    def _collect(
+        conn: object,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    items = get_running_balance(
+        money_flows, limit=10, date_from=datetime(2025, 4, 1), date_to=datetime(2025, 5, 1)
+    )
+
+    assert [(item["id"], item["kind"], item["balance"]) for item in items] == [
+        (3, "expense", 115800),
+        (4, "expense", 115500),
+        (5, "income", 116500),
+    ]
+    assert "OVER (ORDER BY" in statements[0]
+
+
+# money_flows_archiveに移した行も、残高に含まれること
+def test_get_balance_includes_archived_rows(money_flows: Session) -> None:
+    now = datetime(2025, 6, 1)
+    money_flows.add(
+        MoneyFlowsArchive(
+            id=100,
+            title="お年玉",
+            amount=10000,
+            occurred_date=datetime(2025, 1, 5),
+            created_at=now,
+            updated_at=now,
+            version=1,
+            kind=MoneyFlowKind.INCOME,
+            archived_at=now,
+        )
+    )
+    money_flows.flush()
+    rebuild_monthly_summaries(money_flows)
+    money_flows.commit()
+
+    assert get_balance(money_flows, (datetime(2025, 1, 6), None)) == 10000
+    assert get_balance(money_flows, (datetime(2025, 6, 1), None)) == (
+        expected_balance(datetime(2025, 6, 1)) + 10000
+    )
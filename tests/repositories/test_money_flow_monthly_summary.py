@@ -0,0 +1,142 @@
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from todo_app.logic.calculate.calculate_monthly_summary import MonthlySummaryDeltas
+from todo_app.models.db.money_flows import MoneyFlowKind, MoneyFlows
+from todo_app.models.db.money_flows_archive import MoneyFlowsArchive
+from todo_app.repositories.money_flow_monthly_summary import (
+    apply_monthly_summary_deltas,
+    find_monthly_summary_drift,
+    get_monthly_summaries,
+    get_stored_monthly_summaries,
+    rebuild_monthly_summaries,
+)
+
+
+# 行がなければ作成され、あれば加算されること
+def test_apply_monthly_summary_deltas_upsert(sqlite_session: Session) -> None:
+    deltas = MonthlySummaryDeltas()
+    deltas.add(datetime(2025, 4, 1), MoneyFlowKind.EXPENSE, 1000)
+    deltas.add(datetime(2025, 4, 2), MoneyFlowKind.EXPENSE, 500)
+    apply_monthly_summary_deltas(sqlite_session, deltas)
+
+    deltas = MonthlySummaryDeltas()
+    deltas.subtract(datetime(2025, 4, 1), MoneyFlowKind.EXPENSE, 1000)
+    deltas.add(datetime(2025, 5, 1), MoneyFlowKind.INCOME, 1000)
+    apply_monthly_summary_deltas(sqlite_session, deltas)
+    sqlite_session.commit()
+
+    assert get_stored_monthly_summaries(sqlite_session) == {
+        (202504, MoneyFlowKind.EXPENSE): (500, 1),
+        (202505, MoneyFlowKind.INCOME): (1000, 1),
+    }
+
+
+# 月の範囲・種類で絞り込めること、件数0の行は返さないこと
+def test_get_monthly_summaries(sqlite_session: Session) -> None:
+    deltas = MonthlySummaryDeltas()
+    deltas.add(datetime(2025, 3, 1), MoneyFlowKind.EXPENSE, 100)
+    deltas.add(datetime(2025, 4, 1), MoneyFlowKind.EXPENSE, 200)
+    deltas.add(datetime(2025, 4, 1), MoneyFlowKind.INCOME, 300)
+    deltas.add(datetime(2025, 5, 1), MoneyFlowKind.EXPENSE, 400)
+    apply_monthly_summary_deltas(sqlite_session, deltas)
+
+    deltas = MonthlySummaryDeltas()
+    deltas.subtract(datetime(2025, 5, 1), MoneyFlowKind.EXPENSE, 400)
+    apply_monthly_summary_deltas(sqlite_session, deltas)
+    sqlite_session.commit()
+
+    summaries = get_monthly_summaries(
+        sqlite_session, month_from=202504, month_to=202512, kind=MoneyFlowKind.EXPENSE
+    )
+
+    assert [(s.month, s.kind, s.total_amount, s.flow_count) for s in summaries] == [
+        (202504, MoneyFlowKind.EXPENSE, 200, 1)
+    ]
+
+
+# ズレを検出し、作り直すとズレがなくなること
+def test_find_drift_and_rebuild(sqlite_session: Session) -> None:
+    sqlite_session.add_all(
+        [
+            MoneyFlows(
+                title="お米",
+                amount=4200,
+                occurred_date=datetime(2025, 4, 1),
+                kind=MoneyFlowKind.EXPENSE,
+            ),
+            MoneyFlows(
+                title="給料",
+                amount=200000,
+                occurred_date=datetime(2025, 4, 25),
+                kind=MoneyFlowKind.INCOME,
+            ),
+        ]
+    )
+    # 集計テーブルには本来ない月の値だけが入っている状態
+    deltas = MonthlySummaryDeltas()
+    deltas.add(datetime(2025, 3, 1), MoneyFlowKind.EXPENSE, 999)
+    apply_monthly_summary_deltas(sqlite_session, deltas)
+    sqlite_session.commit()
+
+    assert find_monthly_summary_drift(sqlite_session) == {
+        (202503, MoneyFlowKind.EXPENSE): ((999, 1), (0, 0)),
+        (202504, MoneyFlowKind.EXPENSE): ((0, 0), (4200, 1)),
+        (202504, MoneyFlowKind.INCOME): ((0, 0), (200000, 1)),
+    }
+
+    rebuild_monthly_summaries(sqlite_session)
+    sqlite_session.commit()
+
+    assert find_monthly_summary_drift(sqlite_session) == {}
+    assert get_stored_monthly_summaries(sqlite_session) == {
+        (202504, MoneyFlowKind.EXPENSE): (4200, 1),
+        (202504, MoneyFlowKind.INCOME): (200000, 1),
+    }
+
+
+# money_flows_archiveに移した行も、月次集計の作り直しで集計されること
+def test_rebuild_includes_archived_rows(sqlite_session: Session) -> None:
+    now = datetime(2025, 4, 30, 12)
+    sqlite_session.add_all(
+        [
+            MoneyFlows(
+                title="お米",
+                amount=4200,
+                occurred_date=datetime(2025, 4, 1),
+                kind=MoneyFlowKind.EXPENSE,
+            ),
+            MoneyFlowsArchive(
+                id=100,
+                title="お菓子",
+                amount=300,
+                occurred_date=datetime(2025, 4, 2),
+                created_at=now,
+                updated_at=now,
+                version=1,
+                kind=MoneyFlowKind.EXPENSE,
+                archived_at=now,
+            ),
+            MoneyFlowsArchive(
+                id=101,
+                title="電気代",
+                amount=5000,
+                occurred_date=datetime(2022, 1, 31),
+                created_at=now,
+                updated_at=now,
+                version=2,
+                kind=MoneyFlowKind.EXPENSE,
+                archived_at=now,
+            ),
+        ]
+    )
+    sqlite_session.commit()
+
+    rebuild_monthly_summaries(sqlite_session)
+    sqlite_session.commit()
+
+    assert get_stored_monthly_summaries(sqlite_session) == {
+        (202201, MoneyFlowKind.EXPENSE): (5000, 1),
+        (202504, MoneyFlowKind.EXPENSE): (4500, 2),
+    }
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import pytest
+
+from todo_app.repositories.money_flow_partitions import (
+    build_add_partitions_sql,
+    build_copy_exchanged_rows_sql,
+    build_exchange_partition_sql,
+    parse_partition_description,
+    validate_partition_name,
+)
+
+# ※パーティションはMySQLのみのため、SQLiteでは実行せずSQL文だけを確認する
+
+
+def test_build_add_partitions_sql() -> None:
+    assert build_add_partitions_sql([datetime(2025, 5, 1), datetime(2025, 6, 1)]) == (
+        "ALTER TABLE money_flows REORGANIZE PARTITION pmax INTO ("
+        "PARTITION p202505 VALUES LESS THAN ('2025-06-01 00:00:00'), "
+        "PARTITION p202506 VALUES LESS THAN ('2025-07-01 00:00:00'), "
+        "PARTITION pmax VALUES LESS THAN (MAXVALUE))"
+    )
+
+
+def test_build_exchange_partition_sql() -> None:
+    assert build_exchange_partition_sql("p202401") == (
+        "ALTER TABLE money_flows EXCHANGE PARTITION p202401 WITH TABLE money_flows_exchange"
+    )
+
+
+# パーティションから直接ではなく、EXCHANGE PARTITIONで取り出した行をコピーする
+def test_build_copy_exchanged_rows_sql() -> None:
+    sql = build_copy_exchanged_rows_sql()
+
+    assert sql.startswith("INSERT IGNORE INTO money_flows_archive (id, title, amount,")
+    assert sql.endswith(", :archived_at FROM money_flows_exchange")
+
+
+@pytest.mark.parametrize(
+    ("description", "expected"),
+    [("'2025-05-01 00:00:00'", datetime(2025, 5, 1)), ("MAXVALUE", None)],
+)
+def test_parse_partition_description(description: str, expected: datetime | None) -> None:
+    assert parse_partition_description(description) == expected
+
+
+# SQLに埋め込むため、決まった形以外のパーティション名は受け付けない
+@pytest.mark.parametrize("name", ["pmax", "p2025", "p202401; DROP TABLE money_flows"])
+def test_validate_partition_name_invalid(name: str) -> None:
+    with pytest.raises(ValueError):
+        validate_partition_name(name)
@@ -0,0 +1,576 @@
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from todo_app.models.db.money_flows import MoneyFlowKind, MoneyFlows
+from todo_app.models.request.v1.money_flows import (
+    MoneyFlowFilter,
+    TitleMatch,
+    UpdateMoneyFlowRequest,
+)
+from todo_app.repositories import money_flows as money_flows_repository
+from todo_app.repositories.money_flows import (
+    aggregate_money_flows,
+    build_money_flow_conditions,
+    build_money_flows_search_statement,
+    get_money_flow_items,
+    get_money_flows_all,
+    get_money_flows_page,
+    has_consecutive_insert_ids,
+    insert_money_flows,
+    search_money_flows,
+    update_money_flow,
+    update_money_flows_by_ids,
+)
+
+
+# テスト用のデータを登録するヘルパー
+def add_money_flows(session: Session, occurred_dates: list[datetime]) -> None:
+    session.add_all(
+        [
+            MoneyFlows(
+                title=f"タイトル{i}",
+                amount=100 * (i + 1),
+                occurred_date=occurred_date,
+                kind=MoneyFlowKind.EXPENSE,
+            )
+            for i, occurred_date in enumerate(occurred_dates)
+        ]
+    )
+    session.commit()
+
+
+# カーソルを渡しながら最後のページまで辿ると、全件が(occurred_date, id)順に重複なく取れる
+def test_get_money_flows_page_walks_all_rows(sqlite_session: Session) -> None:
+    add_money_flows(
+        sqlite_session,
+        [
+            datetime(2025, 4, 3),
+            datetime(2025, 4, 1),
+            datetime(2025, 4, 2),
+            datetime(2025, 4, 1),  # 同じ日付 → idで順序が決まる
+            datetime(2025, 4, 2),
+        ],
+    )
+
+    seen = []
+    cursor = None
+    while True:
+        items = get_money_flows_page(sqlite_session, limit=2, cursor=cursor)
+        seen.extend((item["occurred_date"], item["id"]) for item in items[:2])
+        if len(items) <= 2:
+            break
+        cursor = (items[1]["occurred_date"], items[1]["id"])
+
+    assert seen == sorted(seen)
+    assert len(seen) == 5
+
+
+# 次のページの有無を判定するため、limit + 1件まで返す
+def test_get_money_flows_page_fetches_one_extra_row(sqlite_session: Session) -> None:
+    add_money_flows(sqlite_session, [datetime(2025, 4, day) for day in range(1, 6)])
+
+    assert len(get_money_flows_page(sqlite_session, limit=3)) == 4
+    assert len(get_money_flows_page(sqlite_session, limit=10)) == 5
+
+
+# OFFSETで読み飛ばさず、WHERE句でシークしていることを確認
+# ※SQLiteはLIMITを付けると必ず「OFFSET ?」を出力するため、値が0であることで確認する
+def test_get_money_flows_page_does_not_use_offset(sqlite_session: Session) -> None:
+    add_money_flows(sqlite_session, [datetime(2025, 4, 1)])
+    statements = []
+
+    @event.listens_for(sqlite_session.get_bind(), "before_cursor_execute")
+    def _collect(
+        conn: object,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        statements.append((statement, parameters))
+
+    get_money_flows_page(sqlite_session, limit=2, cursor=(datetime(2025, 4, 1), 1))
+
+    assert len(statements) == 1
+    statement, parameters = statements[0]
+    assert "money_flows.id > ?" in statement
+    assert "ORDER BY money_flows.occurred_date, money_flows.id" in statement
+    assert parameters[-2:] == (3, 0)  # LIMIT limit + 1 OFFSET 0
+
+
+# 絞り込み条件がWHERE句としてDBに渡り、DB側で絞り込まれていること
+def test_get_money_flows_all_pushes_down_filter(sqlite_session: Session) -> None:
+    sqlite_session.add_all(
+        [
+            MoneyFlows(
+                title="お米",
+                amount=4200,
+                occurred_date=datetime(2025, 4, 1),
+                kind=MoneyFlowKind.EXPENSE,
+            ),
+            MoneyFlows(
+                title="給料",
+                amount=200000,
+                occurred_date=datetime(2025, 4, 25),
+                kind=MoneyFlowKind.INCOME,
+            ),
+            MoneyFlows(
+                title="電気代",
+                amount=5000,
+                occurred_date=datetime(2025, 5, 1),  # toは含まない
+                kind=MoneyFlowKind.EXPENSE,
+            ),
+            MoneyFlows(
+                title="お菓子",
+                amount=300,
+                occurred_date=datetime(2025, 4, 10),
+                kind=MoneyFlowKind.EXPENSE,
+            ),
+        ]
+    )
+    sqlite_session.commit()
+    statements = []
+
+    @event.listens_for(sqlite_session.get_bind(), "before_cursor_execute")
+    def _collect(
+        conn: object,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    items = get_money_flows_all(
+        sqlite_session,
+        filters=MoneyFlowFilter(
+            date_from=datetime(2025, 4, 1),
+            date_to=datetime(2025, 5, 1),
+            kind="expense",
+            amount_min=1000,
+            order="desc",
+        ),
+    )
+
+    assert [item.title for item in items] == ["お米"]
+    assert len(statements) == 1
+    where = statements[0].split("WHERE", 1)[1]
+    assert "money_flows.occurred_date >= ?" in where
+    assert "money_flows.occurred_date < ?" in where
+    assert "money_flows.kind = ?" in where
+    assert "money_flows.amount >= ?" in where
+    assert "ORDER BY money_flows.occurred_date DESC, money_flows.id DESC" in where
+
+
+# 月の条件には、同じ範囲のoccurred_dateの条件も付くこと（MySQLのパーティションプルーニングのため）
+def test_money_flow_month_conditions_bound_occurred_date() -> None:
+    conditions = build_money_flow_conditions(MoneyFlowFilter(month_from=202412, month_to=202502))
+    compiled = [condition.compile() for condition in conditions]
+
+    assert [(str(c), list(c.params.values())) for c in compiled] == [
+        ("money_flows.occurred_month >= :occurred_month_1", [202412]),
+        ("money_flows.occurred_date >= :occurred_date_1", [datetime(2024, 12, 1)]),
+        ("money_flows.occurred_month <= :occurred_month_1", [202502]),
+        ("money_flows.occurred_date < :occurred_date_1", [datetime(2025, 3, 1)]),
+    ]
+
+
+# カラムを関数で包んでいない（サーガブルな）ため、DBがインデックスで検索できること
+@pytest.mark.parametrize(
+    ("filters", "index_name"),
+    [
+        (
+            MoneyFlowFilter(date_from=datetime(2025, 4, 1), date_to=datetime(2025, 5, 1)),
+            "ix_money_flows_occurred_",
+        ),
+        (MoneyFlowFilter(kind="income"), "ix_money_flows_kind"),
+        # 月の条件はoccurred_monthとoccurred_dateの両方に付くため、どちらのインデックスも使える
+        (MoneyFlowFilter(month_from=202504, month_to=202506), "ix_money_flows_"),
+        (
+            MoneyFlowFilter(
+                date_from=datetime(2025, 4, 1), date_to=datetime(2025, 5, 1), kind="income"
+            ),
+            "",  # どのインデックスを選ぶかは統計情報次第のため、インデックス検索であることだけ確認
+        ),
+    ],
+)
+def test_money_flow_conditions_use_index(
+    sqlite_session: Session, filters: MoneyFlowFilter, index_name: str
+) -> None:
+    query = sqlite_session.query(MoneyFlows).where(*build_money_flow_conditions(filters))
+    compiled = query.statement.compile(sqlite_session.get_bind())
+
+    # 実行計画は値に依存しないため、バインドパラメータはNoneで埋める
+    plan = (
+        sqlite_session.connection()
+        .exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {compiled}", (None,) * len(compiled.positiontup or [])
+        )
+        .all()
+    )
+    details = " ".join(row[-1] for row in plan)
+
+    assert f"SEARCH money_flows USING INDEX {index_name}" in details
+    assert "SCAN money_flows" not in details  # テーブルのフルスキャンをしていない
+
+
+# 期間・収支ごとの集計がDB側で行われること
+@pytest.mark.parametrize(
+    ("period", "expected"),
+    [
+        (
+            "month",
+            [
+                ("2025-03", MoneyFlowKind.EXPENSE, 1400, 2),
+                ("2025-04", MoneyFlowKind.EXPENSE, 300, 1),
+                ("2025-04", MoneyFlowKind.INCOME, 200000, 1),
+            ],
+        ),
+        (
+            "week",
+            [
+                ("2025-03-24", MoneyFlowKind.EXPENSE, 1000, 1),  # 3/30(日)はその週の月曜日3/24
+                ("2025-03-31", MoneyFlowKind.EXPENSE, 700, 2),  # 3/31(月)〜4/6(日)
+                ("2025-04-21", MoneyFlowKind.INCOME, 200000, 1),
+            ],
+        ),
+        (
+            "year",
+            [
+                ("2025", MoneyFlowKind.EXPENSE, 1700, 3),
+                ("2025", MoneyFlowKind.INCOME, 200000, 1),
+            ],
+        ),
+    ],
+)
+def test_aggregate_money_flows(sqlite_session: Session, period: str, expected: list[tuple]) -> None:
+    sqlite_session.add_all(
+        [
+            MoneyFlows(
+                title="家賃",
+                amount=1000,
+                occurred_date=datetime(2025, 3, 30, 23, 59),
+                kind=MoneyFlowKind.EXPENSE,
+            ),
+            MoneyFlows(
+                title="お米",
+                amount=400,
+                occurred_date=datetime(2025, 3, 31),
+                kind=MoneyFlowKind.EXPENSE,
+            ),
+            MoneyFlows(
+                title="お菓子",
+                amount=300,
+                occurred_date=datetime(2025, 4, 6, 12),
+                kind=MoneyFlowKind.EXPENSE,
+            ),
+            MoneyFlows(
+                title="給料",
+                amount=200000,
+                occurred_date=datetime(2025, 4, 25),
+                kind=MoneyFlowKind.INCOME,
+            ),
+        ]
+    )
+    sqlite_session.commit()
+
+    rows = aggregate_money_flows(sqlite_session, period=period, filters=MoneyFlowFilter())
+
+    assert [tuple(row) for row in rows] == expected
+
+
+# 集計でも絞り込み条件（期間）が適用されること
+def test_aggregate_money_flows_with_filter(sqlite_session: Session) -> None:
+    add_money_flows(sqlite_session, [datetime(2025, 3, 31), datetime(2025, 4, 1)])
+
+    rows = aggregate_money_flows(
+        sqlite_session,
+        period="month",
+        filters=MoneyFlowFilter(date_from=datetime(2025, 4, 1), date_to=datetime(2025, 5, 1)),
+    )
+
+    assert [tuple(row) for row in rows] == [("2025-04", MoneyFlowKind.EXPENSE, 200, 1)]
+
+
+# 月（日本時間のYYYYMM）での絞り込みが適用されること
+def test_aggregate_money_flows_with_month_filter(sqlite_session: Session) -> None:
+    add_money_flows(
+        sqlite_session, [datetime(2025, 3, 31, 23, 59), datetime(2025, 4, 1), datetime(2025, 5, 1)]
+    )
+
+    rows = aggregate_money_flows(
+        sqlite_session, period="month", filters=MoneyFlowFilter(month_from=202504, month_to=202504)
+    )
+
+    assert [tuple(row) for row in rows] == [("2025-04", MoneyFlowKind.EXPENSE, 200, 1)]
+
+
+# ORMで登録・変更すると、occurred_monthもoccurred_dateに合わせて設定されること
+def test_occurred_month_follows_occurred_date(sqlite_session: Session) -> None:
+    add_money_flows(sqlite_session, [datetime(2025, 3, 31, 23, 59)])
+    item = sqlite_session.query(MoneyFlows).one()
+    assert item.occurred_month == 202503
+
+    item.occurred_date = datetime(2025, 3, 31, 15, 30, tzinfo=UTC)  # 日本時間では4/1 0:30
+    sqlite_session.commit()
+
+    assert (item.occurred_date, item.occurred_month) == (datetime(2025, 4, 1, 0, 30), 202504)
+
+
+# 1文のUPDATE（1件・複数件）でも、occurred_monthがoccurred_dateに合わせて更新されること
+def test_update_money_flows_sets_occurred_month(sqlite_session: Session) -> None:
+    add_money_flows(sqlite_session, [datetime(2025, 3, 1), datetime(2025, 3, 2)])
+
+    update_money_flow(
+        sqlite_session,
+        UpdateMoneyFlowRequest(id=1, title="お米", amount=100, occurred_date=datetime(2025, 4, 1)),
+        version=1,
+    )
+    update_money_flows_by_ids(
+        sqlite_session,
+        [
+            UpdateMoneyFlowRequest(
+                id=2, title="お米", amount=100, occurred_date=datetime(2025, 5, 1)
+            )
+        ],
+    )
+    sqlite_session.commit()
+
+    assert sqlite_session.execute(
+        select(MoneyFlows.id, MoneyFlows.occurred_month).order_by(MoneyFlows.id)
+    ).all() == [(1, 202504), (2, 202505)]
+
+
+# 複数行INSERTで登録し、採番されたidが登録した順番通りに返ること
+# idが連番にならない設定のDB（consecutive=False）では、1行ずつINSERTして、それぞれのidを返すこと
+@pytest.mark.parametrize(("consecutive", "insert_count"), [(True, 1), (False, 2)])
+def test_insert_money_flows(
+    sqlite_session: Session,
+    monkeypatch: pytest.MonkeyPatch,
+    consecutive: bool,
+    insert_count: int,
+) -> None:
+    add_money_flows(sqlite_session, [datetime(2025, 3, 1)])  # 既にデータがある状態
+    now = datetime(2025, 4, 30, 12)
+    monkeypatch.setattr(
+        money_flows_repository, "has_consecutive_insert_ids", lambda connection: consecutive
+    )
+    statements = []
+    event.listen(
+        sqlite_session.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    ids = insert_money_flows(
+        sqlite_session,
+        [
+            ("お米", 4200, datetime(2025, 4, 1), MoneyFlowKind.EXPENSE, now, now),
+            ("給料", 200000, datetime(2025, 4, 25), MoneyFlowKind.INCOME, now, now),
+        ],
+    )
+    sqlite_session.commit()
+
+    assert ids == [2, 3]
+    assert sum(statement.startswith("INSERT INTO money_flows ") for statement in statements) == (
+        insert_count
+    )
+    assert [
+        (item.id, item.title, item.kind, item.occurred_month, item.created_at)
+        for item in sqlite_session.query(MoneyFlows).where(MoneyFlows.id.in_(ids))
+    ] == [
+        (2, "お米", MoneyFlowKind.EXPENSE, 202504, now),
+        (3, "給料", MoneyFlowKind.INCOME, 202504, now),
+    ]
+
+
+# MySQLのinnodb_autoinc_lock_modeを接続ごとに1回だけ確認し、2（MySQL 8の既定値）では連番にならないと判定すること
+@pytest.mark.parametrize(("mode", "expected"), [(1, True), (2, False)])
+def test_has_consecutive_insert_ids_on_mysql(mode: int, expected: bool) -> None:
+    statements = []
+
+    def exec_driver_sql(statement: str) -> SimpleNamespace:
+        statements.append(statement)
+        return SimpleNamespace(scalar_one=lambda: mode)
+
+    connection: Any = SimpleNamespace(
+        dialect=SimpleNamespace(name="mysql"), info={}, exec_driver_sql=exec_driver_sql
+    )
+
+    assert has_consecutive_insert_ids(connection) is expected
+    assert has_consecutive_insert_ids(connection) is expected
+    assert statements == ["SELECT @@innodb_autoinc_lock_mode"]
+
+
+# 一覧APIのレスポンスの形のdictが、ORMを使わず6列だけのSELECTで返ること
+def test_get_money_flow_items(sqlite_session: Session) -> None:
+    sqlite_session.add_all(
+        [
+            MoneyFlows(
+                title="給料",
+                amount=200000,
+                occurred_date=datetime(2025, 4, 25),
+                kind=MoneyFlowKind.INCOME,
+            ),
+            MoneyFlows(
+                title="お米",
+                amount=4200,
+                occurred_date=datetime(2025, 4, 1),
+                kind=MoneyFlowKind.EXPENSE,
+            ),
+        ]
+    )
+    sqlite_session.commit()
+    sqlite_session.expunge_all()
+    statements = []
+
+    @event.listens_for(sqlite_session.get_bind(), "before_cursor_execute")
+    def _collect(
+        conn: object,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    items = get_money_flow_items(sqlite_session, filters=MoneyFlowFilter())
+
+    assert items == [
+        {
+            "id": 2,
+            "title": "お米",
+            "amount": 4200,
+            "occurred_date": datetime(2025, 4, 1),
+            "kind": "expense",
+            "version": 1,
+        },
+        {
+            "id": 1,
+            "title": "給料",
+            "amount": 200000,
+            "occurred_date": datetime(2025, 4, 25),
+            "kind": "income",
+            "version": 1,
+        },
+    ]
+    assert "created_at" not in statements[0]
+    assert len(sqlite_session.identity_map) == 0  # ORMのインスタンスを作っていない
+
+
+# タイトル検索用のデータを登録するヘルパー（occurred_dateはタイトルの順に新しくなる）
+def add_titles(session: Session, titles: list[str]) -> None:
+    session.add_all(
+        [
+            MoneyFlows(
+                title=title,
+                amount=100,
+                occurred_date=datetime(2025, 4, i + 1),
+                kind=MoneyFlowKind.EXPENSE,
+            )
+            for i, title in enumerate(titles)
+        ]
+    )
+    session.commit()
+
+
+# 完全一致 → 前方一致 → 部分一致の順に、同じ順位の中では新しい順に並ぶこと
+def test_search_money_flows_contains(sqlite_session: Session) -> None:
+    add_titles(sqlite_session, ["お米券", "新米のお米", "お米", "米", "おこめ", "お米券"])
+
+    items = search_money_flows(sqlite_session, query="お米", match="contains", limit=10)
+
+    assert [(item["id"], item["title"], item["rank"]) for item in items] == [
+        (3, "お米", 0),
+        (6, "お米券", 1),
+        (1, "お米券", 1),
+        (2, "新米のお米", 2),
+    ]
+    assert set(items[0]) == {"id", "title", "amount", "occurred_date", "kind", "version", "rank"}
+
+
+# 英字の大文字・小文字、空白や記号を含むタイトルも部分一致で検索できること
+def test_search_money_flows_contains_ascii(sqlite_session: Session) -> None:
+    add_titles(sqlite_session, ["Amazon Prime", "プライム", "100% Orange"])
+
+    assert [
+        item["title"]
+        for item in search_money_flows(sqlite_session, query="on pr", match="contains", limit=10)
+    ] == ["Amazon Prime"]
+    assert [
+        item["title"]
+        for item in search_money_flows(sqlite_session, query="% o", match="contains", limit=10)
+    ] == ["100% Orange"]
+
+
+def test_search_money_flows_prefix(sqlite_session: Session) -> None:
+    add_titles(sqlite_session, ["お米券", "新米のお米", "お米", "おこめ", "100%_off"])
+
+    items = search_money_flows(sqlite_session, query="お", match="prefix", limit=10)
+    escaped = search_money_flows(sqlite_session, query="100%_", match="prefix", limit=10)
+
+    assert [item["title"] for item in items] == ["おこめ", "お米", "お米券"]  # すべて前方一致 → 新しい順
+    assert [item["title"] for item in escaped] == ["100%_off"]  # %と_はワイルドカードにしない
+
+
+# 更新・削除した場合も、トリガーで全文検索の表が更新されること
+def test_search_money_flows_follows_updates(sqlite_session: Session) -> None:
+    add_titles(sqlite_session, ["お米", "お菓子"])
+    rice, snack = sqlite_session.query(MoneyFlows).order_by(MoneyFlows.id).all()
+    rice.title = "パン"
+    sqlite_session.delete(snack)
+    sqlite_session.commit()
+
+    assert search_money_flows(sqlite_session, query="お米", match="contains", limit=10) == []
+    assert search_money_flows(sqlite_session, query="お菓子", match="contains", limit=10) == []
+    assert [
+        item["id"] for item in search_money_flows(sqlite_session, "パン", "contains", limit=10)
+    ] == [1]
+
+
+# カーソルを渡しながら最後のページまで辿ると、全件が順位順に重複なく取れる
+def test_search_money_flows_walks_all_pages(sqlite_session: Session) -> None:
+    add_titles(sqlite_session, ["お米", "お米券", "新米のお米", "お米", "玄米とお米", "お米券"])
+
+    seen = []
+    cursor = None
+    while True:
+        items = search_money_flows(
+            sqlite_session, query="お米", match="contains", limit=2, cursor=cursor
+        )
+        seen.extend((item["rank"], item["id"]) for item in items[:2])
+        if len(items) <= 2:
+            break
+        cursor = (items[1]["rank"], items[1]["occurred_date"], items[1]["id"])
+
+    assert seen == [(0, 4), (0, 1), (1, 6), (1, 2), (2, 5), (2, 3)]
+
+
+# money_flowsを全件読まず、インデックス（前方一致：B-tree、部分一致：FTS5）で候補を絞り込むこと
+@pytest.mark.parametrize(
+    ("match", "expected"),
+    [
+        ("prefix", "SEARCH money_flows USING INDEX ix_money_flows_title"),
+        ("contains", "SCAN money_flows_title_fts VIRTUAL TABLE INDEX"),
+    ],
+)
+def test_search_money_flows_uses_index(
+    sqlite_session: Session, match: TitleMatch, expected: str
+) -> None:
+    compiled = build_money_flows_search_statement("お米", match, "sqlite", limit=20).compile(
+        sqlite_session.get_bind(), compile_kwargs={"literal_binds": True}
+    )
+    plan = sqlite_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}").all()
+    details = " ".join(row[-1] for row in plan)
+
+    assert expected in details
+    assert "SCAN money_flows " not in f"{details} "  # money_flowsのフルスキャンをしていない
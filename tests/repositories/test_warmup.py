@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from todo_app.models.db.money_flows import MoneyFlowKind, MoneyFlows
+from todo_app.repositories.warmup import (
+    build_warm_up_queries,
+    build_warm_up_writes,
+    warm_up_statements,
+)
+
+
+# 起動時のウォームアップは、SQL文を実行するが、データは変えないこと（書き込みはロールバックする）
+def test_warm_up_statements(sqlite_session: Session) -> None:
+    sqlite_session.add(
+        MoneyFlows(
+            title="お米",
+            amount=4200,
+            occurred_date=datetime(2025, 4, 1),
+            kind=MoneyFlowKind.EXPENSE,
+        )
+    )
+    sqlite_session.commit()
+    statements = []
+
+    @event.listens_for(sqlite_session.get_bind(), "before_cursor_execute")
+    def _collect(
+        conn: object,
+        cursor: object,
+        statement: str,
+        parameters: object,
+        context: object,
+        executemany: bool,
+    ) -> None:
+        statements.append(statement)
+
+    count = warm_up_statements(sqlite_session)
+
+    assert count == len(build_warm_up_queries("sqlite")) + len(build_warm_up_writes())
+    assert len(statements) == count
+    assert not sqlite_session.new and not sqlite_session.dirty
+    assert sqlite_session.get(MoneyFlows, 1).title == "お米"
+
+
+# 実行したSQL文（書き込みも含む）が、エンジンのコンパイル済みSQLのキャッシュに載り、
+# 次の実行では再利用されること
+def test_warm_up_statements_fills_compiled_cache(sqlite_session: Session) -> None:
+    compiled_cache: dict = {}
+    engine = sqlite_session.get_bind().execution_options(compiled_cache=compiled_cache)
+
+    with Session(engine) as db:
+        count = warm_up_statements(db)
+        cached = len(compiled_cache)
+        for statement in build_warm_up_queries("sqlite"):
+            db.execute(statement).all()
+        for statement in build_warm_up_writes():
+            db.execute(statement)
+        db.rollback()
+
+    assert cached == count
+    assert len(compiled_cache) == cached  # 新しくコンパイルしていない
@@ -0,0 +1,71 @@
+import asyncio
+
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import Session
+
+from todo_app import main
+from todo_app.models.db.base import Base
+from todo_app.monitoring import db_pool
+from todo_app.monitoring.db_pool import InstrumentedQueuePool
+
+
+# アプリのエンジンの代わりに使う、ファイルのSQLite（プールの大きさ3）
+@pytest.fixture
+def engine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Engine]:
+    monkeypatch.setattr(db_pool, "_instrumented_engines", {})
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'budget.db'}", poolclass=InstrumentedQueuePool, pool_size=3
+    )
+    Base.metadata.create_all(engine)
+    disposed = []
+
+    monkeypatch.setattr(main, "get_engine", lambda: engine)
+    monkeypatch.setattr(main, "session", lambda: Session(engine))
+    monkeypatch.setattr(main, "dispose_engine", lambda: disposed.append(engine.dispose()))
+    monkeypatch.setattr(main, "DB_POOL_WARMUP_SIZE", 2)
+    yield engine
+    engine.dispose()
+    assert disposed  # 終了時に接続を閉じたこと
+
+
+# 起動時（lifespan）に接続を開いてプールに入れておき、よく使うSQL文を実行しておくこと
+def test_lifespan_warms_up_database(engine: Engine) -> None:
+    with TestClient(main.create_app()) as client:
+        assert engine.pool.checkedin() == 2  # 開いた接続がプールに残っている
+        assert client.get("/api/v1/healthcheck").status_code == 200
+
+
+# DBに接続できない場合も、起動は失敗しないこと
+def test_lifespan_without_database(engine: Engine, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(
+        main, "get_engine", lambda: create_engine("sqlite:////nonexistent/budget.db")
+    )
+
+    with TestClient(main.create_app()) as client:
+        assert client.get("/api/v1/healthcheck").status_code == 200
+
+
+# 同期のウォームアップは、イベントループを止めないよう、スレッドで実行すること
+def test_lifespan_warms_up_in_thread(engine: Engine, monkeypatch: pytest.MonkeyPatch) -> None:
+    in_event_loop = []
+
+    def _warm_up_statements(db: Session) -> int:
+        try:
+            asyncio.get_running_loop()
+            in_event_loop.append(True)
+        except RuntimeError:
+            in_event_loop.append(False)
+        return 0
+
+    monkeypatch.setattr(main.warmup, "warm_up_statements", _warm_up_statements)
+
+    with TestClient(main.create_app()):
+        pass
+
+    assert in_event_loop == [False]
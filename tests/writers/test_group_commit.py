@@ -0,0 +1,222 @@
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine, event, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from todo_app.api.v1 import money_flows as money_flows_router
+from todo_app.main import app
+from todo_app.models.db.base import Base
+from todo_app.models.db.money_flow_monthly_summary import MoneyFlowMonthlySummary
+from todo_app.models.db.money_flows import MoneyFlowKind, MoneyFlows
+from todo_app.writers.group_commit import GroupCommitWriter
+from todo_app.writers.money_flows_writer import MoneyFlowRow, write_money_flows
+
+
+# 複数のスレッドから書き込むため、ファイルに保存するSQLiteを使う
+@pytest.fixture
+def file_engine(tmp_path: Path) -> Iterator[Engine]:
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'budget.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def build_writer(
+    engine: Engine, max_delay_ms: float = 200, max_rows: int = 100
+) -> GroupCommitWriter[MoneyFlowRow, int]:
+    return GroupCommitWriter(
+        name="test",
+        session_factory=sessionmaker(bind=engine),
+        write=write_money_flows,
+        max_delay_ms=max_delay_ms,
+        max_rows=max_rows,
+    )
+
+
+def build_row(title: str | None, amount: int = 100) -> MoneyFlowRow:
+    now = datetime(2025, 4, 30, 12)
+    return (title, amount, datetime(2025, 4, 1), MoneyFlowKind.EXPENSE, now, now)
+
+
+def count_commits(engine: Engine) -> list[None]:
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(None))
+    return commits
+
+
+# 同時に来た登録が1回のcommitにまとまり、それぞれの呼び出し元に自分のidが返ること
+def test_concurrent_submits_share_one_commit(file_engine: Engine) -> None:
+    writer = build_writer(file_engine)
+    commits = count_commits(file_engine)
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        futures = list(
+            executor.map(lambda i: writer.submit(build_row(f"タイトル{i}", 100 * i)), range(10))
+        )
+        ids = [future.result(timeout=5) for future in futures]
+    writer.close()
+
+    assert len(commits) == 1
+    assert writer.batches == 1
+    assert writer.rows == 10
+    with Session(file_engine) as session:
+        titles = dict(session.execute(select(MoneyFlows.id, MoneyFlows.title)).all())
+        summary = session.scalars(select(MoneyFlowMonthlySummary)).one()
+    assert [titles[id] for id in ids] == [f"タイトル{i}" for i in range(10)]
+    assert (summary.month, summary.total_amount, summary.flow_count) == (202504, 4500, 10)
+
+
+# max_rows件に達したら、max_delay_msを待たずに書き込むこと
+def test_flushes_when_max_rows_reached(file_engine: Engine) -> None:
+    writer = build_writer(file_engine, max_delay_ms=10_000, max_rows=3)
+
+    futures = [writer.submit(build_row(f"タイトル{i}")) for i in range(3)]
+
+    assert [future.result(timeout=5) for future in futures] == [1, 2, 3]
+    writer.close()
+
+
+# 1件の不正な値のせいで同じバッチの他の登録が失敗せず、不正な値の呼び出し元にだけエラーが返ること
+def test_failure_is_reported_per_request(file_engine: Engine) -> None:
+    writer = build_writer(file_engine, max_rows=3)
+
+    good_first = writer.submit(build_row("お米", 4200))
+    bad = writer.submit(build_row(None))  # titleはNOT NULL
+    good_second = writer.submit(build_row("お菓子", 300))
+
+    assert good_first.result(timeout=5) == 1
+    assert good_second.result(timeout=5) == 2
+    with pytest.raises(IntegrityError):
+        bad.result(timeout=5)
+    writer.close()
+
+    assert writer.failures == 1
+    with Session(file_engine) as session:
+        assert session.scalars(select(MoneyFlows.title).order_by(MoneyFlows.id)).all() == [
+            "お米",
+            "お菓子",
+        ]
+        summary = session.scalars(select(MoneyFlowMonthlySummary)).one()
+    assert (summary.total_amount, summary.flow_count) == (4500, 2)  # 失敗した分は集計されない
+
+
+# WRITE_BATCHING_ENABLED=trueの場合、POST /money_flowsが書き込み役を通して登録すること
+def test_create_money_flows_with_write_batching(
+    file_engine: Engine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    writer = build_writer(file_engine, max_delay_ms=1)
+    monkeypatch.setattr(money_flows_router, "WRITE_BATCHING_ENABLED", True)
+    monkeypatch.setattr(money_flows_router, "money_flows_writer", writer)
+
+    response = TestClient(app).post(
+        "/api/v1/money_flows",
+        json={
+            "title": "お米",
+            "amount": 4200,
+            "occurred_date": "2025-04-01T00:00:00",
+            "kind": "expense",
+        },
+    )
+    writer.close()
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": 1,
+        "title": "お米",
+        "amount": 4200,
+        "occurred_date": "2025-04-01T00:00:00",
+        "kind": "expense",
+        "version": 1,
+    }
+    with Session(file_engine) as session:
+        assert session.scalars(select(MoneyFlows.title)).all() == ["お米"]
+
+
+# after_commitは、commitできた場合にだけ、1回のflushにつき1回呼ぶこと
+# （失敗したバッチや、1件ずつの書き直しのたびには呼ばない）
+def test_after_commit_only_after_successful_commit(file_engine: Engine) -> None:
+    calls = []
+    writer = build_writer(file_engine, max_rows=3)
+    writer.after_commit = lambda: calls.append(None)
+
+    futures = [writer.submit(build_row(title)) for title in ("お米", None, "お菓子")]
+    for future in futures:
+        future.exception(timeout=5)
+    assert len(calls) == 1
+
+    with pytest.raises(IntegrityError):
+        writer.submit(build_row(None)).result(timeout=5)
+    writer.close()
+
+    assert len(calls) == 1
+
+
+# after_commitが失敗しても、commit済みの登録は成功を返し、スレッドは止まらないこと
+def test_after_commit_failure_does_not_stop_writer(file_engine: Engine) -> None:
+    writer = build_writer(file_engine, max_delay_ms=1)
+
+    def fail() -> None:
+        raise RuntimeError("キャッシュを削除できない")
+
+    writer.after_commit = fail
+
+    assert writer.submit(build_row("お米")).result(timeout=5) == 1
+    assert writer.submit(build_row("お菓子")).result(timeout=5) == 2
+    writer.close()
+
+
+class WriterCrash(BaseException):
+    pass
+
+
+# スレッドが予期しない例外で止まった場合、待っている依頼を失敗させ、次の依頼でスレッドを起動し直すこと
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_thread_crash_fails_pending_futures(file_engine: Engine) -> None:
+    writer = build_writer(file_engine, max_delay_ms=1)
+    crash = True
+
+    def write(session: Session, rows: list[MoneyFlowRow]) -> list[int]:
+        if crash:
+            raise WriterCrash
+        return write_money_flows(session, rows)
+
+    writer.write = write
+
+    with pytest.raises(RuntimeError, match="停止しました"):
+        writer.submit(build_row("お米")).result(timeout=5)
+
+    crash = False
+    assert writer.submit(build_row("お菓子")).result(timeout=5) == 1
+    writer.close()
+
+
+# close()の後の依頼は、書き込まれないためエラーにすること
+def test_submit_after_close_raises(file_engine: Engine) -> None:
+    writer = build_writer(file_engine)
+    writer.close()
+
+    with pytest.raises(RuntimeError, match="停止しています"):
+        writer.submit(build_row("お米"))
+
+
+# commitを待つ時間を過ぎた場合はTimeoutErrorにし、まだ書き込んでいない依頼は取り消すこと
+def test_submit_and_wait_timeout(file_engine: Engine) -> None:
+    writer = build_writer(file_engine, max_delay_ms=200)
+    writer.timeout_ms = 1
+
+    with pytest.raises(TimeoutError):
+        writer.submit_and_wait(build_row("お米"))
+    writer.close()
+
+    assert writer.rows == 0
+    with Session(file_engine) as session:
+        assert session.scalars(select(MoneyFlows.title)).all() == []